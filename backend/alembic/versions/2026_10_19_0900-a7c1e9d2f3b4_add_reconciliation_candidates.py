@@ -0,0 +1,55 @@
+"""add reconciliation_candidates (Vorschlags-Cache für den Zahlungsabgleich)
+
+Revision ID: a7c1e9d2f3b4
+Revises: d7f3a1b8e2c4
+Create Date: 2026-10-19 09:00:00.000000+02:00
+
+Speichert die Top-N Abgleich-Vorschläge pro offener Banktransaktion.
+Erstbefüllung: POST /api/backoffice/finance/bank-transactions/suggestions/rebuild
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c1e9d2f3b4'
+down_revision: Union[str, None] = 'd7f3a1b8e2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reconciliation_candidates',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('transaction_id', sa.UUID(), nullable=False),
+        sa.Column('invoice_id', sa.UUID(), nullable=False),
+        sa.Column('payment_id', sa.UUID(), nullable=True),
+        sa.Column('confidence', sa.Numeric(5, 4), nullable=False, comment='Confidence Score 0.0 - 1.0'),
+        sa.Column('rank', sa.Integer(), nullable=False, comment='1 = bester Vorschlag'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['transaction_id'], ['bank_transactions.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['invoice_id'], ['invoices.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['payment_id'], ['payments.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('transaction_id', 'invoice_id', name='uq_reconciliation_candidate_transaction_invoice'),
+        sa.CheckConstraint('confidence >= 0 AND confidence <= 1', name='check_candidate_confidence_valid'),
+    )
+    op.create_index(
+        'ix_reconciliation_candidates_transaction_rank',
+        'reconciliation_candidates',
+        ['transaction_id', 'rank'],
+    )
+    op.create_index(
+        'ix_reconciliation_candidates_invoice_id',
+        'reconciliation_candidates',
+        ['invoice_id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reconciliation_candidates_invoice_id', table_name='reconciliation_candidates')
+    op.drop_index('ix_reconciliation_candidates_transaction_rank', table_name='reconciliation_candidates')
+    op.drop_table('reconciliation_candidates')
@@ -0,0 +1,50 @@
+"""add stripe_events (Webhook-Inbox mit Idempotenz über event_id)
+
+Revision ID: b8d2f0e3a4c5
+Revises: a7c1e9d2f3b4
+Create Date: 2026-10-19 09:30:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d2f0e3a4c5'
+down_revision: Union[str, None] = 'a7c1e9d2f3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'stripe_events',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('event_id', sa.String(length=255), nullable=False, comment='Stripe Event ID (evt_...)'),
+        sa.Column('event_type', sa.String(length=100), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False, comment='Rohes Event-JSON'),
+        sa.Column('invoice_id', sa.UUID(), nullable=True, comment='Aus metadata.invoice_id extrahiert (für Gruppierung pro Rechnung)'),
+        sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('stripe_created', sa.DateTime(timezone=True), nullable=True, comment='Erstellungszeitpunkt laut Stripe'),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True, comment='Frühester nächster Versuch (Backoff)'),
+        sa.Column('processed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('event_id', name='uq_stripe_events_event_id'),
+        sa.CheckConstraint(
+            "status IN ('pending', 'processed', 'failed', 'ignored')",
+            name='check_stripe_event_status_valid',
+        ),
+    )
+    op.create_index('ix_stripe_events_status_next_attempt', 'stripe_events', ['status', 'next_attempt_at'])
+    op.create_index('ix_stripe_events_invoice_id', 'stripe_events', ['invoice_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stripe_events_invoice_id', table_name='stripe_events')
+    op.drop_index('ix_stripe_events_status_next_attempt', table_name='stripe_events')
+    op.drop_table('stripe_events')
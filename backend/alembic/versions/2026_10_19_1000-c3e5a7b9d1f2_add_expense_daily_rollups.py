@@ -0,0 +1,60 @@
+"""add expense_daily_rollups (KPI-Buckets pro Tag/Kategorie/Projekt)
+
+Revision ID: c3e5a7b9d1f2
+Revises: b8d2f0e3a4c5
+Create Date: 2026-10-19 10:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d1f2'
+down_revision: Union[str, None] = 'b8d2f0e3a4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'expense_daily_rollups',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False, comment='Tag (aus Expense.created_at)'),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        # Kein FK auf projects: ein SET NULL kollidiert mit vorhandenen
+        # NULL-Buckets, Projektlöschungen falten die Buckets stattdessen um
+        sa.Column('project_id', sa.UUID(), nullable=True, comment='Projekt (ohne FK, siehe Klassendoku)'),
+        sa.Column('total_amount', sa.Numeric(precision=12, scale=2), server_default='0.00', nullable=False),
+        sa.Column('expense_count', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'day', 'category', 'project_id',
+            name='uq_expense_daily_rollup_bucket',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index('ix_expense_daily_rollups_day', 'expense_daily_rollups', ['day'], unique=False)
+    op.create_index('ix_expense_daily_rollups_project_day', 'expense_daily_rollups', ['project_id', 'day'], unique=False)
+
+    op.create_index('ix_expenses_category_created_at', 'expenses', ['category', 'created_at'], unique=False)
+    op.create_index('ix_expenses_project_created_at', 'expenses', ['project_id', 'created_at'], unique=False)
+
+    # Initiale Befüllung aus den bestehenden Ausgaben
+    op.execute(
+        """
+        INSERT INTO expense_daily_rollups (id, day, category, project_id, total_amount, expense_count)
+        SELECT gen_random_uuid(), date(created_at), category, project_id, sum(amount), count(*)
+        FROM expenses
+        GROUP BY date(created_at), category, project_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_expenses_project_created_at', table_name='expenses')
+    op.drop_index('ix_expenses_category_created_at', table_name='expenses')
+    op.drop_index('ix_expense_daily_rollups_project_day', table_name='expense_daily_rollups')
+    op.drop_index('ix_expense_daily_rollups_day', table_name='expense_daily_rollups')
+    op.drop_table('expense_daily_rollups')
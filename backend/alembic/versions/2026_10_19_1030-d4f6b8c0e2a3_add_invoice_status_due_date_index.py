@@ -0,0 +1,25 @@
+"""add ix_invoices_status_due_date (Überfälligkeits-Lauf)
+
+Revision ID: d4f6b8c0e2a3
+Revises: c3e5a7b9d1f2
+Create Date: 2026-10-19 10:30:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e2a3'
+down_revision: Union[str, None] = 'c3e5a7b9d1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_invoices_status_due_date', 'invoices', ['status', 'due_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_status_due_date', table_name='invoices')
@@ -0,0 +1,62 @@
+"""add customer/contact search_text + pg_trgm GIN indexes
+
+Revision ID: e5a7c9d1f3b4
+Revises: d4f6b8c0e2a3
+Create Date: 2026-10-19 11:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f3b4'
+down_revision: Union[str, None] = 'd4f6b8c0e2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+CUSTOMER_SEARCH_TEXT = (
+    "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(customer_number, '') || ' ' || coalesce(city, ''))"
+)
+CONTACT_SEARCH_TEXT = (
+    "lower(coalesce(firstname, '') || ' ' || coalesce(lastname, '') || ' ' || "
+    "coalesce(email, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('customers', sa.Column(
+        'search_text', sa.Text(),
+        sa.Computed(CUSTOMER_SEARCH_TEXT, persisted=True),
+        nullable=True,
+        comment='Generierter Suchtext (name, email, customer_number, city)',
+    ))
+    op.add_column('contacts', sa.Column(
+        'search_text', sa.Text(),
+        sa.Computed(CONTACT_SEARCH_TEXT, persisted=True),
+        nullable=True,
+        comment='Generierter Suchtext (firstname, lastname, email)',
+    ))
+
+    op.create_index(
+        'ix_customers_search_trgm', 'customers', ['search_text'], unique=False,
+        postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_contacts_search_trgm', 'contacts', ['search_text'], unique=False,
+        postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+    op.create_index('ix_customers_name_id', 'customers', ['name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customers_name_id', table_name='customers')
+    op.drop_index('ix_contacts_search_trgm', table_name='contacts')
+    op.drop_index('ix_customers_search_trgm', table_name='customers')
+    op.drop_column('contacts', 'search_text')
+    op.drop_column('customers', 'search_text')
+    # pg_trgm bleibt installiert (evtl. von anderen Indizes genutzt)
@@ -0,0 +1,33 @@
+"""replace ix_audit_logs_entity with (entity_type, entity_id, timestamp) (CRM-Timeline)
+
+Revision ID: f6b8d0e2a4c5
+Revises: e5a7c9d1f3b4
+Create Date: 2026-10-19 11:30:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e2a4c5'
+down_revision: Union[str, None] = 'e5a7c9d1f3b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_audit_logs_entity_timestamp',
+        'audit_logs',
+        ['entity_type', 'entity_id', 'timestamp'],
+        unique=False,
+    )
+    # Präfix des neuen Index – wird nicht mehr benötigt
+    op.drop_index('ix_audit_logs_entity', table_name='audit_logs')
+
+
+def downgrade() -> None:
+    op.create_index('ix_audit_logs_entity', 'audit_logs', ['entity_type', 'entity_id'], unique=False)
+    op.drop_index('ix_audit_logs_entity_timestamp', table_name='audit_logs')
@@ -0,0 +1,35 @@
+"""pipeline board: backfill pipeline_stage, add ix_customers_pipeline_stage_name
+
+Revision ID: a8c0e2f4b6d7
+Revises: f6b8d0e2a4c5
+Create Date: 2026-10-19 12:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c0e2f4b6d7'
+down_revision: Union[str, None] = 'f6b8d0e2a4c5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bisher wurden Kunden ohne Stage im Board als 'new_lead' einsortiert;
+    # das Board filtert jetzt direkt (indexiert) auf pipeline_stage
+    op.execute("UPDATE customers SET pipeline_stage = 'new_lead' WHERE pipeline_stage IS NULL")
+    op.alter_column('customers', 'pipeline_stage', server_default='new_lead')
+    op.create_index(
+        'ix_customers_pipeline_stage_name',
+        'customers',
+        ['pipeline_stage', 'name', 'id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_customers_pipeline_stage_name', table_name='customers')
+    op.alter_column('customers', 'pipeline_stage', server_default=None)
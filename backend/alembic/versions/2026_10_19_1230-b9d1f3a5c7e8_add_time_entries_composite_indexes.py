@@ -0,0 +1,33 @@
+"""add composite indexes on time_entries (employee/project, start_time)
+
+Revision ID: b9d1f3a5c7e8
+Revises: a8c0e2f4b6d7
+Create Date: 2026-10-19 12:30:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d1f3a5c7e8'
+down_revision: Union[str, None] = 'a8c0e2f4b6d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_time_entries_employee_start', 'time_entries',
+        ['employee_id', 'start_time'], unique=False,
+    )
+    op.create_index(
+        'ix_time_entries_project_start', 'time_entries',
+        ['project_id', 'start_time'], unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_entries_project_start', table_name='time_entries')
+    op.drop_index('ix_time_entries_employee_start', table_name='time_entries')
@@ -0,0 +1,61 @@
+"""add time_daily_rollups (Zeiten pro Tag/Mitarbeiter/Projekt/billable)
+
+Revision ID: c0e2a4b6d8f9
+Revises: b9d1f3a5c7e8
+Create Date: 2026-10-19 13:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c0e2a4b6d8f9'
+down_revision: Union[str, None] = 'b9d1f3a5c7e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'time_daily_rollups',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False, comment='Tag (aus TimeEntry.start_time)'),
+        sa.Column('employee_id', sa.UUID(), nullable=False),
+        sa.Column('project_id', sa.UUID(), nullable=True),
+        sa.Column('billable', sa.Boolean(), nullable=False),
+        sa.Column('total_minutes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('approved_minutes', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('entry_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'day', 'employee_id', 'project_id', 'billable',
+            name='uq_time_daily_rollup_bucket',
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.create_index('ix_time_daily_rollups_employee_day', 'time_daily_rollups', ['employee_id', 'day'], unique=False)
+    op.create_index('ix_time_daily_rollups_project_day', 'time_daily_rollups', ['project_id', 'day'], unique=False)
+
+    # Initiale Befüllung aus den bestehenden Zeiteinträgen
+    op.execute(
+        """
+        INSERT INTO time_daily_rollups
+            (id, day, employee_id, project_id, billable, total_minutes, approved_minutes, entry_count)
+        SELECT gen_random_uuid(), date(start_time), employee_id, project_id, billable,
+               sum(coalesce(duration_minutes, 0)),
+               coalesce(sum(coalesce(duration_minutes, 0)) FILTER (WHERE is_approved), 0),
+               count(*)
+        FROM time_entries
+        GROUP BY date(start_time), employee_id, project_id, billable
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_time_daily_rollups_project_day', table_name='time_daily_rollups')
+    op.drop_index('ix_time_daily_rollups_employee_day', table_name='time_daily_rollups')
+    op.drop_table('time_daily_rollups')
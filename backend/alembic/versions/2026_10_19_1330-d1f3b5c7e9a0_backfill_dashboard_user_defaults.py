@@ -0,0 +1,60 @@
+"""backfill dashboards, os_preferences, user_settings for existing employees
+
+Revision ID: d1f3b5c7e9a0
+Revises: c0e2a4b6d8f9
+Create Date: 2026-10-19 13:30:00.000000+02:00
+
+Neue Mitarbeiter bekommen die Zeilen beim Anlegen (create_user_defaults);
+/dashboards/my-dashboard legt beim Lesen nichts mehr an. Hier werden sie
+für den Bestand nachgezogen.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1f3b5c7e9a0'
+down_revision: Union[str, None] = 'c0e2a4b6d8f9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        INSERT INTO dashboards (id, owner_id, widgets_json, layout_json, theme)
+        SELECT
+            gen_random_uuid(),
+            e.id,
+            '{"stats": {"enabled": true, "type": "stats"},
+              "recentReminders": {"enabled": true, "type": "reminders"},
+              "shortcuts": {"enabled": true, "type": "actions"}}'::jsonb,
+            '{"stats": {"x": 0, "y": 0, "w": 3, "h": 2},
+              "recentReminders": {"x": 3, "y": 0, "w": 3, "h": 2},
+              "shortcuts": {"x": 0, "y": 2, "w": 6, "h": 1}}'::jsonb,
+            'catppuccin-frappe'
+        FROM employees e
+        WHERE NOT EXISTS (SELECT 1 FROM dashboards d WHERE d.owner_id = e.id)
+    """)
+    op.execute("""
+        INSERT INTO os_preferences (id, owner_id, sidebar_collapsed, theme_mode, favorite_apps, dock_order)
+        SELECT
+            gen_random_uuid(),
+            e.id,
+            false,
+            'system',
+            '[]'::jsonb,
+            '["crm", "projects", "time_tracking", "invoices", "finance"]'::jsonb
+        FROM employees e
+        WHERE NOT EXISTS (SELECT 1 FROM os_preferences p WHERE p.owner_id = e.id)
+    """)
+    op.execute("""
+        INSERT INTO user_settings (id, owner_id, language, timezone, notifications_enabled)
+        SELECT gen_random_uuid(), e.id, 'de-DE', 'Europe/Berlin', true
+        FROM employees e
+        WHERE NOT EXISTS (SELECT 1 FROM user_settings s WHERE s.owner_id = e.id)
+    """)
+
+
+def downgrade() -> None:
+    # Reine Datenmigration – die Zeilen bleiben bestehen
+    pass
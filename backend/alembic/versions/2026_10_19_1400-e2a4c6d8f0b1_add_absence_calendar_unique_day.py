@@ -0,0 +1,41 @@
+"""unique (employee_id, absence_date) on hr_absence_calendar
+
+Revision ID: e2a4c6d8f0b1
+Revises: d1f3b5c7e9a0
+Create Date: 2026-10-19 14:00:00.000000+02:00
+
+Ermöglicht INSERT ... ON CONFLICT DO NOTHING beim Materialisieren des
+Abwesenheitskalenders. Vorhandene Dubletten werden vorher entfernt (der
+älteste Eintrag bleibt).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6d8f0b1'
+down_revision: Union[str, None] = 'd1f3b5c7e9a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM hr_absence_calendar a
+        USING hr_absence_calendar b
+        WHERE a.employee_id = b.employee_id
+          AND a.absence_date = b.absence_date
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+    """)
+    op.create_unique_constraint(
+        'uq_absence_calendar_employee_date',
+        'hr_absence_calendar',
+        ['employee_id', 'absence_date'],
+    )
+    # Präfix der Unique-Constraint – wird nicht mehr benötigt
+    op.drop_index('ix_absence_calendar_employee_id', table_name='hr_absence_calendar')
+
+
+def downgrade() -> None:
+    op.create_index('ix_absence_calendar_employee_id', 'hr_absence_calendar', ['employee_id'], unique=False)
+    op.drop_constraint('uq_absence_calendar_employee_date', 'hr_absence_calendar', type_='unique')
@@ -0,0 +1,93 @@
+"""append-only leave ledger (hr_leave_ledger), unique (employee_id, year) on hr_leave_balances
+
+Revision ID: f3b5d7e9a1c2
+Revises: e2a4c6d8f0b1
+Create Date: 2026-10-19 14:30:00.000000+02:00
+
+hr_leave_balances wird zum Snapshot des Ledgers. Bestehende Salden werden
+als Eröffnungsbuchungen (accrual/approval, Notiz "Saldo-Übernahme")
+übernommen, damit Snapshot und Ledger von Beginn an übereinstimmen.
+Doppelte Salden pro Mitarbeiter und Jahr werden vorher entfernt (der
+älteste Eintrag bleibt).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b5d7e9a1c2'
+down_revision: Union[str, None] = 'e2a4c6d8f0b1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OPENING_ENTRIES = [
+    # (Kategorie, Buchungsart, Snapshot-Spalte)
+    ('vacation', 'accrual', 'vacation_total'),
+    ('vacation', 'approval', 'vacation_used'),
+    ('sick', 'accrual', 'sick_total'),
+    ('sick', 'approval', 'sick_used'),
+    ('other', 'accrual', 'other_total'),
+    ('other', 'approval', 'other_used'),
+]
+
+
+def upgrade() -> None:
+    op.create_table(
+        'hr_leave_ledger',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('category', sa.String(length=20), nullable=False),
+        sa.Column('entry_type', sa.String(length=20), nullable=False),
+        sa.Column('days', sa.Numeric(precision=6, scale=2), nullable=False),
+        sa.Column('note', sa.Text(), nullable=True),
+        sa.Column('employee_id', sa.UUID(), nullable=False),
+        sa.Column('leave_request_id', sa.UUID(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.CheckConstraint(
+            "entry_type IN ('accrual', 'adjustment', 'carryover', 'approval', 'cancellation')",
+            name='check_leave_ledger_entry_type',
+        ),
+        sa.CheckConstraint("category IN ('vacation', 'sick', 'other')", name='check_leave_ledger_category'),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['leave_request_id'], ['hr_leave_requests.id'], ondelete='SET NULL'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_leave_ledger_employee_year', 'hr_leave_ledger', ['employee_id', 'year'], unique=False)
+    op.create_index('ix_leave_ledger_leave_request_id', 'hr_leave_ledger', ['leave_request_id'], unique=False)
+
+    op.add_column(
+        'hr_leave_balances',
+        sa.Column('vacation_carryover', sa.Numeric(precision=5, scale=2), server_default='0', nullable=False),
+    )
+
+    op.execute("""
+        DELETE FROM hr_leave_balances a
+        USING hr_leave_balances b
+        WHERE a.employee_id = b.employee_id
+          AND a.year = b.year
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+    """)
+    op.create_unique_constraint('uq_leave_balance_employee_year', 'hr_leave_balances', ['employee_id', 'year'])
+    # Ersetzt durch die Unique-Constraint bzw. deren Präfix
+    op.drop_index('ix_leave_balance_employee_year', table_name='hr_leave_balances')
+    op.drop_index('ix_leave_balance_employee_id', table_name='hr_leave_balances')
+
+    for category, entry_type, column in OPENING_ENTRIES:
+        op.execute(f"""
+            INSERT INTO hr_leave_ledger (id, year, category, entry_type, days, note, employee_id)
+            SELECT gen_random_uuid(), year, '{category}', '{entry_type}', {column}, 'Saldo-Übernahme', employee_id
+            FROM hr_leave_balances
+            WHERE coalesce({column}, 0) <> 0
+        """)
+    op.execute("UPDATE hr_leave_balances SET vacation_remaining = vacation_total - vacation_used")
+
+
+def downgrade() -> None:
+    op.create_index('ix_leave_balance_employee_id', 'hr_leave_balances', ['employee_id'], unique=False)
+    op.create_index('ix_leave_balance_employee_year', 'hr_leave_balances', ['employee_id', 'year'], unique=False)
+    op.drop_constraint('uq_leave_balance_employee_year', 'hr_leave_balances', type_='unique')
+    op.drop_column('hr_leave_balances', 'vacation_carryover')
+    op.drop_index('ix_leave_ledger_leave_request_id', table_name='hr_leave_ledger')
+    op.drop_index('ix_leave_ledger_employee_year', table_name='hr_leave_ledger')
+    op.drop_table('hr_leave_ledger')
@@ -0,0 +1,44 @@
+"""add employees.search_text + pg_trgm GIN index (Mitarbeiterverzeichnis/Typeahead)
+
+Revision ID: a4c6e8f0b2d3
+Revises: f3b5d7e9a1c2
+Create Date: 2026-10-19 15:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e8f0b2d3'
+down_revision: Union[str, None] = 'f3b5d7e9a1c2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMPLOYEE_SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(employee_code, '') || ' ' || "
+    "coalesce(workmate_id, ''))"
+)
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('employees', sa.Column(
+        'search_text', sa.Text(),
+        sa.Computed(EMPLOYEE_SEARCH_TEXT, persisted=True),
+        nullable=True,
+        comment='Generierter Suchtext (Name, E-Mail, employee_code, workmate_id)',
+    ))
+    op.create_index(
+        'ix_employees_search_trgm', 'employees', ['search_text'], unique=False,
+        postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_employees_search_trgm', table_name='employees')
+    op.drop_column('employees', 'search_text')
+    # pg_trgm bleibt installiert (evtl. von anderen Indizes genutzt)
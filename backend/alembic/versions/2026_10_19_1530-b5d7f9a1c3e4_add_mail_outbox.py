@@ -0,0 +1,52 @@
+"""add mail_outbox (ausgehende E-Mails, Versand per Hintergrundjob)
+
+Revision ID: b5d7f9a1c3e4
+Revises: a4c6e8f0b2d3
+Create Date: 2026-10-19 15:30:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d7f9a1c3e4'
+down_revision: Union[str, None] = 'a4c6e8f0b2d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'mail_outbox',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('account', sa.String(length=20), nullable=False, comment='SMTP-Zugang: system, support, noreply'),
+        sa.Column('sender', sa.String(length=255), nullable=False, comment='Envelope-From'),
+        sa.Column('recipients', sa.JSON(), nullable=False, comment='Envelope-Empfänger dieser Domain (To, Cc, Bcc)'),
+        sa.Column('recipient_domain', sa.String(length=255), nullable=False, comment='Domain aller Empfänger des Eintrags (Rate-Limit)'),
+        sa.Column('subject', sa.String(length=998), nullable=True),
+        sa.Column('message', sa.LargeBinary(), nullable=False, comment='Fertige MIME-Nachricht'),
+        sa.Column('reference', sa.String(length=100), nullable=True, comment='Bezug, z.B. invoice:<id> oder ticket:TKT-000042'),
+        sa.Column('status', sa.String(length=20), server_default='pending', nullable=False),
+        sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True, comment='Frühester nächster Versuch bzw. Lease-Ende'),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.CheckConstraint(
+            "status IN ('pending', 'sending', 'sent', 'failed')",
+            name='check_mail_outbox_status_valid',
+        ),
+    )
+    op.create_index('ix_mail_outbox_status_next_attempt', 'mail_outbox', ['status', 'next_attempt_at'])
+    op.create_index('ix_mail_outbox_domain_sent_at', 'mail_outbox', ['recipient_domain', 'sent_at'])
+    op.create_index('ix_mail_outbox_reference', 'mail_outbox', ['reference'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_mail_outbox_reference', table_name='mail_outbox')
+    op.drop_index('ix_mail_outbox_domain_sent_at', table_name='mail_outbox')
+    op.drop_index('ix_mail_outbox_status_next_attempt', table_name='mail_outbox')
+    op.drop_table('mail_outbox')
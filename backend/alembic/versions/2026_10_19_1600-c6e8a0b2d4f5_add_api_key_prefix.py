@@ -0,0 +1,33 @@
+"""add api_keys.key_prefix (indizierter Lookup statt bcrypt über alle Keys)
+
+Bestehende Keys behalten key_prefix = NULL und werden bei ihrer ersten
+erfolgreichen Anmeldung nachgetragen (siehe email_intake.service).
+
+Revision ID: c6e8a0b2d4f5
+Revises: b5d7f9a1c3e4
+Create Date: 2026-10-19 16:00:00.000000+02:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6e8a0b2d4f5'
+down_revision: Union[str, None] = 'b5d7f9a1c3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'api_keys',
+        sa.Column('key_prefix', sa.String(length=32), nullable=True),
+    )
+    op.create_index('ix_api_keys_key_prefix', 'api_keys', ['key_prefix'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_api_keys_key_prefix', table_name='api_keys')
+    op.drop_column('api_keys', 'key_prefix')
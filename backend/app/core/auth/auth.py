@@ -200,6 +200,7 @@ async def get_current_user(
     # 🧭 Benutzer in DB finden (mit eager loading der Rolle)
     # ============================================================
     from sqlalchemy.orm import joinedload
+    from app.modules.employees.crud import username_lookup_filters
     from app.modules.employees.models import Employee
 
     email = decoded.get("email")
@@ -213,15 +214,18 @@ async def get_current_user(
             .where(Employee.email == email)
         )
     if not user and username:
-        user = db.scalar(
+        matches = db.scalars(
             select(Employee)
             .options(joinedload(Employee.role), joinedload(Employee.department))
-            .where(
-                (Employee.first_name.ilike(username))
-                | (Employee.last_name.ilike(username))
-                | (Employee.employee_code.ilike(f"%{username}%"))
+            .where(*username_lookup_filters(username))
+            .limit(2)
+        ).unique().all()
+        if len(matches) > 1:
+            raise HTTPException(
+                status_code=409,
+                detail=get_error_detail(ErrorCode.EMPLOYEE_AMBIGUOUS)
             )
-        )
+        user = matches[0] if matches else None
 
     if not user:
         raise HTTPException(
@@ -255,7 +255,17 @@ class KeycloakAuth:
         )
 
         db.add(new_employee)
+        db.flush()
+        # Dashboard/Preferences/Settings einmalig beim Provisioning anlegen
+        from app.modules.dashboards.crud import create_user_defaults
+        create_user_defaults(db, new_employee.id)
         db.commit()
+        from app.modules.hr.analytics.crud import HEADCOUNT, invalidate_hr_analytics
+        from app.modules.employees.directory import invalidate_directory
+        from app.modules.hr.leave.availability import invalidate_team_availability
+        invalidate_hr_analytics(HEADCOUNT)
+        invalidate_directory()
+        invalidate_team_availability(db)
         db.refresh(new_employee)
 
         return new_employee
@@ -0,0 +1,4 @@
+"""Prozessweite In-Memory-Caches"""
+from .ttl import TTLCache
+
+__all__ = ["TTLCache"]
@@ -0,0 +1,72 @@
+"""
+Kleiner, threadsicherer TTL-Cache für prozessweite Werte.
+
+Gedacht für teure, aber nicht benutzerspezifische Abfragen (z.B.
+Dashboard-Zähler), bei denen ein paar Sekunden Verzögerung akzeptabel
+sind. Jeder Worker-Prozess hat seinen eigenen Cache – nach Änderungen,
+die sofort sichtbar sein müssen, invalidate() aufrufen.
+
+Parallel ablaufende Requests für denselben abgelaufenen Key laden nur
+einmal: der Loader läuft unter einem Lock pro Key.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                return default
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._evict()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Liefert den gecachten Wert oder lädt ihn (einmal pro Key gleichzeitig)."""
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            return value
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # Ein paralleler Request hat inzwischen geladen
+            value = self.get(key, missing)
+            if value is missing:
+                value = loader()
+                self.set(key, value)
+            return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Einen Key oder (ohne Argument) den ganzen Cache verwerfen."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        expired = [k for k, (expires, _) in self._entries.items() if expires <= now]
+        for k in expired:
+            del self._entries[k]
+        if len(self._entries) >= self.max_entries:
+            # Ältester Eintrag zuerst (dict behält die Einfügereihenfolge)
+            del self._entries[next(iter(self._entries))]
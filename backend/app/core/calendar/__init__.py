@@ -0,0 +1,28 @@
+"""Arbeitstage, Feiertage und Sollstunden"""
+from .business_days import (
+    DEFAULT_WORK_WEEK,
+    WorkWeek,
+    business_days,
+    count_weekdays,
+    is_working_day,
+    working_dates,
+    working_hours,
+    work_week_for_employee,
+    work_weeks_for_employees,
+)
+from .holidays import holidays_between, holidays_for_year, is_holiday
+
+__all__ = [
+    "DEFAULT_WORK_WEEK",
+    "WorkWeek",
+    "business_days",
+    "count_weekdays",
+    "holidays_between",
+    "holidays_for_year",
+    "is_holiday",
+    "is_working_day",
+    "working_dates",
+    "working_hours",
+    "work_week_for_employee",
+    "work_weeks_for_employees",
+]
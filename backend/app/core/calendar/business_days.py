@@ -0,0 +1,158 @@
+"""
+Arbeitstage und Sollstunden in konstanter Zeit.
+
+Statt Tag für Tag zu iterieren, wird gezählt, wie oft jeder Wochentag im
+Zeitraum vorkommt (volle Wochen + Rest), und davon die Feiertage je
+Wochentag abgezogen (bisect über die gecachte Feiertagstabelle, siehe
+holidays). Welche Wochentage Arbeitstage sind und wie viele Stunden sie
+haben, bestimmt die WorkWeek – pro Mitarbeiter aus dem
+WorkingHoursTemplate, sonst Mo–Fr à 8 Stunden.
+
+Verwendet von Urlaubsanträgen (hr.leave), Abwesenheitskalender und
+Sollstunden in der Zeiterfassung.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .holidays import holiday_counts_by_weekday, holidays_between, is_holiday
+
+HALF = Decimal("0.5")
+WEEKDAY_FIELDS = (
+    "monday_hours", "tuesday_hours", "wednesday_hours", "thursday_hours",
+    "friday_hours", "saturday_hours", "sunday_hours",
+)
+
+
+@dataclass(frozen=True)
+class WorkWeek:
+    """Sollstunden je Wochentag (Mo=0 … So=6); 0 Stunden = kein Arbeitstag."""
+    hours: tuple[Decimal, ...] = (
+        Decimal(8), Decimal(8), Decimal(8), Decimal(8), Decimal(8), Decimal(0), Decimal(0),
+    )
+
+    @property
+    def workdays(self) -> tuple[bool, ...]:
+        return tuple(h > 0 for h in self.hours)
+
+    @classmethod
+    def from_template(cls, template) -> "WorkWeek":
+        """Aus einem WorkingHoursTemplate (fehlende Werte = 0)."""
+        return cls(tuple(Decimal(str(getattr(template, f) or 0)) for f in WEEKDAY_FIELDS))
+
+
+DEFAULT_WORK_WEEK = WorkWeek()
+
+
+def work_week_for_employee(db: Session, employee_id: UUID) -> WorkWeek:
+    """WorkWeek aus dem (neuesten) WorkingHoursTemplate des Mitarbeiters."""
+    from app.modules.backoffice.time_tracking.models import WorkingHoursTemplate
+
+    template = db.scalars(
+        select(WorkingHoursTemplate)
+        .where(WorkingHoursTemplate.employee_id == employee_id)
+        .order_by(WorkingHoursTemplate.created_at.desc())
+        .limit(1)
+    ).first()
+    return WorkWeek.from_template(template) if template else DEFAULT_WORK_WEEK
+
+
+def work_weeks_for_employees(db: Session, employee_ids) -> dict[UUID, WorkWeek]:
+    """WorkWeek je Mitarbeiter mit einer Query; ohne Template → DEFAULT_WORK_WEEK."""
+    from app.modules.backoffice.time_tracking.models import WorkingHoursTemplate
+
+    result = {employee_id: DEFAULT_WORK_WEEK for employee_id in employee_ids}
+    templates = db.scalars(
+        select(WorkingHoursTemplate)
+        .where(WorkingHoursTemplate.employee_id.in_(list(result)))
+        .order_by(WorkingHoursTemplate.created_at)
+    ).all()
+    # Neuestes Template gewinnt
+    for template in templates:
+        result[template.employee_id] = WorkWeek.from_template(template)
+    return result
+
+
+def count_weekdays(start: date, end: date) -> list[int]:
+    """Wie oft jeder Wochentag (Mo=0 … So=6) in [start, end] vorkommt – O(1)."""
+    if start > end:
+        return [0] * 7
+    full_weeks, rest = divmod((end - start).days + 1, 7)
+    counts = [full_weeks] * 7
+    first = start.weekday()
+    for offset in range(rest):
+        counts[(first + offset) % 7] += 1
+    return counts
+
+
+def _working_day_counts(start: date, end: date, state: Optional[str]) -> list[int]:
+    """Arbeitsfähige Tage je Wochentag: Vorkommen minus Feiertage."""
+    holidays = holiday_counts_by_weekday(start, end, state)
+    return [n - h for n, h in zip(count_weekdays(start, end), holidays)]
+
+
+def is_working_day(day: date, work_week: WorkWeek = DEFAULT_WORK_WEEK, state: Optional[str] = None) -> bool:
+    return work_week.workdays[day.weekday()] and not is_holiday(day, state)
+
+
+def business_days(
+    start: date,
+    end: date,
+    work_week: WorkWeek = DEFAULT_WORK_WEEK,
+    state: Optional[str] = None,
+    half_day_start: bool = False,
+    half_day_end: bool = False,
+) -> Decimal:
+    """
+    Arbeitstage in [start, end] ohne Wochenenden und Feiertage.
+
+    Halbe Tage am Start/Ende zählen 0,5 – nur wenn der Tag selbst ein
+    Arbeitstag ist; ein einzelner Tag mit beiden Flags zählt 0,5.
+    """
+    if start > end:
+        return Decimal("0.00")
+
+    counts = _working_day_counts(start, end, state)
+    days = Decimal(sum(n for n, workday in zip(counts, work_week.workdays) if workday))
+
+    if half_day_start and is_working_day(start, work_week, state):
+        days -= HALF
+    if half_day_end and (start != end or not half_day_start) and is_working_day(end, work_week, state):
+        days -= HALF
+    return days.quantize(Decimal("0.01"))
+
+
+def working_hours(
+    start: date,
+    end: date,
+    work_week: WorkWeek = DEFAULT_WORK_WEEK,
+    state: Optional[str] = None,
+) -> Decimal:
+    """Sollstunden in [start, end] laut WorkWeek, Feiertage ausgenommen."""
+    if start > end:
+        return Decimal("0.00")
+    counts = _working_day_counts(start, end, state)
+    return sum((n * h for n, h in zip(counts, work_week.hours)), Decimal("0.00"))
+
+
+def working_dates(
+    start: date,
+    end: date,
+    work_week: WorkWeek = DEFAULT_WORK_WEEK,
+    state: Optional[str] = None,
+) -> list[date]:
+    """Alle Arbeitstage in [start, end] (z.B. für Kalendereinträge)."""
+    holidays = holidays_between(start, end, state)
+    workdays = work_week.workdays
+    return [
+        day
+        for day in (start + timedelta(days=i) for i in range((end - start).days + 1))
+        if workdays[day.weekday()] and day not in holidays
+    ]
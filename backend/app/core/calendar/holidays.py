@@ -0,0 +1,144 @@
+"""
+Gesetzliche Feiertage in Deutschland je Bundesland.
+
+Die Tabelle eines Jahres wird einmal berechnet und pro (Bundesland, Jahr)
+gecacht. Neben der sortierten Liste gibt es je Wochentag eine sortierte
+Liste von Ordinalzahlen – damit zählt business_days die Feiertage eines
+Zeitraums per bisect, ohne über die Tage zu laufen.
+
+Bundesländer: ISO-3166-2-Kürzel ohne "DE-" (z.B. "RP", "BY", "NW").
+Nur landesweite Feiertage; regional begrenzte (z.B. Mariä Himmelfahrt in
+Teilen Bayerns, Fronleichnam in Teilen Sachsens) sind nicht enthalten.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from app.core.settings.config import settings
+
+STATES = {
+    "BW", "BY", "BE", "BB", "HB", "HH", "HE", "MV",
+    "NI", "NW", "RP", "SL", "SN", "ST", "SH", "TH",
+}
+
+# Feiertage, die nur in einzelnen Bundesländern gelten
+_HEILIGE_DREI_KOENIGE = {"BW", "BY", "ST"}
+_FRONLEICHNAM = {"BW", "BY", "HE", "NW", "RP", "SL"}
+_MARIAE_HIMMELFAHRT = {"SL"}
+_REFORMATIONSTAG = {"BB", "MV", "SN", "ST", "TH"}
+_REFORMATIONSTAG_AB_2018 = {"HB", "HH", "NI", "SH"}
+_ALLERHEILIGEN = {"BW", "BY", "NW", "RP", "SL"}
+_BUSS_UND_BETTAG = {"SN"}
+
+
+def easter_sunday(year: int) -> date:
+    """Ostersonntag (gregorianisch, Algorithmus nach Meeus/Jones/Butcher)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7  # noqa: E741
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+def _compute_holidays(state: str, year: int) -> dict[date, str]:
+    easter = easter_sunday(year)
+    days = {
+        date(year, 1, 1): "Neujahr",
+        easter - timedelta(days=2): "Karfreitag",
+        easter + timedelta(days=1): "Ostermontag",
+        date(year, 5, 1): "Tag der Arbeit",
+        easter + timedelta(days=39): "Christi Himmelfahrt",
+        easter + timedelta(days=50): "Pfingstmontag",
+        date(year, 10, 3): "Tag der Deutschen Einheit",
+        date(year, 12, 25): "1. Weihnachtstag",
+        date(year, 12, 26): "2. Weihnachtstag",
+    }
+    if state in _HEILIGE_DREI_KOENIGE:
+        days[date(year, 1, 6)] = "Heilige Drei Könige"
+    if (state == "BE" and year >= 2019) or (state == "MV" and year >= 2023):
+        days[date(year, 3, 8)] = "Internationaler Frauentag"
+    if state in _FRONLEICHNAM:
+        days[easter + timedelta(days=60)] = "Fronleichnam"
+    if state in _MARIAE_HIMMELFAHRT:
+        days[date(year, 8, 15)] = "Mariä Himmelfahrt"
+    if state == "TH" and year >= 2019:
+        days[date(year, 9, 20)] = "Weltkindertag"
+    if (
+        state in _REFORMATIONSTAG
+        or (state in _REFORMATIONSTAG_AB_2018 and year >= 2018)
+        or year == 2017  # 500 Jahre Reformation: bundesweit
+    ):
+        days[date(year, 10, 31)] = "Reformationstag"
+    if state in _ALLERHEILIGEN:
+        days[date(year, 11, 1)] = "Allerheiligen"
+    if state in _BUSS_UND_BETTAG:
+        # Mittwoch vor dem 23. November
+        nov_22 = date(year, 11, 22)
+        days[nov_22 - timedelta(days=(nov_22.weekday() - 2) % 7)] = "Buß- und Bettag"
+    return days
+
+
+def _state(state: Optional[str]) -> str:
+    state = (state or settings.HOLIDAY_STATE).upper()
+    if state not in STATES:
+        raise ValueError(f"Unbekanntes Bundesland: {state}")
+    return state
+
+
+@lru_cache(maxsize=256)
+def _holiday_table(state: str, year: int) -> tuple[dict[date, str], tuple[tuple[int, ...], ...]]:
+    """(Datum → Name, je Wochentag sortierte Ordinalzahlen)"""
+    days = _compute_holidays(state, year)
+    by_weekday: list[list[int]] = [[] for _ in range(7)]
+    for day in sorted(days):
+        by_weekday[day.weekday()].append(day.toordinal())
+    return days, tuple(tuple(ordinals) for ordinals in by_weekday)
+
+
+def holidays_for_year(year: int, state: Optional[str] = None) -> dict[date, str]:
+    """Feiertage eines Jahres (Datum → Name), sortiert."""
+    days, _ = _holiday_table(_state(state), year)
+    return dict(sorted(days.items()))
+
+
+def is_holiday(day: date, state: Optional[str] = None) -> bool:
+    days, _ = _holiday_table(_state(state), day.year)
+    return day in days
+
+
+def holidays_between(start: date, end: date, state: Optional[str] = None) -> dict[date, str]:
+    """Feiertage im Zeitraum [start, end]."""
+    state = _state(state)
+    result: dict[date, str] = {}
+    for year in range(start.year, end.year + 1):
+        days, _ = _holiday_table(state, year)
+        result.update({d: name for d, name in sorted(days.items()) if start <= d <= end})
+    return result
+
+
+def holiday_counts_by_weekday(start: date, end: date, state: Optional[str] = None) -> list[int]:
+    """
+    Anzahl Feiertage im Zeitraum [start, end] je Wochentag (Mo=0 … So=6).
+
+    Pro Jahr und Wochentag zwei bisect-Aufrufe – unabhängig von der Länge
+    des Zeitraums innerhalb eines Jahres.
+    """
+    counts = [0] * 7
+    if start > end:
+        return counts
+    state = _state(state)
+    lo, hi = start.toordinal(), end.toordinal()
+    for year in range(start.year, end.year + 1):
+        _, by_weekday = _holiday_table(state, year)
+        for weekday, ordinals in enumerate(by_weekday):
+            counts[weekday] += bisect_right(ordinals, hi) - bisect_left(ordinals, lo)
+    return counts
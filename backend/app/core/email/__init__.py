@@ -1,8 +1,9 @@
 """Email module"""
-from .service import EmailService, send_leave_request_notification, send_leave_request_approved, send_leave_request_rejected
+from .service import EmailService, TemplatedEmail, send_leave_request_notification, send_leave_request_approved, send_leave_request_rejected
 
 __all__ = [
     "EmailService",
+    "TemplatedEmail",
     "send_leave_request_notification",
     "send_leave_request_approved",
     "send_leave_request_rejected"
@@ -0,0 +1,451 @@
+"""
+Mail Outbox
+
+Entkoppelt den E-Mail-Versand vom Request:
+
+1. Requests bauen die MIME-Nachricht, legen sie mit enqueue_message() in
+   mail_outbox ab (eine Zeile je Empfänger-Domain) und kehren sofort zurück.
+2. Ein Hintergrundjob holt fällige Nachrichten in Batches, gruppiert sie je
+   SMTP-Zugang und versendet sie über gepoolte, angemeldete Verbindungen
+   (siehe smtp_pool).
+3. Pro Empfänger-Domain gilt ein Limit (MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE);
+   Nachrichten darüber werden ohne Fehlversuch verschoben. Da jede Zeile nur
+   Empfänger einer Domain enthält, zählt jede Domain gegen ihr eigenes Limit.
+4. Temporäre Fehler (4xx, Verbindungsabbruch) werden mit exponentiellem
+   Backoff wiederholt, permanente (5xx) und Nachrichten nach MAX_ATTEMPTS
+   landen auf 'failed' (erneut anstoßen über retry_messages()).
+
+Mehrere uvicorn-Worker sind sicher: Nachrichten werden mit
+FOR UPDATE SKIP LOCKED geholt und für LEASE_SECONDS auf 'sending' gesetzt;
+ein abgestürzter Worker gibt sie nach Ablauf des Lease wieder frei.
+"""
+from __future__ import annotations
+
+import logging
+import smtplib
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from email.message import Message
+from email.utils import parseaddr
+from typing import Iterable, Optional
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.settings.config import settings
+from app.core.settings.database import SessionLocal
+from app.modules.admin.models import MailOutbox, MailOutboxStatus
+from app.modules.admin.service import MailSettings, get_mail_settings
+from .smtp_pool import SMTPConnectionPool, SmtpConfig, smtp_pool
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BATCH_SIZE = 50
+MAX_BATCHES_PER_RUN = 20
+MAX_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 60
+LEASE_SECONDS = 300
+RATE_LIMIT_WINDOW_SECONDS = 60
+
+# SMTP-Zugänge
+ACCOUNT_SYSTEM = "system"    # Systemeinstellungen (Admin → E-Mail)
+ACCOUNT_SUPPORT = "support"  # SMTP_* (Support-Postfach)
+ACCOUNT_NOREPLY = "noreply"  # NOREPLY_SMTP_* (Rechnungsversand)
+
+# Laufzeit-Statistik des letzten Laufs in diesem Prozess
+_last_run: dict = {}
+
+
+class MailAccountError(Exception):
+    """SMTP-Zugang deaktiviert oder unvollständig konfiguriert."""
+
+
+# ============================================================================
+# ACCOUNTS
+# ============================================================================
+
+def system_mail_settings(db: Session) -> MailSettings:
+    """
+    SMTP-Einstellungen aus den Systemeinstellungen (prozessweit gecacht).
+
+    Raises:
+        MailAccountError: Versand deaktiviert oder Host/Absender fehlen
+    """
+    system = get_mail_settings(db)
+    if not system.email_enabled:
+        raise MailAccountError("E-Mail-Versand ist in den Systemeinstellungen deaktiviert")
+    if not system.smtp_host or not system.smtp_from_email:
+        raise MailAccountError("SMTP-Konfiguration ist unvollständig")
+    return system
+
+
+def account_config(db: Session, account: str) -> SmtpConfig:
+    """Verbindungsdaten eines SMTP-Zugangs."""
+    if account == ACCOUNT_SYSTEM:
+        system = system_mail_settings(db)
+        return SmtpConfig(
+            host=system.smtp_host,
+            port=system.smtp_port or 587,
+            username=system.smtp_username or "",
+            password=system.smtp_password or "",
+            use_ssl=bool(system.smtp_use_ssl),
+            use_tls=bool(system.smtp_use_tls),
+        )
+    if account == ACCOUNT_SUPPORT:
+        return SmtpConfig(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.SMTP_USER,
+            password=settings.SMTP_PASSWORD,
+        )
+    if account == ACCOUNT_NOREPLY:
+        return SmtpConfig(
+            host=settings.SMTP_HOST,
+            port=settings.SMTP_PORT,
+            username=settings.NOREPLY_SMTP_USER,
+            password=settings.NOREPLY_SMTP_PASSWORD,
+        )
+    raise MailAccountError(f"Unbekannter SMTP-Zugang: {account}")
+
+
+# ============================================================================
+# OUTBOX (WRITE)
+# ============================================================================
+
+def _domain(address: str) -> str:
+    return parseaddr(address)[1].rpartition("@")[2].lower()
+
+
+def _recipients_by_domain(recipients: list[str]) -> dict[str, list[str]]:
+    """Envelope-Empfänger je Domain, in Reihenfolge des ersten Auftretens."""
+    by_domain: dict[str, list[str]] = {}
+    for address in recipients:
+        by_domain.setdefault(_domain(address), []).append(address)
+    return by_domain
+
+
+def enqueue_message(
+    db: Session,
+    msg: Message,
+    recipients: list[str],
+    account: str,
+    sender: str,
+    reference: Optional[str] = None,
+    commit: bool = True,
+) -> list[MailOutbox]:
+    """
+    Legt eine fertige Nachricht zum Versand ab.
+
+    Pro Empfänger-Domain entsteht ein eigener Eintrag mit derselben Nachricht
+    und den Envelope-Empfängern dieser Domain, damit das Rate-Limit jede
+    Domain erfasst (nicht nur die des ersten Empfängers).
+
+    Args:
+        msg: MIME-Nachricht inkl. Header (From, To, Subject, ...)
+        recipients: Alle Envelope-Empfänger (To, Cc, Bcc)
+        account: SMTP-Zugang (ACCOUNT_SYSTEM, ACCOUNT_SUPPORT, ACCOUNT_NOREPLY)
+        sender: Envelope-From
+        reference: Optionaler Bezug (z.B. invoice:<id>) für Statusabfragen
+        commit: Direkt committen (sonst Teil der Transaktion des Aufrufers)
+
+    Returns:
+        Die Outbox-Einträge, einer je Empfänger-Domain
+    """
+    if not recipients:
+        raise ValueError("Nachricht ohne Empfänger")
+
+    subject = str(msg["Subject"] or "")[:998]
+    message = msg.as_bytes()
+    # Clientseitig: FIFO-Reihenfolge auch innerhalb derselben Sekunde
+    created_at = datetime.now(timezone.utc)
+    entries = [
+        MailOutbox(
+            id=uuid.uuid4(),
+            account=account,
+            sender=sender,
+            recipients=addresses,
+            recipient_domain=domain,
+            subject=subject,
+            message=message,
+            reference=reference,
+            status=MailOutboxStatus.PENDING.value,
+            attempts=0,
+            created_at=created_at,
+        )
+        for domain, addresses in _recipients_by_domain(recipients).items()
+    ]
+    db.add_all(entries)
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+    return entries
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def _is_permanent(exc: Exception) -> bool:
+    """5xx-Antworten sind endgültig, alles andere wird wiederholt."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in exc.recipients.values())
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return exc.smtp_code >= 500
+    return False
+
+
+def _mark_sent(entry: MailOutbox, refused: dict, now: datetime) -> None:
+    entry.attempts += 1
+    entry.status = MailOutboxStatus.SENT.value
+    entry.sent_at = now
+    entry.next_attempt_at = None
+    entry.last_error = f"Abgelehnte Empfänger: {', '.join(sorted(refused))}" if refused else None
+
+
+def _mark_failed(entry: MailOutbox, error: Exception | str, now: datetime, permanent: bool = False) -> None:
+    entry.attempts += 1
+    entry.last_error = str(error)[:2000]
+    if permanent or entry.attempts >= MAX_ATTEMPTS:
+        entry.status = MailOutboxStatus.FAILED.value
+        entry.next_attempt_at = None
+    else:
+        entry.status = MailOutboxStatus.PENDING.value
+        entry.next_attempt_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (entry.attempts - 1))
+
+
+def _count(stats: dict, entry: MailOutbox) -> None:
+    if entry.status == MailOutboxStatus.SENT.value:
+        stats["sent"] += 1
+    elif entry.status == MailOutboxStatus.FAILED.value:
+        stats["failed"] += 1
+    else:
+        stats["retried"] += 1
+
+
+def _claim(db: Session, batch_size: int, now: datetime) -> list[MailOutbox]:
+    """Holt fällige Nachrichten (inkl. abgelaufener Leases) und setzt sie auf 'sending'."""
+    entries = db.scalars(
+        select(MailOutbox)
+        .where(or_(
+            and_(
+                MailOutbox.status == MailOutboxStatus.PENDING.value,
+                or_(MailOutbox.next_attempt_at.is_(None), MailOutbox.next_attempt_at <= now),
+            ),
+            and_(
+                MailOutbox.status == MailOutboxStatus.SENDING.value,
+                MailOutbox.next_attempt_at <= now,
+            ),
+        ))
+        .order_by(MailOutbox.created_at, MailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    for entry in entries:
+        entry.status = MailOutboxStatus.SENDING.value
+        entry.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+    db.commit()
+    return list(entries)
+
+
+def _apply_rate_limits(db: Session, entries: list[MailOutbox], now: datetime, stats: dict) -> list[MailOutbox]:
+    """Verschiebt Nachrichten über dem Domain-Limit (zählt nicht als Versuch)."""
+    limit = settings.MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE
+    if limit <= 0:
+        return entries
+
+    domains = {entry.recipient_domain for entry in entries}
+    window_start = now - timedelta(seconds=RATE_LIMIT_WINDOW_SECONDS)
+    budget = {domain: limit for domain in domains}
+    for domain, sent in db.execute(
+        select(MailOutbox.recipient_domain, func.count(MailOutbox.id))
+        .where(MailOutbox.recipient_domain.in_(domains), MailOutbox.sent_at >= window_start)
+        .group_by(MailOutbox.recipient_domain)
+    ):
+        budget[domain] -= sent
+
+    allowed = []
+    for entry in entries:
+        if budget[entry.recipient_domain] > 0:
+            budget[entry.recipient_domain] -= 1
+            allowed.append(entry)
+        else:
+            entry.status = MailOutboxStatus.PENDING.value
+            entry.next_attempt_at = now + timedelta(seconds=RATE_LIMIT_WINDOW_SECONDS)
+            stats["deferred"] += 1
+    return allowed
+
+
+def _send_group(
+    config: SmtpConfig,
+    entries: list[MailOutbox],
+    pool: SMTPConnectionPool,
+    stats: dict,
+) -> None:
+    """Versendet alle Nachrichten eines Zugangs über eine gepoolte Verbindung."""
+    server = None
+    for index, entry in enumerate(entries):
+        now = datetime.now(timezone.utc)
+        if server is None:
+            try:
+                server = pool.acquire(config)
+            except (smtplib.SMTPException, OSError) as exc:
+                # Kein Server erreichbar/Anmeldung fehlgeschlagen: Rest des Zugangs später
+                logger.warning("⚠️ mail outbox: Verbindung zu %s fehlgeschlagen: %s", config.host, exc)
+                for pending in entries[index:]:
+                    _mark_failed(pending, exc, now)
+                    _count(stats, pending)
+                return
+        try:
+            refused = server.sendmail(entry.sender, list(entry.recipients), entry.message)
+            _mark_sent(entry, refused, now)
+        except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException) as exc:
+            # Server hat geantwortet – Verbindung bleibt nutzbar
+            _mark_failed(entry, exc, now, permanent=_is_permanent(exc))
+        except (smtplib.SMTPException, OSError) as exc:
+            logger.warning("⚠️ mail outbox: %s an %s fehlgeschlagen: %s", entry.id, entry.recipient_domain, exc)
+            pool.discard(server)
+            server = None
+            _mark_failed(entry, exc, now)
+        _count(stats, entry)
+    if server is not None:
+        pool.release(config, server)
+
+
+def drain_outbox(
+    db: Session,
+    batch_size: int = BATCH_SIZE,
+    pool: SMTPConnectionPool = smtp_pool,
+) -> dict:
+    """
+    Versendet einen Batch fälliger Nachrichten.
+
+    Returns:
+        Dict mit sent/retried/failed/deferred Counts
+    """
+    now = datetime.now(timezone.utc)
+    stats = {"sent": 0, "retried": 0, "failed": 0, "deferred": 0}
+
+    entries = _claim(db, batch_size, now)
+    if not entries:
+        return stats
+    entries = _apply_rate_limits(db, entries, now, stats)
+
+    groups: dict[str, list[MailOutbox]] = {}
+    for entry in entries:
+        groups.setdefault(entry.account, []).append(entry)
+
+    for account, group in groups.items():
+        try:
+            config = account_config(db, account)
+        except MailAccountError as exc:
+            for entry in group:
+                _mark_failed(entry, exc, now, permanent=True)
+                _count(stats, entry)
+        else:
+            _send_group(config, group, pool, stats)
+        db.commit()
+
+    db.commit()
+    return stats
+
+
+def process_outbox() -> dict:
+    """
+    Arbeitet die Outbox ab, bis keine fällige Nachricht mehr übrig ist
+    (max. MAX_BATCHES_PER_RUN Batches).
+
+    Einstiegspunkt für den Hintergrundjob und den Nachlauf nach Requests
+    (BackgroundTasks); öffnet eine eigene DB-Session.
+    """
+    started = time.monotonic()
+    totals = {"sent": 0, "retried": 0, "failed": 0, "deferred": 0, "batches": 0}
+
+    db = SessionLocal()
+    try:
+        for _ in range(MAX_BATCHES_PER_RUN):
+            stats = drain_outbox(db)
+            if not any(stats.values()):
+                break
+            totals["batches"] += 1
+            for key, value in stats.items():
+                totals[key] += value
+            if stats["deferred"] and not (stats["sent"] or stats["retried"] or stats["failed"]):
+                break  # nur noch Rate-Limit – nächster Lauf
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    duration = time.monotonic() - started
+    _last_run.update({
+        "finished_at": datetime.now(timezone.utc),
+        "duration_seconds": round(duration, 3),
+        **totals,
+    })
+    return totals
+
+
+# ============================================================================
+# METRICS & RETRY
+# ============================================================================
+
+def get_outbox_metrics(db: Session) -> dict:
+    """Anzahl Nachrichten je Status, Alter der ältesten offenen Nachricht, letzter Lauf."""
+    now = datetime.now(timezone.utc)
+    by_status = dict(
+        db.execute(
+            select(MailOutbox.status, func.count(MailOutbox.id)).group_by(MailOutbox.status)
+        ).all()
+    )
+    oldest_pending = db.scalar(
+        select(func.min(MailOutbox.created_at))
+        .where(MailOutbox.status.in_([MailOutboxStatus.PENDING.value, MailOutboxStatus.SENDING.value]))
+    )
+    if oldest_pending is not None and oldest_pending.tzinfo is None:
+        oldest_pending = oldest_pending.replace(tzinfo=timezone.utc)
+
+    return {
+        "by_status": {s.value: by_status.get(s.value, 0) for s in MailOutboxStatus},
+        "lag_seconds": max((now - oldest_pending).total_seconds(), 0.0) if oldest_pending else 0.0,
+        "last_run": dict(_last_run) or None,
+    }
+
+
+def retry_messages(db: Session, message_ids: Optional[Iterable[uuid.UUID]] = None) -> int:
+    """
+    Setzt Nachrichten zurück auf 'pending'.
+
+    Nur 'failed' und (mit IDs) 'pending' Nachrichten; 'sending' gehört
+    unter Lease einem Worker und bleibt wie 'sent' unverändert.
+
+    Args:
+        message_ids: Outbox-IDs; ohne Angabe alle 'failed' Nachrichten
+
+    Returns:
+        Anzahl zurückgesetzter Nachrichten
+    """
+    stmt = update(MailOutbox).values(
+        status=MailOutboxStatus.PENDING.value,
+        attempts=0,
+        next_attempt_at=None,
+        last_error=None,
+    )
+    if message_ids is not None:
+        stmt = stmt.where(
+            MailOutbox.id.in_(list(message_ids)),
+            MailOutbox.status.in_([MailOutboxStatus.FAILED.value, MailOutboxStatus.PENDING.value]),
+        )
+    else:
+        stmt = stmt.where(MailOutbox.status == MailOutboxStatus.FAILED.value)
+
+    count = db.execute(stmt).rowcount
+    db.commit()
+    return count
@@ -0,0 +1,183 @@
+"""
+E-Mail-Templates – vorkompiliert und geprüft
+
+Alle Template-Paare (<name>.txt + <name>.html) werden einmal beim Start
+geladen (load_templates(), siehe main.py) und als kompilierte Templates im
+Prozess gehalten; der Jinja-Bytecode-Cache spart das Kompilieren nach
+einem Neustart. Zur Laufzeit wird nichts mehr im Dateisystem gesucht.
+
+Jedes Paar kennt seine Variablen (aus dem AST, inkl. base.html); fehlende
+Variablen führen zu TemplateContextError statt zu leeren Stellen in der
+Mail (zusätzlich StrictUndefined beim Rendern).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Mapping, Optional, Sequence
+
+from jinja2 import (
+    Environment, FileSystemBytecodeCache, FileSystemLoader, StrictUndefined, Template,
+    meta, select_autoescape,
+)
+
+from app.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+# Variablen, die jedes Template ohne Angabe des Aufrufers erhält
+DEFAULT_CONTEXT: dict[str, Any] = {
+    "workmate_url": "https://workmate.intern.phudevelopement.xyz",
+}
+
+
+class TemplateContextError(ValueError):
+    """Unbekanntes Template oder fehlende Template-Variablen."""
+
+
+@dataclass(frozen=True)
+class EmailTemplate:
+    name: str
+    text: Template
+    html: Template
+    variables: frozenset[str]
+
+    def missing(self, context: Mapping[str, Any]) -> set[str]:
+        return set(self.variables) - context.keys() - DEFAULT_CONTEXT.keys()
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    text: str
+    html: str
+
+
+def _environment() -> Environment:
+    cache_dir = settings.EMAIL_TEMPLATE_CACHE_DIR
+    if cache_dir:
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR),
+        autoescape=select_autoescape(['html', 'xml']),
+        undefined=StrictUndefined,
+        bytecode_cache=FileSystemBytecodeCache(cache_dir or None),
+        auto_reload=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+
+
+jinja_env = _environment()
+
+_templates: dict[str, EmailTemplate] = {}
+_lock = threading.Lock()
+
+
+def _variables(name: str, seen: Optional[set[str]] = None) -> set[str]:
+    """Undeklarierte Variablen eines Templates inkl. extends/include."""
+    seen = seen if seen is not None else set()
+    if name in seen:
+        return set()
+    seen.add(name)
+    source = jinja_env.loader.get_source(jinja_env, name)[0]
+    ast = jinja_env.parse(source)
+    variables = set(meta.find_undeclared_variables(ast))
+    for referenced in meta.find_referenced_templates(ast):
+        if referenced:
+            variables |= _variables(referenced, seen)
+    return variables
+
+
+def load_templates() -> dict[str, EmailTemplate]:
+    """
+    Kompiliert alle Template-Paare (beim Start aufrufen).
+
+    Raises:
+        jinja2.TemplateError: Syntaxfehler – der Start schlägt fehl statt
+        der ersten Mail
+    """
+    loaded = {}
+    for text_path in sorted(TEMPLATE_DIR.glob("*.txt")):
+        name = text_path.stem
+        if not (TEMPLATE_DIR / f"{name}.html").exists():
+            logger.warning("⚠️ E-Mail-Template %s.txt ohne .html – übersprungen", name)
+            continue
+        loaded[name] = EmailTemplate(
+            name=name,
+            text=jinja_env.get_template(f"{name}.txt"),
+            html=jinja_env.get_template(f"{name}.html"),
+            variables=frozenset(_variables(f"{name}.txt") | _variables(f"{name}.html")),
+        )
+    with _lock:
+        _templates.clear()
+        _templates.update(loaded)
+    logger.info("📧 %d E-Mail-Templates vorkompiliert", len(loaded))
+    return loaded
+
+
+def get_template(name: str) -> EmailTemplate:
+    if not _templates:
+        with _lock:
+            needs_load = not _templates
+        if needs_load:
+            load_templates()
+    try:
+        return _templates[name]
+    except KeyError:
+        raise TemplateContextError(f"Unbekanntes E-Mail-Template: {name}") from None
+
+
+def _render(template: EmailTemplate, context: Mapping[str, Any]) -> RenderedEmail:
+    missing = template.missing(context)
+    if missing:
+        raise TemplateContextError(
+            f"E-Mail-Template {template.name}: fehlende Variablen {', '.join(sorted(missing))}"
+        )
+    full_context = {**DEFAULT_CONTEXT, **context}
+    return RenderedEmail(
+        text=template.text.render(full_context),
+        html=template.html.render(full_context),
+    )
+
+
+def render(name: str, context: Mapping[str, Any]) -> RenderedEmail:
+    """Rendert Text- und HTML-Teil eines Templates."""
+    return _render(get_template(name), context)
+
+
+def render_batch(name: str, contexts: Sequence[Mapping[str, Any]]) -> list[RenderedEmail]:
+    """
+    Rendert ein Template für viele Kontexte in einem Durchlauf.
+
+    Identische Kontexte (z.B. dieselbe Benachrichtigung an viele Empfänger)
+    werden nur einmal gerendert. Fehlende Variablen werden vor dem ersten
+    Rendern für alle Kontexte geprüft.
+    """
+    template = get_template(name)
+    for context in contexts:
+        missing = template.missing(context)
+        if missing:
+            raise TemplateContextError(
+                f"E-Mail-Template {name}: fehlende Variablen {', '.join(sorted(missing))}"
+            )
+
+    rendered: list[RenderedEmail] = []
+    memo: dict[Any, RenderedEmail] = {}
+    for context in contexts:
+        try:
+            key = tuple(sorted(context.items()))
+            hash(key)
+        except TypeError:
+            key = None
+        if key is not None and key in memo:
+            rendered.append(memo[key])
+            continue
+        result = _render(template, context)
+        if key is not None:
+            memo[key] = result
+        rendered.append(result)
+    return rendered
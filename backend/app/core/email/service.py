@@ -2,26 +2,39 @@
 Email Service - SMTP Email Sending
 
 Provides functionality to send emails using SMTP configuration from system settings.
-Uses Jinja2 templates for email content.
+Uses precompiled Jinja2 templates for email content (see rendering.py).
+
+Nachrichten werden nicht im Request versendet, sondern in die Mail-Outbox
+gelegt; der Hintergrundjob (outbox.process_outbox) stellt sie zu.
 """
-import smtplib
+from dataclasses import dataclass
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Sequence
 from sqlalchemy.orm import Session
-from jinja2 import Environment, FileSystemLoader, select_autoescape
-from pathlib import Path
 
 from app.modules.admin import service as admin_service
+from . import outbox, rendering
+
+LEAVE_TYPE_LABELS = {
+    "vacation": "Urlaub",
+    "sick": "Krankheit",
+    "unpaid": "Unbezahlter Urlaub",
+    "parental": "Elternzeit",
+    "bereavement": "Trauerfall",
+    "training": "Fortbildung",
+    "remote": "Homeoffice",
+    "other": "Sonstiges"
+}
 
-# Template environment setup
-TEMPLATE_DIR = Path(__file__).parent / "templates"
-jinja_env = Environment(
-    loader=FileSystemLoader(TEMPLATE_DIR),
-    autoescape=select_autoescape(['html', 'xml']),
-    trim_blocks=True,
-    lstrip_blocks=True
-)
+
+@dataclass
+class TemplatedEmail:
+    """Eine Nachricht eines Batch-Versands (siehe EmailService.send_templated_batch)."""
+    to_emails: List[str]
+    subject: str
+    context: Dict[str, Any]
+    reference: Optional[str] = None
 
 
 class EmailService:
@@ -32,9 +45,9 @@ class EmailService:
         self.settings = None
 
     async def _load_settings(self):
-        """Load SMTP settings from database"""
+        """Load SMTP settings (process-level cache, see admin_service.get_mail_settings)"""
         if not self.settings:
-            self.settings = await admin_service.get_or_create_settings(self.db)
+            self.settings = admin_service.get_mail_settings(self.db)
         return self.settings
 
     def _render_template(self, template_name: str, context: Dict[str, Any]) -> tuple[str, str]:
@@ -47,21 +60,49 @@ class EmailService:
 
         Returns:
             tuple: (plain_text, html) rendered content
+
+        Raises:
+            TemplateContextError: Unknown template or missing variables
         """
-        # Add default context variables
-        default_context = {
-            'workmate_url': 'https://workmate.intern.phudevelopement.xyz',
-        }
-        context = {**default_context, **context}
+        rendered = rendering.render(template_name, context)
+        return rendered.text, rendered.html
 
-        # Render templates
-        html_template = jinja_env.get_template(f"{template_name}.html")
-        txt_template = jinja_env.get_template(f"{template_name}.txt")
+    def _check_settings(self, settings) -> bool:
+        # Check if email is enabled
+        if not settings.email_enabled:
+            print("[EmailService] Email sending is disabled in system settings")
+            return False
+
+        # Validate SMTP configuration
+        if not settings.smtp_host or not settings.smtp_from_email:
+            print("[EmailService] SMTP configuration is incomplete")
+            return False
+        return True
 
-        html = html_template.render(**context)
-        text = txt_template.render(**context)
+    def _build_message(
+        self,
+        settings,
+        to_emails: List[str],
+        subject: str,
+        body: str,
+        html_body: Optional[str] = None,
+        cc_emails: Optional[List[str]] = None,
+    ) -> MIMEMultipart:
+        msg = MIMEMultipart('alternative')
+        msg['From'] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
+        msg['To'] = ', '.join(to_emails)
+        msg['Subject'] = subject
 
-        return text, html
+        if cc_emails:
+            msg['Cc'] = ', '.join(cc_emails)
+
+        # Attach plain text body
+        msg.attach(MIMEText(body, 'plain', 'utf-8'))
+
+        # Attach HTML body if provided
+        if html_body:
+            msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+        return msg
 
     async def send_email(
         self,
@@ -70,10 +111,11 @@ class EmailService:
         body: str,
         html_body: Optional[str] = None,
         cc_emails: Optional[List[str]] = None,
-        bcc_emails: Optional[List[str]] = None
+        bcc_emails: Optional[List[str]] = None,
+        reference: Optional[str] = None,
     ) -> bool:
         """
-        Send an email using SMTP settings from system settings.
+        Queue an email for delivery using SMTP settings from system settings.
 
         Args:
             to_emails: List of recipient email addresses
@@ -82,38 +124,17 @@ class EmailService:
             html_body: Optional HTML email body
             cc_emails: Optional list of CC recipients
             bcc_emails: Optional list of BCC recipients
+            reference: Optional reference stored with the outbox entry
 
         Returns:
-            bool: True if email was sent successfully, False otherwise
+            bool: True if email was queued successfully, False otherwise
         """
         try:
             settings = await self._load_settings()
-
-            # Check if email is enabled
-            if not settings.email_enabled:
-                print("[EmailService] Email sending is disabled in system settings")
+            if not self._check_settings(settings):
                 return False
 
-            # Validate SMTP configuration
-            if not settings.smtp_host or not settings.smtp_from_email:
-                print("[EmailService] SMTP configuration is incomplete")
-                return False
-
-            # Create message
-            msg = MIMEMultipart('alternative')
-            msg['From'] = f"{settings.smtp_from_name} <{settings.smtp_from_email}>"
-            msg['To'] = ', '.join(to_emails)
-            msg['Subject'] = subject
-
-            if cc_emails:
-                msg['Cc'] = ', '.join(cc_emails)
-
-            # Attach plain text body
-            msg.attach(MIMEText(body, 'plain', 'utf-8'))
-
-            # Attach HTML body if provided
-            if html_body:
-                msg.attach(MIMEText(html_body, 'html', 'utf-8'))
+            msg = self._build_message(settings, to_emails, subject, body, html_body, cc_emails)
 
             # Prepare recipient list (to + cc + bcc)
             all_recipients = to_emails.copy()
@@ -122,29 +143,63 @@ class EmailService:
             if bcc_emails:
                 all_recipients.extend(bcc_emails)
 
-            # Send email
-            if settings.smtp_use_ssl:
-                # Use SMTP_SSL for port 465
-                with smtplib.SMTP_SSL(settings.smtp_host, settings.smtp_port) as server:
-                    if settings.smtp_username and settings.smtp_password:
-                        server.login(settings.smtp_username, settings.smtp_password)
-                    server.send_message(msg, to_addrs=all_recipients)
-            else:
-                # Use SMTP with STARTTLS for port 587
-                with smtplib.SMTP(settings.smtp_host, settings.smtp_port) as server:
-                    if settings.smtp_use_tls:
-                        server.starttls()
-                    if settings.smtp_username and settings.smtp_password:
-                        server.login(settings.smtp_username, settings.smtp_password)
-                    server.send_message(msg, to_addrs=all_recipients)
-
-            print(f"[EmailService] Email sent successfully to {', '.join(to_emails)}")
+            # Versand übernimmt der Outbox-Job
+            outbox.enqueue_message(
+                self.db,
+                msg,
+                all_recipients,
+                account=outbox.ACCOUNT_SYSTEM,
+                sender=settings.smtp_from_email,
+                reference=reference,
+            )
+
+            print(f"[EmailService] Email queued for {', '.join(to_emails)}")
             return True
 
         except Exception as e:
-            print(f"[EmailService] Failed to send email: {str(e)}")
+            print(f"[EmailService] Failed to queue email: {str(e)}")
             return False
 
+    async def send_templated_batch(self, template_name: str, emails: Sequence[TemplatedEmail]) -> int:
+        """
+        Rendert und reiht viele Nachrichten eines Templates in einem Durchlauf ein.
+
+        Einstellungen werden einmal geladen, alle Kontexte vor dem Rendern
+        geprüft (identische Kontexte nur einmal gerendert) und alle
+        Outbox-Einträge mit einem Commit geschrieben.
+
+        Returns:
+            int: Anzahl eingereihter Nachrichten (0 bei Fehler – nichts eingereiht)
+        """
+        if not emails:
+            return 0
+        try:
+            settings = await self._load_settings()
+            if not self._check_settings(settings):
+                return 0
+
+            rendered = rendering.render_batch(template_name, [email.context for email in emails])
+            for email, content in zip(emails, rendered):
+                msg = self._build_message(settings, email.to_emails, email.subject, content.text, content.html)
+                outbox.enqueue_message(
+                    self.db,
+                    msg,
+                    list(email.to_emails),
+                    account=outbox.ACCOUNT_SYSTEM,
+                    sender=settings.smtp_from_email,
+                    reference=email.reference,
+                    commit=False,
+                )
+            self.db.commit()
+
+            print(f"[EmailService] {len(emails)} emails queued ({template_name})")
+            return len(emails)
+
+        except Exception as e:
+            self.db.rollback()
+            print(f"[EmailService] Failed to queue {template_name} batch: {str(e)}")
+            return 0
+
 
 async def send_leave_request_notification(
     db: Session,
@@ -176,23 +231,8 @@ async def send_leave_request_notification(
     Returns:
         bool: True if email was sent successfully
     """
-    email_service = EmailService(db)
-
-    leave_type_labels = {
-        "vacation": "Urlaub",
-        "sick": "Krankheit",
-        "unpaid": "Unbezahlter Urlaub",
-        "parental": "Elternzeit",
-        "bereavement": "Trauerfall",
-        "training": "Fortbildung",
-        "remote": "Homeoffice",
-        "other": "Sonstiges"
-    }
-
-    leave_label = leave_type_labels.get(leave_type, leave_type)
-
-    # Render templates
-    text, html = email_service._render_template('leave_request_notification', {
+    leave_label = LEAVE_TYPE_LABELS.get(leave_type, leave_type)
+    context = {
         'request_id': request_id,
         'employee_name': employee_name,
         'employee_email': employee_email,
@@ -201,16 +241,17 @@ async def send_leave_request_notification(
         'end_date': end_date,
         'total_days': total_days,
         'reason': reason
-    })
-
+    }
     subject = f"Neuer Urlaubsantrag von {employee_name}"
 
-    return await email_service.send_email(
-        to_emails=approver_emails,
-        subject=subject,
-        body=text,
-        html_body=html
-    )
+    # Eine Mail je Genehmiger (keine offene Empfängerliste); gleicher Kontext
+    # wird nur einmal gerendert
+    queued = await EmailService(db).send_templated_batch('leave_request_notification', [
+        TemplatedEmail(to_emails=[approver], subject=subject, context=context,
+                       reference=f"leave:{request_id}")
+        for approver in approver_emails
+    ])
+    return queued == len(approver_emails)
 
 
 async def send_leave_request_approved(
@@ -227,18 +268,7 @@ async def send_leave_request_approved(
     """Send notification when leave request is approved"""
     email_service = EmailService(db)
 
-    leave_type_labels = {
-        "vacation": "Urlaub",
-        "sick": "Krankheit",
-        "unpaid": "Unbezahlter Urlaub",
-        "parental": "Elternzeit",
-        "bereavement": "Trauerfall",
-        "training": "Fortbildung",
-        "remote": "Homeoffice",
-        "other": "Sonstiges"
-    }
-
-    leave_label = leave_type_labels.get(leave_type, leave_type)
+    leave_label = LEAVE_TYPE_LABELS.get(leave_type, leave_type)
 
     # Render templates
     text, html = email_service._render_template('leave_request_approved', {
@@ -275,18 +305,7 @@ async def send_leave_request_rejected(
     """Send notification when leave request is rejected"""
     email_service = EmailService(db)
 
-    leave_type_labels = {
-        "vacation": "Urlaub",
-        "sick": "Krankheit",
-        "unpaid": "Unbezahlter Urlaub",
-        "parental": "Elternzeit",
-        "bereavement": "Trauerfall",
-        "training": "Fortbildung",
-        "remote": "Homeoffice",
-        "other": "Sonstiges"
-    }
-
-    leave_label = leave_type_labels.get(leave_type, leave_type)
+    leave_label = LEAVE_TYPE_LABELS.get(leave_type, leave_type)
 
     # Render templates
     text, html = email_service._render_template('leave_request_rejected', {
@@ -330,7 +349,7 @@ async def send_ticket_reply(
         reporter_name: Optionaler Name des Empfängers
 
     Returns:
-        bool: True wenn E-Mail erfolgreich gesendet
+        bool: True wenn die E-Mail in die Outbox gelegt wurde
     """
     email_service = EmailService(db)
 
@@ -348,6 +367,7 @@ async def send_ticket_reply(
         subject=subject,
         body=text,
         html_body=html,
+        reference=f"ticket:{ticket_number}",
     )
 
 
@@ -0,0 +1,122 @@
+"""
+SMTP Connection Pool
+
+Hält authentifizierte SMTP-Verbindungen je Zugang (SmtpConfig) offen, damit
+der Outbox-Worker nicht für jede Nachricht neu verbindet, TLS aushandelt und
+sich anmeldet. Idle-Verbindungen werden nach POOL_IDLE_SECONDS geschlossen
+und vor der Wiederverwendung per NOOP geprüft.
+
+Threadsicher: der Worker läuft im Threadpool (siehe app/core/jobs).
+"""
+from __future__ import annotations
+
+import logging
+import smtplib
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+POOL_MAX_IDLE = 2
+POOL_IDLE_SECONDS = 60
+CONNECT_TIMEOUT_SECONDS = 15
+
+
+@dataclass(frozen=True)
+class SmtpConfig:
+    """Verbindungsdaten eines SMTP-Zugangs (Schlüssel im Pool)."""
+    host: str
+    port: int
+    username: str = ""
+    password: str = field(default="", repr=False)
+    use_ssl: bool = False
+    use_tls: bool = True
+    timeout: float = CONNECT_TIMEOUT_SECONDS
+
+
+def open_connection(config: SmtpConfig) -> smtplib.SMTP:
+    """Verbindet, handelt TLS aus und meldet sich an."""
+    if config.use_ssl:
+        server: smtplib.SMTP = smtplib.SMTP_SSL(config.host, config.port, timeout=config.timeout)
+    else:
+        server = smtplib.SMTP(config.host, config.port, timeout=config.timeout)
+    try:
+        server.ehlo()
+        if config.use_tls and not config.use_ssl:
+            server.starttls()
+            server.ehlo()
+        if config.username and config.password:
+            server.login(config.username, config.password)
+    except Exception:
+        close_quietly(server)
+        raise
+    return server
+
+
+def close_quietly(server: Optional[smtplib.SMTP]) -> None:
+    if server is None:
+        return
+    try:
+        server.quit()
+    except Exception:
+        try:
+            server.close()
+        except Exception:
+            pass
+
+
+class SMTPConnectionPool:
+    def __init__(self, max_idle: int = POOL_MAX_IDLE, idle_seconds: float = POOL_IDLE_SECONDS):
+        self.max_idle = max_idle
+        self.idle_seconds = idle_seconds
+        self._idle: dict[SmtpConfig, list[tuple[float, smtplib.SMTP]]] = {}
+        self._lock = threading.Lock()
+        self.connects = 0  # Anzahl neu aufgebauter Verbindungen (Metrik/Tests)
+
+    def acquire(self, config: SmtpConfig) -> smtplib.SMTP:
+        """Liefert eine geprüfte Idle-Verbindung oder baut eine neue auf."""
+        while True:
+            with self._lock:
+                idle = self._idle.get(config)
+                released_at, server = idle.pop() if idle else (None, None)
+            if server is None:
+                break
+            if time.monotonic() - released_at > self.idle_seconds:
+                close_quietly(server)
+                continue
+            try:
+                if server.noop()[0] == 250:
+                    return server
+            except (smtplib.SMTPException, OSError):
+                pass
+            close_quietly(server)
+
+        server = open_connection(config)
+        with self._lock:
+            self.connects += 1
+        return server
+
+    def release(self, config: SmtpConfig, server: smtplib.SMTP) -> None:
+        """Gibt eine intakte Verbindung zurück in den Pool."""
+        with self._lock:
+            idle = self._idle.setdefault(config, [])
+            if len(idle) < self.max_idle:
+                idle.append((time.monotonic(), server))
+                return
+        close_quietly(server)
+
+    def discard(self, server: Optional[smtplib.SMTP]) -> None:
+        """Verwirft eine Verbindung nach einem Verbindungsfehler."""
+        close_quietly(server)
+
+    def close_all(self) -> None:
+        with self._lock:
+            servers = [server for idle in self._idle.values() for _, server in idle]
+            self._idle.clear()
+        for server in servers:
+            close_quietly(server)
+
+
+smtp_pool = SMTPConnectionPool()
@@ -123,6 +123,7 @@ class ErrorCode:
     VALIDATION_ERROR = "SYSTEM_9001"
     NOT_FOUND = "SYSTEM_9404"
     EMPLOYEE_NOT_FOUND = "SYSTEM_9010"
+    EMPLOYEE_AMBIGUOUS = "SYSTEM_9011"
 
 
 @dataclass
@@ -382,6 +383,10 @@ ERROR_MESSAGES: dict[str, ErrorMessage] = {
         message="Mitarbeiter wurde nicht gefunden.",
         hint="Bitte überprüfen Sie die Mitarbeiter-ID."
     ),
+    ErrorCode.EMPLOYEE_AMBIGUOUS: ErrorMessage(
+        message="Benutzername ist nicht eindeutig einem Mitarbeiter zugeordnet.",
+        hint="Bitte die E-Mail-Adresse im Benutzerkonto hinterlegen oder den Administrator kontaktieren."
+    ),
 }
 
 
@@ -0,0 +1,4 @@
+"""In-Process Background Jobs"""
+from .scheduler import PeriodicJob, register_periodic_job, start_jobs, stop_jobs
+
+__all__ = ["PeriodicJob", "register_periodic_job", "start_jobs", "stop_jobs"]
@@ -0,0 +1,85 @@
+"""
+WorkmateOS In-Process Job Scheduler
+
+Leichtgewichtiger Scheduler für periodische Hintergrundjobs im API-Prozess
+(z.B. Stripe-Inbox abarbeiten). Jobs sind synchrone Funktionen und laufen im
+Threadpool, damit der Event-Loop nicht blockiert wird.
+
+WICHTIG: Jeder uvicorn-Worker startet eigene Job-Loops. Jobs müssen daher
+selbst für Mehrfach-Worker-Sicherheit sorgen (z.B. FOR UPDATE SKIP LOCKED
+oder Advisory Locks).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.settings.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PeriodicJob:
+    """Ein periodisch ausgeführter Hintergrundjob."""
+    name: str
+    interval_seconds: float
+    func: Callable[[], object]
+    initial_delay: float = 5.0
+
+
+_jobs: dict[str, PeriodicJob] = {}
+_tasks: list[asyncio.Task] = []
+
+
+def register_periodic_job(
+    name: str,
+    interval_seconds: float,
+    func: Callable[[], object],
+    initial_delay: float = 5.0,
+) -> None:
+    """
+    Registriert einen periodischen Job (vor start_jobs() aufrufen).
+
+    Args:
+        name: Eindeutiger Job-Name (für Logging)
+        interval_seconds: Pause zwischen zwei Läufen
+        func: Synchrone Funktion ohne Argumente (öffnet eigene DB-Session)
+        initial_delay: Wartezeit nach dem Start bis zum ersten Lauf
+    """
+    _jobs[name] = PeriodicJob(name, interval_seconds, func, initial_delay)
+
+
+async def _run_periodic(job: PeriodicJob) -> None:
+    await asyncio.sleep(job.initial_delay)
+    while True:
+        try:
+            await run_in_threadpool(job.func)
+        except Exception:
+            logger.exception("⚠️ background job '%s' failed", job.name)
+        await asyncio.sleep(job.interval_seconds)
+
+
+def start_jobs() -> None:
+    """Startet alle registrierten Jobs im laufenden Event-Loop."""
+    if not settings.BACKGROUND_JOBS_ENABLED:
+        logger.info("⏸️ background jobs disabled (BACKGROUND_JOBS_ENABLED=false)")
+        return
+    if _tasks:
+        return
+
+    for job in _jobs.values():
+        _tasks.append(asyncio.create_task(_run_periodic(job), name=f"job:{job.name}"))
+        logger.info("⏱️ background job '%s' started (every %ss)", job.name, job.interval_seconds)
+
+
+async def stop_jobs() -> None:
+    """Stoppt alle laufenden Jobs (beim Shutdown)."""
+    for task in _tasks:
+        task.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,4 @@
+"""Keyset-/Cursor-Pagination"""
+from .cursor import decode_cursor, encode_cursor
+
+__all__ = ["decode_cursor", "encode_cursor"]
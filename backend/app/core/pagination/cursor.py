@@ -0,0 +1,77 @@
+"""
+Opake Cursor für Keyset-Pagination.
+
+Ein Cursor kodiert die Sortierwerte der letzten Zeile einer Seite
+(z.B. (name, id) oder (rank, id)). Die nächste Seite filtert dann mit
+WHERE (sort, id) > (:sort, :id) statt mit OFFSET – die Kosten bleiben
+unabhängig davon, wie weit geblättert wurde.
+
+Typen (UUID, datetime, date, Decimal) werden beim Dekodieren
+wiederhergestellt, damit die Werte direkt in Vergleichen verwendet
+werden können.
+"""
+from __future__ import annotations
+
+import base64
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi import HTTPException, status
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return {"u": str(value)}
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"n": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "u" in value:
+            return uuid.UUID(value["u"])
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        if "n" in value:
+            return Decimal(value["n"])
+    return value
+
+
+def encode_cursor(*values: Any) -> str:
+    """Kodiert die Sortierwerte der letzten Zeile als URL-sicheren String."""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """
+    Dekodiert einen Cursor.
+
+    Args:
+        cursor: Wert aus encode_cursor()
+        size: Erwartete Anzahl Werte
+
+    Raises:
+        HTTPException 400: Bei ungültigem Cursor
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != size:
+            raise ValueError("unexpected cursor shape")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor",
+        )
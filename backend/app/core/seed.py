@@ -15,6 +15,7 @@ from app.modules.employees.models import Department, Role, Employee
 from app.modules.backoffice.crm.models import Customer, Contact
 from app.modules.backoffice.projects.models import Project
 from app.modules.backoffice.time_tracking.models import TimeEntry
+from app.modules.backoffice.time_tracking.crud import rebuild_time_rollup
 from datetime import datetime, timedelta
 import random
 
@@ -357,6 +358,8 @@ def seed_database():
                     print(f"  ⏺ Added time entry {i+1}h for project '{project.title}'")
 
             db.commit()
+            # Einträge wurden direkt angelegt – Tages-Buckets neu aufbauen
+            rebuild_time_rollup(db)
             print(f"  ✓ {len(time_entries)} time entries created successfully.")
 
             # ----------------------------------
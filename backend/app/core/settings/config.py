@@ -74,6 +74,46 @@ class Settings(BaseSettings):
     NOREPLY_SMTP_FROM: str = os.getenv("NOREPLY_SMTP_FROM", "noreply@kit-it-koblenz.de")
     NOREPLY_SMTP_FROM_NAME: str = os.getenv("NOREPLY_SMTP_FROM_NAME", "K.I.T. Solutions")
 
+    # Mail-Outbox (Versand per Hintergrundjob, siehe app/core/email/outbox.py)
+    MAIL_OUTBOX_INTERVAL_SECONDS: int = int(os.getenv("MAIL_OUTBOX_INTERVAL_SECONDS", "10"))
+    # Max. Nachrichten pro Empfänger-Domain und Minute (0 = unbegrenzt)
+    MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE: int = int(os.getenv("MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE", "60"))
+    # SMTP-Systemeinstellungen prozessweit cachen; update_settings invalidiert
+    SYSTEM_SETTINGS_TTL_SECONDS: int = int(os.getenv("SYSTEM_SETTINGS_TTL_SECONDS", "300"))
+    # Jinja-Bytecode-Cache der E-Mail-Templates (leer = Temp-Verzeichnis)
+    EMAIL_TEMPLATE_CACHE_DIR: str = os.getenv("EMAIL_TEMPLATE_CACHE_DIR", "")
+
+    # Background Jobs (In-Process Scheduler, siehe app/core/jobs)
+    BACKGROUND_JOBS_ENABLED: bool = os.getenv("BACKGROUND_JOBS_ENABLED", "true").lower() == "true"
+    OVERDUE_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("OVERDUE_SWEEP_INTERVAL_SECONDS", "3600"))
+    # Mahnungen beim Überfälligkeits-Lauf automatisch anlegen (nicht versenden)
+    INVOICE_AUTO_DUNNING: bool = os.getenv("INVOICE_AUTO_DUNNING", "false").lower() == "true"
+
+    # Feiertagskalender (Bundesland, ISO-3166-2 ohne "DE-"), siehe app/core/calendar
+    HOLIDAY_STATE: str = os.getenv("HOLIDAY_STATE", "RP")
+
+    # Team-Verfügbarkeit (Abteilung × Monat) prozessweit cachen; Genehmigen/Stornieren invalidiert
+    TEAM_AVAILABILITY_CACHE_TTL_SECONDS: int = int(os.getenv("TEAM_AVAILABILITY_CACHE_TTL_SECONDS", "600"))
+
+    # HR-Analytics: Kennzahlen-Abschnitte prozessweit cachen; schreibende CRUD-Funktionen invalidieren
+    HR_ANALYTICS_TTL_SECONDS: int = int(os.getenv("HR_ANALYTICS_TTL_SECONDS", "60"))
+
+    # Mitarbeiterverzeichnis (Typeahead, Organigramm) prozessweit; Mitarbeiter-Änderungen invalidieren
+    EMPLOYEE_DIRECTORY_TTL_SECONDS: int = int(os.getenv("EMPLOYEE_DIRECTORY_TTL_SECONDS", "300"))
+
+    # Dashboard: globale Zähler prozessweit cachen; Server-Timing-Header je Abschnitt
+    DASHBOARD_STATS_TTL_SECONDS: int = int(os.getenv("DASHBOARD_STATS_TTL_SECONDS", "30"))
+    DASHBOARD_TIMING_HEADER: bool = os.getenv("DASHBOARD_TIMING_HEADER", "false").lower() == "true"
+    # Parallele Dashboard-Abschnitte: prozessweit so viele Worker/Connections (Pool: 5 + 10 Overflow)
+    DASHBOARD_SECTION_WORKERS: int = int(os.getenv("DASHBOARD_SECTION_WORKERS", "4"))
+
+    # Email-Intake: verifizierte API-Keys kurz cachen (bcrypt nur beim ersten Aufruf)
+    API_KEY_CACHE_TTL_SECONDS: int = int(os.getenv("API_KEY_CACHE_TTL_SECONDS", "60"))
+    # Alt-Keys ohne Präfix: annehmen bis zur Umstellung (scripts/reissue_legacy_api_keys.py),
+    # die bcrypt-Suche über nicht migrierte Keys pro Prozess und Minute begrenzen
+    API_KEY_LEGACY_ENABLED: bool = os.getenv("API_KEY_LEGACY_ENABLED", "true").lower() == "true"
+    API_KEY_LEGACY_SCANS_PER_MINUTE: int = int(os.getenv("API_KEY_LEGACY_SCANS_PER_MINUTE", "10"))
+
     model_config = SettingsConfigDict(
         env_file=".env",  # In Docker: /app/.env
         env_file_encoding="utf-8",
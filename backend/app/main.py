@@ -17,6 +17,10 @@ logger = logging.getLogger(__name__)
 
 # Core
 from app.core.auth.routes import auth_router
+from app.core.jobs import register_periodic_job, start_jobs, stop_jobs
+from app.core.email import outbox as mail_outbox
+from app.core.email.smtp_pool import smtp_pool
+from app.core.email import rendering as email_rendering
 
 # Module Imports
 from app.modules.system.router import router as system_router
@@ -31,6 +35,8 @@ from app.modules.backoffice.invoices.routes import router as invoices_router
 from app.modules.backoffice.products.routes import router as products_router
 from app.modules.backoffice.finance import routes as finance_routes
 from app.modules.backoffice.finance.stripe_routes import router as stripe_router
+from app.modules.backoffice.finance import stripe_inbox
+from app.modules.backoffice.invoices import overdue as invoice_overdue
 from app.modules.admin.audit_routes import router as audit_router
 from app.modules.admin.settings_routes import router as settings_router
 from app.modules.hr import router as hr_router
@@ -134,6 +140,39 @@ app.include_router(support_router, tags=["Support"])
 app.include_router(kb_router, tags=["Knowledge Base"])
 app.include_router(email_intake_router, tags=["Email Intake"])
 
+# === Background Jobs ===
+register_periodic_job("stripe_inbox", 30, stripe_inbox.process_pending_events)
+register_periodic_job(
+    "invoice_overdue_sweep",
+    settings.OVERDUE_SWEEP_INTERVAL_SECONDS,
+    invoice_overdue.run_overdue_sweep,
+    initial_delay=60,
+)
+register_periodic_job(
+    "mail_outbox",
+    settings.MAIL_OUTBOX_INTERVAL_SECONDS,
+    mail_outbox.process_outbox,
+    initial_delay=10,
+)
+
+
+@app.on_event("startup")
+async def precompile_email_templates():
+    # Syntaxfehler in Templates brechen den Start ab, nicht die erste Mail
+    email_rendering.load_templates()
+
+
+@app.on_event("startup")
+async def start_background_jobs():
+    start_jobs()
+
+
+@app.on_event("shutdown")
+async def stop_background_jobs():
+    await stop_jobs()
+    smtp_pool.close_all()
+
+
 # === Core Endpoints ===
 
 def _status_html(extra_rows: str = "") -> str:
@@ -1,7 +1,11 @@
 """
 Admin Models - Database models for Admin module
 """
-from sqlalchemy import Column, String, Integer, Boolean, DateTime
+from enum import Enum
+
+from sqlalchemy import (
+    Column, String, Integer, Boolean, DateTime, Text, LargeBinary, JSON, Index, CheckConstraint,
+)
 from sqlalchemy.sql import func
 from app.core.settings.database import Base
 from app.core.misc.mixins import UUIDMixin
@@ -73,3 +77,51 @@ class SystemSettings(Base, UUIDMixin):
     # ========================================================================
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
+class MailOutboxStatus(str, Enum):
+    """Versandstatus einer Nachricht im Mail-Outbox."""
+    PENDING = "pending"
+    SENDING = "sending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
+class MailOutbox(Base, UUIDMixin):
+    """
+    Outbox für ausgehende E-Mails.
+
+    Requests legen die fertige MIME-Nachricht hier ab und kehren sofort
+    zurück; ein Hintergrundjob versendet in Batches über gepoolte
+    SMTP-Verbindungen (siehe app/core/email/outbox.py).
+    """
+    __tablename__ = "mail_outbox"
+    __table_args__ = (
+        Index("ix_mail_outbox_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_mail_outbox_domain_sent_at", "recipient_domain", "sent_at"),
+        Index("ix_mail_outbox_reference", "reference"),
+        CheckConstraint(
+            "status IN ('pending', 'sending', 'sent', 'failed')",
+            name="check_mail_outbox_status_valid"
+        ),
+    )
+
+    account = Column(String(20), nullable=False, comment="SMTP-Zugang: system, support, noreply")
+    sender = Column(String(255), nullable=False, comment="Envelope-From")
+    recipients = Column(JSON, nullable=False, comment="Envelope-Empfänger dieser Domain (To, Cc, Bcc)")
+    recipient_domain = Column(String(255), nullable=False, comment="Domain aller Empfänger des Eintrags (Rate-Limit)")
+    subject = Column(String(998))
+    message = Column(LargeBinary, nullable=False, comment="Fertige MIME-Nachricht")
+    reference = Column(String(100), comment="Bezug, z.B. invoice:<id> oder ticket:TKT-000042")
+
+    status = Column(
+        String(20),
+        nullable=False,
+        default=MailOutboxStatus.PENDING.value,
+        server_default=MailOutboxStatus.PENDING.value,
+    )
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    last_error = Column(Text)
+    next_attempt_at = Column(DateTime(timezone=True), comment="Frühester nächster Versuch bzw. Lease-Ende")
+    sent_at = Column(DateTime(timezone=True))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
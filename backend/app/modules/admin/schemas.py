@@ -189,3 +189,24 @@ class SystemSettingsUpdate(BaseModel):
             if v not in valid_currencies:
                 raise ValueError(f'Currency must be one of: {", ".join(valid_currencies)}')
         return v
+
+
+# ============================================================================
+# Mail Outbox
+# ============================================================================
+
+class MailOutboxMetrics(BaseModel):
+    by_status: dict[str, int]
+    lag_seconds: float
+    last_run: Optional[dict] = None
+
+
+class MailOutboxRetryRequest(BaseModel):
+    message_ids: Optional[List[UUID]] = Field(
+        default=None,
+        description="Outbox-IDs; leer = alle fehlgeschlagenen Nachrichten"
+    )
+
+
+class MailOutboxRetryResponse(BaseModel):
+    retried: int
@@ -2,11 +2,14 @@
 Admin Service - Business logic for Admin APIs
 """
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from typing import Optional, Tuple, List, Dict
+from dataclasses import dataclass
 from datetime import datetime
 from uuid import UUID
 
+from app.core.cache import TTLCache
+from app.core.settings.config import settings as app_settings
 from app.modules.backoffice.invoices.models import AuditLog
 from app.modules.admin.models import SystemSettings
 from app.modules.admin.schemas import AdminAuditLogResponse
@@ -168,6 +171,60 @@ async def update_settings(db: Session, settings_update: dict) -> SystemSettings:
     settings.updated_at = datetime.utcnow()
 
     db.commit()
+    invalidate_system_settings_cache()
     db.refresh(settings)
 
     return settings
+
+
+# ============================================================================
+# SMTP-Einstellungen (prozessweiter Cache)
+# ============================================================================
+
+@dataclass(frozen=True)
+class MailSettings:
+    """Unveränderliche Kopie der SMTP-Felder aus SystemSettings."""
+    email_enabled: bool = False
+    smtp_host: str = ""
+    smtp_port: int = 587
+    smtp_username: str = ""
+    smtp_password: str = ""
+    smtp_from_email: str = ""
+    smtp_from_name: str = "WorkmateOS"
+    smtp_use_tls: bool = True
+    smtp_use_ssl: bool = False
+
+
+_MAIL_SETTINGS_KEY = "mail"
+_system_settings_cache = TTLCache(ttl_seconds=app_settings.SYSTEM_SETTINGS_TTL_SECONDS, max_entries=8)
+
+
+def _load_mail_settings(db: Session) -> MailSettings:
+    row = db.scalar(select(SystemSettings).limit(1))
+    if row is None:
+        return MailSettings()
+    return MailSettings(
+        email_enabled=bool(row.email_enabled),
+        smtp_host=row.smtp_host or "",
+        smtp_port=row.smtp_port or 587,
+        smtp_username=row.smtp_username or "",
+        smtp_password=row.smtp_password or "",
+        smtp_from_email=row.smtp_from_email or "",
+        smtp_from_name=row.smtp_from_name or "",
+        smtp_use_tls=bool(row.smtp_use_tls),
+        smtp_use_ssl=bool(row.smtp_use_ssl),
+    )
+
+
+def get_mail_settings(db: Session) -> MailSettings:
+    """
+    SMTP-Einstellungen für E-Mail-Versand und Outbox-Worker.
+
+    Prozessweit gecacht (SYSTEM_SETTINGS_TTL_SECONDS); update_settings()
+    invalidiert, die TTL fängt Änderungen anderer Worker-Prozesse ab.
+    """
+    return _system_settings_cache.get_or_set(_MAIL_SETTINGS_KEY, lambda: _load_mail_settings(db))
+
+
+def invalidate_system_settings_cache() -> None:
+    _system_settings_cache.invalidate()
@@ -3,9 +3,10 @@ System Settings API Routes
 
 Provides endpoints to manage global system settings.
 """
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 
+from app.core.email import outbox
 from app.core.settings.database import get_db
 from app.core.auth.roles import require_permissions, get_current_user
 from app.modules.admin import schemas, service
@@ -84,3 +85,39 @@ async def update_settings(
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update settings: {str(e)}")
+
+
+@router.get("/mail-outbox", response_model=schemas.MailOutboxMetrics)
+@require_permissions(["admin.settings.view", "admin.*"])
+def get_mail_outbox_metrics(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Zustellstatus der Mail-Outbox: Nachrichten je Status, Alter der ältesten
+    offenen Nachricht und Statistik des letzten Versandlaufs.
+
+    **Permissions required:** admin.settings.view, admin.*, or *
+    """
+    return outbox.get_outbox_metrics(db)
+
+
+@router.post("/mail-outbox/retry", response_model=schemas.MailOutboxRetryResponse)
+@require_permissions(["admin.settings.update", "admin.*"])
+def retry_mail_outbox(
+    data: schemas.MailOutboxRetryRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Nachrichten erneut versenden. Ohne message_ids werden alle
+    fehlgeschlagenen Nachrichten zurückgesetzt; mit message_ids nur
+    fehlgeschlagene oder wartende, nicht solche im Versand.
+
+    **Permissions required:** admin.settings.update, admin.*, or *
+    """
+    count = outbox.retry_messages(db, data.message_ids)
+    if count:
+        background_tasks.add_task(outbox.process_outbox)
+    return schemas.MailOutboxRetryResponse(retried=count)
@@ -4,12 +4,19 @@ CRUD Operations für CRM Module.
 
 Datenbank-Operationen für Customer und Contact Models.
 """
-from sqlalchemy.orm import Session
+import zlib
+
+from sqlalchemy import Select, and_, case, func, literal, or_, select, union
+from sqlalchemy.orm import Session, lazyload
 from uuid import UUID
 from typing import Optional
 
+from app.core.pagination import decode_cursor, encode_cursor
 from . import models, schemas
 
+CUSTOMER_NUMBER_PREFIX = "KIT-CUS-"
+CUSTOMER_NUMBER_LOCK_KEY = zlib.crc32(b"workmate:customer_number")
+
 
 # === Customer CRUD ===
 
@@ -48,6 +55,245 @@ def get_customers(
     return query.offset(skip).limit(limit).all()
 
 
+def customer_aggregates_query(customer_ids=None) -> Select:
+    """
+    Kennzahlen pro Kunde als wiederverwendbare SQL-Query.
+
+    Spalten: customer_id, total_revenue, outstanding_amount, active_projects_count.
+    Entspricht den Properties Customer.total_revenue / outstanding_amount /
+    active_projects_count, rechnet aber mit gruppierten Subqueries über
+    invoices, payments und projects statt pro Kunde Relationships zu laden.
+
+    Args:
+        customer_ids: Optional Liste oder Subquery von Customer IDs; schränkt
+                      alle Teilaggregate ein (z.B. auf eine Seite der Liste)
+
+    Verwendung als Subquery:
+        agg = customer_aggregates_query().subquery()
+        select(Customer, agg.c.total_revenue).join(agg, agg.c.customer_id == Customer.id)
+    """
+    from app.modules.backoffice.invoices.models import Invoice, InvoiceStatus, Payment
+    from app.modules.backoffice.projects.models import Project, ProjectStatus
+
+    paid_stmt = select(Payment.invoice_id, func.sum(Payment.amount).label("paid_amount"))
+    if customer_ids is not None:
+        paid_stmt = paid_stmt.where(
+            Payment.invoice_id.in_(
+                select(Invoice.id).where(Invoice.customer_id.in_(customer_ids))
+            )
+        )
+    paid = paid_stmt.group_by(Payment.invoice_id).subquery()
+
+    invoice_stmt = (
+        select(
+            Invoice.customer_id,
+            func.sum(
+                case((Invoice.status == InvoiceStatus.PAID.value, Invoice.total), else_=0)
+            ).label("total_revenue"),
+            func.sum(
+                case(
+                    (
+                        Invoice.status.notin_([InvoiceStatus.PAID.value, InvoiceStatus.CANCELLED.value]),
+                        Invoice.total - func.coalesce(paid.c.paid_amount, 0),
+                    ),
+                    else_=0,
+                )
+            ).label("outstanding_amount"),
+        )
+        .outerjoin(paid, paid.c.invoice_id == Invoice.id)
+    )
+    project_stmt = (
+        select(Project.customer_id, func.count(Project.id).label("active_projects_count"))
+        .where(Project.status == ProjectStatus.ACTIVE.value)
+    )
+    if customer_ids is not None:
+        invoice_stmt = invoice_stmt.where(Invoice.customer_id.in_(customer_ids))
+        project_stmt = project_stmt.where(Project.customer_id.in_(customer_ids))
+
+    invoice_totals = invoice_stmt.group_by(Invoice.customer_id).subquery()
+    project_counts = project_stmt.group_by(Project.customer_id).subquery()
+
+    stmt = (
+        select(
+            models.Customer.id.label("customer_id"),
+            func.coalesce(invoice_totals.c.total_revenue, 0).label("total_revenue"),
+            func.coalesce(invoice_totals.c.outstanding_amount, 0).label("outstanding_amount"),
+            func.coalesce(project_counts.c.active_projects_count, 0).label("active_projects_count"),
+        )
+        .outerjoin(invoice_totals, invoice_totals.c.customer_id == models.Customer.id)
+        .outerjoin(project_counts, project_counts.c.customer_id == models.Customer.id)
+    )
+    if customer_ids is not None:
+        stmt = stmt.where(models.Customer.id.in_(customer_ids))
+    return stmt
+
+
+def get_customers_with_aggregates(
+    db: Session,
+    skip: int = 0,
+    limit: int = 50,
+    status: Optional[str] = None,
+    search: Optional[str] = None
+) -> list[tuple[models.Customer, float, float, int]]:
+    """
+    Wie get_customers, aber inkl. Umsatz, offenen Forderungen und aktiven
+    Projekten pro Kunde – in einer Query, ohne Lazy Loads pro Zeile.
+
+    Returns:
+        Liste von (Customer, total_revenue, outstanding_amount, active_projects_count)
+    """
+    Customer = models.Customer
+    page = select(Customer.id)
+
+    if status:
+        page = page.where(Customer.status == status)
+
+    if search:
+        search_filter = f"%{search}%"
+        page = page.where(
+            (Customer.name.ilike(search_filter)) |
+            (Customer.email.ilike(search_filter))
+        )
+
+    # Erst die Seite bestimmen, dann nur deren Kunden aggregieren
+    page = page.order_by(Customer.name, Customer.id).offset(skip).limit(limit).subquery()
+    agg = customer_aggregates_query(select(page.c.id)).subquery()
+    stmt = (
+        select(
+            Customer,
+            agg.c.total_revenue,
+            agg.c.outstanding_amount,
+            agg.c.active_projects_count,
+        )
+        .join(agg, agg.c.customer_id == Customer.id)
+        # Kontakte werden in der Liste nicht gebraucht
+        .options(lazyload(Customer.contacts))
+        .order_by(Customer.name, Customer.id)
+    )
+    return [
+        (customer, float(revenue), float(outstanding), int(projects))
+        for customer, revenue, outstanding, projects in db.execute(stmt).all()
+    ]
+
+
+def search_customers(
+    db: Session,
+    q: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Kundensuche mit Ranking, Kennzahlen und Keyset-Pagination.
+
+    - Treffer über den Trigram-Index auf customers.search_text (Name, E-Mail,
+      Kundennummer, Stadt) und contacts.search_text (Name, E-Mail)
+    - Ranking: exakte Kundennummer > Namens-Präfix > Trigram-Ähnlichkeit
+      (Ähnlichkeit nur mit pg_trgm/Postgres)
+    - Ohne Suchbegriff sortiert nach Name
+    - Kennzahlen werden nur für die Kunden der Seite aggregiert (eine Query)
+
+    Returns:
+        Dict mit items [(Customer, rank, total_revenue, outstanding_amount,
+        active_projects_count)], total und next_cursor
+    """
+    Customer, Contact = models.Customer, models.Contact
+    term = (q or "").strip().lower()
+
+    filters = []
+    if status:
+        filters.append(Customer.status == status)
+
+    if term:
+        matched_ids = union(
+            select(Customer.id).where(Customer.search_text.contains(term, autoescape=True)),
+            select(Contact.customer_id).where(Contact.search_text.contains(term, autoescape=True)),
+        )
+        filters.append(Customer.id.in_(matched_ids))
+
+        if db.get_bind().dialect.name == "postgresql":
+            contact_similarity = (
+                select(func.max(func.similarity(Contact.search_text, term)))
+                .where(Contact.customer_id == Customer.id)
+                .scalar_subquery()
+            )
+            similarity = func.greatest(
+                func.similarity(Customer.search_text, term),
+                func.coalesce(contact_similarity, 0) * 0.9,
+            )
+        else:
+            similarity = literal(0.0)
+
+        rank = (
+            case((func.lower(Customer.customer_number) == term, 2.0), else_=0.0)
+            + case((func.lower(Customer.name).like(f"{term}%"), 1.0), else_=0.0)
+            + similarity
+        )
+    else:
+        rank = literal(0.0)
+
+    ranked = (
+        select(Customer.id, Customer.name, rank.label("rank"))
+        .where(*filters)
+        .subquery()
+    )
+    total = db.scalar(select(func.count()).select_from(ranked))
+
+    # Sortierung: Suche nach (rank DESC, name, id), sonst nach (name, id)
+    def _order(source):
+        name_order = (source.c.name, source.c.id)
+        return ((source.c.rank.desc(),) + name_order) if term else name_order
+
+    page_stmt = select(ranked)
+    if cursor:
+        if term:
+            last_rank, last_name, last_id = decode_cursor(cursor, 3)
+        else:
+            last_name, last_id = decode_cursor(cursor, 2)
+        keyset = or_(
+            ranked.c.name > last_name,
+            and_(ranked.c.name == last_name, ranked.c.id > last_id),
+        )
+        if term:
+            keyset = or_(
+                ranked.c.rank < last_rank,
+                and_(ranked.c.rank == last_rank, keyset),
+            )
+        page_stmt = page_stmt.where(keyset)
+    page = page_stmt.order_by(*_order(ranked)).limit(limit + 1).cte("page")
+
+    agg = customer_aggregates_query(select(page.c.id)).subquery()
+    rows = db.execute(
+        select(
+            Customer,
+            page.c.rank,
+            func.coalesce(agg.c.total_revenue, 0),
+            func.coalesce(agg.c.outstanding_amount, 0),
+            func.coalesce(agg.c.active_projects_count, 0),
+        )
+        .join(page, page.c.id == Customer.id)
+        .outerjoin(agg, agg.c.customer_id == Customer.id)
+        .options(lazyload(Customer.contacts))
+        .order_by(*_order(page))
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_customer, last_rank = rows[-1][0], rows[-1][1]
+        keys = (last_customer.name, last_customer.id)
+        next_cursor = encode_cursor(float(last_rank), *keys) if term else encode_cursor(*keys)
+
+    return {
+        "items": [
+            (customer, float(r), float(revenue), float(outstanding), int(projects))
+            for customer, r, revenue, outstanding, projects in rows
+        ],
+        "total": total or 0,
+        "next_cursor": next_cursor,
+    }
+
+
 def get_customer(db: Session, customer_id: UUID) -> Optional[models.Customer]:
     """
     Hole einen einzelnen Kunden.
@@ -64,6 +310,45 @@ def get_customer(db: Session, customer_id: UUID) -> Optional[models.Customer]:
     ).first()
 
 
+def _lock_customer_numbers(db: Session) -> None:
+    """
+    Serialisiert die Vergabe von Kundennummern bis zum Ende der Transaktion.
+
+    Transaktionsgebundener Postgres Advisory Lock – Einzelanlage und
+    CSV-Import können so keine Nummer doppelt vergeben. Auf anderen
+    Datenbanken (SQLite in Tests) ohne Lock.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(select(func.pg_advisory_xact_lock(CUSTOMER_NUMBER_LOCK_KEY)))
+
+
+def reserve_customer_numbers(db: Session, count: int) -> list[str]:
+    """
+    Reserviert einen zusammenhängenden Block von Kundennummern.
+
+    Hält den Nummern-Lock bis zum Commit/Rollback der Transaktion; die
+    Nummern müssen in derselben Transaktion vergeben werden.
+    """
+    if count <= 0:
+        return []
+    _lock_customer_numbers(db)
+    last = db.scalar(
+        select(func.max(models.Customer.customer_number))
+        .where(models.Customer.customer_number.like(f"{CUSTOMER_NUMBER_PREFIX}%"))
+    )
+    first = int(last[len(CUSTOMER_NUMBER_PREFIX):]) + 1 if last else 1
+    return [f"{CUSTOMER_NUMBER_PREFIX}{n:06d}" for n in range(first, first + count)]
+
+
+def _generate_customer_number(db: Session) -> str:
+    """
+    Nächste freie Kundennummer (KIT-CUS-000001).
+
+    Die Eindeutigkeit sichert zusätzlich uq_customers_customer_number ab.
+    """
+    return reserve_customer_numbers(db, 1)[0]
+
+
 def create_customer(db: Session, data: schemas.CustomerCreate) -> models.Customer:
     """
     Erstelle einen neuen Kunden.
@@ -75,7 +360,10 @@ def create_customer(db: Session, data: schemas.CustomerCreate) -> models.Custome
     Returns:
         Erstellter Customer
     """
-    new_customer = models.Customer(**data.model_dump())
+    new_customer = models.Customer(
+        customer_number=_generate_customer_number(db),
+        **data.model_dump(),
+    )
     db.add(new_customer)
     db.commit()
     db.refresh(new_customer)
@@ -125,6 +413,11 @@ def delete_customer(db: Session, customer_id: UUID) -> bool:
     if customer is None:
         return False
     
+    # Projekte werden per Cascade mitgelöscht, ihre Ausgaben bleiben erhalten
+    from app.modules.backoffice.finance.crud import fold_project_expense_rollup
+
+    for project in customer.projects:
+        fold_project_expense_rollup(db, project.id)
     db.delete(customer)
     db.commit()
     return True
@@ -340,16 +633,111 @@ def activities_by_customer(
     return query.all()
 
 
-def get_pipeline_customers(db: Session) -> dict:
-    from .models import PipelineStage
-    all_stages = [s.value for s in PipelineStage]
-    pipeline: dict = {stage: [] for stage in all_stages}
-    customers = db.query(models.Customer).all()
-    for customer in customers:
-        stage = customer.pipeline_stage or PipelineStage.NEW_LEAD.value
-        if stage in pipeline:
-            pipeline[stage].append(customer)
-    return pipeline
+# Spalten der Pipeline-Karten – keine ORM-Entities, damit weder Relationships
+# (contacts: selectin) noch die Umsatz-Properties geladen werden
+PIPELINE_CARD_COLUMNS = (
+    models.Customer.id,
+    models.Customer.customer_number,
+    models.Customer.name,
+    models.Customer.type,
+    models.Customer.email,
+    models.Customer.phone,
+    models.Customer.city,
+    models.Customer.country,
+    models.Customer.pipeline_stage,
+)
+PIPELINE_STAGES = tuple(s.value for s in models.PipelineStage)
+
+
+def _pipeline_card(row) -> dict:
+    return dict(row._mapping)
+
+
+def _pipeline_cursor(cards: list[dict], limit: int) -> Optional[str]:
+    """Kürzt auf limit Karten und liefert den Cursor für die nächste Seite."""
+    if len(cards) <= limit:
+        return None
+    del cards[limit:]
+    return encode_cursor(cards[-1]["name"], cards[-1]["id"])
+
+
+def get_pipeline_board(db: Session, limit: int = 25) -> dict:
+    """
+    Pipeline-Board: Anzahl pro Stage plus die ersten `limit` Karten je Stage.
+
+    Zwei Statements unabhängig von der Anzahl Kunden:
+    - GROUP BY pipeline_stage für die Spaltenzähler
+    - row_number() OVER (PARTITION BY pipeline_stage ORDER BY name, id)
+      für die ersten limit+1 Karten je Stage (+1 erkennt weitere Seiten)
+
+    Returns:
+        Dict stage -> {count, items, next_cursor}; next_cursor für
+        get_pipeline_stage_page()
+    """
+    Customer = models.Customer
+    counts = dict(
+        db.execute(
+            select(Customer.pipeline_stage, func.count())
+            .where(Customer.pipeline_stage.in_(PIPELINE_STAGES))
+            .group_by(Customer.pipeline_stage)
+        ).all()
+    )
+
+    row_number = func.row_number().over(
+        partition_by=Customer.pipeline_stage,
+        order_by=(Customer.name, Customer.id),
+    ).label("row_number")
+    ranked = (
+        select(*PIPELINE_CARD_COLUMNS, row_number)
+        .where(Customer.pipeline_stage.in_(PIPELINE_STAGES))
+        .subquery()
+    )
+    rows = db.execute(
+        select(*(ranked.c[c.key] for c in PIPELINE_CARD_COLUMNS))
+        .where(ranked.c.row_number <= limit + 1)
+        .order_by(ranked.c.pipeline_stage, ranked.c.name, ranked.c.id)
+    ).all()
+
+    cards: dict[str, list[dict]] = {stage: [] for stage in PIPELINE_STAGES}
+    for row in rows:
+        cards[row.pipeline_stage].append(_pipeline_card(row))
+
+    return {
+        stage: {
+            "count": counts.get(stage, 0),
+            "next_cursor": _pipeline_cursor(cards[stage], limit),
+            "items": cards[stage],
+        }
+        for stage in PIPELINE_STAGES
+    }
+
+
+def get_pipeline_stage_page(
+    db: Session,
+    stage: str,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Weitere Karten einer Pipeline-Spalte (Keyset über (name, id)).
+
+    Nutzt ix_customers_pipeline_stage_name (pipeline_stage, name, id).
+
+    Returns:
+        Dict mit items und next_cursor
+    """
+    Customer = models.Customer
+    stmt = select(*PIPELINE_CARD_COLUMNS).where(Customer.pipeline_stage == stage)
+    if cursor:
+        last_name, last_id = decode_cursor(cursor, 2)
+        stmt = stmt.where(or_(
+            Customer.name > last_name,
+            and_(Customer.name == last_name, Customer.id > last_id),
+        ))
+    rows = db.execute(stmt.order_by(Customer.name, Customer.id).limit(limit + 1)).all()
+
+    cards = [_pipeline_card(row) for row in rows]
+    return {"next_cursor": _pipeline_cursor(cards, limit), "items": cards}
 
 
 def update_pipeline_stage(db: Session, customer_id: UUID, stage: str) -> models.Customer | None:
@@ -363,13 +751,30 @@ def update_pipeline_stage(db: Session, customer_id: UUID, stage: str) -> models.
 
 
 def get_stats(db: Session):
-    customers = db.query(models.Customer).all()
+    """CRM-Kennzahlen in einer Query (Status-Zähler + Summen aus customer_aggregates_query)."""
+    agg = customer_aggregates_query().subquery()
+
+    def _count_status(value: str):
+        return func.count(case((models.Customer.status == value, 1)))
+
+    row = db.execute(
+        select(
+            func.count(models.Customer.id),
+            _count_status(models.CustomerStatus.ACTIVE.value),
+            _count_status(models.CustomerStatus.LEAD.value),
+            _count_status(models.CustomerStatus.BLOCKED.value),
+            func.coalesce(func.sum(agg.c.total_revenue), 0),
+            func.coalesce(func.sum(agg.c.outstanding_amount), 0),
+            func.coalesce(func.sum(agg.c.active_projects_count), 0),
+        ).join(agg, agg.c.customer_id == models.Customer.id)
+    ).one()
+
     return {
-        "total_customers": len(customers),
-        "active_customers": sum(1 for c in customers if c.status == models.CustomerStatus.ACTIVE.value),
-        "leads": sum(1 for c in customers if c.status == models.CustomerStatus.LEAD.value),
-        "blocked_customers": sum(1 for c in customers if c.status == models.CustomerStatus.BLOCKED.value),
-        "total_revenue": sum(c.total_revenue for c in customers),
-        "outstanding_revenue": sum(c.outstanding_amount for c in customers),
-        "active_projects": sum(c.active_projects_count for c in customers),
-    }
\ No newline at end of file
+        "total_customers": row[0],
+        "active_customers": row[1],
+        "leads": row[2],
+        "blocked_customers": row[3],
+        "total_revenue": float(row[4]),
+        "outstanding_revenue": float(row[5]),
+        "active_projects": int(row[6]),
+    }
@@ -4,16 +4,30 @@ CSV-Import für CRM Kunden.
 
 Unterstützt Semikolon- und Komma-getrennte Dateien.
 Duplikatserkennung per E-Mail-Adresse.
+
+Der Import arbeitet mengenbasiert:
+1. Datei komplett parsen und validieren
+2. Vorhandene E-Mails mit einer Query vorab laden
+3. Einen Block Kundennummern reservieren (Advisory Lock, siehe crud)
+4. Mehrzeilige INSERTs in Chunks von INSERT_CHUNK_SIZE Zeilen; schlägt ein
+   Chunk fehl, wird er zeilenweise wiederholt (Savepoint pro Zeile), damit
+   nur die fehlerhaften Zeilen übersprungen werden
+
+Dry-Run läuft durch denselben Code inkl. INSERTs und rollt am Ende
+zurück – er findet also auch Datenbankfehler.
 """
 import csv
 import io
+import uuid
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Callable, Iterator, Optional, Union
 
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
 
 from . import models
-from .crud import _generate_customer_number
+from .crud import reserve_customer_numbers
 
 
 ALLOWED_COLUMNS = {
@@ -24,6 +38,9 @@ ALLOWED_COLUMNS = {
 VALID_TYPES = {"individual", "business", "government", "creator"}
 VALID_STATUSES = {"active", "inactive", "lead", "blocked"}
 
+INSERT_CHUNK_SIZE = 1000
+PREVIEW_LIMIT = 100
+
 
 @dataclass
 class ImportResult:
@@ -33,6 +50,14 @@ class ImportResult:
     preview: list[dict] = field(default_factory=list)
 
 
+@dataclass
+class ImportProgress:
+    """Zwischenstand nach jedem Chunk (für Fortschrittsanzeigen)."""
+    phase: str  # parsed | inserted
+    processed: int
+    total: int
+
+
 def _detect_delimiter(content: str) -> str:
     """Auto-detect CSV-Delimiter (Semikolon oder Komma)."""
     first_line = content.split("\n")[0] if "\n" in content else content
@@ -41,52 +66,45 @@ def _detect_delimiter(content: str) -> str:
     return ";" if semicolons >= commas else ","
 
 
-def import_customers_csv(
-    db: Session,
-    file_bytes: bytes,
-    skip_duplicates: bool = True,
-    dry_run: bool = False,
-) -> ImportResult:
-    """
-    Importiert Kunden aus CSV-Daten.
-
-    Args:
-        db: Database Session
-        file_bytes: Rohe CSV-Bytes
-        skip_duplicates: Duplikate (per E-Mail) überspringen statt fehler
-        dry_run: Nur Preview ohne DB-Speicherung
-
-    Returns:
-        ImportResult mit Statistiken und optionaler Preview
-    """
-    result = ImportResult()
-
+def _decode(file_bytes: bytes) -> Optional[str]:
     try:
-        content = file_bytes.decode("utf-8-sig")  # utf-8-sig entfernt BOM
+        return file_bytes.decode("utf-8-sig")  # utf-8-sig entfernt BOM
     except UnicodeDecodeError:
         try:
-            content = file_bytes.decode("latin-1")
+            return file_bytes.decode("latin-1")
         except UnicodeDecodeError:
-            result.errors.append("Datei-Encoding nicht erkannt. Bitte UTF-8 oder Latin-1 verwenden.")
-            return result
+            return None
+
 
+def _parse_rows(content: str, result: ImportResult) -> list[tuple[int, dict]]:
+    """
+    Parst und validiert alle Zeilen.
+
+    Returns:
+        (Zeilennummer, customer_data) je gültiger Zeile
+    """
     delimiter = _detect_delimiter(content)
     reader = csv.DictReader(io.StringIO(content), delimiter=delimiter)
 
     if not reader.fieldnames:
         result.errors.append("CSV-Datei hat keine Spaltenköpfe.")
-        return result
+        return []
 
     # Normalisierte Spaltennamen (lowercase, strip)
     fieldnames = [f.strip().lower() for f in reader.fieldnames]
 
     if "name" not in fieldnames:
         result.errors.append("Pflichtfeld 'name' fehlt in den CSV-Spalten.")
-        return result
+        return []
 
+    rows = []
     for row_num, raw_row in enumerate(reader, start=2):
         # Normalisiere Keys
-        row = {k.strip().lower(): (v.strip() if v else "") for k, v in raw_row.items()}
+        row = {
+            k.strip().lower(): (v.strip() if v else "")
+            for k, v in raw_row.items()
+            if k is not None
+        }
 
         name = row.get("name", "").strip()
         if not name:
@@ -94,17 +112,6 @@ def import_customers_csv(
             result.skipped += 1
             continue
 
-        email = row.get("email", "").strip() or None
-
-        # Duplikatsprüfung per E-Mail
-        if email and skip_duplicates:
-            existing = db.query(models.Customer).filter(
-                models.Customer.email == email
-            ).first()
-            if existing:
-                result.skipped += 1
-                continue
-
         # Typ und Status validieren / bereinigen
         raw_type = row.get("type", "").strip().lower() or None
         customer_type = raw_type if raw_type in VALID_TYPES else None
@@ -112,9 +119,9 @@ def import_customers_csv(
         raw_status = row.get("status", "").strip().lower() or None
         customer_status = raw_status if raw_status in VALID_STATUSES else "lead"
 
-        customer_data = {
+        rows.append((row_num, {
             "name": name,
-            "email": email,
+            "email": row.get("email", "").strip() or None,
             "phone": row.get("phone") or None,
             "city": row.get("city") or None,
             "zip_code": row.get("zip_code") or None,
@@ -123,29 +130,143 @@ def import_customers_csv(
             "type": customer_type,
             "status": customer_status,
             "notes": row.get("notes") or None,
-        }
+        }))
+    return rows
 
-        if dry_run:
-            result.preview.append(customer_data)
-            result.imported += 1
+
+def _drop_duplicates(
+    db: Session,
+    rows: list[tuple[int, dict]],
+    result: ImportResult,
+) -> list[tuple[int, dict]]:
+    """Entfernt Zeilen, deren E-Mail schon existiert oder in der Datei doppelt ist."""
+    emails = {data["email"] for _, data in rows if data["email"]}
+    if not emails:
+        return rows
+
+    seen = set(db.scalars(
+        select(models.Customer.email).where(models.Customer.email.in_(emails))
+    ))
+    unique = []
+    for row_num, data in rows:
+        email = data["email"]
+        if email and email in seen:
+            result.skipped += 1
             continue
+        if email:
+            seen.add(email)
+        unique.append((row_num, data))
+    return unique
 
-        # Kundennummer generieren und Kunden anlegen
-        customer_number = _generate_customer_number(db)
-        customer = models.Customer(
-            customer_number=customer_number,
-            **customer_data,
-        )
-        db.add(customer)
+
+def _insert_rows_individually(
+    db: Session,
+    rows: list[tuple[int, dict]],
+    values: list[dict],
+    result: ImportResult,
+) -> None:
+    """Fallback für einen fehlgeschlagenen Chunk: ein Savepoint pro Zeile."""
+    for (row_num, _), row_values in zip(rows, values):
         try:
-            db.flush()
+            with db.begin_nested():
+                db.execute(insert(models.Customer), [row_values])
             result.imported += 1
-        except Exception as e:
-            db.rollback()
-            result.errors.append(f"Zeile {row_num}: Datenbankfehler – {str(e)}")
+        except SQLAlchemyError as e:
+            result.errors.append(f"Zeile {row_num}: Datenbankfehler – {e.__class__.__name__}")
             result.skipped += 1
 
-    if not dry_run and result.imported > 0:
-        db.commit()
 
-    return result
+def iter_import_customers_csv(
+    db: Session,
+    file_bytes: bytes,
+    skip_duplicates: bool = True,
+    dry_run: bool = False,
+    chunk_size: int = INSERT_CHUNK_SIZE,
+) -> Iterator[Union[ImportProgress, ImportResult]]:
+    """
+    Importiert Kunden aus CSV-Daten und meldet den Fortschritt.
+
+    Liefert nach dem Parsen und nach jedem Chunk ein ImportProgress,
+    zuletzt das ImportResult.
+
+    Args:
+        db: Database Session
+        file_bytes: Rohe CSV-Bytes
+        skip_duplicates: Duplikate (per E-Mail) überspringen statt importieren
+        dry_run: Kompletter Lauf inkl. INSERTs, am Ende Rollback statt Commit
+        chunk_size: Zeilen pro mehrzeiligem INSERT
+    """
+    result = ImportResult()
+
+    content = _decode(file_bytes)
+    if content is None:
+        result.errors.append("Datei-Encoding nicht erkannt. Bitte UTF-8 oder Latin-1 verwenden.")
+        yield result
+        return
+
+    rows = _parse_rows(content, result)
+    if skip_duplicates:
+        rows = _drop_duplicates(db, rows, result)
+    yield ImportProgress(phase="parsed", processed=0, total=len(rows))
+
+    if dry_run:
+        result.preview = [data for _, data in rows[:PREVIEW_LIMIT]]
+
+    try:
+        numbers = reserve_customer_numbers(db, len(rows))
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start:start + chunk_size]
+            values = [
+                {"id": uuid.uuid4(), "customer_number": number, **data}
+                for (_, data), number in zip(chunk, numbers[start:start + chunk_size])
+            ]
+            try:
+                # Savepoint: ein fehlerhafter Chunk verwirft nicht den ganzen Import
+                with db.begin_nested():
+                    db.execute(insert(models.Customer), values)
+                result.imported += len(chunk)
+            except SQLAlchemyError:
+                _insert_rows_individually(db, chunk, values, result)
+            yield ImportProgress(
+                phase="inserted",
+                processed=min(start + chunk_size, len(rows)),
+                total=len(rows),
+            )
+
+        if dry_run:
+            db.rollback()
+        else:
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    yield result
+
+
+def import_customers_csv(
+    db: Session,
+    file_bytes: bytes,
+    skip_duplicates: bool = True,
+    dry_run: bool = False,
+    on_progress: Optional[Callable[[ImportProgress], None]] = None,
+) -> ImportResult:
+    """
+    Importiert Kunden aus CSV-Daten.
+
+    Args:
+        db: Database Session
+        file_bytes: Rohe CSV-Bytes
+        skip_duplicates: Duplikate (per E-Mail) überspringen statt fehler
+        dry_run: Nur Preview ohne DB-Speicherung
+        on_progress: Optionaler Callback je ImportProgress
+
+    Returns:
+        ImportResult mit Statistiken und optionaler Preview
+    """
+    for item in iter_import_customers_csv(db, file_bytes, skip_duplicates, dry_run):
+        if isinstance(item, ImportResult):
+            return item
+        if on_progress is not None:
+            on_progress(item)
+    raise RuntimeError("CSV-Import lieferte kein Ergebnis")
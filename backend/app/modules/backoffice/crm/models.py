@@ -18,7 +18,9 @@ from typing import TYPE_CHECKING
 
 from datetime import datetime
 
-from sqlalchemy import String, Text, ForeignKey, Index, CheckConstraint, text
+from sqlalchemy import (
+    String, Text, ForeignKey, Index, CheckConstraint, Computed, UniqueConstraint, text
+)
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -59,6 +61,17 @@ class PipelineStage(str, Enum):
     LOST = "lost"
 
 
+# Generierte Suchtexte (lowercase) für die Trigram-Indizes (pg_trgm, GIN)
+CUSTOMER_SEARCH_TEXT = (
+    "lower(coalesce(name, '') || ' ' || coalesce(email, '') || ' ' || "
+    "coalesce(customer_number, '') || ' ' || coalesce(city, ''))"
+)
+CONTACT_SEARCH_TEXT = (
+    "lower(coalesce(firstname, '') || ' ' || coalesce(lastname, '') || ' ' || "
+    "coalesce(email, ''))"
+)
+
+
 # ============================================================================
 # MODELS
 # ============================================================================
@@ -85,6 +98,16 @@ class Customer(Base, UUIDMixin, TimestampMixin):
         Index("ix_customers_tax_id", "tax_id"),
         Index("ix_customers_status", "status"),
         Index("ix_customers_type", "type"),
+        Index("ix_customers_customer_number", "customer_number"),
+        UniqueConstraint("customer_number", name="uq_customers_customer_number"),
+        Index("ix_customers_name_id", "name", "id"),
+        Index("ix_customers_pipeline_stage_name", "pipeline_stage", "name", "id"),
+        Index(
+            "ix_customers_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
         CheckConstraint(
             "status IN ('active', 'inactive', 'lead', 'blocked')",
             name="check_customer_status_valid"
@@ -96,6 +119,11 @@ class Customer(Base, UUIDMixin, TimestampMixin):
     )
 
     # Basic Info
+    customer_number: Mapped[str] = mapped_column(
+        String(50),
+        nullable=False,
+        comment="Eindeutige Kundennummer (KIT-CUS-000001)"
+    )
     name: Mapped[str] = mapped_column(
         String(255),
         nullable=False,
@@ -160,8 +188,14 @@ class Customer(Base, UUIDMixin, TimestampMixin):
     pipeline_stage: Mapped[str | None] = mapped_column(
         String(50),
         default=PipelineStage.NEW_LEAD.value,
+        server_default=PipelineStage.NEW_LEAD.value,
         comment="Sales Pipeline Stage"
     )
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        Computed(CUSTOMER_SEARCH_TEXT, persisted=True),
+        comment="Generierter Suchtext (name, email, customer_number, city)"
+    )
 
     # Relationships
     contacts: Mapped[list[Contact]] = relationship(
@@ -287,6 +321,12 @@ class Contact(Base, UUIDMixin, TimestampMixin):
         Index("ix_contacts_customer_id", "customer_id"),
         Index("ix_contacts_email", "email"),
         Index("ix_contacts_lastname", "lastname"),
+        Index(
+            "ix_contacts_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
         # PostgreSQL Partial Unique Index: Nur EIN primary contact pro customer
         Index(
             "ix_one_primary_contact_per_customer",
@@ -320,6 +360,11 @@ class Contact(Base, UUIDMixin, TimestampMixin):
         String(255),
         comment="E-Mail Adresse"
     )
+    search_text: Mapped[str | None] = mapped_column(
+        Text,
+        Computed(CONTACT_SEARCH_TEXT, persisted=True),
+        comment="Generierter Suchtext (firstname, lastname, email)"
+    )
     phone: Mapped[str | None] = mapped_column(
         String(50),
         comment="Telefonnummer"
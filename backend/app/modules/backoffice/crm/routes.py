@@ -4,17 +4,17 @@ FastAPI Routes für CRM Module.
 
 REST API Endpoints für Customer und Contact Management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy import and_
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from uuid import UUID
 from typing import Optional
 
 from app.core.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
-from app.modules.backoffice.invoices.models import AuditLog
-from . import schemas, crud
+from . import schemas, crud, csv_import, timeline
+from .models import PipelineStage
 
 
 router = APIRouter(
@@ -25,7 +25,7 @@ router = APIRouter(
 
 # === Customer Endpoints ===
 
-@router.get("/customers", response_model=list[schemas.CustomerResponse])
+@router.get("/customers", response_model=list[schemas.CustomerListItem])
 @require_permissions(["backoffice.crm.read"])
 def list_customers(
     skip: int = Query(0, ge=0, description="Anzahl zu überspringende Einträge"),
@@ -41,14 +41,91 @@ def list_customers(
     Optional mit Filtern:
     - status: active, inactive, lead, blocked
     - search: Suche in Name und Email
+
+    Umsatz, offene Forderungen und aktive Projekte werden pro Kunde
+    mitgeliefert (SQL-aggregiert).
     """
-    return crud.get_customers(
+    rows = crud.get_customers_with_aggregates(
         db,
         skip=skip,
         limit=limit,
         status=status,
         search=search
     )
+    return [
+        # Nicht CustomerListItem.model_validate(customer): das würde die
+        # gleichnamigen Customer-Properties (Lazy Loads) auslesen
+        schemas.CustomerListItem(
+            **schemas.CustomerResponse.model_validate(customer).model_dump(),
+            total_revenue=revenue,
+            outstanding_amount=outstanding,
+            active_projects_count=projects,
+        )
+        for customer, revenue, outstanding, projects in rows
+    ]
+
+
+@router.get("/customers/search", response_model=schemas.CustomerSearchPage)
+@require_permissions(["backoffice.crm.read"])
+def search_customers(
+    q: Optional[str] = Query(None, description="Suchbegriff (Name, E-Mail, Kundennummer, Stadt, Kontakte)"),
+    status: Optional[str] = Query(None, description="Filter nach Status"),
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Kundensuche (Search-as-you-type) mit Ranking und Keyset-Pagination.
+
+    Liefert pro Kunde Umsatz, offene Forderungen und aktive Projekte mit.
+    Ohne `q` werden alle Kunden nach Name sortiert geblättert.
+    """
+    result = crud.search_customers(db, q=q, status=status, limit=limit, cursor=cursor)
+    return schemas.CustomerSearchPage(
+        items=[
+            schemas.CustomerSearchItem(
+                **schemas.CustomerResponse.model_validate(customer).model_dump(),
+                rank=rank,
+                total_revenue=revenue,
+                outstanding_amount=outstanding,
+                active_projects_count=projects,
+            )
+            for customer, rank, revenue, outstanding, projects in result["items"]
+        ],
+        total=result["total"],
+        next_cursor=result["next_cursor"],
+    )
+
+
+@router.post("/customers/import-csv", response_model=schemas.CsvImportResponse)
+@require_permissions(["backoffice.crm.write"])
+async def import_customers_csv(
+    file: UploadFile = File(...),
+    skip_duplicates: bool = Query(True, description="Duplikate (per E-Mail) überspringen"),
+    dry_run: bool = Query(False, description="Nur prüfen, nichts speichern"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Kunden aus CSV importieren (Spalten: name, email, phone, city, ...).
+
+    Dry-Run läuft komplett durch (inkl. Datenbank) und wird zurückgerollt.
+    """
+    content = await file.read()
+    result = await run_in_threadpool(
+        csv_import.import_customers_csv,
+        db,
+        content,
+        skip_duplicates=skip_duplicates,
+        dry_run=dry_run,
+    )
+    return schemas.CsvImportResponse(
+        imported=result.imported,
+        skipped=result.skipped,
+        errors=result.errors,
+        preview=result.preview if dry_run else None,
+    )
 
 
 @router.get("/customers/{customer_id}", response_model=schemas.CustomerResponseWithContacts)
@@ -287,104 +364,38 @@ def create_activity(data: schemas.ActivityCreate, db: Session = Depends(get_db),
 
 @router.get("/activities/latest")
 @require_permissions(["backoffice.crm.view"])
-def latest(limit: int = Query(10, ge=1, le=50), db: Session = Depends(get_db), user: dict = Depends(get_current_user)):
-    manual = crud.latest_activities(db, limit)
-    result = [
-        {
-            "id": str(a.id),
-            "customer_id": str(a.customer_id),
-            "contact_id": str(a.contact_id) if a.contact_id else None,
-            "type": a.type,
-            "description": a.description,
-            "occurred_at": a.occurred_at.isoformat(),
-            "created_at": a.created_at.isoformat(),
-        }
-        for a in manual
-    ]
-
-    audit_logs = (
-        db.query(AuditLog)
-        .filter(AuditLog.entity_type.in_(["Customer", "Contact"]))
-        .order_by(AuditLog.timestamp.desc())
-        .limit(limit)
-        .all()
-    )
-
-    from app.modules.admin.service import _build_user_cache
-    user_ids = list({str(log.user_id) for log in audit_logs if log.user_id})
-    user_cache = _build_user_cache(db, user_ids)
-
-    for log in audit_logs:
-        result.append({
-            "id": str(log.id),
-            "customer_id": str(log.entity_id),
-            "contact_id": None,
-            "type": "system",
-            "description": _timeline_description(log, user_cache),
-            "occurred_at": log.timestamp.isoformat(),
-            "created_at": log.timestamp.isoformat(),
-        })
-
-    result.sort(key=lambda x: x["occurred_at"], reverse=True)
-    return result[:limit]
+def latest(
+    response: Response,
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None, description="Cursor der vorherigen Seite (X-Next-Cursor)"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    page = timeline.get_timeline(db, limit=limit, cursor=cursor)
+    _set_next_cursor(response, page["next_cursor"])
+    return [_activity_item(entry, page["user_cache"]) for entry in page["items"]]
 
 
 @router.get("/customers/{customer_id}/activities")
 @require_permissions(["backoffice.crm.view"])
 def by_customer(
     customer_id: UUID,
+    response: Response,
     contact_id: Optional[UUID] = Query(None),
     limit: Optional[int] = Query(None, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="Cursor der vorherigen Seite (X-Next-Cursor)"),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
-    effective_limit = limit or 50
-    manual = crud.activities_by_customer(db, customer_id=customer_id, contact_id=contact_id, limit=effective_limit)
-    result = [
-        {
-            "id": str(a.id),
-            "customer_id": str(a.customer_id),
-            "contact_id": str(a.contact_id) if a.contact_id else None,
-            "type": a.type,
-            "description": a.description,
-            "occurred_at": a.occurred_at.isoformat(),
-            "created_at": a.created_at.isoformat(),
-        }
-        for a in manual
-    ]
-
-    if not contact_id:
-        contact_ids = [str(c.id) for c in crud.get_contacts(db, customer_id=customer_id)]
-        from sqlalchemy import or_
-        audit_filter = [and_(AuditLog.entity_type == "Customer", AuditLog.entity_id == customer_id)]
-        if contact_ids:
-            audit_filter.append(and_(AuditLog.entity_type == "Contact", AuditLog.entity_id.in_(contact_ids)))
-
-        audit_logs = (
-            db.query(AuditLog)
-            .filter(or_(*audit_filter))
-            .order_by(AuditLog.timestamp.desc())
-            .limit(effective_limit)
-            .all()
-        )
-
-        from app.modules.admin.service import _build_user_cache
-        user_ids = list({str(log.user_id) for log in audit_logs if log.user_id})
-        user_cache = _build_user_cache(db, user_ids)
-
-        for log in audit_logs:
-            result.append({
-                "id": str(log.id),
-                "customer_id": str(customer_id),
-                "contact_id": None,
-                "type": "system",
-                "description": _timeline_description(log, user_cache),
-                "occurred_at": log.timestamp.isoformat(),
-                "created_at": log.timestamp.isoformat(),
-            })
-
-    result.sort(key=lambda x: x["occurred_at"], reverse=True)
-    return result[:effective_limit]
+    page = timeline.get_timeline(
+        db,
+        customer_id=customer_id,
+        contact_id=contact_id,
+        limit=limit or 50,
+        cursor=cursor,
+    )
+    _set_next_cursor(response, page["next_cursor"])
+    return [_activity_item(entry, page["user_cache"]) for entry in page["items"]]
 
 
 @router.get("/stats", response_model=schemas.CrmStatsResponse)
@@ -398,71 +409,71 @@ def stats(db: Session = Depends(get_db), user: dict = Depends(get_current_user))
 def customer_timeline(
     customer_id: UUID,
     limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor der vorherigen Seite"),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
-    activities = crud.activities_by_customer(db, customer_id=customer_id, limit=limit)
-    activity_items = [
-        {
-            "id": str(a.id),
-            "source": "activity",
-            "type": a.type,
-            "description": a.description,
-            "timestamp": a.occurred_at.isoformat(),
-            "user_id": None,
-            "user_name": None,
-        }
-        for a in activities
-    ]
+    page = timeline.get_timeline(db, customer_id=customer_id, limit=limit, cursor=cursor)
+    user_cache = page["user_cache"]
+    items = []
+    for entry in page["items"]:
+        if entry.source == "activity":
+            items.append({
+                "id": str(entry.id),
+                "source": "activity",
+                "type": entry.type,
+                "description": entry.description,
+                "timestamp": entry.ts.isoformat(),
+                "user_id": None,
+                "user_name": None,
+            })
+        else:
+            items.append({
+                "id": str(entry.id),
+                "source": "audit",
+                "type": entry.type,
+                "description": timeline.describe_audit(entry, user_cache),
+                "timestamp": entry.ts.isoformat(),
+                "user_id": entry.user_id,
+                "user_name": user_cache.get(str(entry.user_id), {}).get("name") if entry.user_id else None,
+                "entity_type": entry.entity_type,
+                "old_values": entry.old_values,
+                "new_values": entry.new_values,
+            })
+    return {
+        "customer_id": str(customer_id),
+        "total": len(items),
+        "items": items,
+        "next_cursor": page["next_cursor"],
+    }
 
-    contact_ids = [str(c.id) for c in crud.get_contacts(db, customer_id=customer_id)]
-    from sqlalchemy import or_
-    audit_filter = [and_(AuditLog.entity_type == "Customer", AuditLog.entity_id == customer_id)]
-    if contact_ids:
-        audit_filter.append(and_(AuditLog.entity_type == "Contact", AuditLog.entity_id.in_(contact_ids)))
-
-    audit_logs = (
-        db.query(AuditLog)
-        .filter(or_(*audit_filter))
-        .order_by(AuditLog.timestamp.desc())
-        .limit(limit)
-        .all()
-    )
 
-    from app.modules.admin.service import _build_user_cache
-    user_ids = list({str(log.user_id) for log in audit_logs if log.user_id})
-    user_cache = _build_user_cache(db, user_ids)
-
-    audit_items = [
-        {
-            "id": str(log.id),
-            "source": "audit",
-            "type": log.action,
-            "description": _timeline_description(log, user_cache),
-            "timestamp": log.timestamp.isoformat(),
-            "user_id": str(log.user_id) if log.user_id else None,
-            "user_name": user_cache.get(str(log.user_id), {}).get("name") if log.user_id else None,
-            "entity_type": log.entity_type,
-            "old_values": log.old_values,
-            "new_values": log.new_values,
-        }
-        for log in audit_logs
-    ]
+@router.get("/pipeline", response_model=dict[str, schemas.PipelineColumn])
+@require_permissions(["backoffice.crm.view"])
+def get_pipeline(
+    limit: int = Query(25, ge=1, le=200, description="Karten pro Stage"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Sales Pipeline: Anzahl und die ersten Karten je Pipeline-Stage.
 
-    timeline = sorted(activity_items + audit_items, key=lambda x: x["timestamp"], reverse=True)[:limit]
-    return {"customer_id": str(customer_id), "total": len(timeline), "items": timeline}
+    Weitere Karten einer Spalte über GET /pipeline/{stage}?cursor=...
+    """
+    return crud.get_pipeline_board(db, limit=limit)
 
 
-@router.get("/pipeline")
+@router.get("/pipeline/{stage}", response_model=schemas.PipelineColumnPage)
 @require_permissions(["backoffice.crm.view"])
-def get_pipeline(
+def get_pipeline_stage(
+    stage: PipelineStage,
+    limit: int = Query(25, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor der Spalte"),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
-    """Sales Pipeline: Kunden nach Pipeline-Stage gruppiert."""
-    pipeline = crud.get_pipeline_customers(db)
-    return {stage: [schemas.CustomerResponse.model_validate(c) for c in customers]
-            for stage, customers in pipeline.items()}
+    """Nächste Seite einer Pipeline-Spalte."""
+    return crud.get_pipeline_stage_page(db, stage.value, limit=limit, cursor=cursor)
 
 
 @router.patch("/customers/{customer_id}/pipeline-stage", response_model=schemas.CustomerResponse)
@@ -479,13 +490,30 @@ def update_customer_pipeline_stage(
     return customer
 
 
-def _timeline_description(log, user_cache: dict) -> str:
-    user_name = user_cache.get(str(log.user_id), {}).get("name", "System") if log.user_id else "System"
-    action_map = {
-        "create": "angelegt",
-        "update": "bearbeitet",
-        "delete": "gelöscht",
-        "status_change": "Status geändert",
+def _activity_item(entry, user_cache: dict) -> dict:
+    """Timeline-Eintrag im Format der Aktivitäten-Endpoints."""
+    if entry.source == "activity":
+        return {
+            "id": str(entry.id),
+            "customer_id": str(entry.customer_id),
+            "contact_id": str(entry.contact_id) if entry.contact_id else None,
+            "type": entry.type,
+            "description": entry.description,
+            "occurred_at": entry.ts.isoformat(),
+            "created_at": entry.created_at.isoformat(),
+        }
+    return {
+        "id": str(entry.id),
+        "customer_id": str(entry.customer_id) if entry.customer_id else None,
+        "contact_id": None,
+        "type": "system",
+        "description": timeline.describe_audit(entry, user_cache),
+        "occurred_at": entry.ts.isoformat(),
+        "created_at": entry.created_at.isoformat(),
     }
-    action = action_map.get(log.action, log.action)
-    return f"{log.entity_type} wurde von {user_name} {action}"
+
+
+def _set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Listen-Endpoints behalten ihr Array-Format; der Cursor kommt als Header."""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
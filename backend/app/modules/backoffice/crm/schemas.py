@@ -57,12 +57,32 @@ class CustomerUpdate(BaseModel):
 class CustomerResponse(CustomerBase):
     """Schema für Customer Response."""
     id: UUID
+    customer_number: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     
     model_config = ConfigDict(from_attributes=True)
 
 
+class CustomerListItem(CustomerResponse):
+    """Customer in der Liste inkl. Kennzahlen (per SQL aggregiert)."""
+    total_revenue: float = 0.0
+    outstanding_amount: float = 0.0
+    active_projects_count: int = 0
+
+
+class CustomerSearchItem(CustomerListItem):
+    """Suchtreffer inkl. Relevanz."""
+    rank: float = Field(0.0, description="Relevanz (nur bei Suche)")
+
+
+class CustomerSearchPage(BaseModel):
+    """Eine Seite der Kundensuche (Keyset-Pagination)."""
+    items: list[CustomerSearchItem]
+    total: int
+    next_cursor: Optional[str] = Field(None, description="Cursor für die nächste Seite; null = Ende")
+
+
 # === Contact Schemas ===
 
 class ContactBase(BaseModel):
@@ -157,6 +177,30 @@ class PipelineStageUpdate(BaseModel):
     stage: str = Field(..., description="Neue Pipeline-Stage")
 
 
+class PipelineCard(BaseModel):
+    """Schlanke Kundenkarte für das Pipeline-Board."""
+    id: UUID
+    customer_number: Optional[str] = None
+    name: str
+    type: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    city: Optional[str] = None
+    country: Optional[str] = None
+    pipeline_stage: Optional[str] = None
+
+
+class PipelineColumnPage(BaseModel):
+    """Weitere Karten einer Pipeline-Spalte (Keyset-Pagination)."""
+    items: list[PipelineCard]
+    next_cursor: Optional[str] = Field(None, description="Cursor für die nächste Seite; null = Ende")
+
+
+class PipelineColumn(PipelineColumnPage):
+    """Eine Spalte des Pipeline-Boards."""
+    count: int = Field(..., description="Anzahl Kunden in der Stage")
+
+
 # === CSV Import ===
 
 class CsvImportResponse(BaseModel):
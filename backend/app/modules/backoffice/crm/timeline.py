@@ -0,0 +1,168 @@
+"""
+CRM-Timeline
+
+Gemeinsamer Timeline-Service für manuelle Aktivitäten (crm_activities) und
+Audit-Einträge (audit_logs) zu Kunden und Kontakten.
+
+Beide Quellen werden in einem Statement zusammengeführt:
+
+    SELECT * FROM (activities ... ORDER BY ts DESC LIMIT n+1)
+    UNION ALL
+    SELECT * FROM (audit_logs ... ORDER BY ts DESC LIMIT n+1)
+    ORDER BY ts DESC, id DESC LIMIT n+1
+
+Jeder Zweig liest nur die obersten n+1 Zeilen über seinen Index
+(ix_activity_customer_time bzw. ix_audit_logs_entity_timestamp), die
+Datenbank mischt die beiden sortierten Ströme. Kein Over-Fetch, kein
+Sortieren in Python. Geblättert wird per Keyset-Cursor über (ts, id).
+"""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Optional
+from uuid import UUID
+
+from sqlalchemy import JSON, String, and_, case, cast, literal, null, or_, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.modules.backoffice.invoices.models import AuditLog
+from . import models
+
+TIMELINE_ENTITY_TYPES = ("Customer", "Contact")
+
+ACTION_LABELS = {
+    "create": "angelegt",
+    "update": "bearbeitet",
+    "delete": "gelöscht",
+    "status_change": "Status geändert",
+}
+
+
+def _keyset(ts_col, id_col, last_ts: datetime, last_id: UUID):
+    """(ts, id) < (:ts, :id) für absteigende Sortierung."""
+    return or_(ts_col < last_ts, and_(ts_col == last_ts, id_col < last_id))
+
+
+def _activity_branch(
+    customer_id: Optional[UUID],
+    contact_id: Optional[UUID],
+    after: Optional[tuple[datetime, UUID]],
+    fetch: int,
+):
+    activity = models.Activity
+    stmt = select(
+        literal("activity").label("source"),
+        activity.id.label("id"),
+        activity.occurred_at.label("ts"),
+        activity.customer_id.label("customer_id"),
+        activity.contact_id.label("contact_id"),
+        activity.type.label("type"),
+        activity.description.label("description"),
+        activity.created_at.label("created_at"),
+        cast(null(), String).label("user_id"),
+        cast(null(), String).label("entity_type"),
+        cast(null(), JSON).label("old_values"),
+        cast(null(), JSON).label("new_values"),
+    )
+    if customer_id is not None:
+        stmt = stmt.where(activity.customer_id == customer_id)
+    if contact_id is not None:
+        stmt = stmt.where(activity.contact_id == contact_id)
+    if after is not None:
+        stmt = stmt.where(_keyset(activity.occurred_at, activity.id, *after))
+    return stmt.order_by(activity.occurred_at.desc(), activity.id.desc()).limit(fetch)
+
+
+def _audit_branch(
+    customer_id: Optional[UUID],
+    after: Optional[tuple[datetime, UUID]],
+    fetch: int,
+):
+    contact = models.Contact
+    is_contact = AuditLog.entity_type == "Contact"
+    stmt = (
+        select(
+            literal("audit").label("source"),
+            AuditLog.id.label("id"),
+            AuditLog.timestamp.label("ts"),
+            # Kontakt-Einträge dem Kunden des Kontakts zuordnen
+            case((is_contact, contact.customer_id), else_=AuditLog.entity_id).label("customer_id"),
+            case((is_contact, AuditLog.entity_id), else_=None).label("contact_id"),
+            AuditLog.action.label("type"),
+            cast(null(), String).label("description"),
+            AuditLog.timestamp.label("created_at"),
+            AuditLog.user_id.label("user_id"),
+            AuditLog.entity_type.label("entity_type"),
+            AuditLog.old_values.label("old_values"),
+            AuditLog.new_values.label("new_values"),
+        )
+        .outerjoin(contact, and_(is_contact, contact.id == AuditLog.entity_id))
+    )
+    if customer_id is not None:
+        # Kontakt-IDs als Subquery statt vorgelagertem get_contacts()
+        contact_ids = select(contact.id).where(contact.customer_id == customer_id)
+        stmt = stmt.where(or_(
+            and_(AuditLog.entity_type == "Customer", AuditLog.entity_id == customer_id),
+            and_(is_contact, AuditLog.entity_id.in_(contact_ids)),
+        ))
+    else:
+        stmt = stmt.where(AuditLog.entity_type.in_(TIMELINE_ENTITY_TYPES))
+    if after is not None:
+        stmt = stmt.where(_keyset(AuditLog.timestamp, AuditLog.id, *after))
+    return stmt.order_by(AuditLog.timestamp.desc(), AuditLog.id.desc()).limit(fetch)
+
+
+def describe_audit(entry: Any, user_cache: dict) -> str:
+    """Lesbarer Text für einen Audit-Eintrag ("Customer wurde von X bearbeitet")."""
+    user_name = user_cache.get(str(entry.user_id), {}).get("name", "System") if entry.user_id else "System"
+    action = ACTION_LABELS.get(entry.type, entry.type)
+    return f"{entry.entity_type} wurde von {user_name} {action}"
+
+
+def get_timeline(
+    db: Session,
+    customer_id: Optional[UUID] = None,
+    contact_id: Optional[UUID] = None,
+    include_audit: bool = True,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> dict:
+    """
+    Timeline aus Aktivitäten und Audit-Einträgen, neueste zuerst.
+
+    Args:
+        customer_id: Nur Einträge dieses Kunden (inkl. seiner Kontakte)
+        contact_id: Nur Aktivitäten dieses Kontakts (ohne Audit-Einträge)
+        include_audit: Audit-Einträge einbeziehen
+        limit: Seitengröße
+        cursor: next_cursor der vorherigen Seite
+
+    Returns:
+        Dict mit items (Row-Objekte), next_cursor und user_cache
+        (Employee-Namen zu den user_ids der Audit-Einträge der Seite)
+    """
+    after = tuple(decode_cursor(cursor, 2)) if cursor else None
+    fetch = limit + 1
+
+    branches = [_activity_branch(customer_id, contact_id, after, fetch).subquery()]
+    if include_audit and contact_id is None:
+        branches.append(_audit_branch(customer_id, after, fetch).subquery())
+
+    combined = union_all(*(select(b) for b in branches)).subquery()
+    rows = db.execute(
+        select(combined)
+        .order_by(combined.c.ts.desc(), combined.c.id.desc())
+        .limit(fetch)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].ts, rows[-1].id)
+
+    from app.modules.admin.service import _build_user_cache
+    user_ids = list({str(r.user_id) for r in rows if r.source == "audit" and r.user_id})
+    user_cache = _build_user_cache(db, user_ids)
+
+    return {"items": rows, "next_cursor": next_cursor, "user_cache": user_cache}
@@ -6,13 +6,158 @@ from datetime import date, datetime
 from decimal import Decimal
 from typing import Optional
 
-from sqlalchemy import func, select
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from .models import Expense, ExpenseCategory
+from .models import Expense, ExpenseCategory, ExpenseDailyRollup
 from .schemas import ExpenseCreate, ExpenseUpdate, ExpenseKpiResponse
 
 
+# ---------------------------
+# Rollup (Tag / Kategorie / Projekt)
+# ---------------------------
+
+def _rollup_key(expense: Expense) -> tuple[date, str, Optional[uuid.UUID]]:
+    """Bucket einer Ausgabe; der Tag stammt aus created_at (wie die KPI-Filter)."""
+    return expense.created_at.date(), expense.category, expense.project_id
+
+
+def _apply_rollup_delta(
+    db: Session,
+    key: tuple[date, str, Optional[uuid.UUID]],
+    amount: Decimal,
+    count: int,
+) -> None:
+    """
+    Addiert amount/count auf einen Rollup-Bucket (ohne Commit).
+
+    Erst UPDATE; existiert der Bucket noch nicht, wird er im Savepoint
+    angelegt. Hat ein paralleler Request ihn inzwischen angelegt, greift
+    die Unique-Constraint und wir addieren erneut per UPDATE.
+    """
+    day, category, project_id = key
+    bucket = (
+        ExpenseDailyRollup.day == day,
+        ExpenseDailyRollup.category == category,
+        ExpenseDailyRollup.project_id.is_(None)
+        if project_id is None
+        else ExpenseDailyRollup.project_id == project_id,
+    )
+    stmt = (
+        update(ExpenseDailyRollup)
+        .where(*bucket)
+        .values(
+            total_amount=ExpenseDailyRollup.total_amount + amount,
+            expense_count=ExpenseDailyRollup.expense_count + count,
+        )
+    )
+    if db.execute(stmt).rowcount:
+        return
+
+    try:
+        with db.begin_nested():
+            db.execute(
+                insert(ExpenseDailyRollup).values(
+                    id=uuid.uuid4(),
+                    day=day,
+                    category=category,
+                    project_id=project_id,
+                    total_amount=amount,
+                    expense_count=count,
+                )
+            )
+    except IntegrityError:
+        db.execute(stmt)
+
+
+def fold_project_expense_rollup(db: Session, project_id: uuid.UUID) -> None:
+    """
+    Schiebt die Buckets eines Projekts in die projektlosen Buckets (ohne Commit).
+
+    Aufzurufen vor dem Löschen eines Projekts: dessen Ausgaben bleiben mit
+    project_id = NULL erhalten, ihre Beträge müssen also in den NULL-Bucket
+    desselben Tages und derselben Kategorie wandern. Die Rollup-Tabelle hat
+    bewusst keinen FK auf projects – ein SET NULL würde mit einem bereits
+    vorhandenen NULL-Bucket die Unique-Constraint verletzen.
+    """
+    bucket = (
+        ExpenseDailyRollup.day,
+        ExpenseDailyRollup.category,
+        ExpenseDailyRollup.total_amount,
+        ExpenseDailyRollup.expense_count,
+    )
+    of_project = ExpenseDailyRollup.project_id == project_id
+
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+        stmt = pg_insert(ExpenseDailyRollup).from_select(
+            ["id", "day", "category", "total_amount", "expense_count"],
+            select(func.gen_random_uuid(), *bucket).where(of_project),
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_expense_daily_rollup_bucket",
+                set_={
+                    "total_amount": ExpenseDailyRollup.total_amount + stmt.excluded.total_amount,
+                    "expense_count": ExpenseDailyRollup.expense_count + stmt.excluded.expense_count,
+                },
+            )
+        )
+    else:
+        # Ohne NULLS NOT DISTINCT (SQLite) greift ON CONFLICT nicht für NULL
+        for day, category, amount, count in db.execute(select(*bucket).where(of_project)).all():
+            _apply_rollup_delta(db, (day, category, None), amount, count)
+
+    db.execute(delete(ExpenseDailyRollup).where(of_project))
+
+
+def rebuild_expense_rollup(db: Session) -> int:
+    """
+    Baut die Rollup-Tabelle komplett aus den Ausgaben neu auf.
+
+    Returns:
+        Anzahl erzeugter Buckets
+    """
+    day = func.date(Expense.created_at)
+    source = (
+        select(
+            day,
+            Expense.category,
+            Expense.project_id,
+            func.sum(Expense.amount),
+            func.count(Expense.id),
+        )
+        .group_by(day, Expense.category, Expense.project_id)
+    )
+
+    db.execute(delete(ExpenseDailyRollup))
+    rows = db.execute(source).all()
+    if rows:
+        db.execute(
+            insert(ExpenseDailyRollup),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    # SQLite liefert date() als String
+                    "day": date.fromisoformat(d) if isinstance(d, str) else d,
+                    "category": category,
+                    "project_id": project_id,
+                    "total_amount": amount,
+                    "expense_count": count,
+                }
+                for d, category, project_id, amount, count in rows
+            ],
+        )
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------
+# CRUD
+# ---------------------------
+
 def create_expense(db: Session, data: ExpenseCreate) -> Expense:
     expense = Expense(
         category=data.category.value if isinstance(data.category, ExpenseCategory) else data.category,
@@ -25,6 +170,8 @@ def create_expense(db: Session, data: ExpenseCreate) -> Expense:
         invoice_id=data.invoice_id,
     )
     db.add(expense)
+    db.flush()
+    _apply_rollup_delta(db, _rollup_key(expense), expense.amount, 1)
     db.commit()
     db.refresh(expense)
     return expense
@@ -90,9 +237,16 @@ def update_expense(
     if "category" in payload and isinstance(payload["category"], ExpenseCategory):
         payload["category"] = payload["category"].value
 
+    old_key, old_amount = _rollup_key(expense), expense.amount
+
     for field, value in payload.items():
         setattr(expense, field, value)
 
+    new_key, new_amount = _rollup_key(expense), expense.amount
+    if new_key != old_key or new_amount != old_amount:
+        _apply_rollup_delta(db, old_key, -old_amount, -1)
+        _apply_rollup_delta(db, new_key, new_amount, 1)
+
     db.add(expense)
     db.commit()
     db.refresh(expense)
@@ -101,6 +255,7 @@ def update_expense(
 
 def delete_expense(db: Session, expense: Expense) -> None:
     """Hard Delete (v0.1)."""
+    _apply_rollup_delta(db, _rollup_key(expense), -expense.amount, -1)
     db.delete(expense)
     db.commit()
 
@@ -113,38 +268,38 @@ def get_expense_kpis(
     from_date: Optional[date] = None,
     to_date: Optional[date] = None,
 ) -> ExpenseKpiResponse:
-    """Einfache KPI-Berechnung: Gesamtsumme + Summe pro Kategorie."""
-    stmt = select(
-        func.coalesce(func.sum(Expense.amount), 0)
+    """
+    KPI-Berechnung aus den Tages-Buckets: Gesamtsumme + Summe pro Kategorie.
+
+    Liest nur expense_daily_rollups – Aufwand wächst mit der Anzahl Buckets
+    im Zeitraum, nicht mit der Anzahl Ausgaben.
+    """
+    cat_stmt = (
+        select(
+            ExpenseDailyRollup.category,
+            func.coalesce(func.sum(ExpenseDailyRollup.total_amount), 0),
+        )
+        .where(ExpenseDailyRollup.expense_count > 0)
+        .group_by(ExpenseDailyRollup.category)
     )
-    cat_stmt = select(
-        Expense.category,
-        func.coalesce(func.sum(Expense.amount), 0)
-    ).group_by(Expense.category)
 
     if category is not None:
-        stmt = stmt.where(Expense.category == category.value)
-        cat_stmt = cat_stmt.where(Expense.category == category.value)
+        cat_stmt = cat_stmt.where(ExpenseDailyRollup.category == category.value)
 
     if project_id is not None:
-        stmt = stmt.where(Expense.project_id == project_id)
-        cat_stmt = cat_stmt.where(Expense.project_id == project_id)
+        cat_stmt = cat_stmt.where(ExpenseDailyRollup.project_id == project_id)
 
     if from_date is not None:
-        from_dt = datetime.combine(from_date, datetime.min.time())
-        stmt = stmt.where(Expense.created_at >= from_dt)
-        cat_stmt = cat_stmt.where(Expense.created_at >= from_dt)
+        cat_stmt = cat_stmt.where(ExpenseDailyRollup.day >= from_date)
 
     if to_date is not None:
-        to_dt = datetime.combine(to_date, datetime.max.time())
-        stmt = stmt.where(Expense.created_at <= to_dt)
-        cat_stmt = cat_stmt.where(Expense.created_at <= to_dt)
-
-    total: Decimal = db.scalar(stmt) or Decimal("0.00")
+        cat_stmt = cat_stmt.where(ExpenseDailyRollup.day <= to_date)
 
     rows = db.execute(cat_stmt).all()
     by_category: dict[ExpenseCategory, Decimal] = {}
     for cat_value, amount in rows:
-        by_category[ExpenseCategory(cat_value)] = amount
+        by_category[ExpenseCategory(cat_value)] = Decimal(amount)
+
+    total = sum(by_category.values(), Decimal("0.00"))
 
     return ExpenseKpiResponse(total=total, by_category=by_category)
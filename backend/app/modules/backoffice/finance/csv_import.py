@@ -422,8 +422,7 @@ def import_transactions(
     Returns:
         Dict mit Import-Statistiken
     """
-    from .crud import create_bank_transaction, get_bank_account
-    from .reconciliation import auto_reconcile_transaction
+    from .reconciliation import auto_reconcile_transaction, refresh_candidates_for_transactions
 
     stats = {
         "total": len(transactions),
@@ -432,6 +431,7 @@ def import_transactions(
         "reconciled": 0,
         "errors": []
     }
+    imported_ids = []
 
     for transaction_data in transactions:
         try:
@@ -446,16 +446,25 @@ def import_transactions(
                     continue
 
             # Import transaction
-            transaction = create_bank_transaction(db, transaction_data)
+            with db.begin_nested():
+                transaction = BankTransaction(**transaction_data.model_dump())
+                db.add(transaction)
             stats["imported"] += 1
-
-            # Auto-reconcile if enabled
-            if auto_reconcile:
-                success = auto_reconcile_transaction(db, transaction)
-                if success:
-                    stats["reconciled"] += 1
+            imported_ids.append(transaction.id)
 
         except Exception as e:
             stats["errors"].append(f"Import-Fehler: {str(e)}")
 
+    db.commit()
+
+    if auto_reconcile:
+        # Speichert für nicht abgeglichene Transaktionen auch die Vorschläge
+        for transaction in db.query(BankTransaction).filter(BankTransaction.id.in_(imported_ids)).all():
+            if auto_reconcile_transaction(db, transaction):
+                stats["reconciled"] += 1
+    else:
+        # Ohne Abgleich: Vorschlags-Cache trotzdem für alle neuen Transaktionen füllen
+        refresh_candidates_for_transactions(db, imported_ids)
+        db.commit()
+
     return stats
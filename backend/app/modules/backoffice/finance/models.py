@@ -4,6 +4,8 @@ Finance Module Models - WorkmateOS Phase 2.
 
 Verwaltet:
 - Expenses (Ausgaben/Kosten für Projekte)
+- Bankkonten, Banktransaktionen und Abgleich-Vorschläge
+- Stripe-Konfiguration und Webhook-Inbox
 """
 from __future__ import annotations
 
@@ -21,8 +23,11 @@ from sqlalchemy import (
     DateTime,
     ForeignKey,
     Numeric,
+    Integer,
     Index,
-    CheckConstraint
+    CheckConstraint,
+    UniqueConstraint,
+    JSON,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -47,6 +52,23 @@ class ExpenseCategory(str, Enum):
     OTHER = "other"
 
 
+class TransactionType(str, Enum):
+    """Art einer Banktransaktion (siehe csv_import.detect_transaction_type)."""
+    INCOME = "income"
+    EXPENSE = "expense"
+    TRANSFER = "transfer"
+    FEE = "fee"
+    INTEREST = "interest"
+
+
+class ReconciliationStatus(str, Enum):
+    """Status des Zahlungsabgleichs einer Banktransaktion."""
+    UNMATCHED = "unmatched"
+    MATCHED = "matched"
+    CONFIRMED = "confirmed"
+    IGNORED = "ignored"
+
+
 class Expense(Base, UUIDMixin, TimestampMixin):
     """
     Ausgaben und Kosten.
@@ -69,6 +91,8 @@ class Expense(Base, UUIDMixin, TimestampMixin):
         Index("ix_expenses_invoice_id", "invoice_id"),
         Index("ix_expenses_category", "category"),
         Index("ix_expenses_created_at", "created_at"),
+        Index("ix_expenses_category_created_at", "category", "created_at"),
+        Index("ix_expenses_project_created_at", "project_id", "created_at"),
         CheckConstraint("amount > 0", name="check_expense_amount_positive"),
     )
 
@@ -137,6 +161,43 @@ class Expense(Base, UUIDMixin, TimestampMixin):
         )
 
 
+class ExpenseDailyRollup(Base, UUIDMixin):
+    """
+    Vorab aggregierte Ausgaben pro Tag, Kategorie und Projekt.
+
+    Wird von create/update/delete_expense inkrementell gepflegt und kann
+    über scripts/rebuild_expense_rollup.py komplett neu aufgebaut werden.
+    KPI-Abfragen lesen nur diese Buckets statt der Expense-Tabelle.
+
+    project_id hat keinen FK: beim Löschen eines Projekts werden dessen
+    Buckets per fold_project_expense_rollup in die NULL-Buckets verschoben.
+    """
+    __tablename__ = "expense_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "category", "project_id",
+            name="uq_expense_daily_rollup_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_expense_daily_rollups_day", "day"),
+        Index("ix_expense_daily_rollups_project_day", "project_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, nullable=False, comment="Tag (aus Expense.created_at)")
+    category: Mapped[str] = mapped_column(String(50), nullable=False)
+    project_id: Mapped[uuid.UUID | None] = mapped_column(comment="Projekt (ohne FK, siehe Klassendoku)")
+    total_amount: Mapped[Decimal] = mapped_column(
+        Numeric(12, 2), default=Decimal("0.00"), server_default="0.00"
+    )
+    expense_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return (
+            f"<ExpenseDailyRollup(day={self.day}, category='{self.category}', "
+            f"total={self.total_amount}, count={self.expense_count})>"
+        )
+
+
 class BankAccount(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "bank_accounts"
     __table_args__ = (
@@ -190,6 +251,48 @@ class BankTransaction(Base, UUIDMixin, TimestampMixin):
     reconciled_by: Mapped[Optional[str]] = mapped_column(String(100))
 
     account: Mapped["BankAccount"] = relationship("BankAccount", back_populates="transactions")
+    candidates: Mapped[list["ReconciliationCandidate"]] = relationship(
+        "ReconciliationCandidate",
+        back_populates="transaction",
+        cascade="all, delete-orphan",
+        order_by="ReconciliationCandidate.rank",
+    )
+
+
+class ReconciliationCandidate(Base, UUIDMixin, TimestampMixin):
+    """
+    Vorberechnete Abgleich-Vorschläge (Top-N) pro offener Banktransaktion.
+
+    Wird inkrementell aktualisiert, sobald sich Transaktionen, Rechnungen
+    oder Zahlungen ändern (siehe reconciliation.refresh_*), damit die
+    Vorschlags-Endpoints nur noch einen indizierten Lesezugriff brauchen.
+    """
+    __tablename__ = "reconciliation_candidates"
+    __table_args__ = (
+        Index("ix_reconciliation_candidates_transaction_rank", "transaction_id", "rank"),
+        Index("ix_reconciliation_candidates_invoice_id", "invoice_id"),
+        UniqueConstraint("transaction_id", "invoice_id", name="uq_reconciliation_candidate_transaction_invoice"),
+        CheckConstraint("confidence >= 0 AND confidence <= 1", name="check_candidate_confidence_valid"),
+    )
+
+    transaction_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("bank_transactions.id", ondelete="CASCADE"), nullable=False
+    )
+    invoice_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False
+    )
+    payment_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("payments.id", ondelete="SET NULL")
+    )
+    confidence: Mapped[Decimal] = mapped_column(
+        Numeric(5, 4), nullable=False, comment="Confidence Score 0.0 - 1.0"
+    )
+    rank: Mapped[int] = mapped_column(
+        Integer, nullable=False, comment="1 = bester Vorschlag"
+    )
+
+    transaction: Mapped["BankTransaction"] = relationship("BankTransaction", back_populates="candidates")
+    invoice: Mapped["Invoice"] = relationship("Invoice")
 
 
 class StripeConfig(Base, UUIDMixin, TimestampMixin):
@@ -200,4 +303,54 @@ class StripeConfig(Base, UUIDMixin, TimestampMixin):
     secret_key: Mapped[str] = mapped_column(String(255), nullable=False)
     webhook_secret: Mapped[Optional[str]] = mapped_column(String(255))
     test_mode: Mapped[bool] = mapped_column(Boolean, default=True)
-    is_active: Mapped[bool] = mapped_column(Boolean, default=False)
\ No newline at end of file
+    is_active: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+class StripeEventStatus(str, Enum):
+    """Verarbeitungsstatus eines Stripe-Webhook-Events in der Inbox."""
+    PENDING = "pending"
+    PROCESSED = "processed"
+    FAILED = "failed"
+    IGNORED = "ignored"
+
+
+class StripeEvent(Base, UUIDMixin, TimestampMixin):
+    """
+    Inbox für Stripe-Webhook-Events.
+
+    Der Webhook speichert jedes Event roh (dedupliziert über event_id) und
+    bestätigt sofort; ein Hintergrundjob arbeitet die Inbox in Batches ab
+    (siehe stripe_inbox.py). Stripe-Retries werden so nicht doppelt verbucht.
+    """
+    __tablename__ = "stripe_events"
+    __table_args__ = (
+        Index("ix_stripe_events_status_next_attempt", "status", "next_attempt_at"),
+        Index("ix_stripe_events_invoice_id", "invoice_id"),
+        CheckConstraint(
+            "status IN ('pending', 'processed', 'failed', 'ignored')",
+            name="check_stripe_event_status_valid"
+        ),
+    )
+
+    event_id: Mapped[str] = mapped_column(
+        String(255), unique=True, nullable=False, comment="Stripe Event ID (evt_...)"
+    )
+    event_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=False, comment="Rohes Event-JSON")
+    invoice_id: Mapped[uuid.UUID | None] = mapped_column(
+        comment="Aus metadata.invoice_id extrahiert (für Gruppierung pro Rechnung)"
+    )
+    status: Mapped[str] = mapped_column(
+        String(20),
+        default=StripeEventStatus.PENDING.value,
+        server_default=StripeEventStatus.PENDING.value,
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    stripe_created: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), comment="Erstellungszeitpunkt laut Stripe"
+    )
+    next_attempt_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), comment="Frühester nächster Versuch (Backoff)"
+    )
+    processed_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
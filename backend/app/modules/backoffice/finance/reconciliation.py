@@ -10,16 +10,22 @@ Algorithmus:
 2. Vergleiche Betrag (mit Toleranz)
 3. Berechne Confidence Score
 4. Auto-Match wenn Confidence > 90%
+
+Vorschlags-Cache:
+Die Top-N Treffer pro offener Transaktion werden in `reconciliation_candidates`
+vorgehalten und inkrementell aktualisiert, wenn sich Transaktionen, Rechnungen
+oder Zahlungen ändern. Die Vorschlags-Endpoints lesen nur noch diese Tabelle.
 """
 from decimal import Decimal
-from typing import Optional, List, Tuple
+from typing import Iterable, Optional, List, Tuple
 import re
+import uuid
 from datetime import datetime, timedelta
 
 from sqlalchemy.orm import Session
-from sqlalchemy import select, or_, and_, func
+from sqlalchemy import select, or_, and_, func, delete, insert
 
-from .models import BankTransaction, ReconciliationStatus
+from .models import BankTransaction, ReconciliationCandidate, ReconciliationStatus
 from app.modules.backoffice.invoices.models import Invoice, Payment
 
 
@@ -30,6 +36,7 @@ from app.modules.backoffice.invoices.models import Invoice, Payment
 AUTO_MATCH_THRESHOLD = Decimal("0.90")  # 90% Confidence für Auto-Matching
 AMOUNT_TOLERANCE = Decimal("1.00")  # ±1 EUR Toleranz
 DATE_TOLERANCE_DAYS = 14  # ±14 Tage Toleranz
+SUGGESTION_CACHE_SIZE = 5  # Top-N Vorschläge pro Transaktion im Cache
 
 
 # ============================================================================
@@ -221,16 +228,15 @@ def auto_reconcile_transaction(
     # Finde passende Invoices
     matches = find_matching_invoices(db, transaction)
 
-    if not matches:
+    if not matches or matches[0][2] < AUTO_MATCH_THRESHOLD:
+        # Kein Auto-Match → Vorschläge für den manuellen Abgleich cachen
+        _store_candidates(db, transaction, matches)
+        db.commit()
         return False
 
     # Nehme besten Match
     invoice, payment, confidence = matches[0]
 
-    # Auto-Match nur wenn Confidence > Threshold
-    if confidence < AUTO_MATCH_THRESHOLD:
-        return False
-
     # Erstelle Payment wenn noch keins existiert
     if not payment:
         from app.modules.backoffice.invoices import payments_crud
@@ -258,6 +264,7 @@ def auto_reconcile_transaction(
     transaction.reconciled_by = user_id or "auto-reconciliation"
 
     db.add(transaction)
+    _store_candidates(db, transaction, [])
     db.commit()
     db.refresh(transaction)
 
@@ -306,45 +313,267 @@ def auto_reconcile_all_unmatched(
             })
         else:
             stats["failed"] += 1
-            # Finde Matches für Debugging
-            matches = find_matching_invoices(db, transaction)
-            best_match = matches[0] if matches else None
+            # Bester Vorschlag steht bereits im Cache (von auto_reconcile_transaction)
+            best_confidence = db.scalar(
+                select(ReconciliationCandidate.confidence)
+                .where(
+                    ReconciliationCandidate.transaction_id == transaction.id,
+                    ReconciliationCandidate.rank == 1,
+                )
+            )
 
             stats["details"].append({
                 "transaction_id": str(transaction.id),
                 "amount": float(transaction.amount),
                 "status": "failed",
-                "reason": "no_match" if not best_match else f"low_confidence_{best_match[2]:.0%}"
+                "reason": "no_match" if best_confidence is None else f"low_confidence_{best_confidence:.0%}"
             })
 
     return stats
 
 
-def get_reconciliation_suggestions(
+# ============================================================================
+# SUGGESTION CACHE
+# ============================================================================
+
+def _store_candidates(
     db: Session,
     transaction: BankTransaction,
-    limit: int = 5,
-) -> List[dict]:
+    matches: List[Tuple[Invoice, Optional[Payment], Decimal]],
+) -> None:
     """
-    Gibt Vorschläge für manuelle Reconciliation.
+    Ersetzt die gecachten Vorschläge einer Transaktion durch die Top-N Treffer.
+
+    Abgeglichene/ignorierte Transaktionen behalten keine Vorschläge.
+    Kein Commit – läuft in der Transaktion des Aufrufers.
+    """
+    db.execute(
+        delete(ReconciliationCandidate)
+        .where(ReconciliationCandidate.transaction_id == transaction.id)
+    )
+
+    if transaction.reconciliation_status != ReconciliationStatus.UNMATCHED.value:
+        return
+
+    rows = [
+        {
+            "id": uuid.uuid4(),
+            "transaction_id": transaction.id,
+            "invoice_id": invoice.id,
+            "payment_id": payment.id if payment else None,
+            "confidence": confidence,
+            "rank": rank,
+        }
+        for rank, (invoice, payment, confidence) in enumerate(
+            matches[:SUGGESTION_CACHE_SIZE], start=1
+        )
+    ]
+    if rows:
+        db.execute(insert(ReconciliationCandidate), rows)
+
+
+def refresh_transaction_candidates(db: Session, transaction: BankTransaction) -> None:
+    """Berechnet die Vorschläge einer einzelnen Transaktion neu (ohne Commit)."""
+    db.flush()
+    _store_candidates(db, transaction, find_matching_invoices(db, transaction))
+
+
+def refresh_candidates_for_transactions(
+    db: Session,
+    transaction_ids: Iterable[uuid.UUID],
+) -> int:
+    """
+    Berechnet die Vorschläge mehrerer Transaktionen neu (ohne Commit).
 
     Returns:
-        Liste von Suggestion-Dicts mit Invoice, Payment, Confidence
+        Anzahl aktualisierter Transaktionen
     """
-    matches = find_matching_invoices(db, transaction)[:limit]
-
-    suggestions = []
-    for invoice, payment, confidence in matches:
-        suggestions.append({
-            "invoice_id": str(invoice.id),
-            "invoice_number": invoice.invoice_number,
-            "invoice_total": float(invoice.total),
-            "invoice_status": invoice.status,
-            "payment_id": str(payment.id) if payment else None,
-            "payment_amount": float(payment.amount) if payment else None,
+    ids = list(set(transaction_ids))
+    if not ids:
+        return 0
+
+    db.flush()
+    transactions = db.scalars(
+        select(BankTransaction).where(BankTransaction.id.in_(ids))
+    ).all()
+    for transaction in transactions:
+        _store_candidates(db, transaction, find_matching_invoices(db, transaction))
+    return len(transactions)
+
+
+def affected_transaction_ids(db: Session, invoice_id: uuid.UUID) -> List[uuid.UUID]:
+    """
+    Offene Transaktionen, deren Vorschläge sich durch Änderungen an einer
+    Rechnung (oder ihren Zahlungen) ändern können.
+
+    Das sind Transaktionen, die die Rechnung bereits als Kandidat führen,
+    die Rechnungsnummer im Verwendungszweck tragen, oder deren Betrag und
+    Datum ins Toleranzfenster der Rechnung fallen.
+    """
+    db.flush()
+    conditions = [
+        BankTransaction.id.in_(
+            select(ReconciliationCandidate.transaction_id)
+            .where(ReconciliationCandidate.invoice_id == invoice_id)
+        )
+    ]
+
+    invoice = db.get(Invoice, invoice_id)
+    if invoice is not None:
+        conditions.append(BankTransaction.purpose.ilike(f"%{invoice.invoice_number}%"))
+        if invoice.issued_date:
+            conditions.append(
+                and_(
+                    BankTransaction.amount >= invoice.total - AMOUNT_TOLERANCE,
+                    BankTransaction.amount <= invoice.total + AMOUNT_TOLERANCE,
+                    BankTransaction.transaction_date >= invoice.issued_date - timedelta(days=DATE_TOLERANCE_DAYS),
+                    BankTransaction.transaction_date <= invoice.issued_date + timedelta(days=DATE_TOLERANCE_DAYS),
+                )
+            )
+
+    return list(db.scalars(
+        select(BankTransaction.id).where(
+            BankTransaction.reconciliation_status == ReconciliationStatus.UNMATCHED.value,
+            BankTransaction.amount > 0,
+            or_(*conditions),
+        )
+    ).all())
+
+
+def refresh_candidates_for_invoice(db: Session, invoice_id: uuid.UUID) -> int:
+    """
+    Aktualisiert den Vorschlags-Cache nach Änderungen an einer Rechnung
+    oder an deren Zahlungen (ohne Commit).
+
+    Returns:
+        Anzahl aktualisierter Transaktionen
+    """
+    return refresh_candidates_for_transactions(db, affected_transaction_ids(db, invoice_id))
+
+
+def refresh_candidates_for_invoices(
+    db: Session,
+    invoice_ids: Iterable[uuid.UUID],
+) -> int:
+    """
+    Wie refresh_candidates_for_invoice, für mehrere Rechnungen (ohne Commit).
+
+    Jede betroffene Transaktion wird nur einmal neu bewertet, auch wenn
+    sie Kandidaten mehrerer geänderter Rechnungen führt.
+    """
+    affected: set[uuid.UUID] = set()
+    for invoice_id in set(invoice_ids):
+        affected.update(affected_transaction_ids(db, invoice_id))
+    return refresh_candidates_for_transactions(db, affected)
+
+
+def rebuild_all_candidates(
+    db: Session,
+    account_id: Optional[uuid.UUID] = None,
+) -> int:
+    """
+    Baut den Vorschlags-Cache für alle offenen Transaktionen neu auf.
+
+    Für die Erstbefüllung nach der Migration oder nach Änderungen an den
+    Matching-Regeln. Committet am Ende.
+
+    Returns:
+        Anzahl neu berechneter Transaktionen
+    """
+    stale = delete(ReconciliationCandidate)
+    stmt = select(BankTransaction).where(
+        BankTransaction.reconciliation_status == ReconciliationStatus.UNMATCHED.value
+    )
+    if account_id:
+        stale = stale.where(
+            ReconciliationCandidate.transaction_id.in_(
+                select(BankTransaction.id).where(BankTransaction.account_id == account_id)
+            )
+        )
+        stmt = stmt.where(BankTransaction.account_id == account_id)
+
+    db.execute(stale)
+
+    count = 0
+    for transaction in db.scalars(stmt).all():
+        _store_candidates(db, transaction, find_matching_invoices(db, transaction))
+        count += 1
+
+    db.commit()
+    return count
+
+
+# ============================================================================
+# SUGGESTIONS (READ)
+# ============================================================================
+
+def get_reconciliation_suggestions_bulk(
+    db: Session,
+    transaction_ids: Iterable[uuid.UUID],
+    limit: int = SUGGESTION_CACHE_SIZE,
+) -> dict[uuid.UUID, List[dict]]:
+    """
+    Vorschläge für eine ganze Seite von Transaktionen in einer Abfrage.
+
+    Liest ausschließlich aus dem Vorschlags-Cache
+    (Index auf transaction_id, rank).
+
+    Returns:
+        Dict transaction_id → Liste von Suggestion-Dicts (beste zuerst);
+        enthält für jede angefragte ID einen Eintrag (ggf. leer)
+    """
+    ids = list(dict.fromkeys(transaction_ids))
+    result: dict[uuid.UUID, List[dict]] = {tid: [] for tid in ids}
+    if not ids:
+        return result
+
+    rows = db.execute(
+        select(
+            ReconciliationCandidate.transaction_id,
+            ReconciliationCandidate.invoice_id,
+            ReconciliationCandidate.payment_id,
+            ReconciliationCandidate.confidence,
+            Invoice.invoice_number,
+            Invoice.total,
+            Invoice.status,
+            Payment.amount,
+        )
+        .join(Invoice, Invoice.id == ReconciliationCandidate.invoice_id)
+        .outerjoin(Payment, Payment.id == ReconciliationCandidate.payment_id)
+        .where(
+            ReconciliationCandidate.transaction_id.in_(ids),
+            ReconciliationCandidate.rank <= limit,
+        )
+        .order_by(ReconciliationCandidate.transaction_id, ReconciliationCandidate.rank)
+    ).all()
+
+    for transaction_id, invoice_id, payment_id, confidence, number, total, inv_status, payment_amount in rows:
+        result[transaction_id].append({
+            "invoice_id": str(invoice_id),
+            "invoice_number": number,
+            "invoice_total": float(total),
+            "invoice_status": inv_status,
+            "payment_id": str(payment_id) if payment_id else None,
+            "payment_amount": float(payment_amount) if payment_amount is not None else None,
             "confidence": float(confidence),
             "confidence_percent": f"{confidence:.0%}",
             "auto_match": confidence >= AUTO_MATCH_THRESHOLD,
         })
 
-    return suggestions
+    return result
+
+
+def get_reconciliation_suggestions(
+    db: Session,
+    transaction: BankTransaction,
+    limit: int = 5,
+) -> List[dict]:
+    """
+    Gibt Vorschläge für manuelle Reconciliation.
+
+    Liest aus dem Vorschlags-Cache (siehe get_reconciliation_suggestions_bulk).
+
+    Returns:
+        Liste von Suggestion-Dicts mit Invoice, Payment, Confidence
+    """
+    return get_reconciliation_suggestions_bulk(db, [transaction.id], limit)[transaction.id]
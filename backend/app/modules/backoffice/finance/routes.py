@@ -18,6 +18,8 @@ from .schemas import (
     ExpenseKpiResponse,
     BankAccountResponse,
     BankTransactionResponse,
+    ReconciliationSuggestion,
+    ReconciliationRebuildResponse,
 )
 from .crud import (
     create_expense,
@@ -27,6 +29,11 @@ from .crud import (
     delete_expense,
     get_expense_kpis,
 )
+from .reconciliation import (
+    SUGGESTION_CACHE_SIZE,
+    get_reconciliation_suggestions_bulk,
+    rebuild_all_candidates,
+)
 
 router = APIRouter(
     prefix="/backoffice/finance",
@@ -216,3 +223,59 @@ def list_bank_transactions(
     if reconciliation_status:
         query = query.filter(BankTransaction.reconciliation_status == reconciliation_status)
     return query.order_by(BankTransaction.transaction_date.desc()).limit(limit).all()
+
+
+# ---------------------------
+# Reconciliation Suggestions
+# ---------------------------
+
+@router.get(
+    "/bank-transactions/suggestions",
+    response_model=dict[uuid.UUID, list[ReconciliationSuggestion]],
+)
+@require_permissions(["backoffice.finance.view"])
+def list_reconciliation_suggestions(
+    transaction_ids: list[uuid.UUID] = Query(..., description="Transaktionen der aktuellen Seite"),
+    limit: int = Query(SUGGESTION_CACHE_SIZE, ge=1, le=SUGGESTION_CACHE_SIZE),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Abgleich-Vorschläge für eine ganze Seite von Transaktionen.
+
+    Liest aus dem vorberechneten Vorschlags-Cache (eine Abfrage).
+    """
+    if len(transaction_ids) > 2000:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Maximal 2000 Transaktionen pro Anfrage")
+    return get_reconciliation_suggestions_bulk(db, transaction_ids, limit)
+
+
+@router.get(
+    "/bank-transactions/{transaction_id}/suggestions",
+    response_model=list[ReconciliationSuggestion],
+)
+@require_permissions(["backoffice.finance.view"])
+def get_transaction_suggestions(
+    transaction_id: uuid.UUID,
+    limit: int = Query(SUGGESTION_CACHE_SIZE, ge=1, le=SUGGESTION_CACHE_SIZE),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Abgleich-Vorschläge für eine einzelne Transaktion."""
+    if db.get(BankTransaction, transaction_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Transaktion nicht gefunden")
+    return get_reconciliation_suggestions_bulk(db, [transaction_id], limit)[transaction_id]
+
+
+@router.post(
+    "/bank-transactions/suggestions/rebuild",
+    response_model=ReconciliationRebuildResponse,
+)
+@require_permissions(["backoffice.finance.write"])
+def rebuild_reconciliation_suggestions(
+    account_id: Optional[uuid.UUID] = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Vorschlags-Cache für alle offenen Transaktionen neu aufbauen."""
+    return ReconciliationRebuildResponse(transactions=rebuild_all_candidates(db, account_id))
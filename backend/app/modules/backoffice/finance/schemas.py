@@ -8,7 +8,7 @@ from typing import Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from .models import ExpenseCategory
+from .models import ExpenseCategory, TransactionType
 
 
 class ExpenseBase(BaseModel):
@@ -130,6 +130,21 @@ class BankAccountResponse(BaseModel):
 
 # === Bank Transactions ===
 
+class BankTransactionCreate(BaseModel):
+    """Eine importierte Transaktion (siehe csv_import.parse_csv)."""
+    account_id: uuid.UUID
+    transaction_date: date
+    value_date: Optional[date] = None
+    amount: Decimal
+    transaction_type: TransactionType
+    counterparty_name: Optional[str] = None
+    counterparty_iban: Optional[str] = None
+    purpose: Optional[str] = None
+    reference: Optional[str] = None
+
+    model_config = ConfigDict(use_enum_values=True)
+
+
 class BankTransactionResponse(BaseModel):
     id: uuid.UUID
     account_id: uuid.UUID
@@ -151,6 +166,25 @@ class BankTransactionResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+# === Reconciliation ===
+
+class ReconciliationSuggestion(BaseModel):
+    """Ein gecachter Abgleich-Vorschlag (Rechnung ↔ Banktransaktion)."""
+    invoice_id: uuid.UUID
+    invoice_number: str
+    invoice_total: float
+    invoice_status: str
+    payment_id: Optional[uuid.UUID] = None
+    payment_amount: Optional[float] = None
+    confidence: float
+    confidence_percent: str
+    auto_match: bool
+
+
+class ReconciliationRebuildResponse(BaseModel):
+    transactions: int
+
+
 # === Stripe ===
 
 class StripeConfigCreate(BaseModel):
@@ -187,3 +221,38 @@ class StripeWebhookEvent(BaseModel):
     type: str
     data: dict
     created: int
+
+
+class StripeEventResponse(BaseModel):
+    id: uuid.UUID
+    event_id: str
+    event_type: str
+    invoice_id: Optional[uuid.UUID] = None
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    stripe_created: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
+    processed_at: Optional[datetime] = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class StripeInboxMetrics(BaseModel):
+    by_status: dict[str, int]
+    lag_seconds: float
+    processed_last_hour: int
+    avg_processing_latency_seconds: Optional[float] = None
+    last_run: Optional[dict] = None
+
+
+class StripeReplayRequest(BaseModel):
+    event_ids: Optional[list[str]] = Field(
+        default=None,
+        description="Stripe Event IDs; leer = alle fehlgeschlagenen Events"
+    )
+
+
+class StripeReplayResponse(BaseModel):
+    replayed: int
@@ -0,0 +1,353 @@
+"""
+Stripe Webhook Inbox
+
+Entkoppelt den Webhook-Empfang von der Verarbeitung:
+
+1. Webhook prüft die Signatur, speichert das rohe Event (dedupliziert über
+   die Stripe Event ID) und bestätigt sofort.
+2. Ein Hintergrundjob arbeitet die Inbox in Batches ab. Events werden pro
+   Rechnung gruppiert, damit jede Rechnung nur einmal geladen, aktualisiert
+   und neu bewertet wird.
+3. Fehlgeschlagene Gruppen werden mit exponentiellem Backoff wiederholt und
+   nach MAX_ATTEMPTS als 'failed' markiert (Replay über die Admin-Routen).
+
+Mehrere uvicorn-Worker sind sicher: die Batches werden mit
+FOR UPDATE SKIP LOCKED geholt.
+"""
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.settings.database import SessionLocal
+from app.modules.backoffice.invoices.models import Invoice, Payment, PaymentMethod, InvoiceStatus
+from . import reconciliation
+from .models import StripeEvent, StripeEventStatus
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+BATCH_SIZE = 100
+MAX_BATCHES_PER_RUN = 20
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30
+
+HANDLED_EVENT_TYPES = {
+    "payment_intent.succeeded",
+    "payment_intent.payment_failed",
+    "invoice.payment_succeeded",
+    "invoice.payment_failed",
+}
+
+# Laufzeit-Statistik des letzten Drain-Laufs in diesem Prozess
+_last_run: dict = {}
+
+
+# ============================================================================
+# INBOX (WRITE)
+# ============================================================================
+
+def _extract_invoice_id(event: dict) -> Optional[uuid.UUID]:
+    metadata = event.get("data", {}).get("object", {}).get("metadata") or {}
+    try:
+        return uuid.UUID(str(metadata["invoice_id"]))
+    except (KeyError, ValueError):
+        return None
+
+
+def store_event(db: Session, event: dict) -> bool:
+    """
+    Speichert ein verifiziertes Stripe-Event in der Inbox.
+
+    Unbekannte Event-Typen werden direkt als 'ignored' abgelegt.
+
+    Returns:
+        True wenn neu, False wenn die Event ID bereits bekannt war (Stripe-Retry)
+    """
+    event_type = event.get("type", "")
+    created = event.get("created")
+    handled = event_type in HANDLED_EVENT_TYPES
+
+    stmt = (
+        pg_insert(StripeEvent)
+        .values(
+            id=uuid.uuid4(),
+            event_id=event["id"],
+            event_type=event_type,
+            payload=event,
+            invoice_id=_extract_invoice_id(event),
+            status=StripeEventStatus.PENDING.value if handled else StripeEventStatus.IGNORED.value,
+            attempts=0,
+            stripe_created=datetime.fromtimestamp(created, tz=timezone.utc) if created else None,
+            processed_at=None if handled else datetime.now(timezone.utc),
+        )
+        .on_conflict_do_nothing(index_elements=["event_id"])
+        .returning(StripeEvent.id)
+    )
+    inserted = db.execute(stmt).scalar_one_or_none()
+    db.commit()
+    return inserted is not None
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+
+def _apply_invoice_events(
+    db: Session,
+    invoice: Optional[Invoice],
+    events: list[StripeEvent],
+    booked_references: set[str],
+) -> set[str]:
+    """
+    Wendet alle Events einer Rechnung in Reihenfolge an (ohne Commit).
+
+    Returns:
+        In dieser Gruppe neu verbuchte PaymentIntent-IDs; der Aufrufer
+        übernimmt sie erst nach erfolgreichem Savepoint in booked_references.
+    """
+    booked: set[str] = set()
+    if invoice is None:
+        for event in events:
+            if event.event_type.endswith("payment_failed"):
+                logger.info("[Stripe] %s ohne Rechnung: %s", event.event_type, event.event_id)
+        return booked
+
+    for event in events:
+        obj = event.payload.get("data", {}).get("object", {})
+
+        if event.event_type == "payment_intent.succeeded":
+            pi_id = obj.get("id")
+            if pi_id in booked_references or pi_id in booked:
+                continue  # bereits verbucht
+            amount = (Decimal(obj.get("amount", 0)) / Decimal("100")).quantize(Decimal("0.01"))
+            invoice.payments.append(Payment(
+                amount=amount,
+                payment_date=(event.stripe_created or datetime.now(timezone.utc)).date(),
+                method=PaymentMethod.CREDIT_CARD.value,
+                reference=pi_id,
+                note=f"Stripe PaymentIntent {pi_id}",
+            ))
+            booked.add(pi_id)
+            # Sofort (in Event-Reihenfolge) und vor dem Flush – Änderungen aus
+            # dem after_insert-Event gingen sonst verloren; ein späteres
+            # invoice.payment_succeeded darf den Status danach noch setzen
+            invoice.update_status_from_payments()
+
+        elif event.event_type == "payment_intent.payment_failed":
+            logger.info("[Stripe] PaymentIntent fehlgeschlagen: %s", obj.get("id"))
+
+        elif event.event_type == "invoice.payment_succeeded":
+            if invoice.status != InvoiceStatus.PAID.value:
+                invoice.status = InvoiceStatus.PAID.value
+
+        elif event.event_type == "invoice.payment_failed":
+            if invoice.status == InvoiceStatus.DRAFT.value:
+                invoice.status = InvoiceStatus.OVERDUE.value
+
+    reconciliation.refresh_candidates_for_invoice(db, invoice.id)
+    return booked
+
+
+def _mark_failed(event: StripeEvent, error: Exception, now: datetime) -> None:
+    event.attempts += 1
+    event.last_error = str(error)[:2000]
+    if event.attempts >= MAX_ATTEMPTS:
+        event.status = StripeEventStatus.FAILED.value
+        event.next_attempt_at = None
+    else:
+        event.next_attempt_at = now + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (event.attempts - 1))
+
+
+def drain_inbox(db: Session, batch_size: int = BATCH_SIZE) -> dict:
+    """
+    Verarbeitet einen Batch fälliger Events.
+
+    Events werden pro Rechnung gruppiert; jede Gruppe läuft in einem
+    Savepoint, sodass ein Fehler nur die Events dieser Rechnung betrifft.
+    Der gesamte Batch wird mit einem Commit abgeschlossen.
+
+    Returns:
+        Dict mit processed/failed/retried Counts
+    """
+    now = datetime.now(timezone.utc)
+    stats = {"processed": 0, "failed": 0, "retried": 0, "invoices": 0}
+
+    events = db.scalars(
+        select(StripeEvent)
+        .where(
+            StripeEvent.status == StripeEventStatus.PENDING.value,
+            (StripeEvent.next_attempt_at.is_(None)) | (StripeEvent.next_attempt_at <= now),
+        )
+        .order_by(StripeEvent.stripe_created, StripeEvent.created_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    if not events:
+        return stats
+
+    groups: dict[Optional[uuid.UUID], list[StripeEvent]] = {}
+    for event in events:
+        groups.setdefault(event.invoice_id, []).append(event)
+
+    invoice_ids = [invoice_id for invoice_id in groups if invoice_id is not None]
+    invoices = {
+        invoice.id: invoice
+        for invoice in db.scalars(select(Invoice).where(Invoice.id.in_(invoice_ids))).all()
+    } if invoice_ids else {}
+
+    pi_ids = [
+        event.payload.get("data", {}).get("object", {}).get("id")
+        for event in events
+        if event.event_type == "payment_intent.succeeded"
+    ]
+    booked_references = set(
+        db.scalars(select(Payment.reference).where(Payment.reference.in_(pi_ids))).all()
+    ) if pi_ids else set()
+
+    for invoice_id, group in groups.items():
+        try:
+            with db.begin_nested():
+                booked = _apply_invoice_events(db, invoices.get(invoice_id), group, booked_references)
+            booked_references |= booked
+            for event in group:
+                event.status = StripeEventStatus.PROCESSED.value
+                event.processed_at = now
+                event.last_error = None
+            stats["processed"] += len(group)
+            stats["invoices"] += 1 if invoice_id else 0
+        except Exception as exc:
+            logger.warning("⚠️ stripe inbox: invoice %s failed: %s", invoice_id, exc)
+            for event in group:
+                _mark_failed(event, exc, now)
+                if event.status == StripeEventStatus.FAILED.value:
+                    stats["failed"] += 1
+                else:
+                    stats["retried"] += 1
+
+    db.commit()
+    return stats
+
+
+def process_pending_events() -> dict:
+    """
+    Arbeitet die Inbox ab, bis sie leer ist (max. MAX_BATCHES_PER_RUN Batches).
+
+    Einstiegspunkt für den Hintergrundjob und den Webhook-Nachlauf;
+    öffnet eine eigene DB-Session.
+    """
+    started = time.monotonic()
+    totals = {"processed": 0, "failed": 0, "retried": 0, "invoices": 0, "batches": 0}
+
+    db = SessionLocal()
+    try:
+        for _ in range(MAX_BATCHES_PER_RUN):
+            stats = drain_inbox(db)
+            if not any(stats.values()):
+                break
+            totals["batches"] += 1
+            for key, value in stats.items():
+                totals[key] += value
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    duration = time.monotonic() - started
+    _last_run.update({
+        "finished_at": datetime.now(timezone.utc),
+        "duration_seconds": round(duration, 3),
+        "events_per_second": round(totals["processed"] / duration, 1) if duration > 0 else 0.0,
+        **totals,
+    })
+    return totals
+
+
+# ============================================================================
+# METRICS & REPLAY
+# ============================================================================
+
+def get_inbox_metrics(db: Session) -> dict:
+    """
+    Kennzahlen zur Inbox.
+
+    - Anzahl Events je Status
+    - Lag: Alter des ältesten fälligen Events
+    - Durchsatz: verarbeitete Events der letzten Stunde + mittlere Latenz
+    - Statistik des letzten Drain-Laufs in diesem Prozess
+    """
+    now = datetime.now(timezone.utc)
+    hour_ago = now - timedelta(hours=1)
+
+    by_status = dict(
+        db.execute(
+            select(StripeEvent.status, func.count(StripeEvent.id)).group_by(StripeEvent.status)
+        ).all()
+    )
+
+    oldest_pending = db.scalar(
+        select(func.min(StripeEvent.created_at))
+        .where(StripeEvent.status == StripeEventStatus.PENDING.value)
+    )
+
+    processed_last_hour, avg_latency = db.execute(
+        select(
+            func.count(StripeEvent.id),
+            func.avg(func.extract("epoch", StripeEvent.processed_at - StripeEvent.created_at)),
+        ).where(
+            StripeEvent.status == StripeEventStatus.PROCESSED.value,
+            StripeEvent.processed_at >= hour_ago,
+        )
+    ).one()
+
+    return {
+        "by_status": {s.value: by_status.get(s.value, 0) for s in StripeEventStatus},
+        "lag_seconds": (now - oldest_pending).total_seconds() if oldest_pending else 0.0,
+        "processed_last_hour": processed_last_hour or 0,
+        "avg_processing_latency_seconds": float(avg_latency) if avg_latency is not None else None,
+        "last_run": dict(_last_run) or None,
+    }
+
+
+def replay_events(
+    db: Session,
+    event_ids: Optional[Iterable[str]] = None,
+) -> int:
+    """
+    Setzt Events zur erneuten Verarbeitung zurück auf 'pending'.
+
+    Args:
+        event_ids: Stripe Event IDs; ohne Angabe werden alle 'failed' Events
+                   zurückgesetzt
+
+    Returns:
+        Anzahl zurückgesetzter Events
+    """
+    stmt = update(StripeEvent).values(
+        status=StripeEventStatus.PENDING.value,
+        attempts=0,
+        next_attempt_at=None,
+        last_error=None,
+        processed_at=None,
+    )
+    if event_ids is not None:
+        stmt = stmt.where(StripeEvent.event_id.in_(list(event_ids)))
+    else:
+        stmt = stmt.where(StripeEvent.status == StripeEventStatus.FAILED.value)
+
+    count = db.execute(stmt).rowcount
+    db.commit()
+    return count
@@ -1,21 +1,35 @@
 """
 Stripe Payment Integration Routes
 Konfiguration und Webhook-Handling für Stripe-Zahlungen.
+
+Der Webhook legt Events nur in der Inbox ab (siehe stripe_inbox.py);
+die Verarbeitung läuft im Hintergrund.
 """
 import hashlib
 import hmac
 import json
 import time
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.settings.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
 
-from .models import StripeConfig
-from .schemas import StripeConfigCreate, StripeConfigUpdate, StripeConfigResponse
+from . import stripe_inbox
+from .models import StripeConfig, StripeEvent
+from .schemas import (
+    StripeConfigCreate,
+    StripeConfigUpdate,
+    StripeConfigResponse,
+    StripeEventResponse,
+    StripeInboxMetrics,
+    StripeReplayRequest,
+    StripeReplayResponse,
+)
 
 router = APIRouter(prefix="/backoffice/finance/stripe", tags=["Stripe"])
 
@@ -159,17 +173,24 @@ async def delete_stripe_config(
 @router.post("/webhook", status_code=status.HTTP_200_OK)
 async def stripe_webhook(
     request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """
     Stripe Webhook Empfänger.
     Signatur wird via HMAC-SHA256 gegen den Webhook-Secret geprüft.
+
+    Das Event wird nur in der Inbox gespeichert (dedupliziert über die
+    Event ID) und sofort bestätigt. Die Verarbeitung übernimmt der
+    Inbox-Worker.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature", "")
 
     # Aktive Config laden
-    config = db.query(StripeConfig).filter(StripeConfig.is_active == True).first()
+    config = await run_in_threadpool(
+        lambda: db.query(StripeConfig).filter(StripeConfig.is_active == True).first()
+    )
     if not config or not config.webhook_secret:
         raise HTTPException(status_code=400, detail="Stripe Webhook nicht konfiguriert.")
 
@@ -178,22 +199,14 @@ async def stripe_webhook(
         raise HTTPException(status_code=400, detail="Ungültige Webhook-Signatur.")
 
     event = json.loads(payload)
-    event_type = event.get("type", "")
+    if not event.get("id"):
+        raise HTTPException(status_code=400, detail="Event ohne ID.")
 
-    # Event-Handler
-    if event_type == "payment_intent.succeeded":
-        await _handle_payment_succeeded(db, event)
-    elif event_type == "payment_intent.payment_failed":
-        await _handle_payment_failed(db, event)
-    elif event_type == "invoice.payment_succeeded":
-        await _handle_invoice_paid(db, event)
-    elif event_type == "invoice.payment_failed":
-        await _handle_invoice_payment_failed(db, event)
-    else:
-        # Unbekannte Events still akzeptieren (Stripe erwartet 200)
-        pass
+    is_new = await run_in_threadpool(stripe_inbox.store_event, db, event)
+    if is_new:
+        background_tasks.add_task(stripe_inbox.process_pending_events)
 
-    return {"received": True, "type": event_type}
+    return {"received": True, "type": event.get("type", ""), "duplicate": not is_new}
 
 
 def _verify_stripe_signature(payload: bytes, sig_header: str, secret: str) -> bool:
@@ -219,63 +232,49 @@ def _verify_stripe_signature(payload: bytes, sig_header: str, secret: str) -> bo
         return False
 
 
-async def _handle_payment_succeeded(db: Session, event: dict) -> None:
-    """payment_intent.succeeded — Zahlung erfolgreich."""
-    payment_intent = event.get("data", {}).get("object", {})
-    pi_id = payment_intent.get("id")
-    amount = payment_intent.get("amount", 0) / 100  # Cent → Euro
-    metadata = payment_intent.get("metadata", {})
-    invoice_id = metadata.get("invoice_id")
-
-    if invoice_id:
-        from app.modules.backoffice.invoices.models import Invoice, Payment
-        from app.core.settings.database import generate_uuid
-        from decimal import Decimal
-
-        invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-        if invoice:
-            payment = Payment(
-                id=generate_uuid(),
-                invoice_id=invoice.id,
-                amount=Decimal(str(amount)),
-                payment_method="stripe",
-                reference=pi_id,
-                note=f"Stripe PaymentIntent {pi_id}",
-            )
-            db.add(payment)
-            db.commit()
-
-
-async def _handle_payment_failed(db: Session, event: dict) -> None:
-    """payment_intent.payment_failed — Zahlung fehlgeschlagen."""
-    # Logging reicht erstmal — kein weiterer State-Change nötig
-    payment_intent = event.get("data", {}).get("object", {})
-    print(f"[Stripe] PaymentIntent fehlgeschlagen: {payment_intent.get('id')}")
-
-
-async def _handle_invoice_paid(db: Session, event: dict) -> None:
-    """invoice.payment_succeeded — Stripe-Rechnung bezahlt."""
-    stripe_invoice = event.get("data", {}).get("object", {})
-    metadata = stripe_invoice.get("metadata", {})
-    invoice_id = metadata.get("invoice_id")
-
-    if invoice_id:
-        from app.modules.backoffice.invoices.models import Invoice
-        invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-        if invoice and invoice.status != "paid":
-            invoice.status = "paid"
-            db.commit()
-
-
-async def _handle_invoice_payment_failed(db: Session, event: dict) -> None:
-    """invoice.payment_failed — Stripe-Rechnung Zahlung fehlgeschlagen."""
-    stripe_invoice = event.get("data", {}).get("object", {})
-    metadata = stripe_invoice.get("metadata", {})
-    invoice_id = metadata.get("invoice_id")
-
-    if invoice_id:
-        from app.modules.backoffice.invoices.models import Invoice
-        invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
-        if invoice and invoice.status == "draft":
-            invoice.status = "overdue"
-            db.commit()
+# ============================================================================
+# INBOX (Monitoring & Replay)
+# ============================================================================
+
+@router.get("/inbox", response_model=list[StripeEventResponse])
+@require_permissions(["admin.manage"])
+def list_inbox_events(
+    status_filter: Optional[str] = Query(None, alias="status", description="pending, processed, failed, ignored"),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """Events der Stripe-Inbox, neueste zuerst (benötigt: admin.manage)"""
+    query = db.query(StripeEvent)
+    if status_filter:
+        query = query.filter(StripeEvent.status == status_filter)
+    return query.order_by(StripeEvent.created_at.desc()).limit(limit).all()
+
+
+@router.get("/inbox/metrics", response_model=StripeInboxMetrics)
+@require_permissions(["admin.manage"])
+def get_inbox_metrics(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """Lag und Durchsatz der Stripe-Inbox (benötigt: admin.manage)"""
+    return stripe_inbox.get_inbox_metrics(db)
+
+
+@router.post("/inbox/replay", response_model=StripeReplayResponse)
+@require_permissions(["admin.manage"])
+def replay_inbox_events(
+    data: StripeReplayRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Events erneut verarbeiten (benötigt: admin.manage).
+
+    Ohne event_ids werden alle fehlgeschlagenen Events zurückgesetzt.
+    """
+    count = stripe_inbox.replay_events(db, data.event_ids)
+    if count:
+        background_tasks.add_task(stripe_inbox.process_pending_events)
+    return StripeReplayResponse(replayed=count)
@@ -21,13 +21,16 @@ Usage:
     log_audit(db, "Payment", payment.id, "delete", old_values=payment_dict)
 """
 from datetime import datetime
-from typing import Any, Dict, Optional
-from uuid import UUID
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from app.modules.backoffice.invoices.models import AuditLog
 
+VALID_ACTIONS = {"create", "update", "delete", "status_change"}
+
 
 def log_audit(
     db: Session,
@@ -58,9 +61,8 @@ def log_audit(
     Raises:
         ValueError: Wenn action ungültig ist
     """
-    valid_actions = {"create", "update", "delete", "status_change"}
-    if action not in valid_actions:
-        raise ValueError(f"Invalid action '{action}'. Must be one of: {valid_actions}")
+    if action not in VALID_ACTIONS:
+        raise ValueError(f"Invalid action '{action}'. Must be one of: {VALID_ACTIONS}")
 
     audit_entry = AuditLog(
         entity_type=entity_type,
@@ -79,6 +81,55 @@ def log_audit(
     return audit_entry
 
 
+def log_audit_bulk(
+    db: Session,
+    entries: List[Dict[str, Any]],
+    user_id: Optional[str] = None,
+    ip_address: Optional[str] = None
+) -> int:
+    """
+    Schreibt viele Audit-Log-Einträge mit einem einzigen INSERT (executemany).
+
+    Für Bulk-Operationen, bei denen log_audit pro Entität einen eigenen
+    Flush auslösen würde.
+
+    Args:
+        db: Database Session
+        entries: Dicts mit entity_type, entity_id, action und optional
+                 old_values/new_values
+        user_id: Optionale User-ID (gilt für alle Einträge)
+        ip_address: Optionale IP-Adresse (gilt für alle Einträge)
+
+    Returns:
+        Anzahl geschriebener Einträge
+
+    Raises:
+        ValueError: Wenn eine action ungültig ist
+    """
+    if not entries:
+        return 0
+
+    timestamp = datetime.utcnow()
+    rows = []
+    for entry in entries:
+        if entry["action"] not in VALID_ACTIONS:
+            raise ValueError(f"Invalid action '{entry['action']}'. Must be one of: {VALID_ACTIONS}")
+        rows.append({
+            "id": uuid4(),
+            "entity_type": entry["entity_type"],
+            "entity_id": entry["entity_id"],
+            "action": entry["action"],
+            "old_values": entry.get("old_values"),
+            "new_values": entry.get("new_values"),
+            "user_id": user_id,
+            "ip_address": ip_address,
+            "timestamp": timestamp,
+        })
+
+    db.execute(insert(AuditLog), rows)
+    return len(rows)
+
+
 def serialize_for_audit(obj: Any, exclude_fields: Optional[set] = None) -> Dict[str, Any]:
     """
     Serialisiert ein SQLAlchemy-Objekt für Audit-Logging.
@@ -219,7 +219,7 @@ def validate_invoice_not_deleted(invoice) -> None:
     Raises:
         HTTPException 404: Wenn Invoice gelöscht ist
     """
-    if invoice.deleted_at is not None:
+    if getattr(invoice, "deleted_at", None) is not None:
         raise HTTPException(
             status_code=404,
             detail=f"Invoice {invoice.invoice_number} has been deleted"
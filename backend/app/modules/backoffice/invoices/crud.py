@@ -13,8 +13,8 @@ CHANGES:
 - ✅ Filter support (status, customer_id, date_range)
 - ✅ Automatische Nummernkreise pro Dokumenttyp & Jahr
 """
-from sqlalchemy.orm import Session, selectinload
-from sqlalchemy import func
+from sqlalchemy.orm import Session, selectinload, noload
+from sqlalchemy import func, select, update
 from decimal import Decimal
 from datetime import date, datetime
 from typing import Optional, List
@@ -25,10 +25,13 @@ import tempfile
 from fastapi import HTTPException
 
 from app.modules.backoffice.invoices import models, schemas
+from app.modules.backoffice.invoices.audit import log_audit_bulk
+from app.modules.backoffice.invoices.compliance import validate_invoice_status_change
 from app.modules.backoffice.invoices.pdf_generator import generate_invoice_pdf
 from app.modules.documents.models import Document
 from app.modules.backoffice.crm.models import Customer
 from app.modules.backoffice.projects.models import Project
+from app.modules.backoffice.finance import reconciliation
 from app.core.storage.factory import get_storage
 
 
@@ -341,6 +344,7 @@ def create_invoice(
 
         # 5. Totals neu berechnen
         invoice.recalculate_totals()
+        reconciliation.refresh_candidates_for_invoice(db, invoice.id)
 
         # 6. Commit + refresh
         db.commit()
@@ -419,6 +423,7 @@ def update_invoice(
         for key, value in update_data.items():
             setattr(invoice, key, value)
 
+        reconciliation.refresh_candidates_for_invoice(db, invoice.id)
         db.commit()
         db.refresh(invoice)
         return invoice
@@ -443,11 +448,112 @@ def update_invoice_status(
         raise HTTPException(status_code=400, detail=f"Invalid status: {new_status}")
 
     invoice.status = new_status
+    reconciliation.refresh_candidates_for_invoice(db, invoice.id)
     db.commit()
     db.refresh(invoice)
     return invoice
 
 
+def bulk_update_invoice_status(
+    db: Session,
+    invoice_ids: List[uuid.UUID],
+    new_status: str,
+    all_or_nothing: bool = False,
+    user_id: Optional[str] = None,
+) -> List[dict]:
+    """
+    Setzt den Status mehrerer Invoices in einer Transaktion.
+
+    - Lädt alle Invoices mit einer IN-Query
+    - Prüft jeden Übergang in-memory gegen die Compliance-State-Machine
+    - Schreibt gültige Übergänge mit einem UPDATE + Bulk-Audit-Einträgen
+    - Ein Commit für den gesamten Batch
+
+    Args:
+        invoice_ids: Invoice IDs (Duplikate werden ignoriert)
+        new_status: Gewünschter Status
+        all_or_nothing: Bei mindestens einem Fehler wird nichts geändert
+
+    Returns:
+        Ergebnis pro ID (Reihenfolge wie angefragt):
+        invoice_id, success, changed, old_status, error
+    """
+    ids = list(dict.fromkeys(invoice_ids))
+
+    # Positionen/Zahlungen werden für Statuswechsel nicht gebraucht
+    invoices = {
+        invoice.id: invoice
+        for invoice in db.scalars(
+            select(models.Invoice)
+            .where(models.Invoice.id.in_(ids))
+            .options(noload(models.Invoice.line_items), noload(models.Invoice.payments))
+        ).all()
+    }
+
+    results: List[dict] = []
+    to_change: List[models.Invoice] = []
+    for invoice_id in ids:
+        invoice = invoices.get(invoice_id)
+        result = {
+            "invoice_id": invoice_id,
+            "success": False,
+            "changed": False,
+            "old_status": invoice.status if invoice else None,
+            "error": None,
+        }
+        if invoice is None:
+            result["error"] = f"Invoice {invoice_id} not found"
+        else:
+            try:
+                validate_invoice_status_change(invoice, new_status)
+                result["success"] = True
+                if invoice.status != new_status:
+                    result["changed"] = True
+                    to_change.append(invoice)
+            except HTTPException as e:
+                result["error"] = e.detail
+        results.append(result)
+
+    failed = any(not r["success"] for r in results)
+    if all_or_nothing and failed:
+        for result in results:
+            if result["success"]:
+                result["success"] = False
+                result["changed"] = False
+                result["error"] = "Not applied: batch aborted (all_or_nothing)"
+        return results
+
+    if not to_change:
+        return results
+
+    changed_ids = [invoice.id for invoice in to_change]
+    audit_entries = [
+        {
+            "entity_type": "Invoice",
+            "entity_id": invoice.id,
+            "action": "status_change",
+            "old_values": {"status": invoice.status},
+            "new_values": {"status": new_status},
+        }
+        for invoice in to_change
+    ]
+
+    try:
+        db.execute(
+            update(models.Invoice)
+            .where(models.Invoice.id.in_(changed_ids))
+            .values(status=new_status)
+        )
+        log_audit_bulk(db, audit_entries, user_id=user_id)
+        reconciliation.refresh_candidates_for_invoices(db, changed_ids)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to update invoice status: {str(e)}")
+
+    return results
+
+
 def recalculate_invoice_totals(
     db: Session,
     invoice_id: uuid.UUID,
@@ -458,6 +564,7 @@ def recalculate_invoice_totals(
         return None
 
     invoice.recalculate_totals()
+    reconciliation.refresh_candidates_for_invoice(db, invoice.id)
     db.commit()
     db.refresh(invoice)
     return invoice
@@ -480,7 +587,12 @@ def delete_invoice(db: Session, invoice_id: uuid.UUID) -> bool:
             except Exception as e:
                 print(f"⚠️ Failed to delete PDF: {e}")
 
+        # Betroffene Transaktionen vor dem Löschen merken (Kandidaten fallen per CASCADE weg)
+        affected = reconciliation.affected_transaction_ids(db, invoice.id)
+
         db.delete(invoice)
+        db.flush()
+        reconciliation.refresh_candidates_for_transactions(db, affected)
         db.commit()
         return True
 
@@ -104,6 +104,7 @@ class Invoice(Base, UUIDMixin, TimestampMixin):
         Index("ix_invoices_status", "status"),
         Index("ix_invoices_issued_date", "issued_date"),
         Index("ix_invoices_due_date", "due_date"),
+        Index("ix_invoices_status_due_date", "status", "due_date"),
         Index("ix_invoices_invoice_number", "invoice_number"),
         CheckConstraint("total >= 0", name="check_invoice_total_positive"),
         CheckConstraint("subtotal >= 0", name="check_invoice_subtotal_positive"),
@@ -649,7 +650,8 @@ class AuditLog(Base, UUIDMixin):
     """Audit Trail für Compliance (GoBD, HGB, AO)."""
     __tablename__ = "audit_logs"
     __table_args__ = (
-        Index("ix_audit_logs_entity", "entity_type", "entity_id"),
+        # Deckt auch Lookups nur über (entity_type, entity_id) ab
+        Index("ix_audit_logs_entity_timestamp", "entity_type", "entity_id", "timestamp"),
         Index("ix_audit_logs_timestamp", "timestamp"),
         Index("ix_audit_logs_action", "action"),
         Index("ix_audit_logs_user_id", "user_id"),
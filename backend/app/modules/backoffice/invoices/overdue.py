@@ -0,0 +1,220 @@
+"""
+Überfälligkeits-Lauf (Overdue Sweeper)
+
+Setzt alle versendeten bzw. teilbezahlten Rechnungen mit
+due_date < heute per set-basiertem UPDATE ... RETURNING auf 'overdue',
+schreibt die Audit-Einträge gesammelt und legt optional die nächste
+fällige Mahnstufe (InvoiceReminder) an.
+
+Läuft periodisch im API-Prozess (siehe app/core/jobs). Bei mehreren
+uvicorn-Workern sorgt ein transaktionsgebundener Postgres Advisory Lock
+dafür, dass immer nur ein Worker gleichzeitig sweept; die anderen
+überspringen den Lauf.
+"""
+from __future__ import annotations
+
+import logging
+import uuid
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.core.settings.config import settings
+from app.core.settings.database import SessionLocal
+from app.modules.backoffice.invoices.audit import log_audit_bulk
+from app.modules.backoffice.invoices.models import Invoice, InvoiceReminder, InvoiceStatus
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CONFIGURATION
+# ============================================================================
+
+ADVISORY_LOCK_KEY = zlib.crc32(b"workmate:invoice_overdue_sweep")
+AUDIT_USER = "system:overdue_sweeper"
+
+SWEEPABLE_STATUSES = (InvoiceStatus.SENT.value, InvoiceStatus.PARTIAL.value)
+
+# Mahnwesen: Stufe 1 nach DUNNING_GRACE_DAYS, danach alle DUNNING_INTERVAL_DAYS
+DUNNING_GRACE_DAYS = 7
+DUNNING_INTERVAL_DAYS = 14
+DUNNING_PAYMENT_DAYS = 7  # Zahlungsfrist der Mahnung
+DUNNING_FEES = {1: Decimal("0.00"), 2: Decimal("5.00"), 3: Decimal("10.00")}
+MAX_DUNNING_LEVEL = 3
+
+
+# ============================================================================
+# LOCKING
+# ============================================================================
+
+def _try_lock(db: Session) -> bool:
+    """
+    Holt den Advisory Lock für die laufende Transaktion (non-blocking).
+
+    Wird beim Commit/Rollback automatisch freigegeben. Auf anderen
+    Datenbanken als Postgres (z.B. SQLite in Tests) gibt es keinen Lock.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return True
+    return bool(db.scalar(select(func.pg_try_advisory_xact_lock(ADVISORY_LOCK_KEY))))
+
+
+# ============================================================================
+# SWEEP
+# ============================================================================
+
+def mark_overdue_invoices(db: Session, today: date) -> list[tuple[uuid.UUID, str]]:
+    """
+    Setzt fällige Rechnungen in einem Statement auf 'overdue' (ohne Commit).
+
+    UPDATE ... FROM (SELECT id, status ...) RETURNING liefert in Postgres
+    den alten Status aus dem Snapshot der Subquery – für die Audit-Einträge.
+    Status und Fälligkeit werden im äußeren WHERE wiederholt: Postgres prüft
+    sie nach dem Sperren der Zeile erneut, sodass eine zwischen Snapshot und
+    UPDATE bezahlte Rechnung nicht auf 'overdue' gesetzt wird.
+
+    Returns:
+        (invoice_id, alter Status) pro umgestellter Rechnung
+    """
+    previous = (
+        select(Invoice.id, Invoice.status)
+        .where(
+            Invoice.status.in_(SWEEPABLE_STATUSES),
+            Invoice.due_date < today,
+        )
+        .subquery()
+    )
+    stmt = (
+        update(Invoice)
+        .where(
+            Invoice.id == previous.c.id,
+            Invoice.status.in_(SWEEPABLE_STATUSES),
+            Invoice.due_date < today,
+        )
+        .values(status=InvoiceStatus.OVERDUE.value)
+        .returning(Invoice.id, previous.c.status)
+    )
+    rows = db.execute(stmt, execution_options={"synchronize_session": False}).all()
+    return [(invoice_id, old_status) for invoice_id, old_status in rows]
+
+
+def create_due_reminders(db: Session, today: date) -> int:
+    """
+    Legt für überfällige Rechnungen die nächste fällige Mahnstufe an (ohne Commit).
+
+    Stufe n ist fällig ab due_date + DUNNING_GRACE_DAYS + (n-1) * DUNNING_INTERVAL_DAYS
+    und frühestens nach Ablauf der Zahlungsfrist der vorherigen Mahnung.
+    Mahnungen werden nur angelegt, nicht versendet (sent_at bleibt leer).
+
+    Returns:
+        Anzahl angelegter Mahnungen
+    """
+    current_level = func.coalesce(func.max(InvoiceReminder.level), 0)
+    last_deadline = func.max(InvoiceReminder.due_date)
+    rows = db.execute(
+        select(Invoice.id, Invoice.due_date, current_level, last_deadline)
+        .outerjoin(InvoiceReminder, InvoiceReminder.invoice_id == Invoice.id)
+        .where(
+            Invoice.status == InvoiceStatus.OVERDUE.value,
+            Invoice.due_date <= today - timedelta(days=DUNNING_GRACE_DAYS),
+        )
+        .group_by(Invoice.id, Invoice.due_date)
+        .having(current_level < MAX_DUNNING_LEVEL)
+    ).all()
+
+    reminders = []
+    for invoice_id, due_date, level, deadline in rows:
+        next_level = level + 1
+        level_due = due_date + timedelta(
+            days=DUNNING_GRACE_DAYS + (next_level - 1) * DUNNING_INTERVAL_DAYS
+        )
+        if level_due > today or (deadline is not None and deadline >= today):
+            continue
+        reminders.append({
+            "id": uuid.uuid4(),
+            "invoice_id": invoice_id,
+            "level": next_level,
+            "fee": DUNNING_FEES[next_level],
+            "due_date": today + timedelta(days=DUNNING_PAYMENT_DAYS),
+            "notes": "Automatisch angelegt (Überfälligkeits-Lauf)",
+        })
+
+    if reminders:
+        db.execute(insert(InvoiceReminder), reminders)
+    return len(reminders)
+
+
+def sweep_overdue(
+    db: Session,
+    today: Optional[date] = None,
+    create_reminders: Optional[bool] = None,
+) -> dict:
+    """
+    Ein kompletter Überfälligkeits-Lauf in einer Transaktion.
+
+    Args:
+        today: Stichtag (Default: heute)
+        create_reminders: Mahnungen anlegen (Default: settings.INVOICE_AUTO_DUNNING)
+
+    Returns:
+        Dict mit skipped/marked_overdue/reminders_created
+    """
+    today = today or date.today()
+    if create_reminders is None:
+        create_reminders = settings.INVOICE_AUTO_DUNNING
+
+    stats = {"skipped": False, "marked_overdue": 0, "reminders_created": 0}
+
+    if not _try_lock(db):
+        db.rollback()
+        stats["skipped"] = True
+        return stats
+
+    try:
+        changed = mark_overdue_invoices(db, today)
+        log_audit_bulk(
+            db,
+            [
+                {
+                    "entity_type": "Invoice",
+                    "entity_id": invoice_id,
+                    "action": "status_change",
+                    "old_values": {"status": old_status},
+                    "new_values": {"status": InvoiceStatus.OVERDUE.value},
+                }
+                for invoice_id, old_status in changed
+            ],
+            user_id=AUDIT_USER,
+        )
+        stats["marked_overdue"] = len(changed)
+
+        if create_reminders:
+            stats["reminders_created"] = create_due_reminders(db, today)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return stats
+
+
+def run_overdue_sweep() -> dict:
+    """Einstiegspunkt für den Hintergrundjob; öffnet eine eigene DB-Session."""
+    db = SessionLocal()
+    try:
+        stats = sweep_overdue(db)
+    finally:
+        db.close()
+
+    if stats["marked_overdue"] or stats["reminders_created"]:
+        logger.info(
+            "📅 overdue sweep: %s invoices overdue, %s reminders created",
+            stats["marked_overdue"], stats["reminders_created"],
+        )
+    return stats
@@ -10,6 +10,7 @@ from datetime import date
 import uuid
 
 from app.modules.backoffice.invoices import models, schemas
+from app.modules.backoffice.finance import reconciliation
 from fastapi import HTTPException, status
 
 
@@ -107,6 +108,7 @@ def create_payment(
 
         # 4. Invoice Status manuell aktualisieren (da Event manchmal nicht triggert)
         invoice.update_status_from_payments()
+        reconciliation.refresh_candidates_for_invoice(db, invoice_id)
         db.commit()
         db.refresh(invoice)
 
@@ -154,6 +156,7 @@ def update_payment(
 
         # Invoice Status aktualisieren
         payment.invoice.update_status_from_payments()
+        reconciliation.refresh_candidates_for_invoice(db, payment.invoice_id)
         db.commit()
 
         return payment
@@ -193,6 +196,7 @@ def delete_payment(db: Session, payment_id: uuid.UUID) -> bool:
 
         # Invoice Status aktualisieren
         invoice.update_status_from_payments()
+        reconciliation.refresh_candidates_for_invoice(db, invoice.id)
         db.commit()
 
         return True
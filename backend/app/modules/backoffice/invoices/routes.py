@@ -20,7 +20,6 @@ from datetime import date
 import uuid
 import os
 import tempfile
-import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -30,10 +29,12 @@ from pydantic import BaseModel, EmailStr
 from app.core.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
+from app.core.email import outbox
 from app.core.storage.factory import get_storage
 from app.modules.backoffice.invoices import crud, schemas
 from app.modules.backoffice.invoices.pdf_generator import generate_invoice_pdf
 from app.modules.backoffice.invoices import payments_crud
+from app.modules.backoffice.invoices import overdue
 
 
 router = APIRouter(prefix="/backoffice/invoices", tags=["Backoffice Invoices"])
@@ -435,10 +436,17 @@ class InvoiceSendRequest(BaseModel):
 def send_invoice_email(
     invoice_id: uuid.UUID,
     data: InvoiceSendRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
-    """Rechnung per E-Mail versenden (PDF als Anhang). Setzt Status auf 'sent'."""
+    """
+    Rechnung per E-Mail versenden (PDF als Anhang). Setzt Status auf 'sent'.
+
+    Die Nachricht wird in die Mail-Outbox gelegt (gleiche Transaktion wie der
+    Statuswechsel) und nach der Antwort zugestellt; der Zustellstatus steht
+    in mail_outbox (reference invoice:<id>).
+    """
     from app.core.settings.config import settings
 
     invoice = crud.get_invoice(db, invoice_id)
@@ -477,16 +485,17 @@ def send_invoice_email(
     if data.cc_email:
         recipients.append(data.cc_email)
 
-    try:
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=15) as smtp:
-            smtp.starttls()
-            smtp.login(settings.NOREPLY_SMTP_USER, settings.NOREPLY_SMTP_PASSWORD)
-            smtp.sendmail(settings.NOREPLY_SMTP_FROM, recipients, msg.as_string())
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=f"E-Mail-Versand fehlgeschlagen: {e}")
+    outbox.enqueue_message(
+        db, msg, recipients,
+        account=outbox.ACCOUNT_NOREPLY,
+        sender=settings.NOREPLY_SMTP_FROM,
+        reference=f"invoice:{invoice.id}",
+        commit=False,
+    )
 
-    # Status auf sent setzen
+    # Status auf sent setzen (committet auch den Outbox-Eintrag)
     crud.update_invoice_status(db, invoice_id, "sent")
+    background_tasks.add_task(outbox.process_outbox)
 
 
 # ============================================================================
@@ -504,28 +513,45 @@ def bulk_update_status(
     Status für mehrere Invoices gleichzeitig ändern.
 
     **Beispiel:** Alle draft Invoices auf sent setzen.
-    """
-    success_count = 0
-    failed_ids = []
 
-    for invoice_id in data.invoice_ids:
-        try:
-            invoice = crud.update_invoice_status(db, invoice_id, data.new_status)
-            if invoice:
-                success_count += 1
-            else:
-                failed_ids.append(str(invoice_id))
-        except Exception as e:
-            failed_ids.append(str(invoice_id))
-            print(f"❌ Failed to update {invoice_id}: {e}")
+    Alle Übergänge werden gegen die Compliance-State-Machine geprüft und in
+    einer Transaktion geschrieben (inkl. Audit-Log). Mit `all_or_nothing`
+    wird bei einem ungültigen Übergang keine Invoice geändert.
+    """
+    results = crud.bulk_update_invoice_status(
+        db,
+        data.invoice_ids,
+        data.new_status,
+        all_or_nothing=data.all_or_nothing,
+        user_id=str(user.get("id")) if user.get("id") else None,
+    )
+    failed_ids = [str(r["invoice_id"]) for r in results if not r["success"]]
 
     return schemas.BulkUpdateResponse(
-        success_count=success_count,
+        success_count=len(results) - len(failed_ids),
         failed_count=len(failed_ids),
-        failed_ids=failed_ids
+        failed_ids=failed_ids,
+        results=results,
     )
 
 
+@router.post("/overdue/sweep", response_model=schemas.OverdueSweepResponse)
+@require_permissions(["backoffice.invoices.write"])
+def run_overdue_sweep(
+    create_reminders: Optional[bool] = Query(None, description="Mahnungen anlegen (Default: INVOICE_AUTO_DUNNING)"),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Überfälligkeits-Lauf manuell anstoßen.
+
+    Läuft sonst periodisch im Hintergrund. Alle sent/partial Invoices mit
+    überschrittenem Fälligkeitsdatum werden auf overdue gesetzt.
+    `skipped=true` bedeutet, dass gerade ein anderer Worker sweept.
+    """
+    return overdue.sweep_overdue(db, create_reminders=create_reminders)
+
+
 # ============================================================================
 # PAYMENT ENDPOINTS
 # ============================================================================
@@ -343,6 +343,10 @@ class BulkStatusUpdate(BaseModel):
     """Schema für Bulk Status Update."""
     invoice_ids: List[uuid.UUID] = Field(..., min_length=1, description="Liste von Invoice IDs")
     new_status: str = Field(..., description="Neuer Status")
+    all_or_nothing: bool = Field(
+        default=False,
+        description="Bei mindestens einem ungültigen Übergang wird keine Invoice geändert"
+    )
 
     @field_validator("new_status")
     @classmethod
@@ -361,11 +365,28 @@ class BulkStatusUpdate(BaseModel):
         return v
 
 
+class BulkStatusResult(BaseModel):
+    """Ergebnis einer einzelnen Invoice im Bulk Status Update."""
+    invoice_id: uuid.UUID
+    success: bool
+    changed: bool = Field(default=False, description="False bei No-Op (Status war bereits gesetzt)")
+    old_status: Optional[str] = None
+    error: Optional[str] = None
+
+
 class BulkUpdateResponse(BaseModel):
     """Response für Bulk Operations."""
     success_count: int = Field(description="Anzahl erfolgreich aktualisiert")
     failed_count: int = Field(description="Anzahl fehlgeschlagen")
     failed_ids: List[str] = Field(default_factory=list, description="IDs fehlgeschlagener Updates")
+    results: List[BulkStatusResult] = Field(default_factory=list, description="Ergebnis pro Invoice ID")
+
+
+class OverdueSweepResponse(BaseModel):
+    """Ergebnis eines Überfälligkeits-Laufs."""
+    skipped: bool = Field(description="Lauf übersprungen (Lock von anderem Worker gehalten)")
+    marked_overdue: int = Field(description="Anzahl auf overdue gesetzter Invoices")
+    reminders_created: int = Field(description="Anzahl automatisch angelegter Mahnungen")
 
 
 # ============================================================================
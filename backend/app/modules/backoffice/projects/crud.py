@@ -1,12 +1,56 @@
 # app/modules/backoffice/projects/crud.py
+from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.modules.backoffice.finance.crud import fold_project_expense_rollup
 from app.modules.backoffice.projects import models, schemas
+from app.modules.backoffice.projects.financials import (
+    ProjectFinancials,
+    financials_from_row,
+    project_financials_query,
+)
 
 
 def get_projects(db: Session, skip: int = 0, limit: int = 50):
     return db.query(models.Project).offset(skip).limit(limit).all()
 
 
+def get_projects_with_financials(
+    db: Session, skip: int = 0, limit: int = 50
+) -> list[tuple[models.Project, ProjectFinancials]]:
+    """
+    Projekte inkl. Stunden, Umsatz und Ausgaben in einem Statement.
+
+    Die Kennzahlen kommen aus den Rollup-Tabellen; time_entries, invoices
+    und expenses der Projekte werden nicht geladen.
+    """
+    page = (
+        select(models.Project.id)
+        .order_by(models.Project.created_at.desc(), models.Project.id)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    fin = project_financials_query(select(page.c.id)).subquery()
+    rows = db.execute(
+        select(models.Project, fin)
+        .join(fin, fin.c.project_id == models.Project.id)
+        .order_by(models.Project.created_at.desc(), models.Project.id)
+    ).all()
+    return [(row[0], financials_from_row(row)) for row in rows]
+
+
+def project_list_item(project: models.Project, fin: ProjectFinancials) -> schemas.ProjectListItem:
+    return schemas.ProjectListItem(
+        **schemas.ProjectResponse.model_validate(project).model_dump(),
+        total_hours_tracked=round(float(fin.total_hours), 2),
+        billable_hours=round(float(fin.billable_hours), 2),
+        total_revenue=fin.revenue,
+        total_expenses=fin.expenses,
+        budget_utilization=fin.budget_utilization(project.budget, project.hourly_rate),
+        profit_margin=fin.profit_margin(project.hourly_rate),
+    )
+
+
 def get_project(db: Session, project_id: str):
     return db.query(models.Project).filter(models.Project.id == project_id).first()
 
@@ -33,6 +77,7 @@ def update_project(db: Session, project_id: str, data: schemas.ProjectUpdate):
 def delete_project(db: Session, project_id: str):
     project = get_project(db, project_id)
     if project:
+        fold_project_expense_rollup(db, project.id)
         db.delete(project)
         db.commit()
         return True
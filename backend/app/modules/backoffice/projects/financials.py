@@ -0,0 +1,121 @@
+# app/modules/backoffice/projects/financials.py
+"""
+Projekt-Kennzahlen aus vorab aggregierten Daten.
+
+Stunden kommen aus time_daily_rollups, Ausgaben aus expense_daily_rollups,
+Umsatz aus den bezahlten Rechnungen (ix_invoices_project_id). Eine Query
+liefert die Kennzahlen für beliebig viele Projekte – ohne die Collections
+time_entries/invoices/expenses zu laden.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Iterable, Optional
+
+from sqlalchemy import Select, case, func, select
+
+ZERO = Decimal("0.00")
+
+
+@dataclass(frozen=True)
+class ProjectFinancials:
+    total_minutes: int = 0
+    billable_minutes: int = 0
+    revenue: Decimal = ZERO
+    expenses: Decimal = ZERO
+
+    @property
+    def total_hours(self) -> Decimal:
+        return Decimal(self.total_minutes) / Decimal("60")
+
+    @property
+    def billable_hours(self) -> Decimal:
+        return Decimal(self.billable_minutes) / Decimal("60")
+
+    def costs(self, hourly_rate: Optional[Decimal]) -> Decimal:
+        """Kosten = Ausgaben + abrechenbare Stunden * Stundensatz."""
+        costs = self.expenses
+        if hourly_rate:
+            costs += self.billable_hours * hourly_rate
+        return costs
+
+    def budget_utilization(self, budget: Optional[Decimal], hourly_rate: Optional[Decimal]) -> float | None:
+        """Budget-Auslastung in Prozent oder None ohne Budget."""
+        if budget is None or budget <= ZERO:
+            return None
+        return float((self.costs(hourly_rate) / budget) * Decimal("100"))
+
+    def profit_margin(self, hourly_rate: Optional[Decimal]) -> Decimal | None:
+        """Gewinn (Umsatz - Kosten) oder None ohne Umsatz."""
+        if self.revenue <= ZERO:
+            return None
+        return self.revenue - self.costs(hourly_rate)
+
+
+def project_financials_query(project_ids: Optional[Iterable[uuid.UUID] | Select] = None) -> Select:
+    """
+    Spalten: project_id, total_minutes, billable_minutes, revenue, expenses.
+
+    Args:
+        project_ids: Projekt-IDs oder Subquery; None = alle Projekte
+    """
+    from app.modules.backoffice.finance.models import ExpenseDailyRollup
+    from app.modules.backoffice.invoices.models import Invoice, InvoiceStatus
+    from app.modules.backoffice.projects.models import Project
+    from app.modules.backoffice.time_tracking.models import TimeDailyRollup
+
+    def _scoped(column):
+        return [column.in_(project_ids)] if project_ids is not None else []
+
+    hours = (
+        select(
+            TimeDailyRollup.project_id.label("project_id"),
+            func.sum(TimeDailyRollup.total_minutes).label("total_minutes"),
+            func.sum(
+                case((TimeDailyRollup.billable == True, TimeDailyRollup.total_minutes), else_=0)  # noqa: E712
+            ).label("billable_minutes"),
+        )
+        .where(TimeDailyRollup.project_id.is_not(None), *_scoped(TimeDailyRollup.project_id))
+        .group_by(TimeDailyRollup.project_id)
+        .subquery()
+    )
+    revenue = (
+        select(Invoice.project_id.label("project_id"), func.sum(Invoice.total).label("revenue"))
+        .where(Invoice.status == InvoiceStatus.PAID.value, *_scoped(Invoice.project_id))
+        .group_by(Invoice.project_id)
+        .subquery()
+    )
+    expenses = (
+        select(
+            ExpenseDailyRollup.project_id.label("project_id"),
+            func.sum(ExpenseDailyRollup.total_amount).label("expenses"),
+        )
+        .where(ExpenseDailyRollup.project_id.is_not(None), *_scoped(ExpenseDailyRollup.project_id))
+        .group_by(ExpenseDailyRollup.project_id)
+        .subquery()
+    )
+
+    return (
+        select(
+            Project.id.label("project_id"),
+            func.coalesce(hours.c.total_minutes, 0).label("total_minutes"),
+            func.coalesce(hours.c.billable_minutes, 0).label("billable_minutes"),
+            func.coalesce(revenue.c.revenue, 0).label("revenue"),
+            func.coalesce(expenses.c.expenses, 0).label("expenses"),
+        )
+        .outerjoin(hours, hours.c.project_id == Project.id)
+        .outerjoin(revenue, revenue.c.project_id == Project.id)
+        .outerjoin(expenses, expenses.c.project_id == Project.id)
+        .where(*_scoped(Project.id))
+    )
+
+
+def financials_from_row(row) -> ProjectFinancials:
+    return ProjectFinancials(
+        total_minutes=int(row.total_minutes or 0),
+        billable_minutes=int(row.billable_minutes or 0),
+        revenue=Decimal(str(row.revenue or 0)),
+        expenses=Decimal(str(row.expenses or 0)),
+    )
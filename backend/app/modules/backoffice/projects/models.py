@@ -18,8 +18,8 @@ from typing import TYPE_CHECKING
 from decimal import Decimal
 from enum import Enum
 
-from sqlalchemy import String, Text, ForeignKey, Date, Numeric, Index, CheckConstraint
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import String, Text, ForeignKey, Date, Numeric, Index, CheckConstraint, event
+from sqlalchemy.orm import Mapped, mapped_column, object_session, relationship
 
 from app.core.mixins import UUIDMixin, TimestampMixin
 from app.core.database import Base
@@ -30,6 +30,7 @@ if TYPE_CHECKING:
     from app.modules.backoffice.invoices.models import Invoice
     from app.modules.backoffice.finance.models import Expense
     from app.modules.backoffice.time_tracking.models import TimeEntry
+    from app.modules.backoffice.projects.financials import ProjectFinancials
 
 
 # ============================================================================
@@ -212,10 +213,12 @@ class Project(Base, UUIDMixin, TimestampMixin):
         cascade="save-update, merge"
     )
 
+    # Wie invoices: Ausgaben bleiben beim Löschen erhalten (project_id = NULL),
+    # ihre Rollup-Buckets faltet delete_project in die NULL-Buckets
     expenses: Mapped[list[Expense]] = relationship(
         "Expense",
         back_populates="project",
-        cascade="all, delete-orphan"
+        cascade="save-update, merge"
     )
 
     # ========================================================================
@@ -259,19 +262,40 @@ class Project(Base, UUIDMixin, TimestampMixin):
         delta = self.deadline - date.today()
         return delta.days
 
+    def _financials(self) -> ProjectFinancials:
+        """
+        Kennzahlen aus den Rollup-Tabellen, eine Query pro Instanz.
+
+        Das Ergebnis wird an der Instanz gemerkt, damit mehrere Properties
+        nicht jeweils dieselbe Query ausführen; expire/refresh (z.B. nach
+        Commit) verwirft es. Listen-Endpoints laden die Kennzahlen gesammelt
+        über projects.crud.get_projects_with_financials.
+        """
+        from app.modules.backoffice.projects.financials import (
+            ProjectFinancials,
+            financials_from_row,
+            project_financials_query,
+        )
+        cached = self.__dict__.get("_financials_cache")
+        if cached is not None:
+            return cached
+        session = object_session(self)
+        if session is None or self.id is None:
+            return ProjectFinancials()
+        row = session.execute(project_financials_query([self.id])).one_or_none()
+        financials = financials_from_row(row) if row else ProjectFinancials()
+        self.__dict__["_financials_cache"] = financials
+        return financials
+
     @property
     def total_hours_tracked(self) -> Decimal:
         """
         Summe aller erfassten Stunden.
 
         Returns:
-            Gesamtstunden aus allen TimeEntries
+            Gesamtstunden aus allen TimeEntries (über time_daily_rollups)
         """
-        total_minutes = sum(
-            entry.duration_minutes or 0
-            for entry in self.time_entries
-        )
-        return Decimal(total_minutes) / Decimal("60")
+        return self._financials().total_hours
 
     @property
     def billable_hours(self) -> Decimal:
@@ -279,14 +303,9 @@ class Project(Base, UUIDMixin, TimestampMixin):
         Summe aller abrechenbaren Stunden.
 
         Returns:
-            Gesamtstunden aus billable TimeEntries
+            Gesamtstunden aus billable TimeEntries (über time_daily_rollups)
         """
-        total_minutes = sum(
-            entry.duration_minutes or 0
-            for entry in self.time_entries
-            if entry.billable
-        )
-        return Decimal(total_minutes) / Decimal("60")
+        return self._financials().billable_hours
 
     @property
     def total_revenue(self) -> Decimal:
@@ -296,11 +315,7 @@ class Project(Base, UUIDMixin, TimestampMixin):
         Returns:
             Summe aller paid invoices
         """
-        from app.modules.backoffice.invoices.models import InvoiceStatus
-        return sum(
-            inv.total for inv in self.invoices
-            if inv.status == InvoiceStatus.PAID.value
-        )
+        return self._financials().revenue
 
     @property
     def total_expenses(self) -> Decimal:
@@ -308,11 +323,9 @@ class Project(Base, UUIDMixin, TimestampMixin):
         Summe aller Ausgaben.
 
         Returns:
-            Gesamtbetrag aller Expenses
+            Gesamtbetrag aller Expenses (über expense_daily_rollups)
         """
-        return sum(
-            exp.amount for exp in self.expenses
-        )
+        return self._financials().expenses
 
     @property
     def budget_utilization(self) -> float | None:
@@ -322,15 +335,7 @@ class Project(Base, UUIDMixin, TimestampMixin):
         Returns:
             0.0 bis 100.0+ oder None wenn kein Budget definiert
         """
-        if self.budget is None or self.budget <= Decimal("0.00"):
-            return None
-
-        # Kosten = Ausgaben + abrechenbare Stunden * Stundensatz
-        costs = self.total_expenses
-        if self.hourly_rate:
-            costs += self.billable_hours * self.hourly_rate
-
-        return float((costs / self.budget) * Decimal("100"))
+        return self._financials().budget_utilization(self.budget, self.hourly_rate)
 
     @property
     def profit_margin(self) -> Decimal | None:
@@ -340,13 +345,7 @@ class Project(Base, UUIDMixin, TimestampMixin):
         Returns:
             Gewinn oder None wenn keine Daten
         """
-        revenue = self.total_revenue
-        costs = self.total_expenses
-
-        if self.hourly_rate:
-            costs += self.billable_hours * self.hourly_rate
-
-        return revenue - costs if revenue > Decimal("0.00") else None
+        return self._financials().profit_margin(self.hourly_rate)
 
     @property
     def completion_percentage(self) -> float | None:
@@ -378,3 +377,14 @@ class Project(Base, UUIDMixin, TimestampMixin):
             f"<Project(id={self.id}, title='{self.title}', "
             f"status='{self.status}', customer={self.customer_id})>"
         )
+
+
+# ============================================================================
+# EVENTS
+# ============================================================================
+
+@event.listens_for(Project, "expire")
+@event.listens_for(Project, "refresh")
+def reset_project_financials(target, *args):
+    """Verwirft die gemerkten Kennzahlen, sobald die Instanz neu geladen wird."""
+    target.__dict__.pop("_financials_cache", None)
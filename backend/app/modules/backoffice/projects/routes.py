@@ -1,5 +1,5 @@
 # app/modules/backoffice/projects/routes.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List
 from app.core.database import get_db
@@ -10,13 +10,19 @@ from app.modules.backoffice.projects import crud, schemas
 router = APIRouter(prefix="/backoffice/projects", tags=["Backoffice Projects"])
 
 
-@router.get("/", response_model=List[schemas.ProjectResponse])
+@router.get("/", response_model=List[schemas.ProjectListItem])
 @require_permissions(["backoffice.projects.read"])
 def list_projects(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
 ):
-    return crud.get_projects(db)
+    """Projekte inkl. Stunden, Umsatz, Ausgaben und Budget-Auslastung."""
+    return [
+        crud.project_list_item(project, fin)
+        for project, fin in crud.get_projects_with_financials(db, skip=skip, limit=limit)
+    ]
 
 
 @router.get("/{project_id}", response_model=schemas.ProjectResponse)
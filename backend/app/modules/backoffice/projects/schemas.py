@@ -1,5 +1,6 @@
 # app/modules/backoffice/projects/schemas.py
 from datetime import datetime, date
+from decimal import Decimal
 from typing import Optional
 import uuid
 from pydantic import BaseModel
@@ -35,3 +36,13 @@ class ProjectResponse(ProjectBase):
 
     class Config:
         from_attributes = True
+
+
+class ProjectListItem(ProjectResponse):
+    """Projekt inkl. Kennzahlen aus den Rollup-Tabellen."""
+    total_hours_tracked: float = 0.0
+    billable_hours: float = 0.0
+    total_revenue: Decimal = Decimal("0.00")
+    total_expenses: Decimal = Decimal("0.00")
+    budget_utilization: Optional[float] = None
+    profit_margin: Optional[Decimal] = None
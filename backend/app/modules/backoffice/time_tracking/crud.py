@@ -3,12 +3,16 @@ from collections import defaultdict
 from datetime import datetime, date, timedelta, time
 from decimal import Decimal
 from typing import Optional
+import uuid
 from uuid import UUID
 
 from fastapi import HTTPException
-from sqlalchemy import or_
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.core.calendar import work_week_for_employee, working_hours
+from app.modules.backoffice.invoices.audit import log_audit_bulk
 from app.modules.backoffice.time_tracking import models, schemas
 
 
@@ -61,6 +65,136 @@ def get_entry(db: Session, entry_id) -> Optional[models.TimeEntry]:
     return db.query(models.TimeEntry).filter(models.TimeEntry.id == entry_id).first()
 
 
+# ---------------------------
+# Tages-Rollup
+# ---------------------------
+
+RollupKey = tuple[date, UUID, Optional[UUID], bool]
+
+
+def _rollup_key(entry: models.TimeEntry) -> RollupKey:
+    """Bucket eines Eintrags; der Tag stammt aus start_time (wie die Wochenübersicht)."""
+    return entry.start_time.date(), entry.employee_id, entry.project_id, bool(entry.billable)
+
+
+def _rollup_values(entry: models.TimeEntry) -> tuple[int, int]:
+    """(Minuten, davon freigegeben) eines Eintrags."""
+    minutes = entry.duration_minutes or 0
+    return minutes, minutes if entry.is_approved else 0
+
+
+def _apply_rollup_delta(
+    db: Session,
+    key: RollupKey,
+    minutes: int,
+    approved_minutes: int,
+    count: int,
+) -> None:
+    """
+    Addiert Minuten/Anzahl auf einen Rollup-Bucket (ohne Commit).
+
+    Erst UPDATE; existiert der Bucket noch nicht, wird er im Savepoint
+    angelegt. Hat ein paralleler Request ihn inzwischen angelegt, greift
+    die Unique-Constraint und wir addieren erneut per UPDATE.
+    """
+    Rollup = models.TimeDailyRollup
+    day, employee_id, project_id, billable = key
+    bucket = (
+        Rollup.day == day,
+        Rollup.employee_id == employee_id,
+        Rollup.project_id.is_(None) if project_id is None else Rollup.project_id == project_id,
+        Rollup.billable == billable,
+    )
+    stmt = (
+        update(Rollup)
+        .where(*bucket)
+        .values(
+            total_minutes=Rollup.total_minutes + minutes,
+            approved_minutes=Rollup.approved_minutes + approved_minutes,
+            entry_count=Rollup.entry_count + count,
+        )
+    )
+    if db.execute(stmt).rowcount:
+        return
+
+    try:
+        with db.begin_nested():
+            db.execute(
+                insert(Rollup).values(
+                    id=uuid.uuid4(),
+                    day=day,
+                    employee_id=employee_id,
+                    project_id=project_id,
+                    billable=billable,
+                    total_minutes=minutes,
+                    approved_minutes=approved_minutes,
+                    entry_count=count,
+                )
+            )
+    except IntegrityError:
+        db.execute(stmt)
+
+
+def _rollup_add(db: Session, entry: models.TimeEntry) -> None:
+    _apply_rollup_delta(db, _rollup_key(entry), *_rollup_values(entry), 1)
+
+
+def _rollup_remove(db: Session, key: RollupKey, values: tuple[int, int]) -> None:
+    minutes, approved = values
+    _apply_rollup_delta(db, key, -minutes, -approved, -1)
+
+
+def rebuild_time_rollup(db: Session) -> int:
+    """
+    Baut die Rollup-Tabelle komplett aus den Zeiteinträgen neu auf.
+
+    Returns:
+        Anzahl erzeugter Buckets
+    """
+    TimeEntry = models.TimeEntry
+    day = func.date(TimeEntry.start_time)
+    minutes = func.coalesce(TimeEntry.duration_minutes, 0)
+    source = (
+        select(
+            day,
+            TimeEntry.employee_id,
+            TimeEntry.project_id,
+            TimeEntry.billable,
+            func.sum(minutes),
+            func.coalesce(func.sum(minutes).filter(TimeEntry.is_approved == True), 0),  # noqa: E712
+            func.count(TimeEntry.id),
+        )
+        .group_by(day, TimeEntry.employee_id, TimeEntry.project_id, TimeEntry.billable)
+    )
+
+    db.execute(delete(models.TimeDailyRollup))
+    rows = db.execute(source).all()
+    if rows:
+        db.execute(
+            insert(models.TimeDailyRollup),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    # SQLite liefert date() als String
+                    "day": date.fromisoformat(d) if isinstance(d, str) else d,
+                    "employee_id": employee_id,
+                    "project_id": project_id,
+                    "billable": bool(billable),
+                    "total_minutes": total,
+                    "approved_minutes": approved,
+                    "entry_count": count,
+                }
+                for d, employee_id, project_id, billable, total, approved, count in rows
+            ],
+        )
+    db.commit()
+    return len(rows)
+
+
+# ---------------------------
+# CRUD
+# ---------------------------
+
 def create_entry(db: Session, data: schemas.TimeEntryCreate) -> models.TimeEntry:
     entry_data = data.model_dump()
     entry_data["duration_minutes"] = _calculate_duration(
@@ -68,6 +202,8 @@ def create_entry(db: Session, data: schemas.TimeEntryCreate) -> models.TimeEntry
     )
     entry = models.TimeEntry(**entry_data)
     db.add(entry)
+    db.flush()
+    _rollup_add(db, entry)
     db.commit()
     db.refresh(entry)
     return entry
@@ -77,9 +213,12 @@ def update_entry(db: Session, entry_id, data: schemas.TimeEntryUpdate) -> Option
     entry = get_entry(db, entry_id)
     if not entry:
         return None
+    old_key, old_values = _rollup_key(entry), _rollup_values(entry)
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(entry, key, value)
     entry.duration_minutes = _calculate_duration(entry.start_time, entry.end_time)
+    _rollup_remove(db, old_key, old_values)
+    _rollup_add(db, entry)
     db.commit()
     db.refresh(entry)
     return entry
@@ -88,260 +227,602 @@ def update_entry(db: Session, entry_id, data: schemas.TimeEntryUpdate) -> Option
 def delete_entry(db: Session, entry_id) -> bool:
     entry = get_entry(db, entry_id)
     if entry:
+        _rollup_remove(db, _rollup_key(entry), _rollup_values(entry))
         db.delete(entry)
         db.commit()
         return True
     return False
 
 
-def approve_entry(db: Session, entry_id) -> Optional[models.TimeEntry]:
+def _set_approved(db: Session, entry_id, approved: bool) -> Optional[models.TimeEntry]:
     entry = get_entry(db, entry_id)
     if not entry:
         return None
-    entry.is_approved = True
+    if bool(entry.is_approved) != approved:
+        minutes = entry.duration_minutes or 0
+        _apply_rollup_delta(db, _rollup_key(entry), 0, minutes if approved else -minutes, 0)
+    entry.is_approved = approved
     db.commit()
     db.refresh(entry)
     return entry
 
 
+def approve_entry(db: Session, entry_id) -> Optional[models.TimeEntry]:
+    return _set_approved(db, entry_id, True)
+
+
 def reject_entry(db: Session, entry_id) -> Optional[models.TimeEntry]:
-    entry = get_entry(db, entry_id)
-    if not entry:
-        return None
-    entry.is_approved = False
-    db.commit()
-    db.refresh(entry)
-    return entry
+    return _set_approved(db, entry_id, False)
 
 
-def get_stats(db: Session, employee_id: Optional[UUID] = None) -> dict:
-    query = db.query(models.TimeEntry)
+# ---------------------------
+# Bulk-Import / Bulk-Freigabe
+# ---------------------------
+
+BULK_INSERT_CHUNK_SIZE = 1000
+
+
+def _overlaps(start: datetime, end: datetime, intervals: list[tuple[datetime, datetime]]) -> bool:
+    return any(start < other_end and other_start < end for other_start, other_end in intervals)
+
+
+def bulk_create_entries(
+    db: Session,
+    entries: list[schemas.TimeEntryCreate],
+    all_or_nothing: bool = False,
+) -> list[dict]:
+    """
+    Legt viele Zeiteinträge in einer Transaktion an (z.B. Sync der Timer-App).
+
+    - Mitarbeiter/Projekte werden mit je einer IN-Query geprüft
+    - Bestehende Einträge der betroffenen Mitarbeiter im Zeitraum des
+      Batches werden einmal geladen; Überschneidungen (auch innerhalb des
+      Batches) werden pro Mitarbeiter in-memory geprüft
+    - Gültige Zeilen per mehrzeiligem INSERT, Rollup je Bucket einmal
+    - Ein Commit für den gesamten Batch
+
+    Laufende Einträge (ohne end_time) werden nicht auf Überschneidung geprüft.
+
+    Returns:
+        Ergebnis pro Zeile (Reihenfolge wie angefragt):
+        index, time_entry_id, success, error
+    """
+    from app.modules.employees.models import Employee
+    from app.modules.backoffice.projects.models import Project
+
+    TimeEntry = models.TimeEntry
+    employee_ids = {e.employee_id for e in entries}
+    project_ids = {e.project_id for e in entries if e.project_id}
+    known_employees = set(db.scalars(select(Employee.id).where(Employee.id.in_(employee_ids))))
+    known_projects = (
+        set(db.scalars(select(Project.id).where(Project.id.in_(project_ids)))) if project_ids else set()
+    )
+
+    intervals: dict[UUID, list[tuple[datetime, datetime]]] = defaultdict(list)
+    closed = [e for e in entries if e.end_time]
+    if closed:
+        window_start = min(e.start_time for e in closed)
+        window_end = max(e.end_time for e in closed)
+        existing = db.execute(
+            select(TimeEntry.employee_id, TimeEntry.start_time, TimeEntry.end_time).where(
+                TimeEntry.employee_id.in_(employee_ids),
+                TimeEntry.end_time.is_not(None),
+                TimeEntry.start_time < window_end,
+                TimeEntry.end_time > window_start,
+            )
+        ).all()
+        for employee_id, start, end in existing:
+            intervals[employee_id].append((start, end))
+
+    results: list[dict] = []
+    rows: list[dict] = []
+    for index, data in enumerate(entries):
+        result = {"index": index, "time_entry_id": None, "success": False, "error": None}
+        results.append(result)
+
+        if data.employee_id not in known_employees:
+            result["error"] = f"Mitarbeiter {data.employee_id} nicht gefunden"
+        elif data.project_id and data.project_id not in known_projects:
+            result["error"] = f"Projekt {data.project_id} nicht gefunden"
+        elif data.end_time and data.end_time <= data.start_time:
+            result["error"] = "end_time muss nach start_time liegen"
+        elif data.end_time and _overlaps(data.start_time, data.end_time, intervals[data.employee_id]):
+            result["error"] = "Überschneidet sich mit einem anderen Eintrag des Mitarbeiters"
+        if result["error"]:
+            continue
+
+        if data.end_time:
+            intervals[data.employee_id].append((data.start_time, data.end_time))
+        row = data.model_dump()
+        row["id"] = uuid.uuid4()
+        row["duration_minutes"] = _calculate_duration(data.start_time, data.end_time)
+        row["is_approved"] = False
+        row["is_invoiced"] = False
+        rows.append(row)
+        result["time_entry_id"] = row["id"]
+        result["success"] = True
+
+    if all_or_nothing and len(rows) < len(entries):
+        for result in results:
+            if result["success"]:
+                result["success"] = False
+                result["time_entry_id"] = None
+                result["error"] = "Nicht angelegt: Batch abgebrochen (all_or_nothing)"
+        return results
+
+    if not rows:
+        return results
+
+    deltas: dict[RollupKey, list[int]] = defaultdict(lambda: [0, 0])
+    for row in rows:
+        key = (row["start_time"].date(), row["employee_id"], row["project_id"], bool(row["billable"]))
+        deltas[key][0] += row["duration_minutes"] or 0
+        deltas[key][1] += 1
+
+    try:
+        for start in range(0, len(rows), BULK_INSERT_CHUNK_SIZE):
+            db.execute(insert(TimeEntry), rows[start:start + BULK_INSERT_CHUNK_SIZE])
+        for key, (minutes, count) in deltas.items():
+            _apply_rollup_delta(db, key, minutes, 0, count)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to import time entries: {str(e)}")
+
+    return results
+
+
+def bulk_set_approved(
+    db: Session,
+    approved: bool,
+    entry_ids: Optional[list[UUID]] = None,
+    employee_id: Optional[UUID] = None,
+    project_id: Optional[UUID] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    user_id: Optional[str] = None,
+) -> list[dict]:
+    """
+    Gibt Einträge per ID-Liste oder Filter frei bzw. lehnt sie ab.
+
+    Ein UPDATE ... RETURNING ändert nur Einträge, deren Status abweicht;
+    die Rückgabe speist Rollup-Deltas (je Bucket) und die Bulk-Audit-Einträge.
+    Ein Commit für den gesamten Batch.
+
+    Returns:
+        Ergebnis pro Eintrag: time_entry_id, success, changed, error.
+        Bei ID-Listen in angefragter Reihenfolge inkl. unveränderter und
+        unbekannter IDs, bei Filtern nur die geänderten Einträge.
+    """
+    TimeEntry = models.TimeEntry
+    conditions = []
+    ids = list(dict.fromkeys(entry_ids or []))
+    if entry_ids is not None:
+        conditions.append(TimeEntry.id.in_(ids))
     if employee_id:
-        query = query.filter(models.TimeEntry.employee_id == employee_id)
+        conditions.append(TimeEntry.employee_id == employee_id)
+    if project_id:
+        conditions.append(TimeEntry.project_id == project_id)
+    if start_date:
+        conditions.append(TimeEntry.start_time >= datetime.combine(start_date, time.min))
+    if end_date:
+        conditions.append(TimeEntry.start_time <= datetime.combine(end_date, time.max))
+
+    try:
+        changed = db.execute(
+            update(TimeEntry)
+            .where(*conditions, TimeEntry.is_approved != approved)
+            .values(is_approved=approved)
+            .returning(
+                TimeEntry.id,
+                TimeEntry.start_time,
+                TimeEntry.employee_id,
+                TimeEntry.project_id,
+                TimeEntry.billable,
+                TimeEntry.duration_minutes,
+            ),
+            execution_options={"synchronize_session": False},
+        ).all()
+
+        deltas: dict[RollupKey, int] = defaultdict(int)
+        for row in changed:
+            key = (row.start_time.date(), row.employee_id, row.project_id, bool(row.billable))
+            deltas[key] += row.duration_minutes or 0
+        for key, minutes in deltas.items():
+            _apply_rollup_delta(db, key, 0, minutes if approved else -minutes, 0)
+
+        log_audit_bulk(
+            db,
+            [
+                {
+                    "entity_type": "TimeEntry",
+                    "entity_id": row.id,
+                    "action": "status_change",
+                    "old_values": {"is_approved": not approved},
+                    "new_values": {"is_approved": approved},
+                }
+                for row in changed
+            ],
+            user_id=user_id,
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to update time entries: {str(e)}")
+
+    changed_ids = {row.id for row in changed}
+    if entry_ids is None:
+        return [
+            {"time_entry_id": row.id, "success": True, "changed": True, "error": None}
+            for row in changed
+        ]
+
+    unchanged = set(db.scalars(select(TimeEntry.id).where(*conditions))) - changed_ids
+    results = []
+    for entry_id in ids:
+        result = {"time_entry_id": entry_id, "success": True, "changed": entry_id in changed_ids, "error": None}
+        if not result["changed"] and entry_id not in unchanged:
+            result["success"] = False
+            result["error"] = f"Zeiteintrag {entry_id} nicht gefunden (oder außerhalb des Filters)"
+        results.append(result)
+    return results
+
+
+def get_stats(db: Session, employee_id: Optional[UUID] = None) -> dict:
+    """
+    Kennzahlen der Zeiterfassung, komplett in SQL aggregiert.
+
+    Drei Statements unabhängig von der Anzahl Einträge:
+    - Summen für heute/Woche/Monat/billable per SUM(...) FILTER (WHERE ...)
+    - GROUP BY project_id
+    - GROUP BY task_type
 
-    entries = query.all()
+    Mit employee_id nutzen alle drei ix_time_entries_employee_start.
+    """
+    TimeEntry = models.TimeEntry
 
     now = datetime.utcnow()
     today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
     week_start = today_start - timedelta(days=today_start.weekday())
     month_start = today_start.replace(day=1)
 
-    def _sum_hours(items):
-        return round(sum((e.duration_minutes or 0) for e in items) / 60, 2)
-
-    today_entries = [e for e in entries if e.start_time >= today_start]
-    week_entries = [e for e in entries if e.start_time >= week_start]
-    month_entries = [e for e in entries if e.start_time >= month_start]
-
-    project_map: dict[str, float] = {}
-    for e in entries:
-        pid = str(e.project_id) if e.project_id else "no_project"
-        project_map[pid] = project_map.get(pid, 0) + (e.duration_minutes or 0)
-    hours_by_project = [{"project_id": k, "hours": round(v / 60, 2)} for k, v in project_map.items()]
-
-    type_map: dict[str, float] = {}
-    for e in entries:
-        tt = e.task_type or "unspecified"
-        type_map[tt] = type_map.get(tt, 0) + (e.duration_minutes or 0)
-    hours_by_task_type = [{"task_type": k, "hours": round(v / 60, 2)} for k, v in type_map.items()]
+    minutes = func.coalesce(TimeEntry.duration_minutes, 0)
+    scope = [TimeEntry.employee_id == employee_id] if employee_id else []
+
+    def _minutes_where(condition):
+        return func.coalesce(func.sum(minutes).filter(condition), 0)
+
+    totals = db.execute(
+        select(
+            _minutes_where(TimeEntry.start_time >= today_start).label("today"),
+            _minutes_where(TimeEntry.start_time >= week_start).label("week"),
+            _minutes_where(TimeEntry.start_time >= month_start).label("month"),
+            func.count(TimeEntry.id).label("entries"),
+            _minutes_where(TimeEntry.billable == True).label("billable"),  # noqa: E712
+            _minutes_where(TimeEntry.billable == False).label("non_billable"),  # noqa: E712
+        ).where(*scope)
+    ).one()
+
+    by_project = db.execute(
+        select(TimeEntry.project_id, func.sum(minutes))
+        .where(*scope)
+        .group_by(TimeEntry.project_id)
+    ).all()
+    # Leere task_type zählen wie bisher zu "unspecified"
+    task_type = func.coalesce(func.nullif(TimeEntry.task_type, ""), "unspecified")
+    by_task_type = db.execute(
+        select(task_type, func.sum(minutes))
+        .where(*scope)
+        .group_by(task_type)
+    ).all()
+
+    def _hours(total_minutes) -> float:
+        return round((total_minutes or 0) / 60, 2)
 
     return {
-        "total_hours_today": _sum_hours(today_entries),
-        "total_hours_week": _sum_hours(week_entries),
-        "total_hours_month": _sum_hours(month_entries),
-        "total_entries": len(entries),
-        "billable_hours": _sum_hours([e for e in entries if e.billable]),
-        "non_billable_hours": _sum_hours([e for e in entries if not e.billable]),
-        "hours_by_project": hours_by_project,
-        "hours_by_task_type": hours_by_task_type,
+        "total_hours_today": _hours(totals.today),
+        "total_hours_week": _hours(totals.week),
+        "total_hours_month": _hours(totals.month),
+        "total_entries": totals.entries,
+        "billable_hours": _hours(totals.billable),
+        "non_billable_hours": _hours(totals.non_billable),
+        "hours_by_project": [
+            {"project_id": str(pid) if pid else "no_project", "hours": _hours(m)}
+            for pid, m in by_project
+        ],
+        "hours_by_task_type": [
+            {"task_type": tt, "hours": _hours(m)}
+            for tt, m in by_task_type
+        ],
     }
 
 
+def _billable_minutes():
+    """Minuten eines Eintrags (wie TimeEntry.duration_hours: gespeicherte Dauer)."""
+    return func.coalesce(models.TimeEntry.duration_minutes, 0)
+
+
 def get_billable_uninvoiced(
     db: Session,
     customer_id: Optional[UUID] = None,
     project_id: Optional[UUID] = None,
     employee_id: Optional[UUID] = None,
 ) -> schemas.BillableUninvoicedResponse:
+    """
+    Abrechenbare, noch nicht abgerechnete Einträge.
+
+    Ein Statement mit reiner Spalten-Projektion (Mitarbeiter- und
+    Projektname per JOIN); Beträge pro Zeile und die Summen kommen aus SQL
+    (Window-Summen über alle Zeilen).
+    """
     from app.modules.employees.models import Employee
     from app.modules.backoffice.projects.models import Project
 
-    query = (
-        db.query(models.TimeEntry)
-        .join(Employee, models.TimeEntry.employee_id == Employee.id)
-        .outerjoin(Project, models.TimeEntry.project_id == Project.id)
-        .filter(
-            models.TimeEntry.billable == True,
-            models.TimeEntry.is_invoiced == False,
+    TimeEntry = models.TimeEntry
+    minutes = _billable_minutes()
+    amount = minutes * TimeEntry.hourly_rate / 60
+    effective_customer = func.coalesce(TimeEntry.customer_id, Project.customer_id)
+
+    stmt = (
+        select(
+            TimeEntry.id,
+            TimeEntry.start_time,
+            Employee.first_name,
+            Employee.last_name,
+            TimeEntry.project_id,
+            Project.title.label("project_name"),
+            effective_customer.label("customer_id"),
+            TimeEntry.task_type,
+            TimeEntry.note,
+            minutes.label("minutes"),
+            TimeEntry.hourly_rate,
+            amount.label("amount"),
+            func.sum(minutes).over().label("total_minutes"),
+            func.sum(amount).over().label("total_amount"),
+        )
+        .join(Employee, TimeEntry.employee_id == Employee.id)
+        .outerjoin(Project, TimeEntry.project_id == Project.id)
+        .where(
+            TimeEntry.billable == True,  # noqa: E712
+            TimeEntry.is_invoiced == False,  # noqa: E712
         )
     )
-
     if customer_id:
-        query = query.filter(
-            or_(
-                Project.customer_id == customer_id,
-                models.TimeEntry.customer_id == customer_id,
-            )
-        )
+        stmt = stmt.where(effective_customer == customer_id)
     if project_id:
-        query = query.filter(models.TimeEntry.project_id == project_id)
+        stmt = stmt.where(TimeEntry.project_id == project_id)
     if employee_id:
-        query = query.filter(models.TimeEntry.employee_id == employee_id)
-
-    entries = query.order_by(models.TimeEntry.start_time.desc()).all()
-
-    billable_entries: list[schemas.BillableEntry] = []
-    total_hours = 0.0
-    total_amount = Decimal("0.00")
-
-    for entry in entries:
-        duration_hours = entry.duration_hours or 0.0
-        hourly_rate = entry.hourly_rate
-        amount: Optional[Decimal] = None
-        if hourly_rate is not None:
-            amount = Decimal(str(round(duration_hours, 4))) * hourly_rate
-            total_amount += amount
-
-        total_hours += duration_hours
-
-        # customer_id: direkt auf Entry oder über Projekt
-        effective_customer_id = entry.customer_id or (
-            entry.project.customer_id if entry.project else None
-        )
-        billable_entries.append(
-            schemas.BillableEntry(
-                id=entry.id,
-                date=entry.start_time.date(),
-                employee_name=f"{entry.employee.first_name} {entry.employee.last_name}",
-                project_id=entry.project_id,
-                project_name=entry.project.title if entry.project else None,
-                customer_id=effective_customer_id,
-                task_type=entry.task_type,
-                note=entry.note,
-                duration_hours=round(duration_hours, 2),
-                hourly_rate=hourly_rate,
-                amount=amount,
-            )
+        stmt = stmt.where(TimeEntry.employee_id == employee_id)
+
+    rows = db.execute(stmt.order_by(TimeEntry.start_time.desc())).all()
+
+    entries = [
+        schemas.BillableEntry(
+            id=row.id,
+            date=row.start_time.date(),
+            employee_name=f"{row.first_name} {row.last_name}",
+            project_id=row.project_id,
+            project_name=row.project_name,
+            customer_id=row.customer_id,
+            task_type=row.task_type,
+            note=row.note,
+            duration_hours=round(row.minutes / 60, 2),
+            hourly_rate=row.hourly_rate,
+            amount=Decimal(str(row.amount)) if row.amount is not None else None,
         )
+        for row in rows
+    ]
+    total_minutes = rows[0].total_minutes if rows else 0
+    total_amount = rows[0].total_amount if rows and rows[0].total_amount is not None else 0
 
     return schemas.BillableUninvoicedResponse(
-        entries=billable_entries,
-        total_hours=round(total_hours, 2),
-        total_amount=total_amount,
+        entries=entries,
+        total_hours=round((total_minutes or 0) / 60, 2),
+        total_amount=Decimal(str(total_amount)),
     )
 
 
-def create_invoice_from_entries(
-    db: Session,
-    data: schemas.CreateInvoiceFromEntries,
-):
-    from app.modules.backoffice.invoices import crud as invoices_crud
-    from app.modules.backoffice.invoices import schemas as invoice_schemas
+def _claim_entries(db: Session, entry_ids: list[UUID]) -> list:
+    """
+    Markiert Einträge race-sicher als abgerechnet (ohne Commit).
+
+    Ein UPDATE ... WHERE id IN (...) AND billable AND NOT is_invoiced
+    RETURNING: parallel abgerechnete Einträge fallen heraus statt doppelt
+    berechnet zu werden. Wurden nicht alle Einträge erfasst, wird
+    zurückgerollt und 404 (unbekannt) bzw. 422 (nicht abrechenbar) geworfen.
+
+    Returns:
+        Zeilen mit id, task_type, minutes
+    """
+    TimeEntry = models.TimeEntry
+    claimed = db.execute(
+        update(TimeEntry)
+        .where(
+            TimeEntry.id.in_(entry_ids),
+            TimeEntry.billable == True,  # noqa: E712
+            TimeEntry.is_invoiced == False,  # noqa: E712
+        )
+        .values(is_invoiced=True)
+        .returning(TimeEntry.id, TimeEntry.task_type, _billable_minutes().label("minutes")),
+        execution_options={"synchronize_session": False},
+    ).all()
 
-    # 1. Einträge laden und validieren
-    entries = (
-        db.query(models.TimeEntry)
-        .filter(models.TimeEntry.id.in_(data.time_entry_ids))
-        .all()
-    )
+    if len(claimed) == len(set(entry_ids)):
+        return claimed
 
-    found_ids = {e.id for e in entries}
-    missing = set(data.time_entry_ids) - found_ids
+    db.rollback()
+    found = set(db.scalars(select(TimeEntry.id).where(TimeEntry.id.in_(entry_ids))))
+    missing = set(entry_ids) - found
     if missing:
         raise HTTPException(
             status_code=404,
             detail=f"Zeiteinträge nicht gefunden: {[str(i) for i in missing]}",
         )
+    invalid = found - {row.id for row in claimed}
+    raise HTTPException(
+        status_code=422,
+        detail=(
+            f"Folgende Einträge sind nicht billable oder bereits abgerechnet: "
+            f"{[str(i) for i in invalid]}"
+        ),
+    )
 
-    invalid = [e for e in entries if not e.billable or e.is_invoiced]
-    if invalid:
-        raise HTTPException(
-            status_code=422,
-            detail=(
-                f"Folgende Einträge sind nicht billable oder bereits abgerechnet: "
-                f"{[str(e.id) for e in invalid]}"
-            ),
+
+def _line_items(claimed: list, hourly_rate: Decimal, group_by_task_type: bool) -> list:
+    from app.modules.backoffice.invoices import schemas as invoice_schemas
+
+    groups: dict[str, int] = defaultdict(int)
+    for row in claimed:
+        key = (row.task_type or "IT-Dienstleistung") if group_by_task_type else "Erbrachte Leistungen"
+        groups[key] += row.minutes
+
+    return [
+        invoice_schemas.InvoiceLineItemCreate(
+            position=pos,
+            description=description,
+            quantity=Decimal(str(round(total_minutes / 60, 2))),
+            unit="Stunden",
+            unit_price=hourly_rate,
         )
+        for pos, (description, total_minutes) in enumerate(groups.items(), start=1)
+    ]
 
-    # 2. Line Items erstellen
-    if data.group_by_task_type:
-        groups: dict[str, list] = defaultdict(list)
-        for entry in entries:
-            key = entry.task_type or "IT-Dienstleistung"
-            groups[key].append(entry)
-
-        line_items = []
-        for pos, (task_type, group_entries) in enumerate(groups.items(), start=1):
-            total_group_hours = sum(e.duration_hours or 0.0 for e in group_entries)
-            line_items.append(
-                invoice_schemas.InvoiceLineItemCreate(
-                    position=pos,
-                    description=task_type,
-                    quantity=Decimal(str(round(total_group_hours, 2))),
-                    unit="Stunden",
-                    unit_price=data.hourly_rate,
-                )
-            )
-    else:
-        total_hours = sum(e.duration_hours or 0.0 for e in entries)
-        line_items = [
-            invoice_schemas.InvoiceLineItemCreate(
-                position=1,
-                description="Erbrachte Leistungen",
-                quantity=Decimal(str(round(total_hours, 2))),
-                unit="Stunden",
-                unit_price=data.hourly_rate,
-            )
-        ]
 
-    # 3. Rechnung erstellen (AUTO-Nummernvergabe)
+def _invoice_claimed_entries(
+    db: Session,
+    entry_ids: list[UUID],
+    customer_id: UUID,
+    project_id: Optional[UUID],
+    hourly_rate: Decimal,
+    group_by_task_type: bool,
+    notes: Optional[str],
+):
+    """Einträge beanspruchen und Rechnung anlegen – ein gemeinsamer Commit."""
+    from app.modules.backoffice.invoices import crud as invoices_crud
+    from app.modules.backoffice.invoices import schemas as invoice_schemas
+
+    claimed = _claim_entries(db, entry_ids)
     invoice_create = invoice_schemas.InvoiceCreate(
         invoice_number="AUTO",
+        customer_id=customer_id,
+        project_id=project_id,
+        issued_date=date.today(),
+        notes=notes,
+        line_items=_line_items(claimed, hourly_rate, group_by_task_type),
+    )
+    # create_invoice committet (inkl. is_invoiced) bzw. rollt bei Fehlern
+    # zurück – dann sind auch die Einträge wieder frei
+    return invoices_crud.create_invoice(db, invoice_create)
+
+
+def create_invoice_from_entries(
+    db: Session,
+    data: schemas.CreateInvoiceFromEntries,
+):
+    return _invoice_claimed_entries(
+        db,
+        entry_ids=list(data.time_entry_ids),
         customer_id=data.customer_id,
         project_id=data.project_id,
-        issued_date=date.today(),
+        hourly_rate=data.hourly_rate,
+        group_by_task_type=data.group_by_task_type,
         notes=data.notes,
-        line_items=line_items,
     )
-    invoice = invoices_crud.create_invoice(db, invoice_create)
 
-    # 4. Einträge als abgerechnet markieren
-    for entry in entries:
-        entry.is_invoiced = True
-    db.commit()
 
-    return invoice
+def create_invoices_from_entries(
+    db: Session,
+    data: schemas.CreateInvoicesFromEntries,
+) -> schemas.CreateInvoicesFromEntriesResponse:
+    """
+    Rechnet Einträge mehrerer Kunden in einem Aufruf ab.
+
+    Gruppiert nach Kunde (Eintrag oder Projekt) und optional Projekt; pro
+    Gruppe eine Rechnung. Jede Gruppe wird für sich beansprucht und
+    committet – scheitert eine Gruppe, bleiben die anderen bestehen.
+    """
+    from app.modules.backoffice.projects.models import Project
+
+    TimeEntry = models.TimeEntry
+    effective_customer = func.coalesce(TimeEntry.customer_id, Project.customer_id)
+    rows = db.execute(
+        select(TimeEntry.id, effective_customer, TimeEntry.project_id)
+        .outerjoin(Project, TimeEntry.project_id == Project.id)
+        .where(TimeEntry.id.in_(data.time_entry_ids))
+    ).all()
+
+    result = schemas.CreateInvoicesFromEntriesResponse()
+    found = {row[0] for row in rows}
+    missing = [i for i in dict.fromkeys(data.time_entry_ids) if i not in found]
+    if missing:
+        result.failed.append(schemas.InvoiceFromEntriesResult(
+            time_entry_ids=missing, error="Zeiteinträge nicht gefunden",
+        ))
+
+    groups: dict[tuple, list[UUID]] = defaultdict(list)
+    for entry_id, customer_id, project_id in rows:
+        groups[(customer_id, project_id if data.split_by_project else None)].append(entry_id)
+
+    for (customer_id, project_id), entry_ids in groups.items():
+        group = schemas.InvoiceFromEntriesResult(
+            customer_id=customer_id, project_id=project_id, time_entry_ids=entry_ids,
+        )
+        if customer_id is None:
+            group.error = "Einträge ohne Kunde (weder am Eintrag noch am Projekt)"
+            result.failed.append(group)
+            continue
+        try:
+            invoice = _invoice_claimed_entries(
+                db,
+                entry_ids=entry_ids,
+                customer_id=customer_id,
+                project_id=project_id,
+                hourly_rate=data.hourly_rate,
+                group_by_task_type=data.group_by_task_type,
+                notes=data.notes,
+            )
+        except HTTPException as e:
+            group.error = str(e.detail)
+            result.failed.append(group)
+            continue
+        group.invoice_id = invoice.id
+        group.invoice_number = invoice.invoice_number
+        group.total = invoice.total
+        result.invoices.append(group)
+
+    return result
 
 
 def get_weekly_summary(db: Session, employee_id: UUID, year: int, week: int) -> dict:
+    """Wochenübersicht eines Mitarbeiters aus den Tages-Buckets (time_daily_rollups)."""
     monday = date.fromisocalendar(year, week, 1)
     sunday = monday + timedelta(days=6)
 
-    entries = (
-        db.query(models.TimeEntry)
-        .filter(
-            models.TimeEntry.employee_id == employee_id,
-            models.TimeEntry.start_time >= datetime.combine(monday, time.min),
-            models.TimeEntry.start_time <= datetime.combine(sunday, time.max),
+    Rollup = models.TimeDailyRollup
+    rows = db.execute(
+        select(Rollup.day, func.sum(Rollup.total_minutes), func.sum(Rollup.entry_count))
+        .where(
+            Rollup.employee_id == employee_id,
+            Rollup.day >= monday,
+            Rollup.day <= sunday,
         )
-        .all()
-    )
+        .group_by(Rollup.day)
+    ).all()
+    by_day = {day: (minutes or 0, count or 0) for day, minutes, count in rows}
 
-    daily: dict[str, dict] = {}
+    daily = []
     for i in range(7):
         day = monday + timedelta(days=i)
-        daily[day.isoformat()] = {"date": day.isoformat(), "hours": 0.0, "entries_count": 0}
-
-    for e in entries:
-        day_key = e.start_time.date().isoformat()
-        if day_key in daily:
-            daily[day_key]["hours"] = round(daily[day_key]["hours"] + (e.duration_minutes or 0) / 60, 2)
-            daily[day_key]["entries_count"] += 1
+        minutes, count = by_day.get(day, (0, 0))
+        daily.append({"date": day.isoformat(), "hours": round(minutes / 60, 2), "entries_count": count})
 
-    total = round(sum(d["hours"] for d in daily.values()), 2)
+    total = round(sum(d["hours"] for d in daily), 2)
+    # Soll laut Arbeitszeitmodell, Feiertage ausgenommen
+    target = working_hours(monday, sunday, work_week_for_employee(db, employee_id))
     return {
         "employee_id": employee_id,
         "week": f"{year}-W{week:02d}",
         "total_hours": total,
-        "daily_breakdown": list(daily.values()),
+        "target_hours": float(target),
+        "daily_breakdown": daily,
     }
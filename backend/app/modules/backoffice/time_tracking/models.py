@@ -13,10 +13,10 @@ Falls du TimeEntry hier haben willst, lösche es aus projects/models.py!
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
-from sqlalchemy import String, Text, ForeignKey, DateTime, Numeric
+from sqlalchemy import Date, DateTime, ForeignKey, Index, Integer, Numeric, String, Text, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.core.mixins import UUIDMixin, TimestampMixin
 
@@ -38,6 +38,11 @@ class TimeEntry(Base, UUIDMixin, TimestampMixin):
     """
 
     __tablename__ = "time_entries"
+    __table_args__ = (
+        # Statistiken/Reports je Mitarbeiter bzw. Projekt über Zeiträume
+        Index("ix_time_entries_employee_start", "employee_id", "start_time"),
+        Index("ix_time_entries_project_start", "project_id", "start_time"),
+    )
 
     # Foreign Keys
     employee_id: Mapped[uuid.UUID] = mapped_column(
@@ -105,6 +110,45 @@ class TimeEntry(Base, UUIDMixin, TimestampMixin):
         return f"<TimeEntry(id={self.id}, employee={self.employee_id}, duration={self.duration_hours}h)>"
 
 
+class TimeDailyRollup(Base, UUIDMixin):
+    """
+    Vorab aggregierte Zeiten pro Tag, Mitarbeiter, Projekt und billable-Flag.
+
+    Wird von create/update/delete/approve/reject_entry inkrementell gepflegt
+    und kann über scripts/rebuild_time_rollup.py komplett neu aufgebaut
+    werden. Wochenübersicht und Projekt-Kennzahlen lesen nur diese Buckets.
+    """
+    __tablename__ = "time_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "day", "employee_id", "project_id", "billable",
+            name="uq_time_daily_rollup_bucket",
+            postgresql_nulls_not_distinct=True,
+        ),
+        Index("ix_time_daily_rollups_employee_day", "employee_id", "day"),
+        Index("ix_time_daily_rollups_project_day", "project_id", "day"),
+    )
+
+    day: Mapped[date] = mapped_column(Date, nullable=False, comment="Tag (aus TimeEntry.start_time)")
+    employee_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    project_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("projects.id", ondelete="CASCADE")
+    )
+    billable: Mapped[bool] = mapped_column(nullable=False)
+    total_minutes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    approved_minutes: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+    entry_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return (
+            f"<TimeDailyRollup(day={self.day}, employee={self.employee_id}, "
+            f"project={self.project_id}, minutes={self.total_minutes})>"
+        )
+
+
 # === OPTION 2: Zusätzliche Zeit-bezogene Models ===
 class WorkingHoursTemplate(Base, UUIDMixin, TimestampMixin):
     """
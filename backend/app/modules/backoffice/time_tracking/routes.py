@@ -76,6 +76,83 @@ def create_invoice_from_entries(
     return crud.create_invoice_from_entries(db, data)
 
 
+@router.post("/create-invoices", response_model=schemas.CreateInvoicesFromEntriesResponse)
+@require_permissions(["backoffice.time_tracking.write", "backoffice.*"])
+def create_invoices_from_entries(
+    data: schemas.CreateInvoicesFromEntries,
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Einträge mehrerer Kunden abrechnen: eine Rechnung pro Kunde (optional pro Projekt)."""
+    return crud.create_invoices_from_entries(db, data)
+
+
+# ─── Bulk Endpoints (VOR /{entry_id}) ───────────────────────
+
+@router.post("/bulk", response_model=schemas.TimeEntryBulkCreateResponse)
+@require_permissions(["backoffice.time_tracking.write", "backoffice.*"])
+def bulk_create_entries(
+    data: schemas.TimeEntryBulkCreate,
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Viele Einträge in einer Transaktion anlegen (Import/Sync).
+
+    Überschneidungen je Mitarbeiter werden geprüft – gegen bestehende
+    Einträge und innerhalb des Batches. Ergebnis pro Zeile.
+    """
+    results = crud.bulk_create_entries(db, data.entries, all_or_nothing=data.all_or_nothing)
+    failed = sum(1 for r in results if not r["success"])
+    return schemas.TimeEntryBulkCreateResponse(
+        success_count=len(results) - failed,
+        failed_count=failed,
+        results=results,
+    )
+
+
+def _bulk_approval(db: Session, data: schemas.TimeEntryBulkApproval, approved: bool, user: dict):
+    results = crud.bulk_set_approved(
+        db,
+        approved,
+        entry_ids=data.time_entry_ids,
+        employee_id=data.employee_id,
+        project_id=data.project_id,
+        start_date=data.start_date,
+        end_date=data.end_date,
+        user_id=str(user.get("id")) if user.get("id") else None,
+    )
+    failed = sum(1 for r in results if not r["success"])
+    return schemas.TimeEntryBulkApprovalResponse(
+        success_count=len(results) - failed,
+        changed_count=sum(1 for r in results if r["changed"]),
+        failed_count=failed,
+        results=results,
+    )
+
+
+@router.put("/bulk/approve", response_model=schemas.TimeEntryBulkApprovalResponse)
+@require_permissions(["backoffice.time_tracking.approve", "backoffice.*"])
+def bulk_approve_entries(
+    data: schemas.TimeEntryBulkApproval,
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Einträge per ID-Liste oder Filter freigeben (ein UPDATE, Audit je Eintrag)."""
+    return _bulk_approval(db, data, True, user)
+
+
+@router.put("/bulk/reject", response_model=schemas.TimeEntryBulkApprovalResponse)
+@require_permissions(["backoffice.time_tracking.approve", "backoffice.*"])
+def bulk_reject_entries(
+    data: schemas.TimeEntryBulkApproval,
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """Freigabe per ID-Liste oder Filter zurücknehmen (ein UPDATE, Audit je Eintrag)."""
+    return _bulk_approval(db, data, False, user)
+
+
 # ─── CRUD Endpoints ─────────────────────────────────────────
 
 @router.get("/", response_model=list[schemas.TimeEntryResponse])
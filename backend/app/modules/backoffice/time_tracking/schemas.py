@@ -4,7 +4,7 @@ from typing import Optional
 from decimal import Decimal
 import uuid
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, model_validator
 
 
 # ─── Time Entry Schemas ──────────────────────────────────────
@@ -50,6 +50,63 @@ class TimeEntryResponse(TimeEntryBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+# ─── Bulk Schemas ────────────────────────────────────────────
+
+class TimeEntryBulkCreate(BaseModel):
+    """Mehrere Einträge auf einmal anlegen (z.B. Sync der Timer-App)."""
+    entries: list[TimeEntryCreate] = Field(..., min_length=1, max_length=5000)
+    all_or_nothing: bool = Field(
+        default=False,
+        description="Bei mindestens einer ungültigen Zeile wird nichts angelegt"
+    )
+
+
+class TimeEntryBulkCreateResult(BaseModel):
+    """Ergebnis einer einzelnen Zeile im Bulk-Import."""
+    index: int
+    time_entry_id: Optional[uuid.UUID] = None
+    success: bool
+    error: Optional[str] = None
+
+
+class TimeEntryBulkCreateResponse(BaseModel):
+    success_count: int
+    failed_count: int
+    results: list[TimeEntryBulkCreateResult] = Field(default_factory=list)
+
+
+class TimeEntryBulkApproval(BaseModel):
+    """Einträge per ID-Liste und/oder Filter freigeben bzw. ablehnen."""
+    time_entry_ids: Optional[list[uuid.UUID]] = Field(None, min_length=1, max_length=5000)
+    employee_id: Optional[uuid.UUID] = None
+    project_id: Optional[uuid.UUID] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+    @model_validator(mode="after")
+    def require_selection(self):
+        if self.time_entry_ids is None and not any(
+            (self.employee_id, self.project_id, self.start_date, self.end_date)
+        ):
+            raise ValueError("time_entry_ids oder mindestens ein Filter erforderlich")
+        return self
+
+
+class TimeEntryBulkApprovalResult(BaseModel):
+    """Ergebnis eines einzelnen Eintrags bei Bulk-Freigabe/-Ablehnung."""
+    time_entry_id: uuid.UUID
+    success: bool
+    changed: bool = Field(default=False, description="False bei No-Op (Status war bereits gesetzt)")
+    error: Optional[str] = None
+
+
+class TimeEntryBulkApprovalResponse(BaseModel):
+    success_count: int
+    changed_count: int
+    failed_count: int
+    results: list[TimeEntryBulkApprovalResult] = Field(default_factory=list)
+
+
 # ─── Statistics Schemas ──────────────────────────────────────
 
 class ProjectHours(BaseModel):
@@ -85,6 +142,7 @@ class WeeklySummaryResponse(BaseModel):
     employee_id: uuid.UUID
     week: str
     total_hours: float
+    target_hours: float = Field(0, description="Sollstunden der Woche (Arbeitszeitmodell, ohne Feiertage)")
     daily_breakdown: list[DaySummary]
 
 
@@ -117,3 +175,27 @@ class CreateInvoiceFromEntries(BaseModel):
     hourly_rate: Decimal
     group_by_task_type: bool = True
     notes: Optional[str] = None
+
+
+class CreateInvoicesFromEntries(BaseModel):
+    """Einträge mehrerer Kunden abrechnen – eine Rechnung pro Kunde (und Projekt)."""
+    time_entry_ids: list[uuid.UUID] = Field(..., min_length=1)
+    hourly_rate: Decimal
+    group_by_task_type: bool = True
+    split_by_project: bool = Field(False, description="Pro Kunde und Projekt eine eigene Rechnung")
+    notes: Optional[str] = None
+
+
+class InvoiceFromEntriesResult(BaseModel):
+    customer_id: Optional[uuid.UUID] = None
+    project_id: Optional[uuid.UUID] = None
+    time_entry_ids: list[uuid.UUID]
+    invoice_id: Optional[uuid.UUID] = None
+    invoice_number: Optional[str] = None
+    total: Optional[Decimal] = None
+    error: Optional[str] = None
+
+
+class CreateInvoicesFromEntriesResponse(BaseModel):
+    invoices: list[InvoiceFromEntriesResult] = Field(default_factory=list)
+    failed: list[InvoiceFromEntriesResult] = Field(default_factory=list)
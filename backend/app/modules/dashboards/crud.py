@@ -2,12 +2,19 @@
 WorkmateOS - Dashboards CRUD Operations (SQLAlchemy 2.x Compatible)
 """
 
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Callable
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import bindparam, or_, text, update
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.core.cache import TTLCache
+from app.core.settings.config import settings as app_settings
 
 from app.modules.dashboards.models import (
     Dashboard,
@@ -19,6 +26,56 @@ from app.modules.dashboards.models import (
 from app.modules.dashboards.schemas import DashboardCreate, DashboardUpdate
 
 
+# ================================================================
+# DEFAULTS (werden beim Anlegen eines Mitarbeiters geschrieben)
+# ================================================================
+
+DEFAULT_DASHBOARD: Dict[str, Any] = {
+    "widgets_json": {
+        "stats": {"enabled": True, "type": "stats"},
+        "recentReminders": {"enabled": True, "type": "reminders"},
+        "shortcuts": {"enabled": True, "type": "actions"},
+    },
+    "layout_json": {
+        "stats": {"x": 0, "y": 0, "w": 3, "h": 2},
+        "recentReminders": {"x": 3, "y": 0, "w": 3, "h": 2},
+        "shortcuts": {"x": 0, "y": 2, "w": 6, "h": 1},
+    },
+}
+
+DEFAULT_DOCK_ORDER = ["crm", "projects", "time_tracking", "invoices", "finance"]
+
+DEFAULT_USER_SETTINGS: Dict[str, Any] = {
+    "language": "de-DE",
+    "timezone": "Europe/Berlin",
+    "notifications_enabled": True,
+}
+
+
+def _default_os_preferences() -> Dict[str, Any]:
+    return {
+        "sidebar_collapsed": False,
+        "theme_mode": "system",
+        "favorite_apps": [],
+        "dock_order": list(DEFAULT_DOCK_ORDER),
+        "wallpaper": None,
+    }
+
+
+def create_user_defaults(db: Session, owner_id: UUID) -> None:
+    """
+    Legt Dashboard, OS Preferences und User Settings für einen neuen
+    Mitarbeiter an (ohne Commit – gehört zur Transaktion des Aufrufers).
+
+    Damit muss /dashboards/my-dashboard beim Lesen nichts mehr anlegen.
+    """
+    db.add_all([
+        Dashboard(owner_id=owner_id, **copy.deepcopy(DEFAULT_DASHBOARD)),
+        OSPreferences(owner_id=owner_id, **_default_os_preferences()),
+        UserSettings(owner_id=owner_id, **DEFAULT_USER_SETTINGS),
+    ])
+
+
 # ================================================================
 # BASIC DASHBOARD CRUD
 # ================================================================
@@ -97,19 +154,7 @@ def get_or_create_dashboard_for_owner(
         return dashboard
 
     # Default-Layout & Widgets für neue User
-    dashboard_create = DashboardCreate(
-        owner_id=owner_id,
-        widgets_json={
-            "stats": {"enabled": True, "type": "stats"},
-            "recentReminders": {"enabled": True, "type": "reminders"},
-            "shortcuts": {"enabled": True, "type": "actions"},
-        },
-        layout_json={
-            "stats": {"x": 0, "y": 0, "w": 3, "h": 2},
-            "recentReminders": {"x": 3, "y": 0, "w": 3, "h": 2},
-            "shortcuts": {"x": 0, "y": 2, "w": 6, "h": 1},
-        },
-    )
+    dashboard_create = DashboardCreate(owner_id=owner_id, **DEFAULT_DASHBOARD)
     return create_dashboard(db, dashboard_create)
 
 
@@ -122,14 +167,7 @@ def get_or_create_os_preferences(db: Session, owner_id: UUID) -> OSPreferences:
     if prefs:
         return prefs
 
-    prefs = OSPreferences(
-        owner_id=owner_id,
-        sidebar_collapsed=False,
-        theme_mode="system",
-        favorite_apps=[],
-        dock_order=["crm", "projects", "time_tracking", "invoices", "finance"],
-        wallpaper=None,
-    )
+    prefs = OSPreferences(owner_id=owner_id, **_default_os_preferences())
     db.add(prefs)
     db.commit()
     db.refresh(prefs)
@@ -141,12 +179,7 @@ def get_or_create_user_settings(db: Session, owner_id: UUID) -> UserSettings:
     if settings:
         return settings
 
-    settings = UserSettings(
-        owner_id=owner_id,
-        language="de-DE",
-        timezone="Europe/Berlin",
-        notifications_enabled=True,
-    )
+    settings = UserSettings(owner_id=owner_id, **DEFAULT_USER_SETTINGS)
     db.add(settings)
     db.commit()
     db.refresh(settings)
@@ -157,53 +190,75 @@ def get_or_create_user_settings(db: Session, owner_id: UUID) -> UserSettings:
 # LIVE DASHBOARD DATA
 # ================================================================
 
-def get_dashboard_stats(db: Session, owner_id: UUID) -> Dict[str, int]:
-    # Active Projects
-    projects = db.execute(
-        text("SELECT COUNT(*) FROM projects WHERE status='active'")
-    ).scalar() or 0
-
-    # Pending Invoices
-    invoices = db.execute(
-        text("SELECT COUNT(*) FROM invoices WHERE status='sent'")
-    ).scalar() or 0
-
-    # Registered Customers
-    customers = db.execute(
-        text("SELECT COUNT(*) FROM customers WHERE status='active'")
-    ).scalar() or 0
-
-    # Open Reminders
-    reminders = db.execute(
-        text("""
-            SELECT COUNT(*)
-            FROM reminders
-            WHERE owner_id = :oid
-              AND status = 'open'
-        """),
-        {"oid": str(owner_id)},
-    ).scalar() or 0
+# Globale Zähler sind nicht benutzerspezifisch → prozessweit mit kurzer TTL
+_global_stats_cache = TTLCache(ttl_seconds=app_settings.DASHBOARD_STATS_TTL_SECONDS)
 
-    return {
-        "activeProjects": projects,
-        "pendingInvoices": invoices,
-        "registeredCustomers": customers,
-        "openReminders": reminders,
-    }
+GLOBAL_STATS_SQL = text("""
+    SELECT
+        (SELECT COUNT(*) FROM projects WHERE status = 'active') AS active_projects,
+        (SELECT COUNT(*) FROM invoices WHERE status = 'sent') AS pending_invoices,
+        (SELECT COUNT(*) FROM customers WHERE status = 'active') AS registered_customers
+""")
 
 
-def get_recent_reminders(db: Session, owner_id: UUID, limit: int = 5) -> List[Dict[str, Any]]:
+def get_global_stats(db: Session) -> Dict[str, int]:
+    """Aktive Projekte, offene Rechnungen, aktive Kunden – ein Statement, gecacht."""
+    def _load() -> Dict[str, int]:
+        row = db.execute(GLOBAL_STATS_SQL).one()
+        return {
+            "activeProjects": row.active_projects or 0,
+            "pendingInvoices": row.pending_invoices or 0,
+            "registeredCustomers": row.registered_customers or 0,
+        }
+
+    return dict(_global_stats_cache.get_or_set("global", _load))
+
+
+def invalidate_dashboard_stats() -> None:
+    _global_stats_cache.invalidate()
+
+
+def get_reminder_section(db: Session, owner_id: UUID, limit: int = 5) -> tuple[int, List[Dict[str, Any]]]:
+    """
+    Offene Reminder (Anzahl) und die letzten Reminder in einem Statement.
+
+    Returns:
+        (open_count, recent_reminders)
+    """
     result = db.execute(
         text("""
-            SELECT id, title, priority, due_date
-            FROM reminders
-            WHERE owner_id = :oid
-            ORDER BY created_at DESC
-            LIMIT :limit
-        """),
-        {"oid": str(owner_id), "limit": limit},
-    )
-    return list(result.mappings().all())
+            SELECT
+                (SELECT COUNT(*) FROM reminders WHERE owner_id = :oid AND status = 'open') AS open_count,
+                r.id, r.title, r.priority, r.due_date
+            FROM (SELECT 1) AS one
+            LEFT JOIN (
+                SELECT id, title, priority, due_date, created_at
+                FROM reminders
+                WHERE owner_id = :oid
+                ORDER BY created_at DESC
+                LIMIT :limit
+            ) AS r ON TRUE
+            ORDER BY r.created_at DESC
+        """).bindparams(bindparam("oid", type_=PG_UUID(as_uuid=True))),
+        {"oid": owner_id, "limit": limit},
+    ).mappings().all()
+
+    open_count = (result[0]["open_count"] or 0) if result else 0
+    recent = [
+        {"id": row["id"], "title": row["title"], "priority": row["priority"], "due_date": row["due_date"]}
+        for row in result
+        if row["id"] is not None
+    ]
+    return open_count, recent
+
+
+def get_dashboard_stats(db: Session, owner_id: UUID) -> Dict[str, int]:
+    open_count, _ = get_reminder_section(db, owner_id, limit=0)
+    return {**get_global_stats(db), "openReminders": open_count}
+
+
+def get_recent_reminders(db: Session, owner_id: UUID, limit: int = 5) -> List[Dict[str, Any]]:
+    return get_reminder_section(db, owner_id, limit=limit)[1]
 
 
 def get_notifications_for_owner(
@@ -238,9 +293,83 @@ def get_activity_for_owner(
 # FULL DASHBOARD VIEW (für /dashboards/my-dashboard)
 # ================================================================
 
+# Gemeinsamer, begrenzter Pool für die parallelen Abschnitte. Jeder Worker
+# hält höchstens eine eigene Pool-Connection, prozessweit also maximal
+# DASHBOARD_SECTION_WORKERS zusätzlich zu den Request-Sessions – bei der
+# Standard-Engine (pool_size 5 + max_overflow 10) bleibt der Großteil des
+# Pools für Requests frei, egal wie viele Dashboards gleichzeitig laden.
+_section_executor = ThreadPoolExecutor(
+    max_workers=app_settings.DASHBOARD_SECTION_WORKERS,
+    thread_name_prefix="dashboard",
+)
+
+# last_accessed wird höchstens in diesem Abstand geschrieben
+LAST_ACCESSED_INTERVAL = timedelta(minutes=15)
+
+
+def _touch_last_accessed(db: Session, owner_id: UUID) -> None:
+    """
+    Setzt Dashboard.last_accessed, wenn der Wert älter als LAST_ACCESSED_INTERVAL ist.
+
+    Ein UPDATE ohne Treffer schreibt keine Zeile; committet wird nur nach
+    einer Änderung – und vor dem Laden der Abschnitte, damit der Commit
+    keine bereits geladenen Objekte expired.
+    """
+    now = datetime.utcnow()
+    result = db.execute(
+        update(Dashboard)
+        .where(
+            Dashboard.owner_id == owner_id,
+            or_(
+                Dashboard.last_accessed.is_(None),
+                Dashboard.last_accessed < now - LAST_ACCESSED_INTERVAL,
+            ),
+        )
+        .values(last_accessed=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        db.commit()
+
+
+def _load_user_rows(db: Session, owner_id: UUID) -> tuple[Dashboard, OSPreferences, UserSettings]:
+    """
+    Liest Dashboard, OS Preferences und User Settings.
+
+    Die Zeilen entstehen beim Anlegen des Mitarbeiters (create_user_defaults);
+    nur für Altbestände ohne Zeilen wird hier einmalig nachgelegt.
+    """
+    dashboard = get_dashboard_by_owner(db, owner_id)
+    os_prefs = db.query(OSPreferences).filter(OSPreferences.owner_id == owner_id).first()
+    user_settings = db.query(UserSettings).filter(UserSettings.owner_id == owner_id).first()
+
+    if dashboard is None or os_prefs is None or user_settings is None:
+        dashboard = dashboard or get_or_create_dashboard_for_owner(db, owner_id)
+        os_prefs = os_prefs or get_or_create_os_preferences(db, owner_id)
+        user_settings = user_settings or get_or_create_user_settings(db, owner_id)
+    return dashboard, os_prefs, user_settings
+
+
+def _timed(timings: Optional[Dict[str, float]], name: str, fn: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        return fn()
+    finally:
+        if timings is not None:
+            timings[name] = (time.perf_counter() - started) * 1000
+
+
+def _in_own_session(db: Session, fn: Callable[[Session], Any]) -> Callable[[], Any]:
+    def _run() -> Any:
+        with Session(bind=db.get_bind(), autoflush=False, expire_on_commit=False) as section_db:
+            return fn(section_db)
+    return _run
+
+
 def get_full_dashboard(
     db: Session,
     owner_id: UUID,
+    timings: Optional[Dict[str, float]] = None,
 ) -> Dict[str, Any]:
     """
     Aggregiert:
@@ -251,21 +380,49 @@ def get_full_dashboard(
     - Recent Reminders
     - Notifications
     - Activity Feed
+
+    Die benutzerspezifischen Abschnitte laufen parallel auf dem begrenzten
+    _section_executor (je eine eigene Pool-Connection); die globalen Zähler
+    kommen aus dem TTL-Cache. SQLite (Tests) hat nur eine Connection → dort
+    sequentiell.
+
+    Args:
+        timings: Optionales Dict, das pro Abschnitt die Dauer in ms erhält
     """
-    dashboard = get_or_create_dashboard_for_owner(db, owner_id)
-    os_prefs = get_or_create_os_preferences(db, owner_id)
-    user_settings = get_or_create_user_settings(db, owner_id)
-    stats = get_dashboard_stats(db, owner_id)
-    recent_reminders = get_recent_reminders(db, owner_id, limit=5)
-    notifications = get_notifications_for_owner(db, owner_id, limit=10)
-    activity = get_activity_for_owner(db, owner_id, limit=20)
+    sections: Dict[str, Callable[[Session], Any]] = {
+        "global_stats": get_global_stats,
+        "reminders": lambda s: get_reminder_section(s, owner_id, limit=5),
+        "notifications": lambda s: get_notifications_for_owner(s, owner_id, limit=10),
+        "activity": lambda s: get_activity_for_owner(s, owner_id, limit=20),
+    }
+
+    started = time.perf_counter()
+    # Ein eventueller Commit läuft vor allen Lesezugriffen der Request-Session
+    _timed(timings, "touch", lambda: _touch_last_accessed(db, owner_id))
+    if db.get_bind().dialect.name == "sqlite":
+        user_rows = _timed(timings, "user_rows", lambda: _load_user_rows(db, owner_id))
+        results = {name: _timed(timings, name, lambda fn=fn: fn(db)) for name, fn in sections.items()}
+    else:
+        futures = {
+            name: _section_executor.submit(_timed, timings, name, _in_own_session(db, fn))
+            for name, fn in sections.items()
+        }
+        # Dashboard/Preferences/Settings auf der Request-Session, während
+        # die übrigen Abschnitte laufen
+        user_rows = _timed(timings, "user_rows", lambda: _load_user_rows(db, owner_id))
+        results = {name: future.result() for name, future in futures.items()}
+    if timings is not None:
+        timings["total"] = (time.perf_counter() - started) * 1000
+
+    dashboard, os_prefs, user_settings = user_rows
+    open_reminders, recent_reminders = results["reminders"]
 
     return {
         "dashboard": dashboard,
         "os_preferences": os_prefs,
         "user_settings": user_settings,
-        "stats": stats,
+        "stats": {**results["global_stats"], "openReminders": open_reminders},
         "recent_reminders": recent_reminders,
-        "notifications": notifications,
-        "activity_feed": activity,
+        "notifications": results["notifications"],
+        "activity_feed": results["activity"],
     }
@@ -3,10 +3,11 @@ WorkmateOS - Dashboards API Routes
 REST endpoints for user dashboard configuration
 """
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
+from app.core.settings.config import settings
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
 from app.modules.dashboards import crud, schemas
@@ -32,6 +33,7 @@ def list_dashboards(
 @router.get("/my-dashboard", response_model=schemas.DashboardFullResponse)
 @require_permissions(["dashboards.read"])
 def get_my_dashboard(
+    response: Response,
     owner_id: UUID = Query(..., description="Current user's UUID"),
     db: Session = Depends(get_db),
     user: dict = Depends(get_current_user),
@@ -45,8 +47,16 @@ def get_my_dashboard(
     - Recent Reminders
     - Notifications
     - Activity Feed
+
+    Mit DASHBOARD_TIMING_HEADER=true enthält die Antwort einen
+    Server-Timing-Header mit der Dauer je Abschnitt (ms).
     """
-    full = crud.get_full_dashboard(db, owner_id)
+    timings: dict[str, float] | None = {} if settings.DASHBOARD_TIMING_HEADER else None
+    full = crud.get_full_dashboard(db, owner_id, timings=timings)
+    if timings:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={duration:.1f}" for name, duration in timings.items()
+        )
     return full
 
 
@@ -120,14 +120,21 @@ class ApiKey(Base):
     Der Klartext-Key wird nur einmalig beim Erstellen zurückgegeben.
     In der Datenbank wird ausschließlich der bcrypt-Hash gespeichert.
 
-    scopes – JSON-Liste von erlaubten Scopes, z. B. ["email:ingest"]
+    key_prefix – öffentlicher Lookup-Teil des Keys (wm_<prefix>_<secret>);
+                 bei Alt-Keys ohne Präfix nach der ersten Anmeldung ein
+                 Digest-Kennzeichen (siehe service.authenticate_api_key)
+    scopes     – JSON-Liste von erlaubten Scopes, z. B. ["email:ingest"]
     """
 
     __tablename__ = "api_keys"
-    __table_args__ = (Index("ix_api_keys_name", "name"),)
+    __table_args__ = (
+        Index("ix_api_keys_name", "name"),
+        Index("ix_api_keys_key_prefix", "key_prefix", unique=True),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=generate_uuid)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
+    key_prefix: Mapped[Optional[str]] = mapped_column(String(32))
     key_hash: Mapped[str] = mapped_column(String(255), nullable=False)
     scopes: Mapped[Optional[list]] = mapped_column(JSON, default=list)
     active: Mapped[bool] = mapped_column(
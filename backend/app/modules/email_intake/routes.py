@@ -10,10 +10,11 @@ POST /api/v1/email/admin/keys        – API-Key anlegen (nur Admin)
 from __future__ import annotations
 
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from app.core.auth.roles import get_current_user, require_permissions
+from app.core.email.outbox import process_outbox
 from app.core.settings.database import get_db
 from app.modules.email_intake import schemas, service
 from app.modules.email_intake.auth import require_api_key
@@ -36,6 +37,7 @@ router = APIRouter(prefix="/api/v1/email", tags=["Email Intake"])
 )
 def ingest_email(
     payload: schemas.EmailIngestRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     _api_key=Depends(require_api_key),
 ):
@@ -52,6 +54,8 @@ def ingest_email(
             "Ingest abgeschlossen: ticket_id=%s, contact_id=%s, mailbox=%s",
             result.ticket_id, result.contact_id, payload.mailbox,
         )
+        # Bestätigungsmail liegt in der Outbox – Zustellung nach der Antwort
+        background_tasks.add_task(process_outbox)
         return result
     except Exception as exc:
         logger.error("Ingest-Fehler: %s", exc, exc_info=True)
@@ -172,6 +176,7 @@ def reply_to_ticket(
         raise HTTPException(status_code=404, detail="Ticket nicht gefunden")
 
     service.send_reply_email(
+        db,
         to_email=ticket.from_email,
         to_name=ticket.from_name or "",
         subject=ticket.subject or "",
@@ -4,25 +4,32 @@ Email Intake Service
 Business-Logik für den E-Mail-Eingang:
 - Kontakt matchen oder neu anlegen
 - Ticket erstellen und mit Kontakt verknüpfen
-- API-Key generieren und verifizieren
+- API-Key generieren und verifizieren (Präfix-Lookup + TTL-Cache)
 - HTML-Body in Plaintext konvertieren (optional)
 """
 from __future__ import annotations
 
+import hashlib
+import hmac
 import logging
 import re
 import secrets
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import datetime
 from typing import Optional
 
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from passlib.context import CryptContext
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core.cache import TTLCache
+from app.core.email import outbox
 from app.core.settings.config import settings
 from app.modules.email_intake.models import ApiKey, EmailContact, EmailTicket
 from app.modules.email_intake.schemas import EmailIngestRequest, EmailIngestResponse
@@ -34,6 +41,22 @@ logger = logging.getLogger(__name__)
 # Bcrypt-Kontext für API-Key-Hashing
 _pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# API-Keys: wm_<prefix>_<secret>, prefix ist öffentlich und indiziert
+API_KEY_MARKER = "wm"
+API_KEY_PREFIX_BYTES = 6
+LEGACY_PREFIX_MARKER = "legacy-"
+
+# Verifizierte Keys: HMAC(Key) → ApiKey.id, erspart bcrypt bei Folgeaufrufen.
+# Das HMAC-Geheimnis lebt nur im Prozess; Klartext-Keys werden nicht gehalten.
+_verified_keys = TTLCache(ttl_seconds=settings.API_KEY_CACHE_TTL_SECONDS, max_entries=1024)
+_cache_secret = secrets.token_bytes(32)
+
+# Suche nach Alt-Keys (bcrypt gegen jeden nicht migrierten Key): prozessweit
+# höchstens API_KEY_LEGACY_SCANS_PER_MINUTE Suchen im gleitenden Fenster
+LEGACY_SCAN_WINDOW_SECONDS = 60
+_legacy_scans: deque[float] = deque()
+_legacy_scans_lock = threading.Lock()
+
 # Mapping Postfach → Ticket-Typ
 MAILBOX_TO_TYPE: dict[str, str] = {
     "support": "support",
@@ -149,12 +172,13 @@ def create_email_ticket(
 # ---------------------------------------------------------------------------
 
 def send_confirmation_email(
+    db: Session,
     to_email: str,
     to_name: str,
     ticket_number: str,
     subject: str,
 ) -> None:
-    """Sendet eine Bestätigungsmail an den Kunden nach Ticket-Erstellung."""
+    """Legt eine Bestätigungsmail an den Kunden nach Ticket-Erstellung in die Outbox."""
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = f"Ihre Anfrage wurde erhalten – {ticket_number}"
@@ -228,24 +252,28 @@ support@kit-it-koblenz.de
         msg.attach(MIMEText(text_body, "plain", "utf-8"))
         msg.attach(MIMEText(html_body, "html", "utf-8"))
 
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as smtp:
-            smtp.starttls()
-            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            smtp.sendmail(settings.SMTP_FROM, [to_email], msg.as_string())
+        outbox.enqueue_message(
+            db, msg, [to_email],
+            account=outbox.ACCOUNT_SUPPORT,
+            sender=settings.SMTP_FROM,
+            reference=f"ticket:{ticket_number}",
+        )
 
-        logger.info("Bestätigungsmail gesendet an %s (Ticket: %s)", to_email, ticket_number)
+        logger.info("Bestätigungsmail eingereiht für %s (Ticket: %s)", to_email, ticket_number)
     except Exception as exc:
+        db.rollback()
         logger.error("Bestätigungsmail fehlgeschlagen: %s", exc)
 
 
 def send_reply_email(
+    db: Session,
     to_email: str,
     to_name: str,
     subject: str,
     body: str,
     agent_name: str = "Support",
 ) -> None:
-    """Sendet eine Antwort-Mail an den Kunden."""
+    """Legt eine Antwort-Mail an den Kunden in die Outbox."""
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = f"Re: {subject}" if not subject.startswith("Re:") else subject
@@ -296,12 +324,13 @@ def send_reply_email(
         msg.attach(MIMEText(body, "plain", "utf-8"))
         msg.attach(MIMEText(html_body, "html", "utf-8"))
 
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=10) as smtp:
-            smtp.starttls()
-            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            smtp.sendmail(settings.SMTP_FROM, [to_email], msg.as_string())
+        outbox.enqueue_message(
+            db, msg, [to_email],
+            account=outbox.ACCOUNT_SUPPORT,
+            sender=settings.SMTP_FROM,
+        )
 
-        logger.info("Antwort-Mail gesendet an %s", to_email)
+        logger.info("Antwort-Mail eingereiht für %s", to_email)
     except Exception as exc:
         logger.error("Antwort-Mail fehlgeschlagen: %s", exc)
         raise
@@ -369,6 +398,7 @@ def ingest_email(
     # Bestätigungsmail an Kunden
     if support_ticket:
         send_confirmation_email(
+            db,
             to_email=email,
             to_name=name,
             ticket_number=support_ticket.ticket_number,
@@ -389,8 +419,25 @@ def ingest_email(
 # ---------------------------------------------------------------------------
 
 def generate_api_key() -> str:
-    """Generiert einen sicheren, zufälligen API-Key (Präfix wm_)."""
-    return "wm_" + secrets.token_urlsafe(32)
+    """Generiert einen sicheren, zufälligen API-Key (wm_<prefix>_<secret>)."""
+    prefix = secrets.token_hex(API_KEY_PREFIX_BYTES)
+    return f"{API_KEY_MARKER}_{prefix}_{secrets.token_urlsafe(32)}"
+
+
+def api_key_prefix(key: str) -> Optional[str]:
+    """Öffentlicher Lookup-Teil eines Keys, None bei Keys im Altformat."""
+    parts = key.split("_", 2)
+    if len(parts) != 3 or parts[0] != API_KEY_MARKER:
+        return None
+    prefix = parts[1]
+    if len(prefix) != 2 * API_KEY_PREFIX_BYTES or any(c not in "0123456789abcdef" for c in prefix):
+        return None
+    return prefix
+
+
+def legacy_key_prefix(key: str) -> str:
+    """Lookup-Kennzeichen für Alt-Keys (wm_<secret>) ohne eigenes Präfix."""
+    return LEGACY_PREFIX_MARKER + hashlib.sha256(key.encode()).hexdigest()[:16]
 
 
 def hash_api_key(key: str) -> str:
@@ -403,6 +450,10 @@ def verify_api_key(plain_key: str, hashed_key: str) -> bool:
     return _pwd_ctx.verify(plain_key, hashed_key)
 
 
+def _cache_key(plain_key: str) -> str:
+    return hmac.new(_cache_secret, plain_key.encode(), hashlib.sha256).hexdigest()
+
+
 def create_api_key(
     db: Session,
     name: str,
@@ -420,6 +471,7 @@ def create_api_key(
     api_key = ApiKey(
         id=uuid.uuid4(),
         name=name,
+        key_prefix=api_key_prefix(plain_key),
         key_hash=key_hash,
         scopes=scopes,
         active=True,
@@ -431,6 +483,105 @@ def create_api_key(
     return api_key, plain_key
 
 
+def get_legacy_api_keys(db: Session) -> list[ApiKey]:
+    """Aktive Keys im Altformat (ohne Präfix, migriert oder nicht)."""
+    return list(db.scalars(
+        select(ApiKey)
+        .where(
+            ApiKey.active.is_(True),
+            (ApiKey.key_prefix.is_(None)) | (ApiKey.key_prefix.startswith(LEGACY_PREFIX_MARKER)),
+        )
+        .order_by(ApiKey.created_at, ApiKey.id)
+    ).all())
+
+
+def reissue_legacy_api_keys(db: Session) -> list[tuple[ApiKey, ApiKey, str]]:
+    """
+    Ersetzt alle aktiven Alt-Keys durch Keys im neuen Format.
+
+    Der neue Key übernimmt Name und Scopes, der alte wird deaktiviert. Danach
+    kann API_KEY_LEGACY_ENABLED abgeschaltet werden.
+
+    Returns:
+        Liste von (alter Key, neuer Key, plaintext_key) – Klartext nur hier
+    """
+    reissued = []
+    for old in get_legacy_api_keys(db):
+        plain_key = generate_api_key()
+        new = ApiKey(
+            id=uuid.uuid4(),
+            name=old.name,
+            key_prefix=api_key_prefix(plain_key),
+            key_hash=hash_api_key(plain_key),
+            scopes=list(old.scopes or []),
+            active=True,
+        )
+        old.active = False
+        db.add(new)
+        reissued.append((old, new, plain_key))
+    db.commit()
+    _verified_keys.invalidate()
+    for old, _, _ in reissued:
+        logger.info("Alt-Key '%s' ersetzt und deaktiviert", old.name)
+    return reissued
+
+
+def _take_legacy_scan() -> bool:
+    """Reserviert eine Alt-Key-Suche im gleitenden Fenster, False wenn ausgeschöpft."""
+    now = time.monotonic()
+    with _legacy_scans_lock:
+        while _legacy_scans and _legacy_scans[0] <= now - LEGACY_SCAN_WINDOW_SECONDS:
+            _legacy_scans.popleft()
+        if len(_legacy_scans) >= settings.API_KEY_LEGACY_SCANS_PER_MINUTE:
+            return False
+        _legacy_scans.append(now)
+        return True
+
+
+def _find_api_key(db: Session, plain_key: str) -> Optional[ApiKey]:
+    """
+    Sucht den passenden aktiven Key: ein indizierter Lookup über key_prefix
+    und ein bcrypt-Vergleich.
+
+    Alt-Keys ohne key_prefix (vor Einführung des Präfixes ausgegeben) werden
+    einmalig per Vergleich gefunden und bekommen dabei ihr Kennzeichen
+    legacy_key_prefix() – danach laufen auch sie über den Index. Diese Suche
+    vergleicht gegen jeden nicht migrierten Key und ist deshalb prozessweit
+    begrenzt (API_KEY_LEGACY_SCANS_PER_MINUTE); darüber wird abgewiesen.
+    """
+    lookups = [legacy_key_prefix(plain_key)]
+    prefix = api_key_prefix(plain_key)
+    if prefix:
+        lookups.insert(0, prefix)
+
+    candidates = db.scalars(
+        select(ApiKey).where(ApiKey.key_prefix.in_(lookups), ApiKey.active.is_(True))
+    ).all()
+    for key_obj in candidates:
+        if verify_api_key(plain_key, key_obj.key_hash):
+            return key_obj
+    if prefix:
+        # Neues Format, aber kein passender Key: kein Alt-Key-Vergleich nötig
+        return None
+
+    unmigrated = db.scalars(
+        select(ApiKey).where(ApiKey.key_prefix.is_(None), ApiKey.active.is_(True))
+    ).all()
+    if not unmigrated:
+        return None
+    if not _take_legacy_scan():
+        logger.warning("Alt-Key-Suche abgewiesen: Limit von %s/min erreicht",
+                       settings.API_KEY_LEGACY_SCANS_PER_MINUTE)
+        return None
+    for key_obj in unmigrated:
+        if verify_api_key(plain_key, key_obj.key_hash):
+            key_obj.key_prefix = lookups[0]
+            db.commit()
+            logger.info("API-Key '%s' auf indizierten Lookup umgestellt", key_obj.name)
+            return key_obj
+    return None
+
+
 def authenticate_api_key(
     db: Session,
     plain_key: str,
@@ -439,6 +590,11 @@ def authenticate_api_key(
     """
     Prüft einen API-Key gegen die Datenbank.
 
+    Bereits verifizierte Keys kommen für API_KEY_CACHE_TTL_SECONDS aus dem
+    Cache (Primärschlüssel-Abfrage statt bcrypt); deaktivierte Keys werden
+    dabei trotzdem sofort abgewiesen. Mit API_KEY_LEGACY_ENABLED=false werden
+    Keys ohne Präfix ohne DB-Zugriff abgewiesen.
+
     Args:
         plain_key:      Klartext-Key aus dem Authorization-Header
         required_scope: Wenn angegeben, muss dieser Scope im Key enthalten sein
@@ -446,15 +602,23 @@ def authenticate_api_key(
     Returns:
         ApiKey wenn gültig, None sonst
     """
-    # Alle aktiven Keys laden und hashen vergleichen
-    # Hinweis: Bei vielen Keys (>100) sollte ein Key-Präfix als DB-Filter genutzt werden.
-    active_keys = db.query(ApiKey).filter(ApiKey.active.is_(True)).all()
-    for key_obj in active_keys:
-        if verify_api_key(plain_key, key_obj.key_hash):
-            if required_scope and required_scope not in (key_obj.scopes or []):
-                logger.warning(
-                    "API-Key '%s' hat nicht den Scope '%s'", key_obj.name, required_scope
-                )
-                return None
-            return key_obj
-    return None
+    if not settings.API_KEY_LEGACY_ENABLED and api_key_prefix(plain_key) is None:
+        # Nach der Umstellung (siehe reissue_legacy_api_keys) nur noch neue Keys
+        return None
+
+    cache_key = _cache_key(plain_key)
+    key_id = _verified_keys.get(cache_key)
+    key_obj = db.get(ApiKey, key_id) if key_id is not None else None
+    if key_obj is None or not key_obj.active:
+        _verified_keys.invalidate(cache_key)
+        key_obj = _find_api_key(db, plain_key)
+        if key_obj is None:
+            return None
+        _verified_keys.set(cache_key, key_obj.id)
+
+    if required_scope and required_scope not in (key_obj.scopes or []):
+        logger.warning(
+            "API-Key '%s' hat nicht den Scope '%s'", key_obj.name, required_scope
+        )
+        return None
+    return key_obj
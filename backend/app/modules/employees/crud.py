@@ -5,8 +5,11 @@ Database operations for Employee, Department, Role
 from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_
+from sqlalchemy import case, false, func, literal, or_, select
+from app.modules.employees.directory import invalidate_directory
 from app.modules.employees.models import Employee, Department, Role
+from app.modules.hr.analytics.crud import HEADCOUNT, invalidate_hr_analytics
+from app.modules.hr.leave.availability import invalidate_team_availability
 from app.modules.employees.schemas import (
     EmployeeCreate, EmployeeUpdate,
     DepartmentCreate, DepartmentUpdate,
@@ -41,6 +44,34 @@ def get_employee_by_email(db: Session, email: str) -> Optional[Employee]:
         .first()
 
 
+def _search_terms(search: Optional[str]) -> list[str]:
+    return (search or "").strip().lower().split()
+
+
+def employee_search_filters(terms: list[str]) -> list:
+    """Jeder Begriff muss im Suchtext vorkommen (Trigram-Index ix_employees_search_trgm)."""
+    return [Employee.search_text.contains(term, autoescape=True) for term in terms]
+
+
+def employee_search_rank(db: Session, terms: list[str]):
+    """
+    Ranking für die Mitarbeitersuche:
+    exakter Code > Präfix von Vor-/Nachname, E-Mail oder Code > Trigram-Ähnlichkeit
+    (Ähnlichkeit nur mit pg_trgm/Postgres)
+    """
+    rank = literal(0.0)
+    for term in terms:
+        prefix = or_(*(
+            func.lower(column).startswith(term, autoescape=True)
+            for column in (Employee.first_name, Employee.last_name, Employee.email, Employee.employee_code)
+        ))
+        rank = rank + case((func.lower(Employee.employee_code) == term, 2.0), else_=0.0)
+        rank = rank + case((prefix, 1.0), else_=0.0)
+    if terms and db.get_bind().dialect.name == "postgresql":
+        rank = rank + func.similarity(Employee.search_text, " ".join(terms))
+    return rank
+
+
 def get_employees(
     db: Session,
     skip: int = 0,
@@ -52,47 +83,76 @@ def get_employees(
 ) -> tuple[list[Employee], int]:
     """
     Get employees with filtering and pagination
+
+    Suche über employees.search_text (Trigram-Index), Treffer nach Relevanz
+    sortiert. Der COUNT läuft ohne die Eager-Joins auf department/role.
+
     Returns: (employees list, total count)
     """
-    query = db.query(Employee)\
-        .options(joinedload(Employee.department))\
-        .options(joinedload(Employee.role))
-    
-    # Apply filters
-    if search:
-        search_filter = f"%{search}%"
-        query = query.filter(
-            or_(
-                Employee.first_name.ilike(search_filter),
-                Employee.last_name.ilike(search_filter),
-                Employee.email.ilike(search_filter),
-                Employee.employee_code.ilike(search_filter)
-            )
-        )
-    
+    terms = _search_terms(search)
+    filters = employee_search_filters(terms)
+
     if department_id:
-        query = query.filter(Employee.department_id == department_id)
-    
+        filters.append(Employee.department_id == department_id)
+
     if role_id:
-        query = query.filter(Employee.role_id == role_id)
-    
+        filters.append(Employee.role_id == role_id)
+
     if status:
-        query = query.filter(Employee.status == status)
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination
-    employees = query.offset(skip).limit(limit).all()
-    
-    return employees, total
+        filters.append(Employee.status == status)
+
+    total = db.scalar(select(func.count(Employee.id)).where(*filters))
+
+    order_by = [Employee.last_name, Employee.first_name, Employee.id]
+    if terms:
+        order_by.insert(0, employee_search_rank(db, terms).desc())
+
+    employees = db.scalars(
+        select(Employee)
+        .options(joinedload(Employee.department), joinedload(Employee.role))
+        .where(*filters)
+        .order_by(*order_by)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+    return list(employees), total
+
+
+def username_lookup_filters(username: str) -> list:
+    """
+    Keycloak preferred_username → Mitarbeiter: exakter Treffer (case-insensitiv)
+    nur auf die eindeutigen Schlüssel employee_code und workmate_id.
+    Der contains-Filter auf search_text grenzt über den Trigram-Index vor.
+
+    Es können höchstens zwei Zeilen passen (Code des einen = workmate_id des
+    anderen); der Aufrufer muss diesen Fall als mehrdeutig behandeln.
+    """
+    name = username.strip().lower()
+    if not name:
+        return [false()]
+    return [
+        Employee.search_text.contains(name, autoescape=True),
+        or_(
+            func.lower(Employee.employee_code) == name,
+            func.lower(Employee.workmate_id) == name,
+        ),
+    ]
 
 
 def create_employee(db: Session, employee: EmployeeCreate) -> Employee:
     """Create new employee"""
+    from app.modules.dashboards.crud import create_user_defaults
+
     db_employee = Employee(**employee.model_dump())
     db.add(db_employee)
+    db.flush()
+    # Dashboard/Preferences/Settings einmalig hier statt bei jedem Dashboard-Aufruf
+    create_user_defaults(db, db_employee.id)
     db.commit()
+    invalidate_hr_analytics(HEADCOUNT)
+    invalidate_directory()
+    invalidate_team_availability(db)
     db.refresh(db_employee)
     return db_employee
 
@@ -113,6 +173,9 @@ def update_employee(
         setattr(db_employee, field, value)
     
     db.commit()
+    invalidate_hr_analytics(HEADCOUNT)
+    invalidate_directory()
+    invalidate_team_availability(db)
     db.refresh(db_employee)
     return db_employee
 
@@ -126,6 +189,9 @@ def delete_employee(db: Session, employee_id: UUID) -> bool:
     # Soft delete - type: ignore für SQLAlchemy Column assignment
     db_employee.status = "inactive"  # type: ignore[assignment]
     db.commit()
+    invalidate_hr_analytics(HEADCOUNT)
+    invalidate_directory()
+    invalidate_team_availability(db)
     return True
 
 
@@ -148,6 +214,9 @@ def create_department(db: Session, department: DepartmentCreate) -> Department:
     db_dept = Department(**department.model_dump())
     db.add(db_dept)
     db.commit()
+    invalidate_hr_analytics(HEADCOUNT)
+    invalidate_directory()
+    invalidate_team_availability(db)
     db.refresh(db_dept)
     return db_dept
 
@@ -167,6 +236,9 @@ def update_department(
         setattr(db_dept, field, value)
     
     db.commit()
+    invalidate_hr_analytics(HEADCOUNT)
+    invalidate_directory()
+    invalidate_team_availability(db)
     db.refresh(db_dept)
     return db_dept
 
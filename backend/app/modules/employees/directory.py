@@ -0,0 +1,165 @@
+"""
+WorkmateOS - Mitarbeiterverzeichnis (In-Process-Snapshot)
+
+Personenauswahl (Typeahead), Verzeichnis und Organigramm lesen aus einem
+prozessweiten Snapshot aller nicht deaktivierten Mitarbeiter. Der Snapshot
+wird mit einer Query (employees LEFT JOIN departments) geladen und von den
+schreibenden CRUD-Funktionen (Mitarbeiter, Abteilungen, Keycloak-Provisioning)
+über invalidate_directory() verworfen. Die TTL fängt Änderungen anderer
+Worker-Prozesse ab.
+"""
+from __future__ import annotations
+
+import uuid
+from dataclasses import asdict, dataclass
+from typing import Any, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.settings.config import settings
+from app.modules.employees.models import Department, Employee
+
+TYPEAHEAD_LIMIT = 10
+
+_SNAPSHOT_KEY = "directory"
+_directory_cache = TTLCache(ttl_seconds=settings.EMPLOYEE_DIRECTORY_TTL_SECONDS, max_entries=1)
+
+
+@dataclass(frozen=True)
+class DirectoryEntry:
+    id: uuid.UUID
+    employee_code: str
+    workmate_id: Optional[str]
+    first_name: Optional[str]
+    last_name: Optional[str]
+    email: str
+    photo_url: Optional[str]
+    status: Optional[str]
+    department_id: Optional[uuid.UUID]
+    department_name: Optional[str]
+    reports_to: Optional[uuid.UUID]
+
+    @property
+    def name(self) -> str:
+        return " ".join(part for part in (self.first_name, self.last_name) if part) or self.email
+
+    @property
+    def search_text(self) -> str:
+        # Gleicher Aufbau wie employees.search_text (EMPLOYEE_SEARCH_TEXT)
+        return " ".join(
+            value or "" for value in (
+                self.first_name, self.last_name, self.email, self.employee_code, self.workmate_id,
+            )
+        ).lower()
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "name": self.name}
+
+
+class EmployeeDirectory:
+    """Unveränderlicher Snapshot, sortiert nach Nachname, Vorname."""
+
+    def __init__(self, entries: list[DirectoryEntry]):
+        self.entries = entries
+        self.by_id = {entry.id: entry for entry in entries}
+        self.reports: dict[uuid.UUID, list[DirectoryEntry]] = {}
+        for entry in entries:
+            if entry.reports_to in self.by_id and entry.reports_to != entry.id:
+                self.reports.setdefault(entry.reports_to, []).append(entry)
+        self._search_texts = [(entry, entry.search_text) for entry in entries]
+
+    def search(self, q: str, limit: int = TYPEAHEAD_LIMIT) -> list[DirectoryEntry]:
+        """
+        Typeahead: jeder Begriff muss vorkommen; Ranking wie die SQL-Suche
+        (exakter Code > Präfix von Vor-/Nachname, E-Mail oder Code).
+        """
+        terms = q.strip().lower().split()
+        if not terms:
+            return []
+
+        ranked = []
+        for position, (entry, text) in enumerate(self._search_texts):
+            if not all(term in text for term in terms):
+                continue
+            prefixes = [
+                (value or "").lower()
+                for value in (entry.first_name, entry.last_name, entry.email, entry.employee_code)
+            ]
+            rank = 0.0
+            for term in terms:
+                if entry.employee_code.lower() == term:
+                    rank += 2.0
+                if any(value.startswith(term) for value in prefixes):
+                    rank += 1.0
+            # position hält die Namenssortierung innerhalb gleichen Rangs
+            ranked.append((-rank, position, entry))
+        ranked.sort(key=lambda item: item[:2])
+        return [entry for _, _, entry in ranked[:limit]]
+
+    def org_chart(self, root_id: Optional[uuid.UUID] = None) -> list[dict[str, Any]]:
+        """
+        Organigramm als verschachtelte Knoten {**entry, reports: [...]}.
+
+        Ohne root_id: alle Mitarbeiter ohne (aktiven) Vorgesetzten als Wurzeln.
+        Zyklen in reports_to werden einmal aufgelöst, kein Mitarbeiter
+        erscheint doppelt.
+        """
+        if root_id is not None:
+            roots = [self.by_id[root_id]] if root_id in self.by_id else []
+        else:
+            roots = [
+                entry for entry in self.entries
+                if entry.reports_to not in self.by_id or entry.reports_to == entry.id
+            ]
+
+        visited: set[uuid.UUID] = set()
+
+        def _node(entry: DirectoryEntry) -> dict[str, Any]:
+            visited.add(entry.id)
+            return {
+                **entry.as_dict(),
+                "reports": [
+                    _node(child) for child in self.reports.get(entry.id, [])
+                    if child.id not in visited
+                ],
+            }
+
+        tree = [_node(entry) for entry in roots if entry.id not in visited]
+        if root_id is None:
+            # Reine Zyklen (A → B → A) haben keine Wurzel
+            tree.extend(_node(entry) for entry in self.entries if entry.id not in visited)
+        return tree
+
+
+def _load_directory(db: Session) -> EmployeeDirectory:
+    rows = db.execute(
+        select(
+            Employee.id,
+            Employee.employee_code,
+            Employee.workmate_id,
+            Employee.first_name,
+            Employee.last_name,
+            Employee.email,
+            Employee.photo_url,
+            Employee.status,
+            Employee.department_id,
+            Department.name.label("department_name"),
+            Employee.reports_to,
+        )
+        .outerjoin(Department, Employee.department_id == Department.id)
+        .where(or_(Employee.status.is_(None), Employee.status != "inactive"))
+        .order_by(Employee.last_name, Employee.first_name, Employee.id)
+    )
+    return EmployeeDirectory([DirectoryEntry(**row._mapping) for row in rows])
+
+
+def get_directory(db: Session) -> EmployeeDirectory:
+    """Liefert den Snapshot; lädt ihn nach Invalidierung/TTL neu (eine Query)."""
+    return _directory_cache.get_or_set(_SNAPSHOT_KEY, lambda: _load_directory(db))
+
+
+def invalidate_directory() -> None:
+    """Nach Änderungen an Mitarbeitern oder Abteilungen aufrufen."""
+    _directory_cache.invalidate()
@@ -2,7 +2,7 @@
 WorkmateOS - Employee Module Models
 Departments, Roles & Employees (Core Entities)
 """
-from sqlalchemy import Column, String, Date, Boolean, Text, ForeignKey, TIMESTAMP
+from sqlalchemy import Column, Computed, String, Date, Boolean, Text, ForeignKey, Index, TIMESTAMP
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship, Mapped
 from sqlalchemy.sql import func
@@ -56,9 +56,25 @@ class Role(Base):
 # EMPLOYEE (Core Entity)
 # ============================================================================
 
+# Generierter Suchtext (lowercase) für den Trigram-Index (pg_trgm, GIN)
+EMPLOYEE_SEARCH_TEXT = (
+    "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || coalesce(employee_code, '') || ' ' || "
+    "coalesce(workmate_id, ''))"
+)
+
+
 class Employee(Base):
     """Core employee entity with organizational & personal info"""
     __tablename__ = "employees"
+    __table_args__ = (
+        Index(
+            "ix_employees_search_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+    )
 
     # Primary Info
     id = Column(UUID(as_uuid=True), primary_key=True, default=generate_uuid)
@@ -118,6 +134,13 @@ class Employee(Base):
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
     last_login = Column(TIMESTAMP)
 
+    # Suche (Mitarbeiterverzeichnis, Typeahead)
+    search_text = Column(
+        Text,
+        Computed(EMPLOYEE_SEARCH_TEXT, persisted=True),
+        comment="Generierter Suchtext (Name, E-Mail, employee_code, workmate_id)",
+    )
+
     # Relationships
     department = relationship("Department", back_populates="employees", foreign_keys=[department_id])
     role = relationship("Role", back_populates="employees")
@@ -6,11 +6,12 @@ from typing import Optional
 from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
-from app.modules.employees import crud, schemas
+from app.modules.employees import crud, directory, schemas
 
 # Create routers
 router = APIRouter()
@@ -40,7 +41,7 @@ def list_employees(
 
     - **skip**: Number of records to skip (for pagination)
     - **limit**: Max number of records to return
-    - **search**: Search in name, email, employee_code
+    - **search**: Search in name, email, employee_code (ranked, prefix matches first)
     - **department_id**: Filter by department
     - **role_id**: Filter by role
     - **status**: Filter by status (active, inactive, on_leave)
@@ -101,6 +102,62 @@ def get_employee_statistics(
     }
 
 
+@employee_router.get("/directory", response_model=list[schemas.DirectoryEntryResponse])
+@require_permissions(["employees.read"])
+async def get_employee_directory(
+    department_id: Optional[UUID] = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Mitarbeiterverzeichnis (alle nicht deaktivierten Mitarbeiter) für
+    Personenauswahl – aus dem In-Process-Snapshot, ohne DB-Zugriff im Normalfall
+
+    - **department_id**: Nur Mitarbeiter dieser Abteilung
+    """
+    snapshot = await run_in_threadpool(directory.get_directory, db)
+    return [
+        entry.as_dict() for entry in snapshot.entries
+        if department_id is None or entry.department_id == department_id
+    ]
+
+
+@employee_router.get("/directory/search", response_model=list[schemas.DirectoryEntryResponse])
+@require_permissions(["employees.read"])
+async def search_employee_directory(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(directory.TYPEAHEAD_LIMIT, ge=1, le=50),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Typeahead: Präfix-Treffer auf Name, E-Mail und employee_code zuerst
+
+    - **q**: Suchbegriff(e), jeder Begriff muss vorkommen
+    - **limit**: Max. Anzahl Treffer
+    """
+    snapshot = await run_in_threadpool(directory.get_directory, db)
+    return [entry.as_dict() for entry in snapshot.search(q, limit=limit)]
+
+
+@employee_router.get("/org-chart", response_model=list[schemas.OrgChartNode])
+@require_permissions(["employees.read"])
+async def get_org_chart(
+    root_id: Optional[UUID] = Query(None),
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    Organigramm aus reports_to (verschachtelt)
+
+    - **root_id**: Nur den Teilbaum unter diesem Mitarbeiter
+    """
+    snapshot = await run_in_threadpool(directory.get_directory, db)
+    if root_id is not None and root_id not in snapshot.by_id:
+        raise HTTPException(status_code=404, detail="Employee not found")
+    return snapshot.org_chart(root_id)
+
+
 @employee_router.get("/{employee_id}", response_model=schemas.EmployeeResponse)
 @require_permissions(["employees.read"])
 def get_employee(
@@ -176,4 +176,28 @@ class EmployeeListResponse(BaseModel):
     total: int
     page: int
     page_size: int
-    employees: list[EmployeeResponse]
\ No newline at end of file
+    employees: list[EmployeeResponse]
+
+# ============================================================================
+# DIRECTORY SCHEMAS (Typeahead, Organigramm)
+# ============================================================================
+
+class DirectoryEntryResponse(BaseModel):
+    """Schlanker Verzeichniseintrag aus dem In-Process-Snapshot"""
+    id: UUID
+    name: str
+    employee_code: str
+    workmate_id: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: str
+    photo_url: Optional[str] = None
+    status: Optional[str] = None
+    department_id: Optional[UUID] = None
+    department_name: Optional[str] = None
+    reports_to: Optional[UUID] = None
+
+
+class OrgChartNode(DirectoryEntryResponse):
+    """Organigramm-Knoten mit direkten Berichten"""
+    reports: list["OrgChartNode"] = []
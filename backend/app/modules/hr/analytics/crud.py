@@ -0,0 +1,162 @@
+"""
+HR Analytics – Kennzahlen-Abfragen
+Jeder Abschnitt (Headcount, Urlaub, Recruiting) ist genau ein Statement
+(GROUP BY + FILTER-Aggregate) und wird prozessweit mit kurzer TTL gecacht.
+Schreibende CRUD-Funktionen invalidieren ihren Abschnitt explizit über
+invalidate_hr_analytics().
+"""
+from datetime import date
+from typing import Any, Optional
+
+from sqlalchemy import and_, func, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.settings.config import settings
+
+HEADCOUNT = "headcount"
+LEAVE = "leave"
+RECRUITING = "recruiting"
+
+_analytics_cache = TTLCache(ttl_seconds=settings.HR_ANALYTICS_TTL_SECONDS)
+
+
+def invalidate_hr_analytics(section: Optional[str] = None) -> None:
+    """Verwirft einen Abschnitt (HEADCOUNT, LEAVE, RECRUITING) oder alle."""
+    _analytics_cache.invalidate(section)
+
+
+def _load_headcount(db: Session) -> dict[str, Any]:
+    from app.modules.employees.models import Department, Employee
+
+    active = func.count(Employee.id).filter(Employee.status == "active")
+    per_group = (
+        select(
+            Department.name.label("department"),
+            Employee.employment_type.label("employment_type"),
+            func.count(Employee.id).label("total"),
+            active.label("active"),
+        )
+        .select_from(Employee)
+        .outerjoin(Department, Employee.department_id == Department.id)
+        .group_by(Department.name, Employee.employment_type)
+    )
+    # Abteilungen ohne Mitarbeiter erscheinen mit 0
+    departments = select(Department.name, null(), literal(0), literal(0))
+
+    result = {"total": 0, "active": 0, "by_department": {}, "by_employment_type": {}}
+    for department, employment_type, total, active_count in db.execute(union_all(per_group, departments)):
+        result["total"] += total
+        result["active"] += active_count
+        if department is not None:
+            result["by_department"][department] = result["by_department"].get(department, 0) + total
+        if employment_type is not None:
+            result["by_employment_type"][employment_type] = (
+                result["by_employment_type"].get(employment_type, 0) + total
+            )
+    return result
+
+
+def _load_leave(db: Session) -> dict[str, Any]:
+    from app.modules.hr.leave.models import LeaveRequest
+
+    today = date.today()
+    month_start = today.replace(day=1)
+    next_month = date(today.year + 1, 1, 1) if today.month == 12 else date(today.year, today.month + 1, 1)
+    approved = LeaveRequest.status == "approved"
+
+    stmt = (
+        select(
+            LeaveRequest.leave_type,
+            LeaveRequest.status,
+            func.count(LeaveRequest.id),
+            func.count(LeaveRequest.id).filter(
+                and_(approved, LeaveRequest.approved_date >= month_start, LeaveRequest.approved_date < next_month)
+            ),
+            func.coalesce(
+                func.sum(LeaveRequest.total_days).filter(
+                    and_(
+                        approved,
+                        LeaveRequest.start_date >= date(today.year, 1, 1),
+                        LeaveRequest.start_date < date(today.year + 1, 1, 1),
+                    )
+                ),
+                0,
+            ),
+        )
+        .group_by(LeaveRequest.leave_type, LeaveRequest.status)
+    )
+
+    by_type: dict[str, int] = {}
+    by_status: dict[str, int] = {}
+    approved_this_month = 0
+    days_this_year = 0.0
+    for leave_type, status, count, approved_month, days in db.execute(stmt):
+        by_type[leave_type] = by_type.get(leave_type, 0) + count
+        by_status[status] = by_status.get(status, 0) + count
+        approved_this_month += approved_month
+        days_this_year += float(days or 0)
+
+    return {
+        "total_requests": sum(by_status.values()),
+        "pending_requests": by_status.get("pending", 0),
+        "approved_requests": by_status.get("approved", 0),
+        "rejected_requests": by_status.get("rejected", 0),
+        "by_type": by_type,
+        "by_status": by_status,
+        "approved_this_month": approved_this_month,
+        "total_days_taken_this_year": days_this_year,
+    }
+
+
+def _load_recruiting(db: Session) -> dict[str, Any]:
+    from app.modules.hr.recruiting.models import Application, JobPosting
+
+    postings = (
+        select(literal("posting"), JobPosting.status, func.count(JobPosting.id))
+        .group_by(JobPosting.status)
+    )
+    applications = (
+        select(literal("application"), Application.status, func.count(Application.id))
+        .group_by(Application.status)
+    )
+
+    postings_by_status: dict[str, int] = {}
+    by_status: dict[str, int] = {}
+    for kind, status, count in db.execute(union_all(postings, applications)):
+        (postings_by_status if kind == "posting" else by_status)[status] = count
+
+    return {
+        "open_positions": postings_by_status.get("published", 0),
+        "total_applications": sum(by_status.values()),
+        "by_status": by_status,
+    }
+
+
+_LOADERS = {
+    HEADCOUNT: _load_headcount,
+    LEAVE: _load_leave,
+    RECRUITING: _load_recruiting,
+}
+
+
+def get_section(db: Session, section: str) -> dict[str, Any]:
+    """Ein Kennzahlen-Abschnitt – ein Statement, gecacht (Ergebnis wird geteilt, nicht verändern)."""
+    return _analytics_cache.get_or_set(section, lambda: _LOADERS[section](db))
+
+
+def get_headcount(db: Session) -> dict[str, Any]:
+    return get_section(db, HEADCOUNT)
+
+
+def get_leave_stats(db: Session) -> dict[str, Any]:
+    return get_section(db, LEAVE)
+
+
+def get_recruiting_funnel(db: Session) -> dict[str, Any]:
+    return get_section(db, RECRUITING)
+
+
+def get_overview(db: Session) -> dict[str, Any]:
+    """Alle HR-Kennzahlen in einer Antwort."""
+    return {section: get_section(db, section) for section in _LOADERS}
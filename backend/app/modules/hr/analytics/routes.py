@@ -1,21 +1,37 @@
 """
 HR Analytics Routes
 Aggregierte HR-Kennzahlen ohne eigene Tabellen.
-"""
-from datetime import date
 
+Die Abfragen (siehe crud) laufen über die synchrone Session und werden
+deshalb im Threadpool ausgeführt, um den Event-Loop nicht zu blockieren.
+"""
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, extract
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.settings.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
 
+from . import crud
+
 
 router = APIRouter(prefix="/analytics", tags=["HR Analytics"])
 
 
+@router.get("/overview")
+@require_permissions(["hr.view"])
+async def overview(
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Alle HR-Kennzahlen in einer Antwort: headcount, leave, recruiting
+    (benötigt: hr.view)
+    """
+    return await run_in_threadpool(crud.get_overview, db)
+
+
 @router.get("/headcount")
 @require_permissions(["hr.view"])
 async def headcount(
@@ -26,35 +42,7 @@ async def headcount(
     Headcount-Übersicht: gesamt, aktiv, nach Abteilung und Beschäftigungsart
     (benötigt: hr.view)
     """
-    from app.modules.employees.models import Employee, Department
-
-    total = db.query(func.count(Employee.id)).scalar() or 0
-    active = db.query(func.count(Employee.id)).filter(Employee.status == "active").scalar() or 0
-
-    # Nach Abteilung
-    dept_rows = (
-        db.query(Department.name, func.count(Employee.id).label("cnt"))
-        .join(Employee, Employee.department_id == Department.id, isouter=True)
-        .group_by(Department.name)
-        .all()
-    )
-    by_department = {row.name: row.cnt for row in dept_rows}
-
-    # Nach Beschäftigungsart
-    type_rows = (
-        db.query(Employee.employment_type, func.count(Employee.id).label("cnt"))
-        .filter(Employee.employment_type.isnot(None))
-        .group_by(Employee.employment_type)
-        .all()
-    )
-    by_employment_type = {row.employment_type: row.cnt for row in type_rows}
-
-    return {
-        "total": total,
-        "active": active,
-        "by_department": by_department,
-        "by_employment_type": by_employment_type,
-    }
+    return await run_in_threadpool(crud.get_headcount, db)
 
 
 @router.get("/leave-summary")
@@ -67,30 +55,11 @@ async def leave_summary(
     Urlaubs-Zusammenfassung: offene Anträge, genehmigt diesen Monat, Tage dieses Jahr
     (benötigt: hr.view)
     """
-    from app.modules.hr.leave.models import LeaveRequest
-
-    today = date.today()
-
-    pending = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "pending"
-    ).scalar() or 0
-
-    approved_this_month = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "approved",
-        extract("year", LeaveRequest.approved_date) == today.year,
-        extract("month", LeaveRequest.approved_date) == today.month,
-    ).scalar() or 0
-
-    total_days_result = db.query(func.sum(LeaveRequest.total_days)).filter(
-        LeaveRequest.status == "approved",
-        extract("year", LeaveRequest.start_date) == today.year,
-    ).scalar()
-    total_days_taken = float(total_days_result) if total_days_result else 0.0
-
+    stats = await run_in_threadpool(crud.get_leave_stats, db)
     return {
-        "pending_requests": pending,
-        "approved_this_month": approved_this_month,
-        "total_days_taken_this_year": total_days_taken,
+        "pending_requests": stats["pending_requests"],
+        "approved_this_month": stats["approved_this_month"],
+        "total_days_taken_this_year": stats["total_days_taken_this_year"],
     }
 
 
@@ -104,23 +73,4 @@ async def recruiting_funnel(
     Recruiting-Funnel: offene Stellen, Bewerbungen gesamt, nach Status
     (benötigt: hr.view)
     """
-    from app.modules.hr.recruiting.models import JobPosting, Application
-
-    open_positions = db.query(func.count(JobPosting.id)).filter(
-        JobPosting.status == "published"
-    ).scalar() or 0
-
-    total_applications = db.query(func.count(Application.id)).scalar() or 0
-
-    status_rows = (
-        db.query(Application.status, func.count(Application.id).label("cnt"))
-        .group_by(Application.status)
-        .all()
-    )
-    by_status = {row.status: row.cnt for row in status_rows}
-
-    return {
-        "open_positions": open_positions,
-        "total_applications": total_applications,
-        "by_status": by_status,
-    }
+    return await run_in_threadpool(crud.get_recruiting_funnel, db)
@@ -82,6 +82,22 @@ class LeaveStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+class LeaveLedgerEntryType(str, Enum):
+    """Buchungsart im Urlaubs-Ledger"""
+    ACCRUAL = "accrual"            # Jahresanspruch
+    ADJUSTMENT = "adjustment"      # manuelle Korrektur des Anspruchs
+    CARRYOVER = "carryover"        # Übertrag aus dem Vorjahr
+    APPROVAL = "approval"          # genehmigter Antrag (verbraucht)
+    CANCELLATION = "cancellation"  # Stornierung (negativ verbraucht)
+
+
+class LeaveLedgerCategory(str, Enum):
+    """Saldo-Kategorie einer Ledger-Buchung"""
+    VACATION = "vacation"
+    SICK = "sick"
+    OTHER = "other"
+
+
 # ============================================================================
 # TRAINING ENUMS
 # ============================================================================
@@ -0,0 +1,213 @@
+"""
+Team-Verfügbarkeit: Mitarbeiter × Tag-Matrix für einen Zeitraum.
+
+Statt den Abwesenheitskalender Tag für Tag abzufragen, lädt eine Query
+(employees LEFT JOIN hr_absence_calendar über uq_absence_calendar_employee_date)
+alle Abwesenheiten einer Abteilung für die benötigten Monate. Pro
+(Abteilung, Monat) wird das Ergebnis prozessweit gecacht; Genehmigen,
+Stornieren und Rebuild invalidieren die betroffenen Monate, Änderungen an
+Mitarbeitern und Abteilungen (employees.crud, Keycloak-Provisioning) den
+ganzen Cache.
+
+Antwortformat (kompakt):
+- absences je Mitarbeiter als Lauflängen: start (Tag-Index ab date_from),
+  length, leave_type, full_day
+- available/absent je Tag als Zahlenliste
+- working_days als Bitstring ("1" = Arbeitstag laut Standardwoche, ohne Feiertage)
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.calendar import is_working_day
+from app.core.settings.config import settings
+
+from . import models
+
+MAX_RANGE_DAYS = 93
+
+Month = tuple[int, int]
+
+_month_cache = TTLCache(ttl_seconds=settings.TEAM_AVAILABILITY_CACHE_TTL_SECONDS)
+
+
+def _months(start: date, end: date) -> list[Month]:
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def _month_bounds(month: Month) -> tuple[date, date]:
+    year, mon = month
+    first = date(year, mon, 1)
+    next_first = date(year + 1, 1, 1) if mon == 12 else date(year, mon + 1, 1)
+    return first, next_first - timedelta(days=1)
+
+
+def _load_months(db: Session, department_id: Optional[UUID], months: list[Month]) -> dict[Month, dict]:
+    """
+    Baut die Monats-Matrizen für alle fehlenden Monate mit einer Query.
+
+    Returns:
+        Monat → {"employees": [(id, name)], "absences": {employee_id: [(date, leave_type, full_day)]}}
+    """
+    from app.modules.employees.models import Employee
+
+    span_start = _month_bounds(months[0])[0]
+    span_end = _month_bounds(months[-1])[1]
+    Absence = models.AbsenceCalendar
+
+    stmt = (
+        select(
+            Employee.id,
+            Employee.first_name,
+            Employee.last_name,
+            Absence.absence_date,
+            Absence.leave_type,
+            Absence.is_full_day,
+        )
+        .outerjoin(
+            Absence,
+            and_(
+                Absence.employee_id == Employee.id,
+                Absence.absence_date >= span_start,
+                Absence.absence_date <= span_end,
+            ),
+        )
+        .where(or_(Employee.status.is_(None), Employee.status != "inactive"))
+        .order_by(Employee.last_name, Employee.first_name, Employee.id, Absence.absence_date)
+    )
+    if department_id:
+        stmt = stmt.where(Employee.department_id == department_id)
+
+    employees: dict[UUID, str] = {}
+    absences: dict[Month, dict[UUID, list]] = {month: defaultdict(list) for month in months}
+    for employee_id, first_name, last_name, absence_date, leave_type, full_day in db.execute(stmt):
+        employees.setdefault(employee_id, " ".join(p for p in (first_name, last_name) if p))
+        if absence_date is not None:
+            month = (absence_date.year, absence_date.month)
+            if month in absences:
+                absences[month][employee_id].append((absence_date, leave_type, bool(full_day)))
+
+    employee_list = list(employees.items())
+    return {
+        month: {"employees": employee_list, "absences": dict(absences[month])}
+        for month in months
+    }
+
+
+def _run_lengths(entries: Iterable[tuple[date, str, bool]], date_from: date) -> list[dict]:
+    """Aufeinanderfolgende Tage mit gleichem Typ/Umfang zu Läufen zusammenfassen."""
+    runs: list[dict] = []
+    for day, leave_type, full_day in entries:
+        index = (day - date_from).days
+        last = runs[-1] if runs else None
+        if (
+            last
+            and last["start"] + last["length"] == index
+            and last["leave_type"] == leave_type
+            and last["full_day"] == full_day
+        ):
+            last["length"] += 1
+        else:
+            runs.append({"start": index, "length": 1, "leave_type": leave_type, "full_day": full_day})
+    return runs
+
+
+def get_team_availability(
+    db: Session,
+    date_from: date,
+    date_to: date,
+    department_id: Optional[UUID] = None,
+) -> dict[str, Any]:
+    """
+    Verfügbarkeits-Matrix einer Abteilung (None = alle) für [date_from, date_to].
+
+    Fehlende Monate werden gemeinsam mit einer Query geladen und
+    pro (Abteilung, Monat) gecacht.
+    """
+    months = _months(date_from, date_to)
+    cached: dict[Month, dict] = {}
+    missing: list[Month] = []
+    for month in months:
+        value = _month_cache.get((department_id, month))
+        if value is None:
+            missing.append(month)
+        else:
+            cached[month] = value
+    if missing:
+        for month, value in _load_months(db, department_id, missing).items():
+            _month_cache.set((department_id, month), value)
+            cached[month] = value
+
+    # Mitarbeiterliste aus dem jüngsten Monat (alle Monate stammen i.d.R. aus einer Query)
+    employees = cached[months[-1]]["employees"]
+    days = (date_to - date_from).days + 1
+    absent = [0] * days
+
+    rows = []
+    for employee_id, name in employees:
+        entries = [
+            entry
+            for month in months
+            for entry in cached[month]["absences"].get(employee_id, ())
+            if date_from <= entry[0] <= date_to
+        ]
+        for day, _, full_day in entries:
+            if full_day:
+                absent[(day - date_from).days] += 1
+        rows.append({
+            "employee_id": employee_id,
+            "name": name,
+            "absences": _run_lengths(entries, date_from),
+        })
+
+    working_days = "".join(
+        "1" if is_working_day(date_from + timedelta(days=i)) else "0" for i in range(days)
+    )
+    return {
+        "department_id": department_id,
+        "date_from": date_from,
+        "date_to": date_to,
+        "days": days,
+        "working_days": working_days,
+        "headcount": len(employees),
+        "available": [len(employees) - n for n in absent],
+        "absent": absent,
+        "employees": rows,
+    }
+
+
+def invalidate_team_availability(
+    db: Session,
+    employee_id: Optional[UUID] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+) -> None:
+    """
+    Verwirft gecachte Monate nach Änderungen am Abwesenheitskalender oder
+    an Mitarbeitern/Abteilungen.
+
+    Mit Mitarbeiter und Zeitraum nur die betroffenen Monate seiner
+    Abteilung (und der Gesamtansicht), sonst den ganzen Cache.
+    """
+    if employee_id is None or start is None or end is None:
+        _month_cache.invalidate()
+        return
+
+    from app.modules.employees.models import Employee
+
+    department_id = db.scalar(select(Employee.department_id).where(Employee.id == employee_id))
+    for month in _months(start, end):
+        _month_cache.invalidate((department_id, month))
+        _month_cache.invalidate((None, month))
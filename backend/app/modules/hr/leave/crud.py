@@ -2,16 +2,26 @@
 Leave Management CRUD Operations
 Business-Logik für Urlaubsverwaltung.
 """
+import uuid
 from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, extract, func
-from datetime import date, timedelta
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import and_, or_, delete, exists, extract, func, insert, select, update
+from datetime import date, datetime, timezone
 from decimal import Decimal
 
 from . import models, schemas
-from app.modules.hr.enums import LeaveStatus, LeaveType
-from app.modules.hr.utils import get_date_ranges_between
+from .availability import invalidate_team_availability
+from app.modules.hr.analytics.crud import LEAVE, invalidate_hr_analytics
+from app.modules.hr.enums import LeaveLedgerCategory, LeaveLedgerEntryType, LeaveStatus, LeaveType
+from app.core.calendar import (
+    WorkWeek,
+    business_days,
+    work_week_for_employee,
+    work_weeks_for_employees,
+    working_dates,
+)
 
 
 # ============================================================================
@@ -134,15 +144,24 @@ def create_leave_balance(
     db: Session,
     balance_data: schemas.LeaveBalanceCreate
 ) -> models.LeaveBalance:
-    """Erstellt einen neuen Leave Balance"""
-    # Berechne verbleibende Tage
-    vacation_remaining = balance_data.vacation_total - Decimal("0.00")
-
+    """Erstellt einen neuen Leave Balance (Anspruch als Ledger-Buchungen)"""
     balance = models.LeaveBalance(
-        **balance_data.model_dump(),
-        vacation_remaining=vacation_remaining
+        employee_id=balance_data.employee_id,
+        year=balance_data.year,
+        policy_id=balance_data.policy_id,
     )
     db.add(balance)
+    db.flush()
+
+    post_ledger_entries(db, [
+        _ledger_entry(balance.employee_id, balance.year, category, LeaveLedgerEntryType.ACCRUAL, days)
+        for category, days in (
+            (LeaveLedgerCategory.VACATION, balance_data.vacation_total),
+            (LeaveLedgerCategory.SICK, balance_data.sick_total),
+            (LeaveLedgerCategory.OTHER, balance_data.other_total),
+        )
+        if days
+    ])
     db.commit()
     db.refresh(balance)
     return balance
@@ -153,17 +172,30 @@ def update_leave_balance(
     balance_id: UUID,
     balance_data: schemas.LeaveBalanceUpdate
 ) -> Optional[models.LeaveBalance]:
-    """Aktualisiert einen Leave Balance"""
+    """Aktualisiert einen Leave Balance (Anspruchsänderungen als Korrekturbuchung)"""
     balance = get_leave_balance(db, balance_id)
     if not balance:
         return None
 
     update_data = balance_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(balance, field, value)
-
-    # Neuberechnung verbleibender Tage
-    balance.vacation_remaining = balance.vacation_total - balance.vacation_used
+    if "policy_id" in update_data:
+        balance.policy_id = update_data["policy_id"]
+
+    entries = []
+    for category, field in (
+        (LeaveLedgerCategory.VACATION, "vacation_total"),
+        (LeaveLedgerCategory.SICK, "sick_total"),
+        (LeaveLedgerCategory.OTHER, "other_total"),
+    ):
+        if update_data.get(field) is None:
+            continue
+        delta = update_data[field] - getattr(balance, field)
+        if delta:
+            entries.append(_ledger_entry(
+                balance.employee_id, balance.year, category, LeaveLedgerEntryType.ADJUSTMENT, delta,
+                note="Manuelle Anpassung",
+            ))
+    post_ledger_entries(db, entries)
 
     db.commit()
     db.refresh(balance)
@@ -183,8 +215,8 @@ def initialize_employee_balance(
         return existing
 
     # Hole Policy für Standardwerte
-    vacation_days = Decimal("20.00")
-    sick_days = Decimal("10.00")
+    vacation_days = DEFAULT_VACATION_DAYS
+    sick_days = DEFAULT_SICK_DAYS
 
     if policy_id:
         policy = get_leave_policy(db, policy_id)
@@ -200,7 +232,284 @@ def initialize_employee_balance(
         sick_total=sick_days
     )
 
-    return create_leave_balance(db, balance_data)
+    try:
+        return create_leave_balance(db, balance_data)
+    except IntegrityError:
+        # Parallel angelegt (uq_leave_balance_employee_year)
+        db.rollback()
+        return get_employee_balance(db, employee_id, year)
+
+
+# ============================================================================
+# LEAVE LEDGER
+# ============================================================================
+
+DEFAULT_VACATION_DAYS = Decimal("20.00")
+DEFAULT_SICK_DAYS = Decimal("10.00")
+DEFAULT_MAX_CARRYOVER_DAYS = Decimal("5.00")
+LEDGER_INSERT_CHUNK_SIZE = 1000
+
+# Buchungsart → Snapshot-Spalte je Kategorie
+_TOTAL_TYPES = (
+    LeaveLedgerEntryType.ACCRUAL.value,
+    LeaveLedgerEntryType.ADJUSTMENT.value,
+    LeaveLedgerEntryType.CARRYOVER.value,
+)
+_USED_TYPES = (LeaveLedgerEntryType.APPROVAL.value, LeaveLedgerEntryType.CANCELLATION.value)
+_SNAPSHOT_COLUMNS = {
+    LeaveLedgerCategory.VACATION.value: ("vacation_total", "vacation_used"),
+    LeaveLedgerCategory.SICK.value: ("sick_total", "sick_used"),
+    LeaveLedgerCategory.OTHER.value: ("other_total", "other_used"),
+}
+
+
+def ledger_category(leave_type: str) -> str:
+    """Saldo-Kategorie eines Abwesenheitstyps"""
+    if leave_type == LeaveType.VACATION.value:
+        return LeaveLedgerCategory.VACATION.value
+    if leave_type == LeaveType.SICK.value:
+        return LeaveLedgerCategory.SICK.value
+    return LeaveLedgerCategory.OTHER.value
+
+
+def _ledger_entry(
+    employee_id: UUID,
+    year: int,
+    category: LeaveLedgerCategory | str,
+    entry_type: LeaveLedgerEntryType,
+    days: Decimal,
+    leave_request_id: Optional[UUID] = None,
+    note: Optional[str] = None,
+) -> dict:
+    return {
+        "id": uuid.uuid4(),
+        "employee_id": employee_id,
+        "year": year,
+        "category": category.value if isinstance(category, LeaveLedgerCategory) else category,
+        "entry_type": entry_type.value,
+        "days": Decimal(days),
+        "leave_request_id": leave_request_id,
+        "note": note,
+        # Zeitstempel der Buchung statt now() der Transaktion: hält die Reihenfolge innerhalb einer Transaktion
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+def _snapshot_deltas(entries: list[dict]) -> dict[tuple[UUID, int], dict[str, Decimal]]:
+    """Summiert Buchungen zu Spalten-Deltas je (Mitarbeiter, Jahr)."""
+    deltas: dict[tuple[UUID, int], dict[str, Decimal]] = {}
+    for entry in entries:
+        total_column, used_column = _SNAPSHOT_COLUMNS[entry["category"]]
+        column = total_column if entry["entry_type"] in _TOTAL_TYPES else used_column
+        bucket = deltas.setdefault((entry["employee_id"], entry["year"]), {})
+        bucket[column] = bucket.get(column, Decimal("0")) + entry["days"]
+        if entry["entry_type"] == LeaveLedgerEntryType.CARRYOVER.value:
+            bucket["vacation_carryover"] = bucket.get("vacation_carryover", Decimal("0")) + entry["days"]
+    return deltas
+
+
+def post_ledger_entries(db: Session, entries: list[dict]) -> None:
+    """
+    Bucht Ledger-Einträge und führt den Snapshot nach (ohne Commit).
+
+    Ein mehrzeiliges INSERT für die Buchungen, danach ein UPDATE mit
+    Spalten-Inkrementen je betroffenem Snapshot. Fehlt der Snapshot, wird
+    er im Savepoint angelegt (Race → Unique-Constraint → erneut UPDATE).
+    """
+    if not entries:
+        return
+    Balance = models.LeaveBalance
+    for start in range(0, len(entries), LEDGER_INSERT_CHUNK_SIZE):
+        db.execute(insert(models.LeaveLedgerEntry.__table__), entries[start:start + LEDGER_INSERT_CHUNK_SIZE])
+
+    for (employee_id, year), columns in _snapshot_deltas(entries).items():
+        values = {name: getattr(Balance, name) + delta for name, delta in columns.items()}
+        values["vacation_remaining"] = (
+            values.get("vacation_total", Balance.vacation_total)
+            - values.get("vacation_used", Balance.vacation_used)
+        )
+        stmt = update(Balance).where(Balance.employee_id == employee_id, Balance.year == year).values(values)
+        if db.execute(stmt).rowcount:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(Balance).values(
+                    id=uuid.uuid4(), employee_id=employee_id, year=year,
+                    vacation_total=0, vacation_used=0, vacation_remaining=0, vacation_carryover=0,
+                    sick_total=0, sick_used=0, other_total=0, other_used=0,
+                ))
+        except IntegrityError:
+            pass
+        db.execute(stmt)
+
+
+def get_leave_ledger(
+    db: Session,
+    employee_id: UUID,
+    year: Optional[int] = None
+) -> list[models.LeaveLedgerEntry]:
+    """Ledger-Buchungen eines Mitarbeiters in Buchungsreihenfolge"""
+    query = db.query(models.LeaveLedgerEntry).filter(models.LeaveLedgerEntry.employee_id == employee_id)
+    if year is not None:
+        query = query.filter(models.LeaveLedgerEntry.year == year)
+    return query.order_by(models.LeaveLedgerEntry.created_at, models.LeaveLedgerEntry.id).all()
+
+
+def replay_leave_ledger(entries: list[models.LeaveLedgerEntry]) -> dict[str, Decimal]:
+    """
+    Spielt Buchungen nach und liefert die Snapshot-Werte.
+
+    Für Audits: das Ergebnis muss mit dem gespeicherten LeaveBalance übereinstimmen.
+    """
+    balance = {
+        name: Decimal("0.00")
+        for columns in _SNAPSHOT_COLUMNS.values() for name in columns
+    }
+    balance["vacation_carryover"] = Decimal("0.00")
+    for entry in entries:
+        total_column, used_column = _SNAPSHOT_COLUMNS[entry.category]
+        balance[total_column if entry.entry_type in _TOTAL_TYPES else used_column] += entry.days
+        if entry.entry_type == LeaveLedgerEntryType.CARRYOVER.value:
+            balance["vacation_carryover"] += entry.days
+    balance["vacation_remaining"] = balance["vacation_total"] - balance["vacation_used"]
+    return balance
+
+
+def refresh_leave_balances(db: Session, year: int, employee_ids: Optional[list[UUID]] = None) -> int:
+    """
+    Berechnet die Snapshots eines Jahres mit einem UPDATE aus dem Ledger neu (ohne Commit).
+
+    Returns:
+        Anzahl aktualisierter Snapshots
+    """
+    Balance = models.LeaveBalance
+    Ledger = models.LeaveLedgerEntry
+
+    def _sum(category: str, entry_types: tuple[str, ...]):
+        return (
+            select(func.coalesce(func.sum(Ledger.days), 0))
+            .where(
+                Ledger.employee_id == Balance.employee_id,
+                Ledger.year == Balance.year,
+                Ledger.category == category,
+                Ledger.entry_type.in_(entry_types),
+            )
+            .scalar_subquery()
+        )
+
+    values = {}
+    for category, (total_column, used_column) in _SNAPSHOT_COLUMNS.items():
+        values[total_column] = _sum(category, _TOTAL_TYPES)
+        values[used_column] = _sum(category, _USED_TYPES)
+    vacation = LeaveLedgerCategory.VACATION.value
+    values["vacation_remaining"] = _sum(vacation, _TOTAL_TYPES) - _sum(vacation, _USED_TYPES)
+    values["vacation_carryover"] = _sum(vacation, (LeaveLedgerEntryType.CARRYOVER.value,))
+
+    stmt = update(Balance).where(Balance.year == year).values(values)
+    if employee_ids is not None:
+        stmt = stmt.where(Balance.employee_id.in_(employee_ids))
+    return db.execute(stmt, execution_options={"synchronize_session": False}).rowcount or 0
+
+
+def rollover_leave_year(db: Session, from_year: int) -> dict[str, int]:
+    """
+    Jahreswechsel für alle aktiven Mitarbeiter in einem Durchlauf.
+
+    Legt für from_year + 1 fehlende Snapshots an, bucht den Jahresanspruch
+    laut Policy des Vorjahres (Standard 20/10 Tage) und überträgt den
+    Resturlaub bis max_carryover_days, sofern die Policy das erlaubt.
+    Idempotent: bereits gebuchte Ansprüche/Überträge werden übersprungen.
+
+    Unabhängig von der Mitarbeiterzahl: eine SELECT-Query, mehrzeilige
+    INSERTs (Chunks) und ein UPDATE der Snapshots aus dem Ledger.
+
+    Returns:
+        employees, balances_created, accruals, carryovers
+    """
+    from app.modules.employees.models import Employee
+
+    to_year = from_year + 1
+    Balance = models.LeaveBalance
+    Policy = models.LeavePolicy
+    Ledger = models.LeaveLedgerEntry
+    previous = Balance.__table__.alias("previous")
+    current = Balance.__table__.alias("current")
+
+    def _booked(entry_type: LeaveLedgerEntryType):
+        return exists().where(
+            Ledger.employee_id == Employee.id,
+            Ledger.year == to_year,
+            Ledger.entry_type == entry_type.value,
+        )
+
+    rows = db.execute(
+        select(
+            Employee.id,
+            previous.c.policy_id,
+            previous.c.vacation_remaining,
+            Policy.vacation_days,
+            Policy.sick_days,
+            Policy.carryover_allowed,
+            Policy.max_carryover_days,
+            current.c.id.label("current_id"),
+            _booked(LeaveLedgerEntryType.ACCRUAL).label("has_accrual"),
+            _booked(LeaveLedgerEntryType.CARRYOVER).label("has_carryover"),
+        )
+        .select_from(Employee)
+        .outerjoin(previous, and_(previous.c.employee_id == Employee.id, previous.c.year == from_year))
+        .outerjoin(Policy, Policy.id == previous.c.policy_id)
+        .outerjoin(current, and_(current.c.employee_id == Employee.id, current.c.year == to_year))
+        .where(or_(Employee.status.is_(None), Employee.status != "inactive"))
+    ).all()
+
+    balances = []
+    entries = []
+    carryovers = 0
+    for row in rows:
+        if row.current_id is None:
+            balances.append({
+                "id": uuid.uuid4(), "employee_id": row.id, "year": to_year, "policy_id": row.policy_id,
+                "vacation_total": 0, "vacation_used": 0, "vacation_remaining": 0, "vacation_carryover": 0,
+                "sick_total": 0, "sick_used": 0, "other_total": 0, "other_used": 0,
+            })
+        if not row.has_accrual:
+            vacation = DEFAULT_VACATION_DAYS if row.vacation_days is None else Decimal(row.vacation_days)
+            sick = DEFAULT_SICK_DAYS if row.sick_days is None else Decimal(row.sick_days)
+            entries += [
+                _ledger_entry(row.id, to_year, category, LeaveLedgerEntryType.ACCRUAL, days, note="Jahresanspruch")
+                for category, days in ((LeaveLedgerCategory.VACATION, vacation), (LeaveLedgerCategory.SICK, sick))
+                if days
+            ]
+        remaining = Decimal(str(row.vacation_remaining or 0))
+        allowed = row.carryover_allowed is None or row.carryover_allowed
+        if not row.has_carryover and allowed and remaining > 0:
+            limit = DEFAULT_MAX_CARRYOVER_DAYS if row.max_carryover_days is None else Decimal(row.max_carryover_days)
+            days = min(remaining, limit)
+            if days > 0:
+                carryovers += 1
+                entries.append(_ledger_entry(
+                    row.id, to_year, LeaveLedgerCategory.VACATION, LeaveLedgerEntryType.CARRYOVER, days,
+                    note=f"Übertrag aus {from_year}",
+                ))
+
+    try:
+        for start in range(0, len(balances), LEDGER_INSERT_CHUNK_SIZE):
+            db.execute(insert(Balance.__table__), balances[start:start + LEDGER_INSERT_CHUNK_SIZE])
+        for start in range(0, len(entries), LEDGER_INSERT_CHUNK_SIZE):
+            db.execute(insert(Ledger.__table__), entries[start:start + LEDGER_INSERT_CHUNK_SIZE])
+        if balances or entries:
+            refresh_leave_balances(db, to_year)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return {
+        "employees": len(rows),
+        "balances_created": len(balances),
+        "accruals": sum(e["entry_type"] == LeaveLedgerEntryType.ACCRUAL.value for e in entries),
+        "carryovers": carryovers,
+    }
 
 
 # ============================================================================
@@ -252,38 +561,29 @@ def create_leave_request(
     employee_id: UUID
 ) -> models.LeaveRequest:
     """Erstellt einen neuen Leave Request"""
-    from decimal import Decimal
-    from datetime import timedelta
-
     # Auto-calculate total_days if not provided
     data = request_data.model_dump(exclude={"employee_id"})
     if data.get("total_days") is None:
-        # Calculate business days (weekdays only, excluding weekends)
+        # Arbeitstage laut Arbeitszeitmodell des Mitarbeiters, ohne Feiertage
+        work_week = work_week_for_employee(db, employee_id)
         start = request_data.start_date
         end = request_data.end_date
 
-        business_days = 0
-        current = start
-        while current <= end:
-            # Monday=0, Sunday=6 -> Count Monday-Friday only
-            if current.weekday() < 5:
-                business_days += 1
-            current += timedelta(days=1)
-
         # Validate that there is at least one business day
-        if business_days == 0:
+        if business_days(start, end, work_week) == 0:
             raise ValueError(
-                "Der gewählte Zeitraum enthält keine Werktage. "
-                "Urlaubsanträge müssen mindestens einen Werktag (Mo-Fr) umfassen."
+                "Der gewählte Zeitraum enthält keine Arbeitstage. "
+                "Urlaubsanträge müssen mindestens einen Arbeitstag umfassen "
+                "(Wochenenden und Feiertage zählen nicht)."
             )
 
-        total = Decimal(str(business_days))
-
-        # Adjust for half days
-        if request_data.half_day_start:
-            total -= Decimal("0.5")
-        if request_data.half_day_end:
-            total -= Decimal("0.5")
+        total = business_days(
+            start,
+            end,
+            work_week,
+            half_day_start=request_data.half_day_start,
+            half_day_end=request_data.half_day_end,
+        )
 
         # Final validation
         if total <= 0:
@@ -299,6 +599,7 @@ def create_leave_request(
     )
     db.add(leave_request)
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     db.refresh(leave_request)
 
     return leave_request
@@ -323,6 +624,7 @@ def update_leave_request(
         setattr(leave_request, field, value)
 
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     db.refresh(leave_request)
     return leave_request
 
@@ -347,6 +649,7 @@ def approve_leave_request(
     leave_request.approved_date = date.today()
 
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     db.refresh(leave_request)
 
     # Aktualisiere Balance
@@ -379,6 +682,7 @@ def reject_leave_request(
     leave_request.rejection_reason = rejection_reason
 
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     db.refresh(leave_request)
     return leave_request
 
@@ -402,12 +706,16 @@ def cancel_leave_request(
     leave_request.status = LeaveStatus.CANCELLED.value
 
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     db.refresh(leave_request)
 
     # Wenn bereits genehmigt, Balance zurücksetzen
     if was_approved:
         revert_balance_after_cancellation(db, leave_request)
         delete_absence_calendar_entries(db, leave_request.id)
+        invalidate_team_availability(
+            db, leave_request.employee_id, leave_request.start_date, leave_request.end_date
+        )
 
     return leave_request
 
@@ -424,6 +732,7 @@ def delete_leave_request(db: Session, request_id: UUID) -> bool:
 
     db.delete(leave_request)
     db.commit()
+    invalidate_hr_analytics(LEAVE)
     return True
 
 
@@ -435,23 +744,16 @@ def update_balance_after_approval(
     db: Session,
     leave_request: models.LeaveRequest
 ):
-    """Aktualisiert Balance nach Genehmigung"""
+    """Bucht den genehmigten Antrag ins Ledger"""
     year = leave_request.start_date.year
-    balance = get_employee_balance(db, leave_request.employee_id, year)
-
-    if not balance:
+    if not get_employee_balance(db, leave_request.employee_id, year):
         # Initialisiere Balance wenn nicht vorhanden
-        balance = initialize_employee_balance(db, leave_request.employee_id, year)
-
-    # Aktualisiere basierend auf Leave Type
-    if leave_request.leave_type == LeaveType.VACATION.value:
-        balance.vacation_used += leave_request.total_days
-        balance.vacation_remaining = balance.vacation_total - balance.vacation_used
-    elif leave_request.leave_type == LeaveType.SICK.value:
-        balance.sick_used += leave_request.total_days
-    else:
-        balance.other_used += leave_request.total_days
+        initialize_employee_balance(db, leave_request.employee_id, year)
 
+    post_ledger_entries(db, [_ledger_entry(
+        leave_request.employee_id, year, ledger_category(leave_request.leave_type),
+        LeaveLedgerEntryType.APPROVAL, leave_request.total_days, leave_request_id=leave_request.id,
+    )])
     db.commit()
 
 
@@ -459,22 +761,15 @@ def revert_balance_after_cancellation(
     db: Session,
     leave_request: models.LeaveRequest
 ):
-    """Setzt Balance zurück nach Stornierung"""
+    """Bucht die Stornierung eines genehmigten Antrags ins Ledger"""
     year = leave_request.start_date.year
-    balance = get_employee_balance(db, leave_request.employee_id, year)
-
-    if not balance:
+    if not get_employee_balance(db, leave_request.employee_id, year):
         return
 
-    # Zurücksetzen basierend auf Leave Type
-    if leave_request.leave_type == LeaveType.VACATION.value:
-        balance.vacation_used = max(Decimal("0.00"), balance.vacation_used - leave_request.total_days)
-        balance.vacation_remaining = balance.vacation_total - balance.vacation_used
-    elif leave_request.leave_type == LeaveType.SICK.value:
-        balance.sick_used = max(Decimal("0.00"), balance.sick_used - leave_request.total_days)
-    else:
-        balance.other_used = max(Decimal("0.00"), balance.other_used - leave_request.total_days)
-
+    post_ledger_entries(db, [_ledger_entry(
+        leave_request.employee_id, year, ledger_category(leave_request.leave_type),
+        LeaveLedgerEntryType.CANCELLATION, -leave_request.total_days, leave_request_id=leave_request.id,
+    )])
     db.commit()
 
 
@@ -482,42 +777,107 @@ def revert_balance_after_cancellation(
 # ABSENCE CALENDAR CRUD
 # ============================================================================
 
+ABSENCE_INSERT_CHUNK_SIZE = 1000
+
+
+def _insert_ignoring_duplicates(db: Session):
+    """INSERT ... ON CONFLICT DO NOTHING für den aktiven Dialekt."""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    return dialect_insert(models.AbsenceCalendar.__table__).on_conflict_do_nothing(
+        index_elements=["employee_id", "absence_date"]
+    )
+
+
+def _absence_rows(leave_request: models.LeaveRequest, work_week: WorkWeek) -> list[dict]:
+    """Kalenderzeilen eines Antrags – nur Arbeitstage laut Arbeitszeitmodell, ohne Feiertage."""
+    rows = []
+    for current_date in working_dates(leave_request.start_date, leave_request.end_date, work_week):
+        # Bestimme ob ganzer Tag oder halber
+        is_full_day = not (
+            (current_date == leave_request.start_date and leave_request.half_day_start)
+            or (current_date == leave_request.end_date and leave_request.half_day_end)
+        )
+        rows.append({
+            "id": uuid.uuid4(),
+            "employee_id": leave_request.employee_id,
+            "leave_request_id": leave_request.id,
+            "absence_date": current_date,
+            "is_full_day": is_full_day,
+            "leave_type": leave_request.leave_type,
+        })
+    return rows
+
+
+def _insert_absence_rows(db: Session, rows: list[dict]) -> int:
+    inserted = 0
+    for start in range(0, len(rows), ABSENCE_INSERT_CHUNK_SIZE):
+        # Mehrzeiliges VALUES statt executemany: rowcount zählt zuverlässig
+        result = db.execute(_insert_ignoring_duplicates(db).values(rows[start:start + ABSENCE_INSERT_CHUNK_SIZE]))
+        inserted += result.rowcount or 0
+    return inserted
+
+
 def create_absence_calendar_entries(
     db: Session,
     leave_request: models.LeaveRequest
-):
-    """Erstellt Absence Calendar Einträge für genehmigten Urlaub"""
-    dates = get_date_ranges_between(leave_request.start_date, leave_request.end_date)
-
-    for current_date in dates:
-        # Prüfe ob bereits existiert
-        existing = db.query(models.AbsenceCalendar).filter(
-            and_(
-                models.AbsenceCalendar.employee_id == leave_request.employee_id,
-                models.AbsenceCalendar.absence_date == current_date
-            )
-        ).first()
+) -> int:
+    """
+    Erstellt Absence Calendar Einträge für genehmigten Urlaub.
+
+    Ein mehrzeiliges INSERT ... ON CONFLICT (employee_id, absence_date)
+    DO NOTHING – bereits belegte Tage (überlappende Anträge, erneute
+    Genehmigung) werden übersprungen, ohne vorher einzeln zu prüfen.
+
+    Returns:
+        Anzahl neu angelegter Einträge
+    """
+    work_week = work_week_for_employee(db, leave_request.employee_id)
+    inserted = _insert_absence_rows(db, _absence_rows(leave_request, work_week))
+    db.commit()
+    invalidate_team_availability(
+        db, leave_request.employee_id, leave_request.start_date, leave_request.end_date
+    )
+    return inserted
 
-        if existing:
-            continue
 
-        # Bestimme ob ganzer Tag oder halber
-        is_full_day = True
-        if current_date == leave_request.start_date and leave_request.half_day_start:
-            is_full_day = False
-        if current_date == leave_request.end_date and leave_request.half_day_end:
-            is_full_day = False
-
-        calendar_entry = models.AbsenceCalendar(
-            employee_id=leave_request.employee_id,
-            leave_request_id=leave_request.id,
-            absence_date=current_date,
-            is_full_day=is_full_day,
-            leave_type=leave_request.leave_type
-        )
-        db.add(calendar_entry)
+def rebuild_absence_calendar(db: Session, employee_id: Optional[UUID] = None) -> int:
+    """
+    Baut den Abwesenheitskalender aus allen genehmigten Anträgen neu auf.
+
+    Nötig nach Änderungen an Arbeitszeitmodellen oder Feiertagen sowie
+    nach Importen direkt in die DB.
+
+    Args:
+        employee_id: Nur diesen Mitarbeiter neu aufbauen (None = alle)
 
+    Returns:
+        Anzahl angelegter Einträge
+    """
+    query = db.query(models.LeaveRequest).filter(
+        models.LeaveRequest.status == LeaveStatus.APPROVED.value
+    )
+    delete_stmt = delete(models.AbsenceCalendar)
+    if employee_id:
+        query = query.filter(models.LeaveRequest.employee_id == employee_id)
+        delete_stmt = delete_stmt.where(models.AbsenceCalendar.employee_id == employee_id)
+
+    # Älteste Anträge zuerst: bei Überlappung gewinnt wie bisher der frühere
+    leave_requests = query.order_by(models.LeaveRequest.approved_date, models.LeaveRequest.created_at).all()
+    work_weeks = work_weeks_for_employees(db, {lr.employee_id for lr in leave_requests})
+
+    rows = [
+        row
+        for leave_request in leave_requests
+        for row in _absence_rows(leave_request, work_weeks[leave_request.employee_id])
+    ]
+    db.execute(delete_stmt)
+    inserted = _insert_absence_rows(db, rows)
     db.commit()
+    invalidate_team_availability(db)
+    return inserted
 
 
 def delete_absence_calendar_entries(db: Session, leave_request_id: UUID):
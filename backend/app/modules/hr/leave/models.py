@@ -4,11 +4,11 @@ Urlaubsverwaltung und Abwesenheiten.
 """
 from __future__ import annotations
 import uuid
-from datetime import date
+from datetime import date, datetime
 from decimal import Decimal
 from typing import TYPE_CHECKING
 
-from sqlalchemy import String, Text, ForeignKey, Date, Numeric, Index, CheckConstraint, Boolean, Integer
+from sqlalchemy import String, Text, ForeignKey, Date, DateTime, Numeric, Index, CheckConstraint, Boolean, Integer, UniqueConstraint, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.settings.database import Base
@@ -57,11 +57,15 @@ class LeavePolicy(Base, UUIDMixin, TimestampMixin):
 class LeaveBalance(Base, UUIDMixin, TimestampMixin):
     """
     Urlaubssaldo-Tracking pro Mitarbeiter pro Jahr.
+
+    Snapshot des Urlaubs-Ledgers (LeaveLedgerEntry): Summen werden bei
+    jeder Buchung inkrementell nachgeführt und lassen sich jederzeit aus
+    dem Ledger neu berechnen.
     """
     __tablename__ = "hr_leave_balances"
     __table_args__ = (
-        Index("ix_leave_balance_employee_year", "employee_id", "year"),
-        Index("ix_leave_balance_employee_id", "employee_id"),
+        # Ein Snapshot pro Mitarbeiter und Jahr; deckt auch Lookups nur über employee_id ab
+        UniqueConstraint("employee_id", "year", name="uq_leave_balance_employee_year"),
     )
 
     # Jahr
@@ -71,6 +75,10 @@ class LeaveBalance(Base, UUIDMixin, TimestampMixin):
     vacation_total: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0.00"))
     vacation_used: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0.00"))
     vacation_remaining: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0.00"))
+    # Anteil von vacation_total aus dem Vorjahres-Übertrag
+    vacation_carryover: Mapped[Decimal] = mapped_column(
+        Numeric(5, 2), default=Decimal("0.00"), server_default="0"
+    )
 
     sick_total: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0.00"))
     sick_used: Mapped[Decimal] = mapped_column(Numeric(5, 2), default=Decimal("0.00"))
@@ -92,6 +100,50 @@ class LeaveBalance(Base, UUIDMixin, TimestampMixin):
     policy: Mapped["LeavePolicy"] = relationship("LeavePolicy", back_populates="balances")
 
 
+class LeaveLedgerEntry(Base, UUIDMixin):
+    """
+    Append-only Urlaubs-Ledger.
+
+    Jede Änderung an Anspruch oder Verbrauch ist eine Buchung (Anspruch,
+    Korrektur, Übertrag, Genehmigung, Stornierung). LeaveBalance ist der
+    daraus gepflegte Snapshot; Audits können den Verlauf nachspielen.
+    Buchungen werden nie geändert oder gelöscht.
+    """
+    __tablename__ = "hr_leave_ledger"
+    __table_args__ = (
+        Index("ix_leave_ledger_employee_year", "employee_id", "year"),
+        Index("ix_leave_ledger_leave_request_id", "leave_request_id"),
+        CheckConstraint(
+            "entry_type IN ('accrual', 'adjustment', 'carryover', 'approval', 'cancellation')",
+            name="check_leave_ledger_entry_type"
+        ),
+        CheckConstraint(
+            "category IN ('vacation', 'sick', 'other')",
+            name="check_leave_ledger_category"
+        ),
+    )
+
+    year: Mapped[int] = mapped_column(nullable=False)
+    category: Mapped[str] = mapped_column(String(20), nullable=False)
+    entry_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    # Tage mit Vorzeichen (Stornierungen negativ)
+    days: Mapped[Decimal] = mapped_column(Numeric(6, 2), nullable=False)
+    note: Mapped[str | None] = mapped_column(Text)
+
+    employee_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("employees.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    leave_request_id: Mapped[uuid.UUID | None] = mapped_column(
+        ForeignKey("hr_leave_requests.id", ondelete="SET NULL")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+
+
 class LeaveRequest(Base, UUIDMixin, TimestampMixin):
     """
     Mitarbeiter-Urlaubsanträge.
@@ -177,7 +229,8 @@ class AbsenceCalendar(Base, UUIDMixin, TimestampMixin):
     __tablename__ = "hr_absence_calendar"
     __table_args__ = (
         Index("ix_absence_calendar_date", "absence_date"),
-        Index("ix_absence_calendar_employee_id", "employee_id"),
+        # Ein Eintrag pro Mitarbeiter und Tag; deckt auch Lookups nur über employee_id ab
+        UniqueConstraint("employee_id", "absence_date", name="uq_absence_calendar_employee_date"),
     )
 
     # Abwesenheits-Details
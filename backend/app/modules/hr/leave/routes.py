@@ -8,14 +8,16 @@ from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.settings.database import get_db
 from app.core.auth.auth import get_current_user
 from app.core.auth.roles import require_permissions
 from app.modules.hr.enums import LeaveStatus
+from app.modules.hr.analytics.crud import get_leave_stats
 from app.core.email import send_leave_request_notification, send_leave_request_approved, send_leave_request_rejected
 
-from . import crud, schemas
+from . import availability, crud, schemas
 
 
 router = APIRouter(prefix="/leave", tags=["Leave Management"])
@@ -148,6 +150,35 @@ async def get_employee_balance(
     return balance
 
 
+@router.get("/balances/employee/{employee_id}/ledger", response_model=list[schemas.LeaveLedgerEntryResponse])
+@require_permissions(["hr.view"])
+async def get_employee_leave_ledger(
+    employee_id: UUID,
+    year: Optional[int] = Query(None, ge=2020, le=2100),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """Ledger-Buchungen eines Mitarbeiters für Audits (benötigt: hr.view)"""
+    return crud.get_leave_ledger(db, employee_id, year)
+
+
+@router.post("/balances/rollover", response_model=schemas.LeaveYearRolloverResponse)
+@require_permissions(["hr.manage_balances"])
+async def rollover_leave_year(
+    from_year: int = Query(..., ge=2020, le=2099),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Jahreswechsel für alle aktiven Mitarbeiter (benötigt: hr.manage_balances oder *)
+
+    Bucht Jahresanspruch und Resturlaub-Übertrag für from_year + 1.
+    Mehrfaches Ausführen ist unschädlich.
+    """
+    result = crud.rollover_leave_year(db, from_year)
+    return {"from_year": from_year, "to_year": from_year + 1, **result}
+
+
 @router.post("/balances", response_model=schemas.LeaveBalanceResponse, status_code=status.HTTP_201_CREATED)
 @require_permissions(["hr.manage_balances"])
 async def create_leave_balance(
@@ -156,6 +187,11 @@ async def create_leave_balance(
     user = Depends(get_current_user)
 ):
     """Erstellt/Initialisiert einen Leave Balance (benötigt: hr.manage_balances oder *)"""
+    if crud.get_employee_balance(db, balance_data.employee_id, balance_data.year):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Balance already exists for employee and year"
+        )
     return crud.create_leave_balance(db, balance_data)
 
 
@@ -655,6 +691,37 @@ async def get_absence_calendar(
     }
 
 
+@router.get("/calendar/matrix", response_model=schemas.TeamAvailabilityResponse)
+@require_permissions(["hr.view"])
+async def get_team_availability(
+    date_from: date = Query(...),
+    date_to: date = Query(...),
+    department_id: Optional[UUID] = Query(None),
+    db: Session = Depends(get_db),
+    user = Depends(get_current_user)
+):
+    """
+    Team-Verfügbarkeit als Mitarbeiter × Tag-Matrix (benötigt: hr.view)
+
+    Abwesenheiten lauflängen-kodiert, dazu verfügbare Personen je Tag.
+    Maximal 93 Tage (ein Quartal) pro Abfrage.
+    """
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from"
+        )
+    if (date_to - date_from).days + 1 > availability.MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range must not exceed {availability.MAX_RANGE_DAYS} days"
+        )
+    # Sync-Session nicht auf dem Event Loop ausführen
+    return await run_in_threadpool(
+        availability.get_team_availability, db, date_from, date_to, department_id
+    )
+
+
 @router.get("/calendar/{target_date}", response_model=list[schemas.AbsenceCalendarResponse])
 @require_permissions(["hr.view"])
 async def get_absences_for_date(
@@ -680,43 +747,14 @@ async def get_leave_statistics(
     Get leave request statistics for dashboard (benötigt: hr.view)
 
     Returns counts by type, status, and summary statistics
+    (ein Statement, gecacht – siehe hr.analytics.crud)
     """
-    from sqlalchemy import func
-    from app.modules.hr.leave.models import LeaveRequest
-
-    # Total counts
-    total = db.query(func.count(LeaveRequest.id)).scalar() or 0
-    pending = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "pending"
-    ).scalar() or 0
-    approved = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "approved"
-    ).scalar() or 0
-    rejected = db.query(func.count(LeaveRequest.id)).filter(
-        LeaveRequest.status == "rejected"
-    ).scalar() or 0
-
-    # By type
-    type_stats = db.query(
-        LeaveRequest.leave_type,
-        func.count(LeaveRequest.id).label("count")
-    ).group_by(LeaveRequest.leave_type).all()
-
-    by_type = {leave_type: count for leave_type, count in type_stats}
-
-    # By status
-    status_stats = db.query(
-        LeaveRequest.status,
-        func.count(LeaveRequest.id).label("count")
-    ).group_by(LeaveRequest.status).all()
-
-    by_status = {status: count for status, count in status_stats}
-
+    stats = await run_in_threadpool(get_leave_stats, db)
     return schemas.LeaveStatistics(
-        total_requests=total,
-        pending_requests=pending,
-        approved_requests=approved,
-        rejected_requests=rejected,
-        by_type=by_type,
-        by_status=by_status
+        total_requests=stats["total_requests"],
+        pending_requests=stats["pending_requests"],
+        approved_requests=stats["approved_requests"],
+        rejected_requests=stats["rejected_requests"],
+        by_type=stats["by_type"],
+        by_status=stats["by_status"]
     )
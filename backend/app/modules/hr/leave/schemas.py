@@ -98,6 +98,7 @@ class LeaveBalanceResponse(LeaveBalanceBase):
     id: UUID
     employee_id: UUID
     policy_id: Optional[UUID] = None
+    vacation_carryover: Decimal = Field(default=Decimal("0.00"), description="Anteil aus Vorjahres-Übertrag")
     created_at: datetime
     updated_at: datetime
 
@@ -112,6 +113,31 @@ class LeaveBalanceListResponse(BaseModel):
     limit: int
 
 
+class LeaveLedgerEntryResponse(BaseModel):
+    """Response Schema für eine Ledger-Buchung"""
+    id: UUID
+    employee_id: UUID
+    year: int
+    category: str
+    entry_type: str
+    days: Decimal
+    leave_request_id: Optional[UUID] = None
+    note: Optional[str] = None
+    created_at: datetime
+
+    model_config = {"from_attributes": True}
+
+
+class LeaveYearRolloverResponse(BaseModel):
+    """Ergebnis des Jahreswechsels"""
+    from_year: int
+    to_year: int
+    employees: int
+    balances_created: int
+    accruals: int
+    carryovers: int
+
+
 # ============================================================================
 # LEAVE REQUEST SCHEMAS
 # ============================================================================
@@ -221,6 +247,34 @@ class AbsenceCalendarListResponse(BaseModel):
     limit: int
 
 
+class AbsenceRun(BaseModel):
+    """Lauflängen-kodierte Abwesenheit (Tag-Index relativ zu date_from)"""
+    start: int
+    length: int
+    leave_type: str
+    full_day: bool
+
+
+class TeamAvailabilityEmployee(BaseModel):
+    """Zeile der Verfügbarkeits-Matrix"""
+    employee_id: UUID
+    name: str
+    absences: list[AbsenceRun]
+
+
+class TeamAvailabilityResponse(BaseModel):
+    """Kompakte Mitarbeiter × Tag-Matrix für einen Zeitraum"""
+    department_id: Optional[UUID] = None
+    date_from: date
+    date_to: date
+    days: int
+    working_days: str = Field(..., description="Bitstring je Tag: 1 = Arbeitstag, 0 = Wochenende/Feiertag")
+    headcount: int
+    available: list[int] = Field(..., description="Verfügbare Personen je Tag (ohne ganztägig Abwesende)")
+    absent: list[int] = Field(..., description="Ganztägig Abwesende je Tag")
+    employees: list[TeamAvailabilityEmployee]
+
+
 # ============================================================================
 # SUMMARY SCHEMAS
 # ============================================================================
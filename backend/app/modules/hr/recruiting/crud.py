@@ -4,7 +4,9 @@ from typing import Optional, Tuple, List
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
+
+from app.modules.hr.analytics.crud import RECRUITING, invalidate_hr_analytics
 
 from .models import JobPosting, Application
 from .schemas import JobPostingCreate, JobPostingUpdate, ApplicationCreate, ApplicationUpdate
@@ -18,15 +20,37 @@ def get_job_postings(
     limit: int = 50,
     status: Optional[str] = None,
     department_id: Optional[UUID] = None,
-) -> Tuple[List[JobPosting], int]:
+) -> Tuple[List[Tuple[JobPosting, int]], int]:
+    """Stellen mit Anzahl Bewerbungen – gruppierte Subquery statt COUNT je Zeile."""
     query = db.query(JobPosting)
     if status:
         query = query.filter(JobPosting.status == status)
     if department_id:
         query = query.filter(JobPosting.department_id == department_id)
     total = query.count()
-    items = query.order_by(JobPosting.created_at.desc()).offset(skip).limit(limit).all()
-    return items, total
+
+    # Erst die Seite bestimmen, dann nur deren Bewerbungen zählen
+    page = (
+        query.with_entities(JobPosting.id)
+        .order_by(JobPosting.created_at.desc(), JobPosting.id)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    counts = (
+        select(Application.job_posting_id, func.count(Application.id).label("application_count"))
+        .where(Application.job_posting_id.in_(select(page.c.id)))
+        .group_by(Application.job_posting_id)
+        .subquery()
+    )
+    rows = (
+        db.query(JobPosting, func.coalesce(counts.c.application_count, 0))
+        .join(page, page.c.id == JobPosting.id)
+        .outerjoin(counts, counts.c.job_posting_id == JobPosting.id)
+        .order_by(JobPosting.created_at.desc(), JobPosting.id)
+        .all()
+    )
+    return [(item, count) for item, count in rows], total
 
 
 def get_job_posting(db: Session, job_id: UUID) -> Optional[JobPosting]:
@@ -37,6 +61,7 @@ def create_job_posting(db: Session, data: JobPostingCreate) -> JobPosting:
     obj = JobPosting(**data.model_dump())
     db.add(obj)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     db.refresh(obj)
     return obj
 
@@ -51,6 +76,7 @@ def update_job_posting(db: Session, job_id: UUID, data: JobPostingUpdate) -> Opt
     for k, v in changes.items():
         setattr(obj, k, v)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     db.refresh(obj)
     return obj
 
@@ -61,6 +87,7 @@ def delete_job_posting(db: Session, job_id: UUID) -> bool:
         return False
     db.delete(obj)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     return True
 
 
@@ -95,6 +122,7 @@ def create_application(db: Session, data: ApplicationCreate) -> Application:
     obj = Application(**data.model_dump())
     db.add(obj)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     db.refresh(obj)
     return obj
 
@@ -106,6 +134,7 @@ def update_application(db: Session, app_id: UUID, data: ApplicationUpdate) -> Op
     for k, v in data.model_dump(exclude_unset=True).items():
         setattr(obj, k, v)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     db.refresh(obj)
     return obj
 
@@ -116,4 +145,5 @@ def delete_application(db: Session, app_id: UUID) -> bool:
         return False
     db.delete(obj)
     db.commit()
+    invalidate_hr_analytics(RECRUITING)
     return True
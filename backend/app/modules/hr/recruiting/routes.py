@@ -25,9 +25,9 @@ def list_job_postings(
 ):
     items, total = crud.get_job_postings(db, skip=skip, limit=limit, status=status, department_id=department_id)
     result = []
-    for item in items:
+    for item, application_count in items:
         data = schemas.JobPostingResponse.model_validate(item)
-        data.application_count = crud.get_application_count(db, item.id)
+        data.application_count = application_count
         result.append(data)
     return {"items": result, "total": total, "skip": skip, "limit": limit}
 
@@ -6,10 +6,13 @@ from datetime import date, timedelta
 from decimal import Decimal
 from typing import List
 
+from app.core.calendar import business_days
+
 
 def calculate_business_days(start_date: date, end_date: date, half_day_start: bool = False, half_day_end: bool = False) -> Decimal:
     """
-    Berechnet die Anzahl der Arbeitstage zwischen zwei Daten (Montag-Freitag).
+    Berechnet die Anzahl der Arbeitstage zwischen zwei Daten (Montag-Freitag,
+    ohne gesetzliche Feiertage des konfigurierten Bundeslands).
 
     Args:
         start_date: Startdatum
@@ -20,25 +23,7 @@ def calculate_business_days(start_date: date, end_date: date, half_day_start: bo
     Returns:
         Anzahl der Arbeitstage als Decimal
     """
-    if start_date > end_date:
-        return Decimal("0.00")
-
-    days = Decimal("0.00")
-    current_date = start_date
-
-    while current_date <= end_date:
-        # Montag = 0, Sonntag = 6
-        if current_date.weekday() < 5:  # Montag bis Freitag
-            if current_date == start_date and half_day_start:
-                days += Decimal("0.50")
-            elif current_date == end_date and half_day_end:
-                days += Decimal("0.50")
-            else:
-                days += Decimal("1.00")
-
-        current_date += timedelta(days=1)
-
-    return days
+    return business_days(start_date, end_date, half_day_start=half_day_start, half_day_end=half_day_end)
 
 
 def get_date_ranges_between(start_date: date, end_date: date) -> List[date]:
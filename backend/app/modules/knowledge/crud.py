@@ -5,7 +5,7 @@ from typing import Optional, Tuple, List
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 
 from .models import KBCategory, KBArticle
 from .schemas import KBCategoryCreate, KBCategoryUpdate, KBArticleCreate, KBArticleUpdate
@@ -30,6 +30,23 @@ def get_categories(db: Session) -> List[KBCategory]:
     return db.query(KBCategory).order_by(KBCategory.order, KBCategory.name).all()
 
 
+def get_categories_with_counts(db: Session) -> List[Tuple[KBCategory, int]]:
+    """Kategorien mit Anzahl veröffentlichter Artikel – gruppierte Subquery statt COUNT je Zeile."""
+    counts = (
+        select(KBArticle.category_id, func.count(KBArticle.id).label("article_count"))
+        .where(KBArticle.status == "published")
+        .group_by(KBArticle.category_id)
+        .subquery()
+    )
+    rows = (
+        db.query(KBCategory, func.coalesce(counts.c.article_count, 0))
+        .outerjoin(counts, counts.c.category_id == KBCategory.id)
+        .order_by(KBCategory.order, KBCategory.name)
+        .all()
+    )
+    return [(category, count) for category, count in rows]
+
+
 def get_category(db: Session, cat_id: UUID) -> Optional[KBCategory]:
     return db.query(KBCategory).filter(KBCategory.id == cat_id).first()
 
@@ -66,12 +83,6 @@ def delete_category(db: Session, cat_id: UUID) -> bool:
     return True
 
 
-def get_article_count(db: Session, cat_id: UUID) -> int:
-    return db.query(func.count(KBArticle.id)).filter(
-        KBArticle.category_id == str(cat_id), KBArticle.status == "published"
-    ).scalar() or 0
-
-
 # ── Articles ──
 
 def get_articles(
@@ -16,11 +16,10 @@ router = APIRouter(prefix="/api/kb", tags=["Knowledge Base"])
 @router.get("/categories", response_model=list[schemas.KBCategoryResponse])
 @require_permissions(["kb.view", "kb.*", "*"])
 def list_categories(db: Session = Depends(get_db), user=Depends(get_current_user)):
-    cats = crud.get_categories(db)
     result = []
-    for c in cats:
+    for c, article_count in crud.get_categories_with_counts(db):
         data = schemas.KBCategoryResponse.model_validate(c)
-        data.article_count = crud.get_article_count(db, c.id)
+        data.article_count = article_count
         result.append(data)
     return result
 
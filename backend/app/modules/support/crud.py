@@ -4,7 +4,7 @@ from typing import Optional, Tuple, List
 from uuid import UUID
 
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, select
 from sqlalchemy.exc import IntegrityError
 
 from .models import Ticket, TicketComment, TicketEvent, TicketStatus, TicketEventType
@@ -52,7 +52,8 @@ def get_tickets(
     customer_id: Optional[UUID] = None,
     search: Optional[str] = None,
     include_deleted: bool = False,
-) -> Tuple[List[Ticket], int]:
+) -> Tuple[List[Tuple[Ticket, int]], int]:
+    """Tickets mit Anzahl Kommentare – gruppierte Subquery statt COUNT je Zeile."""
     query = db.query(Ticket)
     if not include_deleted:
         query = query.filter(Ticket.deleted_at.is_(None))
@@ -73,8 +74,29 @@ def get_tickets(
             Ticket.title.ilike(f"%{search}%") | Ticket.description.ilike(f"%{search}%")
         )
     total = query.count()
-    items = query.order_by(Ticket.created_at.desc()).offset(skip).limit(limit).all()
-    return items, total
+
+    # Erst die Seite bestimmen, dann nur deren Kommentare zählen
+    page = (
+        query.with_entities(Ticket.id)
+        .order_by(Ticket.created_at.desc(), Ticket.id)
+        .offset(skip)
+        .limit(limit)
+        .subquery()
+    )
+    counts = (
+        select(TicketComment.ticket_id, func.count(TicketComment.id).label("comment_count"))
+        .where(TicketComment.ticket_id.in_(select(page.c.id)))
+        .group_by(TicketComment.ticket_id)
+        .subquery()
+    )
+    rows = (
+        db.query(Ticket, func.coalesce(counts.c.comment_count, 0))
+        .join(page, page.c.id == Ticket.id)
+        .outerjoin(counts, counts.c.ticket_id == Ticket.id)
+        .order_by(Ticket.created_at.desc(), Ticket.id)
+        .all()
+    )
+    return [(ticket, count) for ticket, count in rows], total
 
 
 def get_ticket(db: Session, ticket_id: UUID, include_deleted: bool = False) -> Optional[Ticket]:
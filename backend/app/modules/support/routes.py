@@ -1,11 +1,12 @@
 """Support Tickets API Routes"""
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 from typing import Optional
 from uuid import UUID
 
 from app.core.settings.database import get_db
 from app.core.auth.roles import require_permissions, get_current_user
+from app.core.email.outbox import process_outbox
 from app.core.email.service import send_ticket_reply
 from . import crud, schemas
 
@@ -33,9 +34,9 @@ def list_tickets(
         customer_id=customer_id, search=search,
     )
     result = []
-    for t in items:
+    for t, comment_count in items:
         data = schemas.TicketResponse.model_validate(t)
-        data.comment_count = crud.get_comment_count(db, t.id)
+        data.comment_count = comment_count
         result.append(data)
     return {"items": result, "total": total, "skip": skip, "limit": limit}
 
@@ -115,6 +116,7 @@ def add_comment(
 async def reply_to_ticket(
     ticket_id: UUID,
     data: schemas.TicketReplyRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user=Depends(get_current_user),
 ):
@@ -133,6 +135,8 @@ async def reply_to_ticket(
     )
     if not sent:
         raise HTTPException(status_code=502, detail="E-Mail konnte nicht gesendet werden.")
+    # Zustellung nach der Antwort anstoßen (sonst beim nächsten Outbox-Lauf)
+    background_tasks.add_task(process_outbox)
 
     comment_data = schemas.TicketCommentCreate(
         content=f"📧 Per E-Mail gesendet an {ticket.reporter_email}:\n\n{data.body}",
@@ -11,35 +11,22 @@ Der Klartext-Key wird NUR einmal angezeigt – sicher in n8n als Credential spei
 """
 import sys
 import os
-import uuid
 
 # Projekt-Root zum PYTHONPATH hinzufügen
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from app.core.settings.database import SessionLocal
-from app.modules.email_intake.models import ApiKey
-from app.modules.email_intake.service import generate_api_key, hash_api_key
+from app.modules.email_intake.service import create_api_key
 
 
 def main():
     key_name = "n8n-email-intake"
     scopes = ["email:ingest"]
 
-    plain_key = generate_api_key()
-    key_hash = hash_api_key(plain_key)
-
     db = SessionLocal()
     try:
-        api_key = ApiKey(
-            id=uuid.uuid4(),
-            name=key_name,
-            key_hash=key_hash,
-            scopes=scopes,
-            active=True,
-        )
-        db.add(api_key)
-        db.commit()
-        db.refresh(api_key)
+        # Legt den Key inkl. Lookup-Präfix an (siehe email_intake.service)
+        api_key, plain_key = create_api_key(db, name=key_name, scopes=scopes)
 
         print("=" * 60)
         print("API-Key erfolgreich erstellt!")
@@ -30,7 +30,7 @@ from app.core.settings.database import SessionLocal
 from app.modules.backoffice.crm import models as crm_models, crud as crm_crud, schemas as crm_schemas
 from app.modules.backoffice.projects import models as project_models
 from app.modules.backoffice.invoices import models as invoice_models
-from app.modules.backoffice.time_tracking import models as time_models
+from app.modules.backoffice.time_tracking import models as time_models, crud as time_crud
 from app.modules.employees.models import Employee
 
 
@@ -474,6 +474,8 @@ def create_demo_time_entries(db: Session, project_map: dict, count: int = 20) ->
             print(f"  ✅ {i + 1}/{count} Time Entries erstellt...")
 
     db.commit()
+    # Einträge wurden direkt angelegt – Tages-Buckets neu aufbauen
+    time_crud.rebuild_time_rollup(db)
     print(f"📊 {created_count} neue Zeiterfassungen erstellt")
     return created_count
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Import Script: CRM-Kunden aus CSV (z.B. Migration aus dem Alt-CRM)
+
+Nutzt denselben mengenbasierten Import wie POST
+/backoffice/crm/customers/import-csv und gibt den Fortschritt je Chunk aus.
+
+Usage:
+    python scripts/import_crm_customers.py kunden.csv
+    python scripts/import_crm_customers.py kunden.csv --dry-run
+    python scripts/import_crm_customers.py kunden.csv --keep-duplicates --chunk-size 2000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.settings.database import SessionLocal
+from app.modules.backoffice.crm.csv_import import (
+    INSERT_CHUNK_SIZE,
+    ImportProgress,
+    iter_import_customers_csv,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRM-Kunden aus CSV importieren")
+    parser.add_argument("file", type=Path, help="CSV-Datei (Semikolon oder Komma)")
+    parser.add_argument("--dry-run", action="store_true", help="Kompletter Lauf, am Ende Rollback")
+    parser.add_argument("--keep-duplicates", action="store_true", help="Bekannte E-Mails trotzdem importieren")
+    parser.add_argument("--chunk-size", type=int, default=INSERT_CHUNK_SIZE, help="Zeilen pro INSERT")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    print("=" * 80)
+    print(f"CRM CSV IMPORT{' (DRY-RUN)' if args.dry_run else ''}: {args.file}")
+    print("=" * 80)
+
+    try:
+        started = time.monotonic()
+        for item in iter_import_customers_csv(
+            db,
+            args.file.read_bytes(),
+            skip_duplicates=not args.keep_duplicates,
+            dry_run=args.dry_run,
+            chunk_size=args.chunk_size,
+        ):
+            if isinstance(item, ImportProgress):
+                if item.phase == "parsed":
+                    print(f"Gültige Zeilen: {item.total}")
+                else:
+                    print(f"  {item.processed}/{item.total} ({time.monotonic() - started:.1f}s)", flush=True)
+                continue
+
+            for error in item.errors:
+                print(f"  ⚠️  {error}")
+            print(f"Importiert: {item.imported}")
+            print(f"Übersprungen: {item.skipped}")
+            print(f"Dauer: {time.monotonic() - started:.2f}s")
+            print("=" * 80)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Rebuild Script: Abwesenheitskalender (hr_absence_calendar)
+
+Baut den Kalender aus allen genehmigten Urlaubsanträgen neu auf – nur
+Arbeitstage laut Arbeitszeitmodell, ohne Feiertage. Nötig nach Änderungen
+an Arbeitszeitmodellen (WorkingHoursTemplate), am Bundesland
+(HOLIDAY_STATE) oder nach Importen direkt in die DB.
+
+Usage:
+    python scripts/rebuild_absence_calendar.py
+    python scripts/rebuild_absence_calendar.py --employee <uuid>
+"""
+import argparse
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.settings.database import SessionLocal
+from app.modules.hr.leave.crud import rebuild_absence_calendar
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Abwesenheitskalender neu aufbauen")
+    parser.add_argument("--employee", type=uuid.UUID, help="Nur diesen Mitarbeiter neu aufbauen")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    print("=" * 80)
+    print("ABSENCE CALENDAR REBUILD")
+    print("=" * 80)
+
+    try:
+        started = time.monotonic()
+        entries = rebuild_absence_calendar(db, employee_id=args.employee)
+        print(f"Einträge: {entries}")
+        print(f"Dauer: {time.monotonic() - started:.2f}s")
+        print("=" * 80)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
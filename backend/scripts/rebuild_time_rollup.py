@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Rebuild Script: Zeit-Rollup (Tag / Mitarbeiter / Projekt / billable)
+
+Baut die Tabelle time_daily_rollups komplett aus den Zeiteinträgen neu auf.
+Nötig nach Datenimporten direkt in die DB oder wenn die Buckets aus
+anderen Gründen nicht mehr zu den Zeiteinträgen passen.
+
+Usage:
+    python scripts/rebuild_time_rollup.py
+"""
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.settings.database import SessionLocal
+from app.modules.backoffice.time_tracking.crud import rebuild_time_rollup
+
+
+def main():
+    db = SessionLocal()
+
+    print("=" * 80)
+    print("TIME ROLLUP REBUILD")
+    print("=" * 80)
+
+    try:
+        started = time.monotonic()
+        buckets = rebuild_time_rollup(db)
+        print(f"Buckets: {buckets}")
+        print(f"Dauer: {time.monotonic() - started:.2f}s")
+        print("=" * 80)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
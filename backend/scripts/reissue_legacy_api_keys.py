@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Script: Alt-API-Keys ersetzen
+
+Keys aus der Zeit vor dem Lookup-Präfix (wm_<secret>) lassen sich nur per
+bcrypt-Vergleich gegen jeden nicht migrierten Key finden. Das Script listet
+alle aktiven Alt-Keys und ersetzt sie mit --apply durch Keys im neuen Format
+(wm_<prefix>_<secret>, gleicher Name und gleiche Scopes); die alten Keys
+werden dabei deaktiviert.
+
+Danach die neuen Keys in n8n hinterlegen und API_KEY_LEGACY_ENABLED=false
+setzen – Keys ohne Präfix werden dann ohne DB-Zugriff abgewiesen.
+
+Usage:
+    python scripts/reissue_legacy_api_keys.py            # nur auflisten
+    python scripts/reissue_legacy_api_keys.py --apply    # ersetzen
+
+Die Klartext-Keys werden NUR einmal angezeigt!
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.settings.database import SessionLocal
+from app.modules.email_intake.service import get_legacy_api_keys, reissue_legacy_api_keys
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alt-API-Keys durch Keys mit Präfix ersetzen")
+    parser.add_argument("--apply", action="store_true", help="Keys ersetzen (sonst nur auflisten)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    print("=" * 80)
+    print("ALT-API-KEYS ERSETZEN")
+    print("=" * 80)
+
+    try:
+        if not args.apply:
+            legacy = get_legacy_api_keys(db)
+            for key_obj in legacy:
+                state = "nicht migriert" if key_obj.key_prefix is None else "migriert"
+                print(f"{key_obj.id}  {key_obj.name}  ({state}, Scopes: {key_obj.scopes})")
+            print(f"Alt-Keys: {len(legacy)} – mit --apply ersetzen")
+            return
+
+        for old, new, plain_key in reissue_legacy_api_keys(db):
+            print(f"{old.name}: {old.id} deaktiviert, ersetzt durch {new.id}")
+            print(f"  KLARTEXT-KEY (nur einmal sichtbar!): {plain_key}")
+        print("Danach API_KEY_LEGACY_ENABLED=false setzen.")
+        print("=" * 80)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
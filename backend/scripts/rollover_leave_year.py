@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Batch Script: Urlaubs-Jahreswechsel
+
+Bucht für alle aktiven Mitarbeiter den Jahresanspruch des Folgejahres
+(laut Policy des Vorjahres) und überträgt den Resturlaub bis zur
+Obergrenze der Policy ins Urlaubs-Ledger. Mehrfaches Ausführen ist
+unschädlich – bereits gebuchte Ansprüche/Überträge werden übersprungen.
+
+Usage:
+    python scripts/rollover_leave_year.py --year 2026   # 2026 → 2027
+"""
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.settings.database import SessionLocal
+from app.modules.hr.leave.crud import rollover_leave_year
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Urlaubs-Jahreswechsel")
+    parser.add_argument(
+        "--year", type=int, default=date.today().year,
+        help="Abgeschlossenes Jahr (Standard: aktuelles Jahr)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+
+    print("=" * 80)
+    print(f"LEAVE YEAR ROLLOVER {args.year} → {args.year + 1}")
+    print("=" * 80)
+
+    try:
+        started = time.monotonic()
+        result = rollover_leave_year(db, args.year)
+        print(f"Mitarbeiter: {result['employees']}")
+        print(f"Neue Salden: {result['balances_created']}")
+        print(f"Ansprüche gebucht: {result['accruals']}")
+        print(f"Überträge gebucht: {result['carryovers']}")
+        print(f"Dauer: {time.monotonic() - started:.2f}s")
+        print("=" * 80)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Gemeinsame Fixtures: SQLite-Testdatenbank
+-------------------------------------------
+- engine: frische In-Memory-DB pro Test (StaticPool, eine Connection für
+  Test und App-Code), mit den Tabellen aus der Modulkonstante TABLES
+- db: Session auf dieser Engine
+
+Es wird nur CREATE TABLE ausgeführt (ohne Indizes): projects definiert
+ix_projects_department_id doppelt, was SQLite beim create_all ablehnt.
+Tabellen mit JSONB-Spalten lassen sich so nicht anlegen; Module, die sie
+brauchen, überschreiben engine und legen eine passende Tabelle per SQL an.
+"""
+from __future__ import annotations
+
+from typing import Generator, Iterable
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateTable
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.settings.database import Base
+
+
+def create_sqlite_engine(tables: Iterable[str]) -> Engine:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    with engine.begin() as conn:
+        for name in tables:
+            conn.execute(CreateTable(Base.metadata.tables[name]))
+    return engine
+
+
+@pytest.fixture()
+def engine(request: pytest.FixtureRequest) -> Generator[Engine, None, None]:
+    engine = create_sqlite_engine(getattr(request.module, "TABLES", ()))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine: Engine) -> Generator[Session, None, None]:
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    yield session
+    session.close()
@@ -0,0 +1,55 @@
+"""
+Gemeinsame Test-Helfer: SQL-Statements zählen
+-----------------------------------------------
+- count_queries: zählt alle Statements innerhalb eines with-Blocks
+- assert_constant_queries: Listen-Endpoints dürfen unabhängig von der
+  Seitengröße nur eine feste Anzahl Statements ausführen (kein N+1)
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import Any, Callable, Iterable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+@contextmanager
+def count_queries(engine: Engine) -> Iterator[list[str]]:
+    """Zählt alle ausgeführten SQL-Statements innerhalb des Blocks."""
+    statements: list[str] = []
+
+    def _before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+
+def assert_constant_queries(
+    engine: Engine,
+    call: Callable[[int], Any],
+    sizes: Iterable[int] = (1, 5, 25),
+    expected: int | None = None,
+) -> int:
+    """
+    Ruft call(size) für jede Seitengröße auf und prüft, dass jedes Mal
+    gleich viele Statements laufen (optional: genau expected).
+
+    Returns:
+        Anzahl Statements pro Aufruf
+    """
+    counts = {}
+    for size in sizes:
+        with count_queries(engine) as statements:
+            call(size)
+        counts[size] = len(statements)
+
+    assert len(set(counts.values())) == 1, f"Statements je Seitengröße: {counts}"
+    count = next(iter(counts.values()))
+    if expected is not None:
+        assert count == expected, f"{count} Statements, erwartet {expected}"
+    return count
@@ -0,0 +1,80 @@
+"""
+Tests für den Abwesenheitskalender (hr.leave)
+-----------------------------------------------
+- Materialisierung eines genehmigten Antrags mit einem INSERT, nur
+  Arbeitstage (ohne Wochenenden/Feiertage), halbe Tage markiert
+- Überlappende Anträge / erneute Materialisierung: ON CONFLICT DO NOTHING
+- rebuild_absence_calendar berücksichtigt geänderte Arbeitszeitmodelle
+"""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.time_tracking.models import WorkingHoursTemplate
+from app.modules.employees.models import Employee
+from app.modules.hr.enums import LeaveStatus
+from app.modules.hr.leave import crud
+from app.modules.hr.leave.models import AbsenceCalendar, LeaveRequest
+
+TABLES = ["employees", "hr_leave_requests", "hr_absence_calendar", "working_hours_templates"]
+
+
+@pytest.fixture()
+def employee(db: Session) -> Employee:
+    employee = Employee(employee_code="EMP-1", first_name="Erika", last_name="Muster", email="e@example.com")
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def _approved(db: Session, employee: Employee, start: date, end: date, **kwargs) -> LeaveRequest:
+    leave_request = LeaveRequest(
+        employee_id=employee.id, leave_type="vacation", start_date=start, end_date=end,
+        total_days=Decimal(1), status=LeaveStatus.APPROVED.value, approved_date=start, **kwargs,
+    )
+    db.add(leave_request)
+    db.commit()
+    return leave_request
+
+
+def _calendar(db: Session) -> dict[date, bool]:
+    return dict(db.execute(select(AbsenceCalendar.absence_date, AbsenceCalendar.is_full_day)).all())
+
+
+def test_materialize_skips_weekends_and_holidays(engine, db: Session, employee):
+    # Fr 22.05. – Fr 29.05.2026, Pfingstmontag 25.05. (RP), halber Tag am Ende
+    leave_request = _approved(db, employee, date(2026, 5, 22), date(2026, 5, 29), half_day_end=True)
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    assert crud.create_absence_calendar_entries(db, leave_request) == 5
+    assert sum(s.lstrip().upper().startswith("INSERT") for s in statements) == 1
+
+    calendar = _calendar(db)
+    assert sorted(calendar) == [date(2026, 5, d) for d in (22, 26, 27, 28, 29)]
+    assert calendar[date(2026, 5, 29)] is False
+    assert calendar[date(2026, 5, 22)] is True
+
+    # Erneute Materialisierung und überlappender Antrag legen nichts doppelt an
+    assert crud.create_absence_calendar_entries(db, leave_request) == 0
+    overlapping = _approved(db, employee, date(2026, 5, 28), date(2026, 6, 2))
+    assert crud.create_absence_calendar_entries(db, overlapping) == 2  # 01.06., 02.06.
+    assert len(_calendar(db)) == 7
+
+
+def test_rebuild_uses_work_week(db: Session, employee):
+    _approved(db, employee, date(2026, 3, 2), date(2026, 3, 13))
+    _approved(db, employee, date(2026, 3, 12), date(2026, 3, 16))
+    assert crud.rebuild_absence_calendar(db) == 11  # 10 + Mo 16.03.
+
+    # Freitags frei → Fr 06.03. und Fr 13.03. entfallen
+    db.add(WorkingHoursTemplate(employee_id=employee.id, friday_hours=0))
+    db.commit()
+    assert crud.rebuild_absence_calendar(db, employee_id=employee.id) == 9
+    assert date(2026, 3, 13) not in _calendar(db)
@@ -0,0 +1,245 @@
+"""
+Tests für die API-Key-Anmeldung des Email Intake (email_intake.service)
+-------------------------------------------------------------------------
+- Neue Keys (wm_<prefix>_<secret>): ein indizierter Lookup, ein Hash-Vergleich
+- Verifizierte Keys aus dem TTL-Cache, deaktivierte Keys trotzdem abgewiesen
+- Alt-Keys ohne Präfix bekommen bei der ersten Anmeldung ihr Kennzeichen
+- Alt-Key-Suche begrenzt, nach der Umstellung (Ersetzen der Alt-Keys,
+  API_KEY_LEGACY_ENABLED=false) werden Keys ohne Präfix abgewiesen
+- Hashing in den Tests mit pbkdf2_sha256 (schnell, ohne bcrypt-Backend)
+- Benchmark (optional, WORKMATE_BENCHMARK=1, benötigt bcrypt): 500 Keys,
+  Alt-Verfahren (bcrypt über alle Keys) gegen Präfix-Lookup
+"""
+from __future__ import annotations
+
+import os
+import secrets
+import statistics
+import time
+import uuid
+from typing import Callable, Generator
+
+import pytest
+from passlib.context import CryptContext
+from passlib.hash import bcrypt as bcrypt_hash
+from sqlalchemy.orm import Session, sessionmaker
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.settings.config import settings
+from app.modules.email_intake import service
+from app.modules.email_intake.models import ApiKey
+
+from query_count import count_queries
+
+TABLES = ["api_keys"]
+SCOPE = "email:ingest"
+
+
+@pytest.fixture()
+def db(db: Session, monkeypatch) -> Generator[Session, None, None]:
+    # Schnelles, immer verfügbares Schema statt bcrypt
+    monkeypatch.setattr(service, "_pwd_ctx", CryptContext(schemes=["pbkdf2_sha256"]))
+    service._verified_keys.invalidate()
+    service._legacy_scans.clear()
+    yield db
+    service._verified_keys.invalidate()
+    service._legacy_scans.clear()
+
+
+@pytest.fixture()
+def verifications(monkeypatch) -> list[str]:
+    """Zählt Hash-Vergleiche."""
+    calls: list[str] = []
+    original = service.verify_api_key
+
+    def _counting(plain_key: str, hashed_key: str) -> bool:
+        calls.append(hashed_key)
+        return original(plain_key, hashed_key)
+
+    monkeypatch.setattr(service, "verify_api_key", _counting)
+    return calls
+
+
+def _legacy_key(db: Session) -> str:
+    """Key im Format vor Einführung des Präfixes (wm_<secret>, key_prefix NULL)."""
+    plain_key = "wm_" + secrets.token_urlsafe(32)
+    db.add(ApiKey(
+        id=uuid.uuid4(), name="alt", key_hash=service.hash_api_key(plain_key),
+        scopes=[SCOPE], active=True,
+    ))
+    db.commit()
+    return plain_key
+
+
+def _prefixed_key(
+    db: Session,
+    scopes: list[str] | None = None,
+    hash_key: Callable[[str], str] | None = None,
+) -> str:
+    plain_key = service.generate_api_key()
+    db.add(ApiKey(
+        id=uuid.uuid4(), name="neu", key_prefix=service.api_key_prefix(plain_key),
+        key_hash=(hash_key or service.hash_api_key)(plain_key),
+        scopes=scopes or [SCOPE], active=True,
+    ))
+    db.commit()
+    return plain_key
+
+
+def test_prefixed_key_needs_one_lookup_and_one_verify(db: Session, engine, verifications):
+    api_key, plain_key = service.create_api_key(db, name="n8n", scopes=[SCOPE])
+    key_id, key_prefix = api_key.id, api_key.key_prefix
+    assert key_prefix == service.api_key_prefix(plain_key)
+    for _ in range(5):
+        _prefixed_key(db)
+        _legacy_key(db)
+    db.expunge_all()
+
+    with count_queries(engine) as statements:
+        assert service.authenticate_api_key(db, plain_key, required_scope=SCOPE).id == key_id
+    assert len(statements) == 1
+    assert len(verifications) == 1
+
+    # Zweiter Aufruf: aus dem Cache, kein Hash-Vergleich
+    db.expunge_all()
+    assert service.authenticate_api_key(db, plain_key, required_scope=SCOPE).id == key_id
+    assert len(verifications) == 1
+
+    # Falscher Key mit gültigem Format: kein Vergleich gegen Alt-Keys
+    wrong = f"wm_{key_prefix}_{secrets.token_urlsafe(32)}"
+    assert service.authenticate_api_key(db, wrong) is None
+    assert len(verifications) == 2
+    assert service.authenticate_api_key(db, service.generate_api_key()) is None
+    assert len(verifications) == 2
+
+    # Fehlender Scope, auch bei Treffer im Cache
+    assert service.authenticate_api_key(db, plain_key, required_scope="other:scope") is None
+
+    # Deaktivierter Key: trotz Cache sofort abgewiesen
+    db.get(ApiKey, key_id).active = False
+    db.commit()
+    assert service.authenticate_api_key(db, plain_key) is None
+
+
+def test_legacy_key_is_migrated_on_first_use(db: Session, engine, verifications):
+    keys = [_legacy_key(db) for _ in range(4)]
+    plain_key = keys[2]
+
+    assert service.authenticate_api_key(db, plain_key, required_scope=SCOPE) is not None
+    migrated = db.query(ApiKey).filter(ApiKey.key_prefix.isnot(None)).one()
+    assert migrated.key_prefix == service.legacy_key_prefix(plain_key)
+
+    # Ab jetzt wie ein neuer Key: ein Lookup, ein Vergleich
+    service._verified_keys.invalidate()
+    db.expunge_all()
+    verifications.clear()
+    with count_queries(engine) as statements:
+        assert service.authenticate_api_key(db, plain_key).id == migrated.id
+    assert len(statements) == 1
+    assert len(verifications) == 1
+
+
+def test_legacy_scan_is_rate_limited(db: Session, engine, verifications, monkeypatch):
+    monkeypatch.setattr(settings, "API_KEY_LEGACY_SCANS_PER_MINUTE", 2)
+    keys = [_legacy_key(db) for _ in range(3)]
+
+    for _ in range(2):
+        assert service.authenticate_api_key(db, "wm_" + secrets.token_urlsafe(32)) is None
+    assert len(verifications) == 6
+
+    # Limit erreicht: kein Vergleich mehr, auch nicht für einen gültigen Alt-Key
+    assert service.authenticate_api_key(db, keys[0]) is None
+    assert len(verifications) == 6
+
+    # Migrierte Alt-Keys laufen über den Index und zählen nicht gegen das Limit
+    service._legacy_scans.clear()
+    assert service.authenticate_api_key(db, keys[0]) is not None
+    service._verified_keys.invalidate()
+    service._legacy_scans.extend([time.monotonic()] * 2)
+    assert service.authenticate_api_key(db, keys[0]) is not None
+
+
+def test_reissue_then_cutover_rejects_legacy_keys(db: Session, engine, verifications, monkeypatch):
+    migrated, unmigrated = _legacy_key(db), _legacy_key(db)
+    prefixed = _prefixed_key(db, scopes=["email:ingest", "other:scope"])
+    assert service.authenticate_api_key(db, migrated) is not None
+    assert {key.key_prefix is None for key in service.get_legacy_api_keys(db)} == {True, False}
+
+    reissued = service.reissue_legacy_api_keys(db)
+    assert len(reissued) == 2
+    assert all(not old.active and new.active and new.scopes == old.scopes for old, new, _ in reissued)
+    assert service.get_legacy_api_keys(db) == []
+    # Ersetzte Keys sind sofort ungültig, auch wenn sie im Cache waren
+    assert service.authenticate_api_key(db, migrated) is None
+    assert service.authenticate_api_key(db, unmigrated) is None
+
+    monkeypatch.setattr(settings, "API_KEY_LEGACY_ENABLED", False)
+    verifications.clear()
+    with count_queries(engine) as statements:
+        assert service.authenticate_api_key(db, "wm_" + secrets.token_urlsafe(32)) is None
+    assert statements == [] and verifications == []
+
+    for _, new, plain_key in reissued:
+        assert service.authenticate_api_key(db, plain_key, required_scope=SCOPE).id == new.id
+    assert service.authenticate_api_key(db, prefixed, required_scope="other:scope") is not None
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+BENCHMARK_KEYS = 500
+BENCHMARK_ROUNDS = 8  # Anlegen der 500 Hashes in vertretbarer Zeit
+
+
+def _bcrypt_usable() -> bool:
+    try:
+        bcrypt_hash.using(rounds=4).hash("probe")
+    except Exception:  # passlib 1.7 mit inkompatiblem bcrypt-Paket
+        return False
+    return True
+
+
+def _legacy_authenticate(db: Session, plain_key: str):
+    """Bisheriges Verfahren: bcrypt gegen alle aktiven Keys."""
+    for key_obj in db.query(ApiKey).filter(ApiKey.active.is_(True)).all():
+        if service.verify_api_key(plain_key, key_obj.key_hash):
+            return key_obj
+    return None
+
+
+@pytest.mark.skipif(
+    not os.getenv("WORKMATE_BENCHMARK"),
+    reason="Benchmark nur mit WORKMATE_BENCHMARK=1",
+)
+@pytest.mark.skipif(not _bcrypt_usable(), reason="bcrypt-Backend von passlib nicht nutzbar")
+def test_benchmark_500_keys(engine):
+    db = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    service._verified_keys.invalidate()
+
+    bcrypt_key = bcrypt_hash.using(rounds=BENCHMARK_ROUNDS).hash
+    plain_keys = [_prefixed_key(db, hash_key=bcrypt_key) for _ in range(BENCHMARK_KEYS)]
+    probes = plain_keys[-5:]  # Worst Case fürs Alt-Verfahren: am Ende der Liste
+
+    def _median(call) -> float:
+        timings = []
+        for plain_key in probes:
+            started = time.perf_counter()
+            assert call(plain_key) is not None
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings)
+
+    legacy = _median(lambda key: _legacy_authenticate(db, key))
+    indexed = _median(lambda key: service.authenticate_api_key(db, key))
+    cached = _median(lambda key: service.authenticate_api_key(db, key))
+
+    print(f"\nAPI-Key-Anmeldung bei {BENCHMARK_KEYS} Keys (bcrypt rounds={BENCHMARK_ROUNDS}), Median:")
+    print(f"  bcrypt über alle Keys: {legacy * 1000:.1f} ms")
+    print(f"  Präfix-Lookup:         {indexed * 1000:.1f} ms")
+    print(f"  Cache-Treffer:         {cached * 1000:.3f} ms")
+
+    db.close()
+    service._verified_keys.invalidate()
+
+    assert indexed * 50 < legacy
+    assert cached < indexed
@@ -0,0 +1,93 @@
+"""
+Tests für den Arbeitstage-Kalender (app.core.calendar)
+--------------------------------------------------------
+Property-based gegen die naive Tag-für-Tag-Schleife:
+- business_days / working_hours / working_dates für beliebige Zeiträume,
+  Arbeitszeitmodelle, Bundesländer und Halbtags-Flags
+- count_weekdays
+Dazu bekannte Feiertage (Rheinland-Pfalz, bewegliche Feiertage).
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from hypothesis import given, settings, strategies as st
+
+from app.core.calendar import (
+    WorkWeek,
+    business_days,
+    count_weekdays,
+    holidays_for_year,
+    working_dates,
+    working_hours,
+)
+from app.core.calendar.holidays import STATES, easter_sunday
+
+dates = st.dates(min_value=date(2000, 1, 1), max_value=date(2045, 12, 31))
+hours = st.sampled_from([Decimal(0), Decimal(0), Decimal(4), Decimal("7.5"), Decimal(8)])
+work_weeks = st.tuples(*[hours] * 7).map(WorkWeek)
+states = st.sampled_from(sorted(STATES))
+
+
+def _days(start: date, end: date):
+    return (start + timedelta(days=i) for i in range((end - start).days + 1))
+
+
+def _naive_working_days(start, end, work_week, state) -> list[date]:
+    return [
+        d for d in _days(start, end)
+        if work_week.hours[d.weekday()] > 0 and d not in holidays_for_year(d.year, state)
+    ]
+
+
+@settings(max_examples=300, deadline=None)
+@given(start=dates, span=st.integers(0, 900), work_week=work_weeks, state=states,
+       half_start=st.booleans(), half_end=st.booleans())
+def test_business_days_matches_naive(start, span, work_week, state, half_start, half_end):
+    end = start + timedelta(days=span)
+    naive = _naive_working_days(start, end, work_week, state)
+
+    expected = Decimal(len(naive))
+    if half_start and start in naive:
+        expected -= Decimal("0.5")
+    if half_end and end in naive and (start != end or not half_start):
+        expected -= Decimal("0.5")
+
+    assert business_days(start, end, work_week, state, half_start, half_end) == expected
+    assert working_dates(start, end, work_week, state) == naive
+    assert working_hours(start, end, work_week, state) == sum(
+        (work_week.hours[d.weekday()] for d in naive), Decimal(0)
+    )
+
+
+@given(start=dates, span=st.integers(-3, 60))
+def test_count_weekdays_matches_naive(start, span):
+    end = start + timedelta(days=span)
+    expected = [0] * 7
+    for d in _days(start, end):
+        expected[d.weekday()] += 1
+    assert count_weekdays(start, end) == expected
+
+
+def test_known_holidays_rheinland_pfalz():
+    holidays = holidays_for_year(2026, "RP")
+    assert date(2026, 6, 4) in holidays  # Fronleichnam
+    assert date(2026, 11, 1) in holidays  # Allerheiligen
+    assert date(2026, 10, 31) not in holidays  # Reformationstag nicht in RP
+    assert easter_sunday(2024) == date(2024, 3, 31)
+    assert easter_sunday(2025) == date(2025, 4, 20)
+    # 261 Wochentage, davon 8 Feiertage
+    assert business_days(date(2026, 1, 1), date(2026, 12, 31), state="RP") == Decimal("253.00")
+    # Buß- und Bettag nur in Sachsen
+    assert date(2026, 11, 18) in holidays_for_year(2026, "SN")
+
+
+def test_reformationstag_north_german_states_since_2018():
+    for state in ("HB", "HH", "NI", "SH"):
+        assert date(2016, 10, 31) not in holidays_for_year(2016, state)
+        assert date(2017, 10, 31) in holidays_for_year(2017, state)  # bundesweit
+        assert date(2018, 10, 31) in holidays_for_year(2018, state)
+    assert date(2016, 10, 31) in holidays_for_year(2016, "SN")
+    assert date(2017, 10, 31) in holidays_for_year(2017, "RP")
+    assert date(2018, 10, 31) not in holidays_for_year(2018, "RP")
@@ -0,0 +1,142 @@
+"""
+Tests für die SQL-aggregierten CRM-Kennzahlen
+-----------------------------------------------
+- get_stats und get_customers_with_aggregates liefern dieselben Werte wie
+  die Customer-Properties (total_revenue, outstanding_amount,
+  active_projects_count)
+- N+1-Schutz: die Anzahl SQL-Statements ist konstant und wächst nicht mit
+  der Anzahl Kunden, Rechnungen und Projekte
+- Die Liste aggregiert nur die Kunden der angefragten Seite
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.crm import crud
+from app.modules.backoffice.crm.models import Customer, CustomerStatus
+from app.modules.backoffice.invoices.models import Invoice, Payment
+from app.modules.backoffice.projects.models import Project
+
+from query_count import count_queries
+
+TABLES = ["customers", "contacts", "projects", "invoices", "invoice_line_items", "payments"]
+
+
+def _seed(db: Session, customers: int) -> None:
+    """Kunden mit gemischten Rechnungen, Teilzahlungen und Projekten."""
+    statuses = [s.value for s in CustomerStatus]
+    invoice_statuses = ["draft", "sent", "partial", "paid", "overdue", "cancelled"]
+    project_statuses = ["planning", "active", "completed"]
+    payments = []
+
+    for i in range(customers):
+        customer = Customer(
+            customer_number=f"KIT-CUS-{i + 1:06d}",
+            name=f"Kunde {i:03d}",
+            status=statuses[i % len(statuses)],
+        )
+        db.add(customer)
+        db.flush()
+
+        for j in range(i % 4):
+            db.add(Project(
+                title=f"Projekt {i}-{j}",
+                customer_id=customer.id,
+                status=project_statuses[(i + j) % len(project_statuses)],
+            ))
+
+        for j in range(i % 5):
+            invoice = Invoice(
+                invoice_number=f"RE-{i:03d}-{j}",
+                customer_id=customer.id,
+                status=invoice_statuses[(i + j) % len(invoice_statuses)],
+                total=Decimal("100.00") * (j + 1),
+                issued_date=date(2026, 1, 1),
+            )
+            db.add(invoice)
+            db.flush()
+            if invoice.status in ("partial", "paid", "overdue"):
+                payments.append({
+                    "id": uuid.uuid4(),
+                    "invoice_id": invoice.id,
+                    "amount": Decimal("40.00"),
+                    "payment_date": date(2026, 1, 10),
+                })
+
+    # Core-Insert: umgeht den Payment-Listener, damit die Status stabil bleiben
+    if payments:
+        db.execute(insert(Payment), payments)
+    db.commit()
+    db.expunge_all()
+
+
+def _naive_per_customer(db: Session) -> dict:
+    return {
+        c.id: (c.total_revenue, float(c.outstanding_amount), c.active_projects_count)
+        for c in db.query(Customer).all()
+    }
+
+
+@pytest.mark.parametrize("customers", [3, 40])
+def test_stats_constant_queries_and_consistent(engine, db: Session, customers: int):
+    _seed(db, customers)
+
+    with count_queries(engine) as statements:
+        stats = crud.get_stats(db)
+    assert len(statements) == 1
+
+    naive = _naive_per_customer(db)
+    assert stats["total_customers"] == customers
+    assert stats["total_revenue"] == pytest.approx(sum(v[0] for v in naive.values()))
+    assert stats["outstanding_revenue"] == pytest.approx(sum(v[1] for v in naive.values()))
+    assert stats["active_projects"] == sum(v[2] for v in naive.values())
+
+
+@pytest.mark.parametrize("customers", [3, 40])
+def test_list_with_aggregates_constant_queries(engine, db: Session, customers: int):
+    _seed(db, customers)
+
+    with count_queries(engine) as statements:
+        rows = crud.get_customers_with_aggregates(db, limit=1000)
+        # Zugriff auf die Spalten der Response darf nichts nachladen
+        for customer, *_ in rows:
+            _ = (customer.name, customer.status, customer.updated_at)
+    assert len(statements) == 1
+    assert len(rows) == customers
+
+    naive = _naive_per_customer(db)
+    for customer, revenue, outstanding, projects in rows:
+        expected = naive[customer.id]
+        assert revenue == pytest.approx(expected[0])
+        assert outstanding == pytest.approx(expected[1])
+        assert projects == expected[2]
+
+
+def test_list_pages_aggregate_only_their_customers(engine, db: Session):
+    _seed(db, 40)
+    naive = _naive_per_customer(db)
+    full = crud.get_customers_with_aggregates(db, limit=1000, status="active")
+
+    pages = []
+    for skip in range(0, len(full), 4):
+        with count_queries(engine) as statements:
+            pages.extend(crud.get_customers_with_aggregates(db, skip=skip, limit=4, status="active"))
+        assert len(statements) == 1
+        # Teilaggregate sind auf die Seite eingeschränkt (Subquery mit LIMIT)
+        assert statements[0].count("LIMIT") >= 3
+
+    assert [row[0].id for row in pages] == [row[0].id for row in full]
+    assert [row[0].name for row in full] == sorted(row[0].name for row in full)
+    for customer, revenue, outstanding, projects in pages:
+        assert customer.status == "active"
+        assert (revenue, outstanding, projects) == pytest.approx(naive[customer.id])
+
+    found = crud.get_customers_with_aggregates(db, search="Kunde 01")
+    assert [row[0].name for row in found] == [f"Kunde {i:03d}" for i in range(10, 20)]
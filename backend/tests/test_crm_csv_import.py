@@ -0,0 +1,101 @@
+"""
+Tests für den CRM-Kundenimport per CSV (crm.csv_import)
+---------------------------------------------------------
+- Semikolon/Komma, Pflichtfeld name, Duplikate per E-Mail (Datei und DB)
+- Kundennummern als zusammenhängender Block nach der höchsten vorhandenen
+- Fehlgeschlagener Chunk wird zeilenweise wiederholt: nur die fehlerhaften
+  Zeilen werden gemeldet und übersprungen
+- Dry-Run: gleicher Ablauf inkl. Datenbankfehlern, danach Rollback
+- Fortschritt nach dem Parsen und je Chunk
+"""
+from __future__ import annotations
+
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.crm import csv_import
+from app.modules.backoffice.crm.models import Customer
+
+TABLES = ["customers", "contacts"]
+
+
+def _csv(lines: list[str], delimiter: str = ";") -> bytes:
+    header = delimiter.join(["Name", "Email", "City", "Type", "Status"])
+    return "\n".join([header, *lines]).encode("utf-8-sig")
+
+
+def _customers(db: Session) -> dict[str, str]:
+    return dict(db.execute(select(Customer.name, Customer.customer_number)).all())
+
+
+def test_import_parses_validates_and_dedupes(db: Session):
+    db.add(Customer(customer_number="KIT-CUS-000041", name="Bestand", email="alt@example.com"))
+    db.commit()
+
+    result = csv_import.import_customers_csv(db, _csv([
+        "Alpha GmbH,alpha@example.com,Berlin,business,active",
+        "Beta,alt@example.com,,,",                # bereits in der DB
+        ",leer@example.com,,,",                   # Name fehlt
+        "Gamma,alpha@example.com,,,",             # doppelt in der Datei
+        "Delta,,Köln,unbekannt,unbekannt",
+    ], delimiter=","))
+
+    assert (result.imported, result.skipped) == (2, 3)
+    assert result.errors == ["Zeile 4: 'name' ist leer – übersprungen."]
+    assert result.preview == []
+    assert _customers(db) == {"Bestand": "KIT-CUS-000041", "Alpha GmbH": "KIT-CUS-000042", "Delta": "KIT-CUS-000043"}
+    delta = db.scalar(select(Customer).where(Customer.name == "Delta"))
+    # Unbekannter Typ/Status: Modell-Default bzw. 'lead'
+    assert (delta.type, delta.status, delta.country) == ("business", "lead", "Deutschland")
+
+    # Ohne Duplikatsprüfung wird auch die vorhandene E-Mail importiert
+    again = csv_import.import_customers_csv(db, _csv(["Beta;alt@example.com;;;"]), skip_duplicates=False)
+    assert again.imported == 1
+
+
+def test_missing_name_column_and_encoding(db: Session):
+    result = csv_import.import_customers_csv(db, b"Email;City\nx@example.com;Berlin")
+    assert result.errors == ["Pflichtfeld 'name' fehlt in den CSV-Spalten."]
+    assert result.imported == 0
+
+    latin1 = csv_import.import_customers_csv(db, "Name\nMüller".encode("latin-1"))
+    assert latin1.imported == 1 and "Müller" in _customers(db)
+
+
+def test_failed_chunk_is_retried_row_by_row(db: Session):
+    # 'creator' besteht die CSV-Prüfung, verletzt aber check_customer_type_valid
+    lines = [f"Kunde {i:02d};k{i}@example.com;;{'creator' if i in (3, 7) else 'business'};" for i in range(10)]
+    progress: list[csv_import.ImportProgress] = []
+
+    result = None
+    for item in csv_import.iter_import_customers_csv(db, _csv(lines), chunk_size=4):
+        if isinstance(item, csv_import.ImportResult):
+            result = item
+        else:
+            progress.append(item)
+
+    assert (result.imported, result.skipped) == (8, 2)
+    assert len(result.errors) == 2
+    assert result.errors[0].startswith("Zeile 5: Datenbankfehler")
+    assert result.errors[1].startswith("Zeile 9: Datenbankfehler")
+    assert sorted(_customers(db)) == [f"Kunde {i:02d}" for i in range(10) if i not in (3, 7)]
+    assert [(p.phase, p.processed, p.total) for p in progress] == [
+        ("parsed", 0, 10), ("inserted", 4, 10), ("inserted", 8, 10), ("inserted", 10, 10),
+    ]
+
+
+def test_dry_run_reports_errors_and_rolls_back(db: Session):
+    lines = ["Alpha;a@example.com;;business;", "Beta;b@example.com;;creator;", "Gamma;;;;"]
+
+    result = csv_import.import_customers_csv(db, _csv(lines), dry_run=True)
+
+    assert (result.imported, result.skipped) == (2, 1)
+    assert len(result.errors) == 1 and result.errors[0].startswith("Zeile 3: Datenbankfehler")
+    assert [row["name"] for row in result.preview] == ["Alpha", "Beta", "Gamma"]
+    assert _customers(db) == {}
+
+    # Der echte Lauf vergibt danach dieselben Nummern
+    csv_import.import_customers_csv(db, _csv(lines))
+    assert _customers(db) == {"Alpha": "KIT-CUS-000001", "Gamma": "KIT-CUS-000003"}
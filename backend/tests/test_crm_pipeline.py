@@ -0,0 +1,118 @@
+"""
+Tests für das Pipeline-Board (crm.crud.get_pipeline_board)
+-------------------------------------------------------------
+- Zähler pro Stage aus GROUP BY, alle Stages immer vorhanden
+- Je Stage die ersten `limit` Karten nach (name, id), next_cursor nur bei
+  weiteren Karten
+- get_pipeline_stage_page setzt den Cursor des Boards fort: jede Karte einer
+  Spalte genau einmal
+- Konstante Anzahl Statements, unabhängig von der Anzahl Kunden
+"""
+from __future__ import annotations
+
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.database import get_db
+from app.modules.backoffice.crm import crud
+from app.modules.backoffice.crm.models import Customer, PipelineStage
+from app.modules.backoffice.crm.routes import router
+
+from query_count import count_queries
+
+TABLES = ["customers", "contacts"]
+
+# Karten je Stage; "won" bleibt leer
+SEED = {"new_lead": 7, "qualified": 3, "proposal": 1, "negotiation": 4, "lost": 2}
+
+
+def _seed(db: Session, factor: int = 1) -> None:
+    number = db.query(Customer).count()
+    for stage, count in SEED.items():
+        for i in range(count * factor):
+            number += 1
+            # Absteigende Namen mit Duplikaten: Sortierung über (name, id)
+            db.add(Customer(
+                customer_number=f"KIT-CUS-{number:06d}", name=f"{stage} {(count * factor - i) // 2:03d}",
+                pipeline_stage=stage,
+            ))
+    db.commit()
+
+
+def _names(db: Session, stage: str) -> list[str]:
+    return [
+        c.name for c in db.query(Customer).filter(Customer.pipeline_stage == stage)
+        .order_by(Customer.name, Customer.id)
+    ]
+
+
+def test_board_counts_and_top_cards(db: Session):
+    _seed(db)
+
+    board = crud.get_pipeline_board(db, limit=3)
+
+    assert list(board) == [s.value for s in PipelineStage]
+    assert {stage: column["count"] for stage, column in board.items()} == {**SEED, "won": 0}
+    for stage, column in board.items():
+        expected = _names(db, stage)
+        assert [card["name"] for card in column["items"]] == expected[:3]
+        assert (column["next_cursor"] is not None) == (len(expected) > 3)
+    assert set(board["new_lead"]["items"][0]) == {c.key for c in crud.PIPELINE_CARD_COLUMNS}
+
+
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_stage_page_continues_board_cursor(db: Session, limit: int):
+    _seed(db)
+    board = crud.get_pipeline_board(db, limit=limit)
+
+    for stage, column in board.items():
+        names = [card["name"] for card in column["items"]]
+        ids = [card["id"] for card in column["items"]]
+        cursor = column["next_cursor"]
+        while cursor:
+            page = crud.get_pipeline_stage_page(db, stage, limit=limit, cursor=cursor)
+            assert len(page["items"]) <= limit
+            names.extend(card["name"] for card in page["items"])
+            ids.extend(card["id"] for card in page["items"])
+            cursor = page["next_cursor"]
+        assert names == _names(db, stage)
+        assert len(set(ids)) == len(ids) == column["count"]
+
+
+def test_board_query_count_is_constant(db: Session, engine):
+    _seed(db)
+    with count_queries(engine) as small:
+        crud.get_pipeline_board(db, limit=2)
+
+    _seed(db, factor=4)
+    with count_queries(engine) as large:
+        board = crud.get_pipeline_board(db, limit=2)
+
+    assert len(small) == len(large) == 2
+    assert board["new_lead"]["count"] == 7 * 5
+
+
+def test_pipeline_routes(db: Session):
+    _seed(db)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    board = client.get("/backoffice/crm/pipeline", params={"limit": 4})
+    assert board.status_code == 200
+    column = board.json()["new_lead"]
+    assert column["count"] == 7 and len(column["items"]) == 4
+
+    rest = client.get("/backoffice/crm/pipeline/new_lead", params={"limit": 4, "cursor": column["next_cursor"]})
+    assert rest.status_code == 200
+    assert len(rest.json()["items"]) == 3 and rest.json()["next_cursor"] is None
+
+    assert client.get("/backoffice/crm/pipeline/unbekannt").status_code == 422
+    assert client.get("/backoffice/crm/pipeline/won", params={"cursor": "kaputt"}).status_code == 400
@@ -0,0 +1,159 @@
+"""
+Tests für die Kundensuche mit Keyset-Pagination (crm.crud.search_customers)
+-----------------------------------------------------------------------------
+- Ranking: exakte Kundennummer > Namens-Präfix > übrige Treffer (nach Name),
+  Treffer auch über Kontakte des Kunden
+- Blättern per next_cursor liefert jeden Kunden genau einmal, in derselben
+  Reihenfolge wie eine ungeteilte Abfrage – mit und ohne Suchbegriff
+- Ungültiger Cursor: 400
+"""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.database import get_db
+from app.modules.backoffice.crm import crud
+from app.modules.backoffice.crm.models import Contact, Customer
+from app.modules.backoffice.crm.routes import router
+from app.modules.backoffice.invoices.models import Invoice
+
+TABLES = ["customers", "contacts", "projects", "invoices", "invoice_line_items", "payments"]
+
+
+def _customer(db: Session, number: str, name: str, status: str = "active") -> Customer:
+    customer = Customer(customer_number=number, name=name, status=status)
+    db.add(customer)
+    db.flush()
+    return customer
+
+
+def _seed_ranking(db: Session) -> None:
+    _customer(db, "KIT-CUS-000001", "Alpha GmbH")
+    _customer(db, "KIT-CUS-000002", "Beta Alpha AG")
+    gamma = _customer(db, "KIT-CUS-000003", "Gamma KG")
+    db.add(Contact(customer_id=gamma.id, firstname="Anna", lastname="Alpha"))
+    _customer(db, "ALPHA", "Zeta Handel")
+    _customer(db, "KIT-CUS-000005", "Delta", status="inactive")
+    db.commit()
+
+
+def _page_through(db: Session, limit: int, **kwargs) -> tuple[list[str], set[int]]:
+    names: list[str] = []
+    totals: set[int] = set()
+    cursor = None
+    while True:
+        page = crud.search_customers(db, limit=limit, cursor=cursor, **kwargs)
+        assert len(page["items"]) <= limit
+        names.extend(item[0].name for item in page["items"])
+        totals.add(page["total"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return names, totals
+
+
+def test_ranking_and_contact_matches(db: Session):
+    _seed_ranking(db)
+
+    page = crud.search_customers(db, q="  Alpha ")
+
+    assert [(item[0].name, item[1]) for item in page["items"]] == [
+        ("Zeta Handel", 2.0),    # exakte Kundennummer
+        ("Alpha GmbH", 1.0),     # Namens-Präfix
+        ("Beta Alpha AG", 0.0),
+        ("Gamma KG", 0.0),       # nur über den Kontakt
+    ]
+    assert page["total"] == 4 and page["next_cursor"] is None
+
+    assert crud.search_customers(db, q="alpha", status="inactive")["total"] == 0
+    assert [i[0].name for i in crud.search_customers(db, q="kit-cus-000005")["items"]] == ["Delta"]
+    # LIKE-Platzhalter im Suchbegriff werden escaped
+    assert crud.search_customers(db, q="%")["total"] == 0
+
+
+def test_search_returns_aggregates_for_page(db: Session):
+    customer = _customer(db, "KIT-CUS-000001", "Alpha GmbH")
+    db.add(Invoice(
+        invoice_number="RE-2026-0001", customer_id=customer.id, status="sent",
+        total=Decimal("120.00"), issued_date=date(2026, 1, 5),
+    ))
+    db.commit()
+
+    (_, rank, revenue, outstanding, projects), = crud.search_customers(db, q="alpha")["items"]
+    # Umsatz zählt nur bezahlte Rechnungen, die offene Rechnung ist Forderung
+    assert (rank, revenue, outstanding, projects) == (1.0, 0.0, 120.0, 0)
+
+
+@pytest.mark.parametrize("limit", [1, 4, 7])
+def test_keyset_paging_without_term(db: Session, limit: int):
+    # Doppelte Namen: die ID entscheidet die Reihenfolge
+    for i in range(20):
+        _customer(db, f"KIT-CUS-{i:06d}", f"Kunde {i % 8:02d}")
+    db.commit()
+
+    names, totals = _page_through(db, limit)
+
+    full = crud.search_customers(db, limit=100)
+    assert full["next_cursor"] is None
+    assert names == [item[0].name for item in full["items"]]
+    assert names == sorted(names) and len(names) == 20
+    assert totals == {20}
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_keyset_paging_across_rank_boundaries(db: Session, limit: int):
+    _seed_ranking(db)
+    for i in range(4):
+        _customer(db, f"KIT-CUS-1{i:05d}", f"Alpha Filiale {i}")
+        _customer(db, f"KIT-CUS-2{i:05d}", f"Omega Alpha {i}")
+    db.commit()
+
+    names, totals = _page_through(db, limit, q="alpha")
+
+    full = crud.search_customers(db, q="alpha", limit=100)
+    assert names == [item[0].name for item in full["items"]]
+    assert len(set(names)) == len(names) == 12
+    assert names[0] == "Zeta Handel"
+    assert totals == {12}
+
+
+def test_invalid_cursor_is_rejected(db: Session):
+    _seed_ranking(db)
+    with pytest.raises(HTTPException) as exc:
+        crud.search_customers(db, cursor="kaputt")
+    assert exc.value.status_code == 400
+
+    # Cursor einer Suche passt nicht zur Liste ohne Suchbegriff (andere Sortierschlüssel)
+    cursor = crud.search_customers(db, q="alpha", limit=1)["next_cursor"]
+    with pytest.raises(HTTPException):
+        crud.search_customers(db, cursor=cursor)
+
+
+def test_search_route_pages_with_cursor(db: Session):
+    _seed_ranking(db)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    first = client.get("/backoffice/crm/customers/search", params={"q": "alpha", "limit": 2}).json()
+    assert [item["name"] for item in first["items"]] == ["Zeta Handel", "Alpha GmbH"]
+    assert first["total"] == 4 and first["next_cursor"]
+
+    second = client.get(
+        "/backoffice/crm/customers/search",
+        params={"q": "alpha", "limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+    assert [item["name"] for item in second["items"]] == ["Beta Alpha AG", "Gamma KG"]
+    assert second["next_cursor"] is None
+
+    response = client.get("/backoffice/crm/customers/search", params={"cursor": "kaputt"})
+    assert response.status_code == 400
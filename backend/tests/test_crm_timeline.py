@@ -0,0 +1,169 @@
+"""
+Tests für die CRM-Timeline (crm.timeline.get_timeline)
+---------------------------------------------------------
+- Aktivitäten und Audit-Einträge in einer Liste, neueste zuerst; gleiche
+  Zeitstempel werden über die ID stabil sortiert
+- Kundenfilter umfasst Audit-Einträge der Kontakte des Kunden, andere
+  Entitäten (z.B. Rechnungen) bleiben außen vor
+- Blättern per (ts, id)-Cursor: jeder Eintrag genau einmal, in derselben
+  Reihenfolge wie eine ungeteilte Abfrage
+- Endpoints: X-Next-Cursor-Header bzw. next_cursor im Timeline-Response
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.database import get_db
+from app.modules.backoffice.crm import timeline
+from app.modules.backoffice.crm.models import Activity, Contact, Customer
+from app.modules.backoffice.crm.routes import router
+from app.modules.backoffice.invoices.models import AuditLog
+
+from query_count import count_queries
+
+TABLES = ["customers", "contacts", "crm_activities", "audit_logs"]
+
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def _seed(db: Session) -> dict[str, uuid.UUID]:
+    """Kunde A mit Kontakt, Kunde B; Aktivitäten und Audit-Einträge im Wechsel."""
+    first = Customer(customer_number="KIT-CUS-000001", name="Kunde A")
+    second = Customer(customer_number="KIT-CUS-000002", name="Kunde B")
+    db.add_all([first, second])
+    db.flush()
+    contact = Contact(customer_id=first.id, firstname="Max", lastname="Kontakt")
+    db.add(contact)
+    db.flush()
+
+    for i in range(6):
+        db.add(Activity(
+            customer_id=first.id, contact_id=contact.id if i % 2 else None,
+            type="call", description=f"A{i}", occurred_at=START + timedelta(hours=2 * i),
+        ))
+    # Gleicher Zeitstempel wie A2 und das Customer-Update: Reihenfolge über die ID
+    db.add(Activity(customer_id=first.id, type="note", description="A2b", occurred_at=START + timedelta(hours=4)))
+    db.add(Activity(customer_id=second.id, type="call", description="B0", occurred_at=START + timedelta(hours=3)))
+    audits = [
+        ("Customer", first.id, "create", 1),
+        ("Contact", contact.id, "update", 5),
+        ("Customer", first.id, "update", 4),
+        ("Customer", second.id, "update", 7),
+        ("Invoice", uuid.uuid4(), "create", 8),
+    ]
+    for entity_type, entity_id, action, hours in audits:
+        db.add(AuditLog(
+            entity_type=entity_type, entity_id=entity_id, action=action,
+            timestamp=START + timedelta(hours=hours),
+        ))
+    db.commit()
+    return {"first": first.id, "second": second.id, "contact": contact.id}
+
+
+def _label(entry) -> str:
+    return entry.description if entry.source == "activity" else f"{entry.entity_type}:{entry.type}"
+
+
+def _page_through(db: Session, limit: int, **kwargs) -> list:
+    entries = []
+    cursor = None
+    while True:
+        page = timeline.get_timeline(db, limit=limit, cursor=cursor, **kwargs)
+        assert len(page["items"]) <= limit
+        entries.extend(page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return entries
+
+
+def test_customer_timeline_merges_sources_newest_first(db: Session, engine):
+    ids = _seed(db)
+
+    with count_queries(engine) as statements:
+        page = timeline.get_timeline(db, customer_id=ids["first"], limit=50)
+
+    labels = [_label(e) for e in page["items"]]
+    assert labels[:4] == ["A5", "A4", "A3", "Contact:update"]
+    assert set(labels[4:7]) == {"A2", "A2b", "Customer:update"}  # gleicher Zeitstempel
+    assert set(labels) == {"A0", "A1", "A2", "A2b", "A3", "A4", "A5", "Customer:create", "Customer:update", "Contact:update"}
+    assert [e.ts for e in page["items"]] == sorted((e.ts for e in page["items"]), reverse=True)
+    tied = [e.id for e in page["items"] if e.ts == START + timedelta(hours=4)]
+    assert len(tied) == 3 and tied == sorted(tied, reverse=True)
+
+    contact_audit = next(e for e in page["items"] if e.entity_type == "Contact")
+    assert contact_audit.customer_id == ids["first"] and contact_audit.contact_id == ids["contact"]
+    assert page["next_cursor"] is None
+    # Systemeinträge ohne user_id: kein Employee-Lookup, ein Statement
+    assert page["user_cache"] == {}
+    assert len(statements) == 1
+
+
+def test_filters_by_contact_and_without_audit(db: Session):
+    ids = _seed(db)
+
+    by_contact = timeline.get_timeline(db, customer_id=ids["first"], contact_id=ids["contact"])
+    assert [_label(e) for e in by_contact["items"]] == ["A5", "A3", "A1"]
+
+    no_audit = timeline.get_timeline(db, customer_id=ids["first"], include_audit=False)
+    assert all(e.source == "activity" for e in no_audit["items"]) and len(no_audit["items"]) == 7
+
+    everything = timeline.get_timeline(db)
+    labels = [_label(e) for e in everything["items"]]
+    assert "B0" in labels and "Invoice:create" not in labels
+    assert len(labels) == 8 + 4
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 5])
+def test_cursor_paging_has_no_gaps_or_duplicates(db: Session, limit: int):
+    ids = _seed(db)
+
+    for kwargs in ({"customer_id": ids["first"]}, {}):
+        paged = _page_through(db, limit, **kwargs)
+        full = timeline.get_timeline(db, limit=100, **kwargs)["items"]
+        assert [e.id for e in paged] == [e.id for e in full]
+        assert len({e.id for e in paged}) == len(paged)
+
+
+def test_invalid_cursor_is_rejected(db: Session):
+    _seed(db)
+    with pytest.raises(HTTPException) as exc:
+        timeline.get_timeline(db, cursor="kaputt")
+    assert exc.value.status_code == 400
+
+
+def test_endpoints_return_next_cursor(db: Session):
+    ids = _seed(db)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    first = client.get(f"/backoffice/crm/customers/{ids['first']}/activities", params={"limit": 4})
+    assert first.status_code == 200
+    assert [item["description"] for item in first.json()[:3]] == ["A5", "A4", "A3"]
+    assert first.json()[3]["type"] == "system"
+    cursor = first.headers["X-Next-Cursor"]
+
+    rest = client.get(
+        f"/backoffice/crm/customers/{ids['first']}/activities", params={"limit": 50, "cursor": cursor},
+    )
+    assert "X-Next-Cursor" not in rest.headers
+    assert len(first.json()) + len(rest.json()) == 10
+
+    body = client.get(f"/backoffice/crm/customers/{ids['first']}/timeline", params={"limit": 6}).json()
+    assert body["total"] == 6 and body["next_cursor"]
+    audit = next(item for item in body["items"] if item["source"] == "audit")
+    assert audit["user_name"] is None
+    assert audit["description"] == "Contact wurde von System bearbeitet"
+
+    latest = client.get("/backoffice/crm/activities/latest", params={"limit": 50})
+    assert len(latest.json()) == 12 and "X-Next-Cursor" not in latest.headers
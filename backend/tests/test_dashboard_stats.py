@@ -0,0 +1,126 @@
+"""
+Tests für die Dashboard-Zähler
+--------------------------------
+- Globale Zähler (Projekte, Rechnungen, Kunden) in einem Statement,
+  danach aus dem prozessweiten TTL-Cache
+- Reminder-Abschnitt: offene Anzahl und letzte Reminder in einem Statement
+- last_accessed wird gedrosselt geschrieben, Commit nur nach Änderung
+- TTLCache: Ablauf, Invalidierung, Loader nur einmal
+"""
+from __future__ import annotations
+
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Generator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.cache import TTLCache
+from app.modules.dashboards import crud
+from app.modules.reminders.models import Reminder
+
+from query_count import count_queries
+
+TABLES = ["reminders"]
+OWNER = uuid.uuid4()
+
+
+@pytest.fixture()
+def engine(engine):
+    # Nur die Spalten, die die Zähler lesen (Original-Tabellen nutzen JSONB)
+    with engine.begin() as conn:
+        for table in ("projects", "invoices", "customers"):
+            conn.execute(text(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, status TEXT)"))
+        conn.execute(text("CREATE TABLE dashboards (id INTEGER PRIMARY KEY, owner_id TEXT, last_accessed TIMESTAMP)"))
+    return engine
+
+
+@pytest.fixture()
+def db(db: Session) -> Generator[Session, None, None]:
+    crud.invalidate_dashboard_stats()
+    yield db
+    crud.invalidate_dashboard_stats()
+
+
+def test_global_stats_one_statement_then_cached(engine, db: Session):
+    db.execute(text(
+        "INSERT INTO projects (status) VALUES ('active'), ('active'), ('done');"
+    ))
+    db.execute(text("INSERT INTO invoices (status) VALUES ('sent'), ('paid')"))
+    db.execute(text("INSERT INTO customers (status) VALUES ('active'), ('lead')"))
+    db.commit()
+
+    with count_queries(engine) as statements:
+        stats = crud.get_global_stats(db)
+        assert crud.get_global_stats(db) == stats
+    assert len(statements) == 1
+    assert stats == {"activeProjects": 2, "pendingInvoices": 1, "registeredCustomers": 1}
+
+    db.execute(text("INSERT INTO invoices (status) VALUES ('sent')"))
+    db.commit()
+    assert crud.get_global_stats(db)["pendingInvoices"] == 1  # noch gecacht
+    crud.invalidate_dashboard_stats()
+    assert crud.get_global_stats(db)["pendingInvoices"] == 2
+
+
+def test_reminder_section(engine, db: Session):
+    now = datetime(2026, 3, 2, 9, 0)
+    db.add_all([
+        Reminder(owner_id=OWNER, title=f"R{i}", status="open" if i % 2 else "done",
+                 created_at=now + timedelta(minutes=i))
+        for i in range(7)
+    ] + [Reminder(owner_id=uuid.uuid4(), title="fremd", status="open", created_at=now)])
+    db.commit()
+
+    with count_queries(engine) as statements:
+        open_count, recent = crud.get_reminder_section(db, OWNER, limit=5)
+    assert len(statements) == 1
+    assert open_count == 3
+    assert [r["title"] for r in recent] == ["R6", "R5", "R4", "R3", "R2"]
+
+    assert crud.get_reminder_section(db, uuid.uuid4(), limit=5) == (0, [])
+    assert crud.get_dashboard_stats(db, OWNER)["openReminders"] == 3
+
+
+def test_last_accessed_is_throttled(engine, db: Session, monkeypatch):
+    stale = datetime.utcnow() - crud.LAST_ACCESSED_INTERVAL - timedelta(minutes=1)
+    db.execute(text("INSERT INTO dashboards (owner_id, last_accessed) VALUES (:oid, :ts)"),
+               {"oid": OWNER.hex, "ts": stale})
+    db.commit()
+    commits = []
+    monkeypatch.setattr(db, "commit", lambda: commits.append(1) or Session.commit(db))
+
+    crud._touch_last_accessed(db, OWNER)
+    touched = db.scalar(text("SELECT last_accessed FROM dashboards"))
+    assert touched != str(stale) and len(commits) == 1
+
+    # Innerhalb des Intervalls: UPDATE ohne Treffer, kein Commit
+    with count_queries(engine) as statements:
+        crud._touch_last_accessed(db, OWNER)
+    assert len(statements) == 1 and len(commits) == 1
+    assert db.scalar(text("SELECT last_accessed FROM dashboards")) == touched
+
+
+def test_ttl_cache():
+    cache = TTLCache(ttl_seconds=0.05, max_entries=2)
+    calls = []
+
+    def _load():
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_set("a", _load) == 1
+    assert cache.get_or_set("a", _load) == 1
+    time.sleep(0.06)
+    assert cache.get_or_set("a", _load) == 2
+
+    cache.set("b", "x")
+    cache.set("c", "y")  # verdrängt den ältesten Eintrag
+    assert cache.get("a") is None
+    assert cache.get("c") == "y"
+    cache.invalidate("c")
+    assert cache.get("c") is None
@@ -0,0 +1,103 @@
+"""
+Tests für vorkompilierte E-Mail-Templates (core.email.rendering)
+-----------------------------------------------------------------
+- Fehlende Template-Variablen fallen vor dem Versand auf
+- Batch-Versand an 200 Empfänger: einmal rendern, ein Commit
+- SMTP-Einstellungen aus dem Prozess-Cache, update_settings invalidiert
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Generator
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.email import rendering
+from app.core.email.service import EmailService, TemplatedEmail, send_leave_request_notification
+from app.modules.admin import service as admin_service
+from app.modules.admin.models import MailOutbox, SystemSettings
+from query_count import count_queries
+
+TABLES = ["system_settings", "mail_outbox"]
+
+LEAVE_CONTEXT = {
+    "request_id": "0000-1111",
+    "employee_name": "Erika Mustermann",
+    "employee_email": "erika@workmate.test",
+    "leave_type_label": "Urlaub",
+    "start_date": "01.12.2026",
+    "end_date": "05.12.2026",
+    "total_days": "5",
+    "reason": None,
+}
+
+
+@pytest.fixture()
+def db(db: Session) -> Generator[Session, None, None]:
+    db.add(SystemSettings(
+        email_enabled=True, smtp_host="127.0.0.1", smtp_port=2525,
+        smtp_from_email="noreply@workmate.test", smtp_from_name="Workmate",
+    ))
+    db.commit()
+    admin_service.invalidate_system_settings_cache()
+    yield db
+    admin_service.invalidate_system_settings_cache()
+
+
+def test_templates_are_precompiled_and_validated():
+    templates = rendering.load_templates()
+    assert "leave_request_notification" in templates
+    # Variablen aus base.html werden mitgezählt, Defaults nicht verlangt
+    assert "workmate_url" in templates["leave_request_notification"].variables
+
+    rendered = rendering.render("leave_request_notification", LEAVE_CONTEXT)
+    assert "Erika Mustermann" in rendered.text and "Erika Mustermann" in rendered.html
+
+    incomplete = {k: v for k, v in LEAVE_CONTEXT.items() if k != "start_date"}
+    with pytest.raises(rendering.TemplateContextError, match="start_date"):
+        rendering.render("leave_request_notification", incomplete)
+    with pytest.raises(rendering.TemplateContextError):
+        rendering.render_batch("leave_request_notification", [LEAVE_CONTEXT, incomplete])
+    with pytest.raises(rendering.TemplateContextError):
+        rendering.render("gibt_es_nicht", {})
+
+
+def test_batch_renders_once_and_commits_once(db: Session, engine, monkeypatch):
+    renders = []
+    original = rendering._render
+    monkeypatch.setattr(rendering, "_render", lambda t, c: renders.append(t.name) or original(t, c))
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+
+    approvers = [f"approver{i}@workmate.test" for i in range(200)]
+    assert asyncio.run(send_leave_request_notification(
+        db, request_id="0000-1111", employee_name="Erika Mustermann",
+        employee_email="erika@workmate.test", leave_type="vacation",
+        start_date="01.12.2026", end_date="05.12.2026", total_days="5",
+        approver_emails=approvers,
+    ))
+
+    assert renders == ["leave_request_notification"]
+    assert len(commits) == 1
+    assert db.scalar(select(func.count(MailOutbox.id))) == 200
+    entry = db.scalar(select(MailOutbox).where(MailOutbox.recipients == ["approver7@workmate.test"]))
+    assert entry.reference == "leave:0000-1111"
+
+    # Fehlende Variable: nichts wird eingereiht
+    broken = [TemplatedEmail(to_emails=["x@workmate.test"], subject="x", context={})]
+    assert asyncio.run(EmailService(db).send_templated_batch("leave_request_notification", broken)) == 0
+    assert db.scalar(select(func.count(MailOutbox.id))) == 200
+
+
+def test_mail_settings_are_cached_until_update(db: Session, engine):
+    assert admin_service.get_mail_settings(db).smtp_port == 2525
+    with count_queries(engine) as statements:
+        for _ in range(3):
+            assert asyncio.run(EmailService(db)._load_settings()).smtp_host == "127.0.0.1"
+    assert statements == []
+
+    asyncio.run(admin_service.update_settings(db, {"smtp_port": 465}))
+    assert admin_service.get_mail_settings(db).smtp_port == 465
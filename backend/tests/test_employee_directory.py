@@ -0,0 +1,166 @@
+"""
+Tests für Mitarbeitersuche und -verzeichnis (employees)
+---------------------------------------------------------
+- get_employees: Suche über search_text, Präfix-Treffer zuerst, COUNT ohne Joins
+- Verzeichnis-Snapshot: Typeahead und Organigramm ohne DB-Zugriff,
+  schreibende CRUD-Funktionen invalidieren
+- Username-Auflösung (Keycloak) nur über die eindeutigen Schlüssel
+  employee_code/workmate_id: kein Treffer 404, mehrdeutig 409
+"""
+from __future__ import annotations
+
+
+import jwt
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.auth.service import ALGORITHM, SECRET_KEY
+from app.core.database import get_db
+from app.modules.employees import crud, directory
+from app.modules.employees.models import Department, Employee
+from app.modules.employees.routes import router
+from app.modules.employees.schemas import EmployeeUpdate
+
+from query_count import count_queries
+
+TABLES = ["departments", "employees"]
+
+
+@pytest.fixture()
+def engine(engine):
+    with engine.begin() as conn:
+        # roles nutzt JSONB – nur die Spalten für joinedload(Employee.role)
+        conn.execute(text(
+            "CREATE TABLE roles (id CHAR(32) PRIMARY KEY, name TEXT, description TEXT, "
+            "keycloak_id TEXT, permissions_json TEXT)"
+        ))
+    directory.invalidate_directory()  # Snapshot ist prozessweit
+    return engine
+
+
+def _seed(db: Session) -> dict[str, Employee]:
+    it = Department(name="IT")
+    db.add(it)
+    db.flush()
+    people = {}
+    for code, first, last, email, boss, status in [
+        ("KIT-0001", "Anna", "Berg", "anna.berg@example.com", None, "active"),
+        ("KIT-0002", "Marta", "Annaberg", "marta@example.com", "KIT-0001", "active"),
+        ("KIT-0003", "Jonas", "Klein", "jk@example.com", "KIT-0002", "active"),
+        ("KIT-0004", "Hanna", "Groß", "hanna@example.com", "KIT-0001", "active"),
+        ("KIT-0005", "Anna", "Alt", "alt@example.com", None, "inactive"),
+    ]:
+        people[code] = Employee(
+            employee_code=code, first_name=first, last_name=last, email=email,
+            department_id=it.id, reports_to=people[boss].id if boss else None, status=status,
+        )
+        db.add(people[code])
+        db.flush()
+    db.commit()
+    return people
+
+
+def test_search_ranking_and_count_without_joins(engine, db: Session):
+    _seed(db)
+
+    with count_queries(engine) as statements:
+        employees, total = crud.get_employees(db, search="anna", limit=2)
+    assert total == 4  # Anna Berg, Marta Annaberg, Hanna Groß, Anna Alt
+    # Präfix-Treffer (Vorname/Nachname) vor reinen Teilstring-Treffern
+    assert [e.employee_code for e in employees] == ["KIT-0005", "KIT-0002"]
+    count_sql = statements[0].lower()
+    assert "count(" in count_sql and "join" not in count_sql
+
+    employees, total = crud.get_employees(db, search="anna berg", status="active")
+    assert total == 2
+    assert [e.employee_code for e in employees] == ["KIT-0001", "KIT-0002"]
+
+    employees, total = crud.get_employees(db, search="kit-0003")
+    assert [e.last_name for e in employees] == ["Klein"]
+    assert crud.get_employees(db, search="100%")[1] == 0
+
+    employees, total = crud.get_employees(db)
+    assert total == 5
+    assert [e.last_name for e in employees][:2] == ["Alt", "Annaberg"]
+
+    def _lookup(username: str):
+        return db.scalars(select(Employee.employee_code).where(*crud.username_lookup_filters(username))).all()
+
+    assert _lookup("kit-0003") == ["KIT-0003"]
+    # Nur eindeutige Schlüssel: weder E-Mail-Lokalteil noch Namen
+    assert _lookup("JK") == []
+    assert _lookup("Groß") == []
+    assert _lookup("0003") == []  # kein Teilstring-Treffer
+    assert _lookup(" ") == []
+
+
+def test_directory_snapshot_typeahead_and_org_chart(engine, db: Session):
+    people = _seed(db)
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    with count_queries(engine) as statements:
+        first = client.get("/employees/directory/search", params={"q": "ann"})
+        second = client.get("/employees/org-chart")
+        listing = client.get("/employees/directory")
+    assert len(statements) == 1  # nur das Laden des Snapshots
+
+    # Präfix vor Teilstring, deaktivierte Mitarbeiter fehlen
+    assert [e["employee_code"] for e in first.json()] == ["KIT-0002", "KIT-0001", "KIT-0004"]
+    assert len(listing.json()) == 4
+
+    (root,) = second.json()
+    assert root["name"] == "Anna Berg"
+    assert [r["employee_code"] for r in root["reports"]] == ["KIT-0002", "KIT-0004"]
+    assert root["reports"][0]["reports"][0]["department_name"] == "IT"
+
+    subtree = client.get("/employees/org-chart", params={"root_id": str(people["KIT-0002"].id)}).json()
+    assert [n["employee_code"] for n in subtree] == ["KIT-0002"]
+    assert client.get("/employees/org-chart", params={"root_id": str(people["KIT-0005"].id)}).status_code == 404
+
+    # Schreibende CRUD-Funktion invalidiert den Snapshot
+    crud.update_employee(db, people["KIT-0003"].id, EmployeeUpdate(
+        email="jk@example.com", first_name="Annabell", reports_to=people["KIT-0001"].id,
+    ))
+    result = client.get("/employees/directory/search", params={"q": "ann", "limit": 2}).json()
+    assert [e["employee_code"] for e in result] == ["KIT-0002", "KIT-0001"]
+    root = client.get("/employees/org-chart").json()[0]
+    assert [r["employee_code"] for r in root["reports"]] == ["KIT-0002", "KIT-0004", "KIT-0003"]
+
+
+def test_current_user_from_preferred_username(db: Session):
+    people = _seed(db)
+    people["KIT-0003"].workmate_id = "WM-3"
+    db.commit()
+
+    app = FastAPI()
+
+    @app.get("/me")
+    def me(user: dict = Depends(get_current_user)):
+        return user
+
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    def _me(username: str):
+        token = jwt.encode({"preferred_username": username}, SECRET_KEY, algorithm=ALGORITHM)
+        return client.get("/me", headers={"Authorization": f"Bearer {token}"})
+
+    assert _me("kit-0003").json()["employee_code"] == "KIT-0003"
+    assert _me("wm-3").json()["employee_code"] == "KIT-0003"
+    assert _me("jk").status_code == 404
+    assert _me("Anna").status_code == 404
+
+    # workmate_id eines Mitarbeiters = employee_code eines anderen: nicht raten
+    people["KIT-0002"].workmate_id = "KIT-0004"
+    db.commit()
+    assert _me("kit-0004").status_code == 409
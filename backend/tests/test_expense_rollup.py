@@ -0,0 +1,181 @@
+"""
+Tests für das Expense-Rollup (finance)
+----------------------------------------
+Die KPI-Werte aus expense_daily_rollups müssen immer der naiven Berechnung
+über die Expense-Tabelle entsprechen:
+- nach create/update/delete (inkrementelle Pflege)
+- nach rebuild_expense_rollup (auch für zurückdatierte Ausgaben)
+- für beliebige Zeiträume, Kategorien und Projekte
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.finance import crud
+from app.modules.backoffice.finance.models import Expense, ExpenseCategory, ExpenseDailyRollup
+from app.modules.backoffice.finance.schemas import ExpenseCreate, ExpenseUpdate
+
+# customers bis invoices nur für das Löschen eines Projekts
+TABLES = ["customers", "projects", "time_entries", "invoices", "expenses", "expense_daily_rollups"]
+PROJECT_A = uuid.uuid4()
+PROJECT_B = uuid.uuid4()
+
+
+# ---------------------------------------------------------------------------
+# Hilfsfunktionen
+# ---------------------------------------------------------------------------
+
+def _naive_kpis(
+    db: Session,
+    category: Optional[ExpenseCategory] = None,
+    project_id: Optional[uuid.UUID] = None,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> tuple[Decimal, dict[ExpenseCategory, Decimal]]:
+    """Referenz: Summen direkt über die Expense-Tabelle."""
+    stmt = select(Expense.category, func.sum(Expense.amount)).group_by(Expense.category)
+    if category is not None:
+        stmt = stmt.where(Expense.category == category.value)
+    if project_id is not None:
+        stmt = stmt.where(Expense.project_id == project_id)
+    if from_date is not None:
+        stmt = stmt.where(Expense.created_at >= datetime.combine(from_date, datetime.min.time()))
+    if to_date is not None:
+        stmt = stmt.where(Expense.created_at <= datetime.combine(to_date, datetime.max.time()))
+
+    by_category = {ExpenseCategory(c): Decimal(a) for c, a in db.execute(stmt).all()}
+    return sum(by_category.values(), Decimal("0.00")), by_category
+
+
+def _assert_consistent(db: Session, **filters) -> None:
+    kpis = crud.get_expense_kpis(db, **filters)
+    total, by_category = _naive_kpis(db, **filters)
+    assert kpis.total == total
+    assert kpis.by_category == by_category
+
+
+def _create(db: Session, category: ExpenseCategory, amount: str, project_id=None) -> Expense:
+    return crud.create_expense(
+        db,
+        ExpenseCreate(
+            category=category,
+            amount=Decimal(amount),
+            description="Test",
+            project_id=project_id,
+        ),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+def test_incremental_rollup_matches_naive(db: Session):
+    a = _create(db, ExpenseCategory.TRAVEL, "120.50", PROJECT_A)
+    b = _create(db, ExpenseCategory.TRAVEL, "80.00", PROJECT_A)
+    c = _create(db, ExpenseCategory.SOFTWARE, "49.99")
+    _create(db, ExpenseCategory.HARDWARE, "999.00", PROJECT_B)
+    _assert_consistent(db)
+
+    crud.update_expense(db, a, ExpenseUpdate(amount=Decimal("100.00")))
+    crud.update_expense(db, b, ExpenseUpdate(category=ExpenseCategory.OFFICE, project_id=PROJECT_B))
+    crud.update_expense(db, c, ExpenseUpdate(project_id=PROJECT_A))
+    crud.delete_expense(db, a)
+
+    for filters in (
+        {},
+        {"project_id": PROJECT_A},
+        {"project_id": PROJECT_B},
+        {"category": ExpenseCategory.TRAVEL},
+        {"category": ExpenseCategory.OFFICE, "project_id": PROJECT_B},
+        {"from_date": date.today(), "to_date": date.today()},
+    ):
+        _assert_consistent(db, **filters)
+
+
+def test_rebuild_matches_naive_for_date_ranges(db: Session):
+    today = date.today()
+    categories = list(ExpenseCategory)
+    for i in range(60):
+        db.add(Expense(
+            category=categories[i % len(categories)].value,
+            amount=Decimal("10.00") + i,
+            description=f"Import {i}",
+            project_id=(PROJECT_A, PROJECT_B, None)[i % 3],
+            created_at=datetime.combine(today - timedelta(days=i % 20), datetime.min.time()) + timedelta(hours=i % 24),
+        ))
+    db.commit()
+
+    buckets = crud.rebuild_expense_rollup(db)
+    assert buckets == db.scalar(select(func.count(ExpenseDailyRollup.id)))
+
+    for filters in (
+        {},
+        {"from_date": today - timedelta(days=7)},
+        {"to_date": today - timedelta(days=10)},
+        {"from_date": today - timedelta(days=15), "to_date": today - timedelta(days=5)},
+        {"from_date": today - timedelta(days=3), "project_id": PROJECT_B},
+        {"category": categories[0], "to_date": today - timedelta(days=1)},
+    ):
+        _assert_consistent(db, **filters)
+
+
+def test_rebuild_after_incremental_is_identical(db: Session):
+    for i, category in enumerate(ExpenseCategory):
+        _create(db, category, f"{i + 1}.25", (PROJECT_A, None)[i % 2])
+    before = crud.get_expense_kpis(db)
+
+    crud.rebuild_expense_rollup(db)
+    assert crud.get_expense_kpis(db) == before
+
+
+def _buckets(db: Session) -> list[tuple]:
+    return sorted(
+        db.execute(select(
+            ExpenseDailyRollup.category, ExpenseDailyRollup.project_id,
+            ExpenseDailyRollup.total_amount, ExpenseDailyRollup.expense_count,
+        )).all(),
+        key=str,
+    )
+
+
+def test_deleting_project_folds_buckets_into_unassigned(db: Session):
+    from app.modules.backoffice.crm.models import Customer
+    from app.modules.backoffice.projects import crud as project_crud
+    from app.modules.backoffice.projects.models import Project
+
+    customer = Customer(customer_number="KIT-CUS-000001", name="Kunde")
+    db.add(customer)
+    db.flush()
+    project = Project(customer_id=customer.id, title="Projekt")
+    db.add(project)
+    db.commit()
+
+    # Gleicher Tag und gleiche Kategorie wie ein projektloser Bucket
+    _create(db, ExpenseCategory.TRAVEL, "100.00", project.id)
+    _create(db, ExpenseCategory.TRAVEL, "20.00", project.id)
+    _create(db, ExpenseCategory.TRAVEL, "5.00")
+    _create(db, ExpenseCategory.SOFTWARE, "30.00", project.id)
+    _create(db, ExpenseCategory.HARDWARE, "999.00", PROJECT_B)
+
+    assert project_crud.delete_project(db, project.id) is True
+
+    # Ausgaben bleiben ohne Projekt erhalten, ihre Beträge in den NULL-Buckets
+    assert db.scalar(select(func.count(Expense.id)).where(Expense.project_id.is_(None))) == 4
+    assert _buckets(db) == [
+        ("hardware", PROJECT_B, Decimal("999.00"), 1),
+        ("software", None, Decimal("30.00"), 1),
+        ("travel", None, Decimal("125.00"), 3),
+    ]
+    _assert_consistent(db)
+
+    incremental = _buckets(db)
+    crud.rebuild_expense_rollup(db)
+    assert _buckets(db) == incremental
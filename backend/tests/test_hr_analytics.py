@@ -0,0 +1,115 @@
+"""
+Tests für die HR-Kennzahlen (hr.analytics)
+--------------------------------------------
+- Headcount, Urlaub und Recruiting stimmen mit einfachen Zählungen überein
+- Je Abschnitt genau ein Statement, danach aus dem Cache
+- Schreibende CRUD-Funktionen invalidieren ihren Abschnitt
+"""
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.employees.models import Department, Employee
+from app.modules.hr.analytics import crud
+from app.modules.hr.leave.models import LeaveRequest
+from app.modules.hr.recruiting import crud as recruiting_crud
+from app.modules.hr.recruiting.models import Application, JobPosting
+from app.modules.hr.recruiting.schemas import ApplicationCreate, JobPostingCreate
+
+from query_count import count_queries
+
+TABLES = ["departments", "employees", "hr_leave_requests", "hr_job_postings", "hr_applications"]
+
+
+@pytest.fixture()
+def engine(engine):
+    crud.invalidate_hr_analytics()  # Cache ist prozessweit
+    return engine
+
+
+def _seed(db: Session) -> list[Employee]:
+    it, hr, empty = Department(name="IT"), Department(name="HR"), Department(name="Leer")
+    db.add_all([it, hr, empty])
+    db.flush()
+    employees = [
+        Employee(employee_code=f"EMP-{i}", first_name="Test", last_name=str(i), email=f"e{i}@example.com",
+                 department_id=dept.id if dept else None, employment_type=kind, status=status)
+        for i, (dept, kind, status) in enumerate([
+            (it, "fulltime", "active"), (it, "parttime", "active"), (it, "fulltime", "inactive"),
+            (hr, "fulltime", "active"), (None, "intern", "active"),
+        ])
+    ]
+    db.add_all(employees)
+    db.flush()
+
+    today = date.today()
+    for employee, leave_type, status, days, approved_date in [
+        (employees[0], "vacation", "approved", "3", today),
+        (employees[0], "vacation", "pending", "2", None),
+        (employees[1], "sick", "approved", "1.5", today - timedelta(days=400)),
+        (employees[3], "vacation", "rejected", "5", None),
+        (employees[3], "training", "approved", "1", today),
+    ]:
+        start = today if approved_date == today else today.replace(year=today.year - 1)
+        db.add(LeaveRequest(
+            employee_id=employee.id, leave_type=leave_type, status=status, total_days=Decimal(days),
+            start_date=start, end_date=start, approved_date=approved_date,
+        ))
+    db.commit()
+    return employees
+
+
+def _count_statements(engine, fn, db):
+    with count_queries(engine) as statements:
+        result = fn(db)
+    return result, len(statements)
+
+
+def test_sections_single_statement_and_cached(engine, db: Session):
+    _seed(db)
+
+    headcount, count = _count_statements(engine, crud.get_headcount, db)
+    assert count == 1
+    assert (headcount["total"], headcount["active"]) == (5, 4)
+    assert headcount["by_department"] == {"IT": 3, "HR": 1, "Leer": 0}
+    assert headcount["by_employment_type"] == {"fulltime": 3, "parttime": 1, "intern": 1}
+
+    leave, count = _count_statements(engine, crud.get_leave_stats, db)
+    assert count == 1
+    assert leave["total_requests"] == 5
+    assert (leave["pending_requests"], leave["approved_requests"], leave["rejected_requests"]) == (1, 3, 1)
+    assert leave["by_type"] == {"vacation": 3, "sick": 1, "training": 1}
+    assert leave["approved_this_month"] == 2
+    assert leave["total_days_taken_this_year"] == pytest.approx(4.0)
+
+    overview, count = _count_statements(engine, crud.get_overview, db)
+    assert count == 1  # nur recruiting ist noch nicht gecacht
+    assert overview["recruiting"] == {"open_positions": 0, "total_applications": 0, "by_status": {}}
+    assert overview["headcount"] == headcount and overview["leave"] == leave
+    assert _count_statements(engine, crud.get_overview, db)[1] == 0
+
+
+def test_crud_invalidates_section(engine, db: Session):
+    _seed(db)
+    assert crud.get_recruiting_funnel(db)["open_positions"] == 0
+    crud.get_headcount(db)
+
+    posting = recruiting_crud.create_job_posting(db, JobPostingCreate(title="Dev", status="published"))
+    recruiting_crud.create_application(db, ApplicationCreate(
+        job_posting_id=posting.id, first_name="A", last_name="B", email="a@example.com",
+    ))
+    funnel, count = _count_statements(engine, crud.get_recruiting_funnel, db)
+    assert count == 1
+    assert funnel == {
+        "open_positions": 1,
+        "total_applications": db.query(Application).count(),
+        "by_status": {"received": 1},
+    }
+    assert db.query(JobPosting).count() == 1
+    # Headcount bleibt gecacht
+    assert _count_statements(engine, crud.get_headcount, db)[1] == 0
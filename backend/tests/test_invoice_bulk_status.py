@@ -0,0 +1,97 @@
+"""
+Tests für den Bulk-Statuswechsel von Rechnungen (invoices.crud)
+-----------------------------------------------------------------
+- Ergebnis pro ID in angefragter Reihenfolge (Duplikate einmal):
+  geändert, No-op, ungültiger Übergang, unbekannte ID
+- Gültige Wechsel: ein UPDATE, Audit-Einträge nur für echte Änderungen
+- all_or_nothing: bei einem Fehler wird nichts geschrieben
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.crm.models import Customer
+from app.modules.backoffice.invoices import crud
+from app.modules.backoffice.invoices.models import AuditLog, Invoice
+
+from query_count import count_queries
+
+TABLES = [
+    "customers", "invoices", "invoice_line_items", "payments", "audit_logs",
+    "bank_transactions", "reconciliation_candidates",
+]
+
+
+def _seed(db: Session) -> dict[str, uuid.UUID]:
+    customer = Customer(customer_number="KIT-CUS-000001", name="Kunde")
+    db.add(customer)
+    db.flush()
+    invoices = {}
+    for number, status in [("draft1", "draft"), ("draft2", "draft"), ("sent", "sent"), ("paid", "paid")]:
+        invoice = Invoice(
+            invoice_number=f"RE-{number}", customer_id=customer.id, status=status,
+            total=Decimal("100.00"), issued_date=date(2026, 1, 5),
+        )
+        db.add(invoice)
+        db.flush()
+        invoices[number] = invoice.id
+    db.commit()
+    db.expunge_all()
+    return invoices
+
+
+def _statuses(db: Session) -> dict[str, str]:
+    return dict(db.execute(select(Invoice.invoice_number, Invoice.status)).all())
+
+
+def test_results_per_id_and_single_update(db: Session, engine):
+    ids = _seed(db)
+    unknown = uuid.uuid4()
+    requested = [ids["draft1"], ids["sent"], ids["paid"], unknown, ids["draft2"], ids["draft1"]]
+
+    with count_queries(engine) as statements:
+        results = crud.bulk_update_invoice_status(db, requested, "sent", user_id="tester")
+
+    assert [r["invoice_id"] for r in results] == [ids["draft1"], ids["sent"], ids["paid"], unknown, ids["draft2"]]
+    by_id = {r["invoice_id"]: r for r in results}
+    assert by_id[ids["draft1"]] == {
+        "invoice_id": ids["draft1"], "success": True, "changed": True, "old_status": "draft", "error": None,
+    }
+    assert by_id[ids["sent"]]["success"] and not by_id[ids["sent"]]["changed"]
+    assert not by_id[ids["paid"]]["success"] and by_id[ids["paid"]]["old_status"] == "paid"
+    assert by_id[ids["paid"]]["error"]
+    assert by_id[unknown]["error"] == f"Invoice {unknown} not found" and by_id[unknown]["old_status"] is None
+
+    assert _statuses(db) == {"RE-draft1": "sent", "RE-draft2": "sent", "RE-sent": "sent", "RE-paid": "paid"}
+    assert sum(1 for s in statements if s.lstrip().upper().startswith("UPDATE INVOICES")) == 1
+
+    audit = db.execute(select(AuditLog.entity_id, AuditLog.old_values, AuditLog.new_values, AuditLog.user_id)).all()
+    assert sorted(a.entity_id for a in audit) == sorted([ids["draft1"], ids["draft2"]])
+    assert all(a.old_values == {"status": "draft"} and a.new_values == {"status": "sent"} for a in audit)
+    assert {a.user_id for a in audit} == {"tester"}
+
+
+def test_all_or_nothing_applies_nothing_on_error(db: Session):
+    ids = _seed(db)
+
+    results = crud.bulk_update_invoice_status(
+        db, [ids["draft1"], ids["paid"], ids["draft2"]], "sent", all_or_nothing=True,
+    )
+
+    assert [r["success"] for r in results] == [False, False, False]
+    assert not any(r["changed"] for r in results)
+    assert results[0]["error"] == results[2]["error"] == "Not applied: batch aborted (all_or_nothing)"
+    assert results[1]["error"] != results[0]["error"]
+    assert _statuses(db)["RE-draft1"] == "draft"
+    assert db.scalar(select(func.count(AuditLog.id))) == 0
+
+    # Ohne Fehler greift all_or_nothing nicht
+    results = crud.bulk_update_invoice_status(db, [ids["draft1"], ids["draft2"]], "sent", all_or_nothing=True)
+    assert all(r["success"] and r["changed"] for r in results)
+    assert db.scalar(select(func.count(AuditLog.id))) == 2
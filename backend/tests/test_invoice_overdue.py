@@ -0,0 +1,125 @@
+"""
+Tests für den Überfälligkeits-Lauf (invoices.overdue)
+-------------------------------------------------------
+- sweep_overdue setzt nur fällige 'sent'/'partial'-Rechnungen auf 'overdue'
+  und schreibt je Rechnung einen Audit-Eintrag mit dem alten Status
+- Mahnungen: nächste fällige Stufe, nicht doppelt, max. Stufe 3
+- Ohne Advisory Lock (anderer Worker sweept) wird der Lauf übersprungen
+"""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.crm.models import Customer
+from app.modules.backoffice.invoices import overdue
+from app.modules.backoffice.invoices.models import AuditLog, Invoice, InvoiceReminder
+
+TABLES = ["customers", "invoices", "invoice_line_items", "payments", "invoice_reminders", "audit_logs"]
+
+TODAY = date(2026, 3, 1)
+
+
+def _seed(db: Session) -> None:
+    customer = Customer(customer_number="KIT-CUS-000001", name="Kunde")
+    db.add(customer)
+    db.flush()
+    invoices = [
+        ("RE-A", "sent", date(2026, 2, 20), []),           # überfällig, Stufe 1 fällig
+        ("RE-B", "partial", date(2026, 2, 27), []),        # überfällig, noch in der Karenz
+        ("RE-C", "sent", date(2026, 3, 5), []),            # noch nicht fällig
+        ("RE-D", "paid", date(2026, 1, 1), []),            # bezahlt
+        ("RE-E", "overdue", date(2026, 1, 1), [(1, date(2026, 1, 20))]),  # Stufe 2 fällig
+        ("RE-F", "overdue", date(2026, 1, 1), [(3, date(2026, 2, 10))]),  # höchste Stufe
+    ]
+    for number, status, due_date, reminders in invoices:
+        invoice = Invoice(
+            invoice_number=number, customer_id=customer.id, status=status,
+            total=Decimal("100.00"), issued_date=date(2026, 1, 1), due_date=due_date,
+        )
+        db.add(invoice)
+        db.flush()
+        for level, deadline in reminders:
+            db.add(InvoiceReminder(invoice_id=invoice.id, level=level, due_date=deadline))
+    db.commit()
+
+
+def _statuses(db: Session) -> dict[str, str]:
+    return dict(db.execute(select(Invoice.invoice_number, Invoice.status)).all())
+
+
+def _levels(db: Session) -> dict[str, list[int]]:
+    levels: dict[str, list[int]] = {}
+    rows = db.execute(
+        select(Invoice.invoice_number, InvoiceReminder.level)
+        .join(InvoiceReminder, InvoiceReminder.invoice_id == Invoice.id)
+        .order_by(Invoice.invoice_number, InvoiceReminder.level)
+    ).all()
+    for number, level in rows:
+        levels.setdefault(number, []).append(level)
+    return levels
+
+
+def test_sweep_marks_overdue_and_audits(db: Session):
+    _seed(db)
+
+    stats = overdue.sweep_overdue(db, today=TODAY, create_reminders=False)
+
+    assert stats == {"skipped": False, "marked_overdue": 2, "reminders_created": 0}
+    assert _statuses(db) == {
+        "RE-A": "overdue", "RE-B": "overdue", "RE-C": "sent",
+        "RE-D": "paid", "RE-E": "overdue", "RE-F": "overdue",
+    }
+    audit = db.execute(
+        select(Invoice.invoice_number, AuditLog.old_values, AuditLog.new_values, AuditLog.user_id)
+        .join(AuditLog, AuditLog.entity_id == Invoice.id)
+        .order_by(Invoice.invoice_number)
+    ).all()
+    assert [a.invoice_number for a in audit] == ["RE-A", "RE-B"]
+    if db.get_bind().dialect.name == "postgresql":
+        # Alter Status aus dem Subquery-Snapshot (SQLite liefert im RETURNING den neuen Wert)
+        assert [a.old_values["status"] for a in audit] == ["sent", "partial"]
+    assert all(a.new_values == {"status": "overdue"} and a.user_id == overdue.AUDIT_USER for a in audit)
+
+    # Zweiter Lauf am selben Tag ändert nichts
+    assert overdue.sweep_overdue(db, today=TODAY, create_reminders=False)["marked_overdue"] == 0
+    assert db.query(AuditLog).count() == 2
+
+
+def test_sweep_creates_next_due_reminder_level(db: Session):
+    _seed(db)
+
+    stats = overdue.sweep_overdue(db, today=TODAY, create_reminders=True)
+
+    assert stats["reminders_created"] == 2
+    assert _levels(db) == {"RE-A": [1], "RE-E": [1, 2], "RE-F": [3]}
+    reminder = db.scalar(
+        select(InvoiceReminder).join(Invoice).where(Invoice.invoice_number == "RE-E", InvoiceReminder.level == 2)
+    )
+    assert reminder.fee == overdue.DUNNING_FEES[2]
+    assert reminder.due_date == date(2026, 3, 8)
+    assert reminder.sent_at is None
+
+    # Zahlungsfrist der neuen Mahnungen läuft noch: keine weitere Stufe
+    assert overdue.sweep_overdue(db, today=TODAY, create_reminders=True)["reminders_created"] == 0
+    # 09.03.: RE-E Stufe 3, RE-B Stufe 1 (Karenz vorbei); RE-A Stufe 2 erst ab 13.03.
+    assert overdue.sweep_overdue(db, today=date(2026, 3, 9), create_reminders=True)["reminders_created"] == 2
+    assert _levels(db) == {"RE-A": [1], "RE-B": [1], "RE-E": [1, 2, 3], "RE-F": [3]}
+
+
+def test_sweep_skipped_without_advisory_lock(db: Session, monkeypatch):
+    _seed(db)
+    assert overdue._try_lock(db) is True  # SQLite: kein Advisory Lock
+    db.rollback()
+
+    monkeypatch.setattr(overdue, "_try_lock", lambda session: False)
+    stats = overdue.sweep_overdue(db, today=TODAY, create_reminders=True)
+
+    assert stats == {"skipped": True, "marked_overdue": 0, "reminders_created": 0}
+    assert _statuses(db)["RE-A"] == "sent"
+    assert _levels(db) == {"RE-E": [1], "RE-F": [3]}
+    assert db.query(AuditLog).count() == 0
@@ -0,0 +1,119 @@
+"""
+Tests für das Urlaubs-Ledger (hr.leave)
+-----------------------------------------
+- Genehmigung, Stornierung und Korrekturen werden gebucht; der Snapshot
+  (hr_leave_balances) entspricht jederzeit dem nachgespielten Ledger
+- Jahreswechsel: Anspruch laut Policy, Übertrag bis max_carryover_days,
+  idempotent und mit konstanter Anzahl SQL-Statements
+"""
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.employees.models import Employee
+from app.modules.hr.leave import crud, schemas
+from app.modules.hr.leave.models import LeaveBalance, LeavePolicy, LeaveRequest
+
+TABLES = [
+    "employees", "hr_leave_policies", "hr_leave_balances", "hr_leave_ledger",
+    "hr_leave_requests", "hr_absence_calendar", "working_hours_templates",
+]
+SNAPSHOT_FIELDS = (
+    "vacation_total", "vacation_used", "vacation_remaining", "vacation_carryover",
+    "sick_total", "sick_used", "other_total", "other_used",
+)
+
+
+def _employee(db: Session, code: str, status: str = "active") -> Employee:
+    employee = Employee(employee_code=code, first_name="Test", last_name=code, email=f"{code}@example.com", status=status)
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def _request(db: Session, employee: Employee, leave_type: str, start: date, end: date) -> LeaveRequest:
+    leave_request = crud.create_leave_request(
+        db, schemas.LeaveRequestCreate(leave_type=leave_type, start_date=start, end_date=end), employee.id
+    )
+    return crud.approve_leave_request(db, leave_request.id, employee.id)
+
+
+def _snapshot(db: Session, employee: Employee, year: int) -> dict:
+    balance = crud.get_employee_balance(db, employee.id, year)
+    db.refresh(balance)
+    return {name: Decimal(str(getattr(balance, name))) for name in SNAPSHOT_FIELDS}
+
+
+def _assert_matches_ledger(db: Session, employee: Employee, year: int) -> dict:
+    snapshot = _snapshot(db, employee, year)
+    assert snapshot == crud.replay_leave_ledger(crud.get_leave_ledger(db, employee.id, year))
+    return snapshot
+
+
+def test_bookings_keep_snapshot_in_sync(db: Session):
+    employee = _employee(db, "EMP-1")
+    vacation = _request(db, employee, "vacation", date(2026, 3, 2), date(2026, 3, 6))  # 5 Tage
+    _request(db, employee, "sick", date(2026, 3, 9), date(2026, 3, 10))               # 2 Tage
+    _request(db, employee, "training", date(2026, 3, 11), date(2026, 3, 11))          # 1 Tag
+
+    snapshot = _assert_matches_ledger(db, employee, 2026)
+    assert snapshot["vacation_total"] == Decimal("20")
+    assert snapshot["vacation_used"] == Decimal("5")
+    assert snapshot["vacation_remaining"] == Decimal("15")
+    assert (snapshot["sick_used"], snapshot["other_used"]) == (Decimal("2"), Decimal("1"))
+
+    crud.cancel_leave_request(db, vacation.id)
+    balance = crud.get_employee_balance(db, employee.id, 2026)
+    crud.update_leave_balance(db, balance.id, schemas.LeaveBalanceUpdate(vacation_total=Decimal("28")))
+    snapshot = _assert_matches_ledger(db, employee, 2026)
+    assert (snapshot["vacation_total"], snapshot["vacation_used"]) == (Decimal("28"), Decimal("0"))
+
+    ledger = [e for e in crud.get_leave_ledger(db, employee.id, 2026) if e.category == "vacation"]
+    assert [e.entry_type for e in ledger] == ["accrual", "approval", "cancellation", "adjustment"]
+    assert ledger[2].leave_request_id == vacation.id and ledger[2].days == Decimal("-5")
+
+    # Neuberechnung aus dem Ledger ändert nichts
+    crud.refresh_leave_balances(db, 2026)
+    db.commit()
+    assert _snapshot(db, employee, 2026) == snapshot
+
+
+def test_year_rollover(engine, db: Session):
+    policy = LeavePolicy(name="Teilzeit", vacation_days=24, sick_days=8, carryover_allowed=True, max_carryover_days=3)
+    no_carryover = LeavePolicy(name="Ohne Übertrag", vacation_days=30, carryover_allowed=False)
+    db.add_all([policy, no_carryover])
+    db.commit()
+
+    with_policy = _employee(db, "EMP-1")
+    strict = _employee(db, "EMP-2")
+    newcomer = _employee(db, "EMP-3")
+    _employee(db, "EMP-4", status="inactive")
+    crud.initialize_employee_balance(db, with_policy.id, 2026, policy.id)
+    crud.initialize_employee_balance(db, strict.id, 2026, no_carryover.id)
+    _request(db, with_policy, "vacation", date(2026, 3, 2), date(2026, 3, 6))  # 19 Rest, max. 3 übertragbar
+
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    result = crud.rollover_leave_year(db, 2026)
+    assert result == {"employees": 3, "balances_created": 3, "accruals": 6, "carryovers": 1}
+    # SELECT, INSERT Salden, INSERT Ledger, UPDATE Snapshots
+    assert len(statements) == 4
+
+    snapshot = _assert_matches_ledger(db, with_policy, 2027)
+    assert (snapshot["vacation_total"], snapshot["vacation_carryover"]) == (Decimal("27"), Decimal("3"))
+    assert snapshot["sick_total"] == Decimal("8")
+    assert _assert_matches_ledger(db, strict, 2027)["vacation_total"] == Decimal("30")
+    assert _assert_matches_ledger(db, newcomer, 2027)["vacation_total"] == Decimal("20")
+    assert crud.get_employee_balance(db, with_policy.id, 2027).policy_id == policy.id
+
+    # Erneuter Lauf bucht nichts doppelt
+    assert crud.rollover_leave_year(db, 2026) == {
+        "employees": 3, "balances_created": 0, "accruals": 0, "carryovers": 0,
+    }
+    assert _snapshot(db, with_policy, 2027)["vacation_total"] == Decimal("27")
+    assert db.query(LeaveBalance).filter(LeaveBalance.year == 2027).count() == 3
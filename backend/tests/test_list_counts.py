@@ -0,0 +1,145 @@
+"""
+Tests für Listen mit Zählern (Recruiting, Knowledge Base, Support)
+--------------------------------------------------------------------
+- Stellen (Bewerbungen), Kategorien (veröffentlichte Artikel) und Tickets
+  (Kommentare) liefern korrekte Zähler
+- Konstante Anzahl SQL-Statements unabhängig von der Seitengröße (kein N+1)
+- Blättern: gezählt werden nur die Zeilen der angefragten Seite
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.settings.database import get_db
+from app.modules.hr.recruiting import crud as recruiting_crud
+from app.modules.hr.recruiting.models import Application, JobPosting
+from app.modules.hr.recruiting.routes import router as recruiting_router
+from app.modules.knowledge.models import KBArticle, KBCategory
+from app.modules.knowledge.routes import router as knowledge_router
+from app.modules.support import crud as support_crud
+from app.modules.support.models import Ticket, TicketComment
+from app.modules.support.routes import router as support_router
+
+from query_count import assert_constant_queries, count_queries
+
+TABLES = [
+    "departments", "hr_job_postings", "hr_applications",
+    "kb_categories", "kb_articles", "support_tickets", "support_ticket_comments",
+]
+ROWS = 30
+
+
+@pytest.fixture()
+def client(db: Session) -> Generator[TestClient, None, None]:
+    """Nur die betroffenen Router, Test-DB und ein Benutzer mit allen Rechten."""
+    api = FastAPI()
+    for router in (recruiting_router, knowledge_router, support_router):
+        api.include_router(router)
+    api.dependency_overrides[get_db] = lambda: db
+    api.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    with TestClient(api) as c:
+        yield c
+
+
+def _created(i: int) -> datetime:
+    return datetime(2026, 1, 1) + timedelta(hours=i)
+
+
+def test_job_postings_application_counts(engine, db: Session, client: TestClient):
+    for i in range(ROWS):
+        posting = JobPosting(title=f"Stelle {i}", status="published", created_at=_created(i))
+        db.add(posting)
+        db.flush()
+        db.add_all([
+            Application(job_posting_id=posting.id, first_name="A", last_name=str(n), email=f"{i}-{n}@example.com")
+            for n in range(i % 4)
+        ])
+    db.commit()
+
+    items = client.get("/recruiting/jobs", params={"limit": ROWS}).json()["items"]
+    assert {item["title"]: item["application_count"] for item in items} == {
+        f"Stelle {i}": i % 4 for i in range(ROWS)
+    }
+    # COUNT für total + eine Listen-Query
+    assert_constant_queries(engine, lambda n: client.get("/recruiting/jobs", params={"limit": n}), expected=2)
+
+
+def test_ticket_comment_counts(engine, db: Session, client: TestClient):
+    for i in range(ROWS):
+        ticket = Ticket(ticket_number=f"TKT-{i:05d}", title=f"Ticket {i}", created_at=_created(i))
+        db.add(ticket)
+        db.flush()
+        db.add_all([TicketComment(ticket_id=ticket.id, content="x") for _ in range(i % 3)])
+    db.commit()
+
+    items = client.get("/api/support/tickets", params={"limit": ROWS}).json()["items"]
+    assert {item["ticket_number"]: item["comment_count"] for item in items} == {
+        f"TKT-{i:05d}": i % 3 for i in range(ROWS)
+    }
+    assert_constant_queries(engine, lambda n: client.get("/api/support/tickets", params={"limit": n}), expected=2)
+
+
+def test_paged_counts_are_scoped_to_the_page(engine, db: Session):
+    for i in range(ROWS):
+        posting = JobPosting(title=f"Stelle {i}", status="published", created_at=_created(i // 2))
+        ticket = Ticket(ticket_number=f"TKT-{i:05d}", title=f"Ticket {i}", created_at=_created(i // 2))
+        db.add_all([posting, ticket])
+        db.flush()
+        db.add_all([
+            Application(job_posting_id=posting.id, first_name="A", last_name=str(n), email=f"{i}-{n}@example.com")
+            for n in range(i % 4)
+        ])
+        db.add_all([TicketComment(ticket_id=ticket.id, content="x") for _ in range(i % 3)])
+    db.commit()
+
+    for fetch, expected in (
+        (recruiting_crud.get_job_postings, {f"Stelle {i}": i % 4 for i in range(ROWS)}),
+        (support_crud.get_tickets, {f"Ticket {i}": i % 3 for i in range(ROWS)}),
+    ):
+        full, total = fetch(db, limit=ROWS)
+        paged = []
+        for skip in range(0, ROWS, 7):
+            with count_queries(engine) as statements:
+                rows, _ = fetch(db, skip=skip, limit=7)
+            # Die Zähl-Subquery ist auf die Seite (LIMIT) eingeschränkt
+            assert statements[-1].count("LIMIT") == 2
+            paged.extend(rows)
+        # Gleiche created_at-Werte: die ID entscheidet, keine Lücken/Duplikate
+        assert [row.id for row, _ in paged] == [row.id for row, _ in full]
+        assert total == ROWS
+        assert {row.title: count for row, count in paged} == expected
+
+
+def test_category_article_counts(engine, db: Session, client: TestClient):
+    def _add_categories(start: int, stop: int) -> None:
+        for i in range(start, stop):
+            category = KBCategory(name=f"Kategorie {i}", slug=f"kategorie-{i}", order=i)
+            db.add(category)
+            db.flush()
+            db.add_all([
+                KBArticle(category_id=category.id, title="Artikel", slug=f"artikel-{i}-{n}",
+                          status="published" if n % 2 == 0 else "draft")
+                for n in range(i % 5)
+            ])
+        db.commit()
+
+    _add_categories(0, 3)
+    with count_queries(engine) as few:
+        client.get("/api/kb/categories")
+    _add_categories(3, ROWS)
+    with count_queries(engine) as many:
+        categories = client.get("/api/kb/categories").json()
+    assert len(few) == len(many) == 1
+
+    # Veröffentlicht: n = 0, 2, 4 < i % 5
+    assert {c["slug"]: c["article_count"] for c in categories} == {
+        f"kategorie-{i}": len(range(0, i % 5, 2)) for i in range(ROWS)
+    }
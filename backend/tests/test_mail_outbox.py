@@ -0,0 +1,246 @@
+"""
+Tests für die Mail-Outbox (core.email.outbox)
+-----------------------------------------------
+Gegen einen lokalen SMTP-Sink (Thread, socketserver):
+- EmailService legt Nachrichten nur ab, der Worker versendet sie im Batch
+  über eine gepoolte Verbindung
+- Domain-Rate-Limit verschiebt, 4xx wird mit Backoff wiederholt,
+  5xx landet auf 'failed' und lässt sich erneut anstoßen
+- Mehrere Empfänger-Domains: ein Eintrag je Domain, jede gegen ihr Limit
+- Erneut anstoßen per ID lässt 'sending' (Lease) und 'sent' unverändert
+- Nicht erreichbarer Server: Wiederholung statt Fehler im Request
+"""
+from __future__ import annotations
+
+import asyncio
+import socket
+import socketserver
+import threading
+from datetime import datetime, timezone
+from typing import Generator
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.email import outbox
+from app.core.email.service import EmailService
+from app.core.email.smtp_pool import SMTPConnectionPool
+from app.core.settings.config import settings
+from app.modules.admin.models import MailOutbox, MailOutboxStatus, SystemSettings
+from app.modules.admin.service import invalidate_system_settings_cache
+
+TABLES = ["system_settings", "mail_outbox"]
+
+
+class _SinkHandler(socketserver.StreamRequestHandler):
+    """Minimaler SMTP-Server: nimmt alles an außer konfigurierten Empfängern."""
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        sink = self.server
+        sink.connections += 1
+        self._reply("220 sink ESMTP")
+        sender, recipients = None, []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode().strip()
+            verb = command[:4].upper()
+            if verb in ("EHLO", "HELO"):
+                self._reply("250-sink")
+                self._reply("250 8BITMIME")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip("<> "), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip("<> ")
+                if address in sink.reject:
+                    self._reply(sink.reject[address])
+                else:
+                    recipients.append(address)
+                    self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    lines.append(line)
+                sink.messages.append((sender, recipients, b"".join(lines)))
+                self._reply("250 queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("502 not implemented")
+
+
+class _Sink(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SinkHandler)
+        self.connections = 0
+        self.messages: list[tuple[str, list[str], bytes]] = []
+        self.reject: dict[str, str] = {}
+
+
+@pytest.fixture()
+def sink() -> Generator[_Sink, None, None]:
+    server = _Sink()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def pool() -> Generator[SMTPConnectionPool, None, None]:
+    pool = SMTPConnectionPool()
+    yield pool
+    pool.close_all()
+
+
+def _configure(db: Session, port: int) -> None:
+    db.add(SystemSettings(
+        email_enabled=True, smtp_host="127.0.0.1", smtp_port=port,
+        smtp_from_email="noreply@workmate.test", smtp_from_name="Workmate",
+        smtp_use_tls=False, smtp_use_ssl=False,
+    ))
+    db.commit()
+    invalidate_system_settings_cache()
+
+
+def _send(db: Session, to: str, subject: str = "Hallo") -> bool:
+    return asyncio.run(EmailService(db).send_email([to], subject, "Text", html_body="<p>Text</p>"))
+
+
+def _by_recipient(db: Session) -> dict[str, MailOutbox]:
+    return {entry.recipients[0]: entry for entry in db.scalars(select(MailOutbox))}
+
+
+def test_queued_mail_is_sent_in_batches_over_pooled_connection(db: Session, sink: _Sink, pool):
+    _configure(db, sink.server_address[1])
+
+    for i in range(5):
+        assert _send(db, f"user{i}@kunde{i % 2}.test", subject=f"Nachricht {i}")
+    assert sink.messages == []  # Request versendet nicht selbst
+    assert db.scalar(select(MailOutbox.status).limit(1)) == MailOutboxStatus.PENDING.value
+
+    stats = outbox.drain_outbox(db, pool=pool)
+    assert stats == {"sent": 5, "retried": 0, "failed": 0, "deferred": 0}
+    assert len(sink.messages) == 5
+    assert sink.connections == 1
+    sender, recipients, data = sink.messages[0]
+    assert sender == "noreply@workmate.test"
+    assert b"Subject: Nachricht" in data
+
+    # Nächster Batch nutzt die Verbindung aus dem Pool
+    _send(db, "spaeter@kunde0.test")
+    assert outbox.drain_outbox(db, pool=pool)["sent"] == 1
+    assert sink.connections == 1 and pool.connects == 1
+
+    assert all(entry.status == MailOutboxStatus.SENT.value and entry.attempts == 1
+               for entry in _by_recipient(db).values())
+    metrics = outbox.get_outbox_metrics(db)
+    assert metrics["by_status"]["sent"] == 6
+    assert metrics["lag_seconds"] == 0.0
+
+
+def test_rate_limit_retry_and_permanent_failure(db: Session, sink: _Sink, pool, monkeypatch):
+    _configure(db, sink.server_address[1])
+    monkeypatch.setattr(settings, "MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE", 2)
+    sink.reject["voll@b.test"] = "452 mailbox full"
+    sink.reject["unbekannt@b.test"] = "550 no such user"
+
+    for to in ("a1@a.test", "a2@a.test", "a3@a.test", "voll@b.test", "unbekannt@b.test"):
+        _send(db, to)
+
+    stats = outbox.drain_outbox(db, pool=pool)
+    assert stats == {"sent": 2, "retried": 1, "failed": 1, "deferred": 1}
+    entries = _by_recipient(db)
+    deferred = entries["a3@a.test"]
+    assert deferred.status == MailOutboxStatus.PENDING.value and deferred.attempts == 0
+    assert entries["voll@b.test"].attempts == 1
+    assert "452" in entries["voll@b.test"].last_error
+    assert entries["unbekannt@b.test"].status == MailOutboxStatus.FAILED.value
+
+    # Nichts fällig: Backoff bzw. Rate-Limit-Fenster laufen noch
+    assert not any(outbox.drain_outbox(db, pool=pool).values())
+
+    sink.reject.clear()
+    assert outbox.retry_messages(db) == 1  # nur 'failed'
+    assert outbox.drain_outbox(db, pool=pool)["sent"] == 1
+    assert _by_recipient(db)["unbekannt@b.test"].status == MailOutboxStatus.SENT.value
+    assert len(sink.messages) == 3
+
+
+def test_each_recipient_domain_counts_against_its_limit(db: Session, sink: _Sink, pool, monkeypatch):
+    _configure(db, sink.server_address[1])
+    monkeypatch.setattr(settings, "MAIL_DOMAIN_RATE_LIMIT_PER_MINUTE", 1)
+
+    assert asyncio.run(EmailService(db).send_email(
+        ["a1@a.test", "b1@b.test"], "Hallo", "Text", cc_emails=["a2@A.test"],
+    ))
+    entries = {entry.recipient_domain: entry.recipients for entry in db.scalars(select(MailOutbox))}
+    assert entries == {"a.test": ["a1@a.test", "a2@A.test"], "b.test": ["b1@b.test"]}
+    assert outbox.drain_outbox(db, pool=pool)["sent"] == 2
+    assert sorted(recipients for _, recipients, _ in sink.messages) == [["a1@a.test", "a2@A.test"], ["b1@b.test"]]
+
+    # b.test ist ausgeschöpft, auch als zweiter Empfänger neben c.test
+    _send(db, "neu@b.test")
+    assert asyncio.run(EmailService(db).send_email(["c1@c.test", "b2@b.test"], "Hallo", "Text"))
+    stats = outbox.drain_outbox(db, pool=pool)
+    assert stats == {"sent": 1, "retried": 0, "failed": 0, "deferred": 2}
+    assert sink.messages[-1][1] == ["c1@c.test"]
+
+
+def test_retry_by_id_skips_sending_and_sent(db: Session):
+    entries = {}
+    for status in MailOutboxStatus:
+        entry = MailOutbox(
+            account="system", sender="noreply@workmate.test", recipients=[f"{status.value}@a.test"],
+            recipient_domain="a.test", subject="Hallo", message=b"Text",
+            status=status.value, attempts=3, last_error="452",
+        )
+        db.add(entry)
+        entries[status] = entry
+    db.commit()
+
+    assert outbox.retry_messages(db, [entry.id for entry in entries.values()]) == 2
+    db.expire_all()
+    assert {s: (e.status, e.attempts) for s, e in entries.items()} == {
+        MailOutboxStatus.PENDING: ("pending", 0),
+        MailOutboxStatus.FAILED: ("pending", 0),
+        MailOutboxStatus.SENDING: ("sending", 3),  # gehört unter Lease einem Worker
+        MailOutboxStatus.SENT: ("sent", 3),
+    }
+
+
+def test_unreachable_server_is_retried(db: Session, pool):
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]  # danach geschlossen – Verbindung wird abgelehnt
+    _configure(db, port)
+
+    assert _send(db, "a@a.test") and _send(db, "b@a.test")
+    stats = outbox.drain_outbox(db, pool=pool)
+    assert stats["retried"] == 2 and stats["sent"] == 0
+
+    entry = db.scalars(select(MailOutbox)).first()
+    assert entry.status == MailOutboxStatus.PENDING.value
+    next_attempt = entry.next_attempt_at.replace(tzinfo=timezone.utc)
+    assert next_attempt > datetime.now(timezone.utc)
+
+    # Deaktivierter Versand: nichts wird eingereiht
+    db.scalar(select(SystemSettings)).email_enabled = False
+    db.commit()
+    invalidate_system_settings_cache()
+    assert _send(db, "c@a.test") is False
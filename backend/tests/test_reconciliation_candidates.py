@@ -0,0 +1,118 @@
+"""
+Tests für den Vorschlags-Cache des Zahlungsabgleichs (finance.reconciliation)
+-------------------------------------------------------------------------------
+- CSV-Import füllt den Cache für neue Transaktionen – mit und ohne Auto-Abgleich
+- Änderungen an Rechnungen aktualisieren die betroffenen Transaktionen
+- Vorschläge einer unbekannten Transaktion: 404
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.database import get_db
+from app.modules.backoffice.crm.models import Customer
+from app.modules.backoffice.finance import reconciliation
+from app.modules.backoffice.finance.csv_import import import_transactions
+from app.modules.backoffice.finance.models import BankAccount, BankTransaction, ReconciliationCandidate
+from app.modules.backoffice.finance.routes import router
+from app.modules.backoffice.finance.schemas import BankTransactionCreate
+from app.modules.backoffice.invoices.models import Invoice
+
+TABLES = [
+    "customers", "invoices", "invoice_line_items", "payments",
+    "bank_accounts", "bank_transactions", "reconciliation_candidates",
+]
+
+
+def _seed(db: Session) -> tuple[BankAccount, Invoice]:
+    customer = Customer(customer_number="KIT-CUS-000001", name="Kunde")
+    account = BankAccount(account_name="Geschäftskonto")
+    db.add_all([customer, account])
+    db.flush()
+    invoice = Invoice(
+        invoice_number="RE-2026-0001", customer_id=customer.id, status="sent",
+        total=Decimal("100.00"), issued_date=date(2026, 1, 5),
+    )
+    db.add(invoice)
+    db.commit()
+    return account, invoice
+
+
+def _transaction(account: BankAccount, amount: str, purpose: str, reference: str) -> BankTransactionCreate:
+    return BankTransactionCreate(
+        account_id=account.id, transaction_date=date(2026, 1, 8), amount=Decimal(amount),
+        transaction_type="income", purpose=purpose, reference=reference,
+    )
+
+
+def _candidates(db: Session, reference: str) -> list[tuple[str, int]]:
+    return db.execute(
+        select(Invoice.invoice_number, ReconciliationCandidate.rank)
+        .join(ReconciliationCandidate, ReconciliationCandidate.invoice_id == Invoice.id)
+        .join(BankTransaction, BankTransaction.id == ReconciliationCandidate.transaction_id)
+        .where(BankTransaction.reference == reference)
+    ).all()
+
+
+def test_import_without_auto_reconcile_fills_cache(db: Session):
+    account, _ = _seed(db)
+
+    stats = import_transactions(db, [
+        _transaction(account, "100.50", "Zahlung RE-2026-0001", "T1"),
+        _transaction(account, "999.00", "Miete", "T2"),
+        _transaction(account, "100.50", "Doppelt", "T1"),
+    ], auto_reconcile=False)
+
+    assert stats["imported"] == 2 and stats["skipped"] == 1 and stats["reconciled"] == 0
+    assert _candidates(db, "T1") == [("RE-2026-0001", 1)]
+    assert _candidates(db, "T2") == []
+    assert db.scalar(select(BankTransaction.reconciliation_status).where(BankTransaction.reference == "T1")) == "unmatched"
+
+
+def test_import_with_auto_reconcile_keeps_low_confidence_suggestions(db: Session):
+    account, _ = _seed(db)
+
+    stats = import_transactions(db, [
+        _transaction(account, "100.50", "Zahlung RE-2026-0001", "T1"),  # Nummer + Toleranz, < 90 %
+    ], auto_reconcile=True)
+
+    assert stats["imported"] == 1 and stats["reconciled"] == 0
+    assert _candidates(db, "T1") == [("RE-2026-0001", 1)]
+
+
+def test_invoice_change_refreshes_affected_transactions(db: Session):
+    account, invoice = _seed(db)
+    import_transactions(db, [_transaction(account, "250.00", "Sammelzahlung", "T1")], auto_reconcile=False)
+    assert _candidates(db, "T1") == []
+
+    # Betrag der Rechnung passt jetzt ins Toleranzfenster
+    invoice.total = Decimal("250.00")
+    assert reconciliation.refresh_candidates_for_invoice(db, invoice.id) == 1
+    db.commit()
+    assert _candidates(db, "T1") == [("RE-2026-0001", 1)]
+
+
+def test_suggestions_for_unknown_transaction_return_404(db: Session):
+    account, _ = _seed(db)
+    import_transactions(db, [_transaction(account, "100.50", "RE-2026-0001", "T1")], auto_reconcile=False)
+    transaction_id = db.scalar(select(BankTransaction.id))
+
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    response = client.get(f"/backoffice/finance/bank-transactions/{transaction_id}/suggestions")
+    assert response.status_code == 200
+    assert [s["invoice_number"] for s in response.json()] == ["RE-2026-0001"]
+    assert client.get(f"/backoffice/finance/bank-transactions/{uuid.uuid4()}/suggestions").status_code == 404
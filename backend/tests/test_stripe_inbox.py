@@ -0,0 +1,155 @@
+"""
+Tests für die Stripe-Webhook-Inbox (finance.stripe_inbox)
+-----------------------------------------------------------
+- store_event dedupliziert über die Stripe Event ID, unbekannte Typen
+  werden direkt 'ignored'
+- drain_inbox gruppiert pro Rechnung: eine Zahlung pro PaymentIntent,
+  ein Fehler betrifft nur die Events seiner Rechnung
+- Fehlgeschlagene Events lassen sich per replay_events erneut verarbeiten
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.crm.models import Customer
+from app.modules.backoffice.finance import stripe_inbox
+from app.modules.backoffice.finance.models import StripeEvent, StripeEventStatus
+from app.modules.backoffice.invoices.models import Invoice, Payment
+
+TABLES = [
+    "customers", "invoices", "invoice_line_items", "payments",
+    "bank_transactions", "reconciliation_candidates", "stripe_events",
+]
+
+
+def _invoice(db: Session, number: str, total: str = "100.00") -> Invoice:
+    customer = Customer(customer_number=f"KIT-CUS-{number}", name=f"Kunde {number}")
+    db.add(customer)
+    db.flush()
+    invoice = Invoice(
+        invoice_number=number, customer_id=customer.id, status="sent",
+        total=Decimal(total), issued_date=date(2026, 1, 5),
+    )
+    db.add(invoice)
+    db.commit()
+    return invoice
+
+
+def _event(event_id: str, event_type: str, invoice_id: uuid.UUID | None, created: int, **obj) -> dict:
+    metadata = {"invoice_id": str(invoice_id)} if invoice_id else {}
+    return {
+        "id": event_id,
+        "type": event_type,
+        "created": created,
+        "data": {"object": {"metadata": metadata, **obj}},
+    }
+
+
+def _status(db: Session, event_id: str) -> str:
+    return db.scalar(select(StripeEvent.status).where(StripeEvent.event_id == event_id))
+
+
+def test_store_event_dedupes_and_ignores_unknown_types(db: Session):
+    event = _event("evt_1", "payment_intent.succeeded", None, 1_767_600_000, id="pi_1", amount=1000)
+
+    assert stripe_inbox.store_event(db, event) is True
+    assert stripe_inbox.store_event(db, event) is False  # Stripe-Retry
+    assert stripe_inbox.store_event(db, _event("evt_2", "customer.created", None, 1_767_600_001)) is True
+
+    assert db.scalar(select(func.count(StripeEvent.id))) == 2
+    assert _status(db, "evt_1") == StripeEventStatus.PENDING.value
+    assert _status(db, "evt_2") == StripeEventStatus.IGNORED.value
+
+
+def test_drain_groups_events_per_invoice(db: Session):
+    first = _invoice(db, "RE-2026-0001")
+    second = _invoice(db, "RE-2026-0002", total="50.00")
+    events = [
+        _event("evt_1", "payment_intent.succeeded", first.id, 1_767_600_000, id="pi_1", amount=6000),
+        # Zweites Event zum selben PaymentIntent: keine zweite Zahlung
+        _event("evt_2", "payment_intent.succeeded", first.id, 1_767_600_001, id="pi_1", amount=6000),
+        _event("evt_3", "payment_intent.succeeded", second.id, 1_767_600_002, id="pi_2", amount=5000),
+        _event("evt_4", "invoice.payment_succeeded", first.id, 1_767_600_003),
+        _event("evt_5", "payment_intent.payment_failed", None, 1_767_600_004, id="pi_3"),
+    ]
+    for event in events:
+        stripe_inbox.store_event(db, event)
+
+    stats = stripe_inbox.drain_inbox(db)
+    assert stats == {"processed": 5, "failed": 0, "retried": 0, "invoices": 2}
+
+    payments = db.execute(select(Payment.invoice_id, Payment.reference, Payment.amount)).all()
+    assert sorted((p.reference, p.amount) for p in payments) == [
+        ("pi_1", Decimal("60.00")), ("pi_2", Decimal("50.00")),
+    ]
+    db.expire_all()
+    assert db.get(Invoice, first.id).status == "paid"
+    assert db.get(Invoice, second.id).status == "paid"
+
+    # Nichts mehr fällig
+    assert not any(stripe_inbox.drain_inbox(db).values())
+
+
+def test_failed_group_is_isolated_and_can_be_replayed(db: Session, monkeypatch):
+    good = _invoice(db, "RE-2026-0001")
+    bad = _invoice(db, "RE-2026-0002")
+    stripe_inbox.store_event(db, _event("evt_ok", "payment_intent.succeeded", good.id, 1_767_600_000,
+                                        id="pi_ok", amount=10000))
+    stripe_inbox.store_event(db, _event("evt_bad", "payment_intent.succeeded", bad.id, 1_767_600_001,
+                                        id="pi_bad", amount="kaputt"))
+
+    monkeypatch.setattr(stripe_inbox, "MAX_ATTEMPTS", 1)
+    stats = stripe_inbox.drain_inbox(db)
+    assert stats == {"processed": 1, "failed": 1, "retried": 0, "invoices": 1}
+    assert _status(db, "evt_ok") == StripeEventStatus.PROCESSED.value
+    assert _status(db, "evt_bad") == StripeEventStatus.FAILED.value
+    assert db.scalar(select(func.count(Payment.id))) == 1
+
+    # Replay ohne IDs setzt nur 'failed' zurück
+    assert stripe_inbox.replay_events(db) == 1
+    failed = db.scalar(select(StripeEvent).where(StripeEvent.event_id == "evt_bad"))
+    assert failed.status == StripeEventStatus.PENDING.value and failed.attempts == 0
+    assert failed.last_error is None
+
+    # Nach Korrektur des Payloads wird das Event verbucht
+    payload = dict(failed.payload)
+    payload["data"] = {"object": {**payload["data"]["object"], "amount": 10000}}
+    failed.payload = payload
+    db.commit()
+    assert stripe_inbox.drain_inbox(db)["processed"] == 1
+    assert db.scalar(select(func.count(Payment.id))) == 2
+
+    # Replay einzelner IDs (z.B. bereits verarbeitete Events)
+    assert stripe_inbox.replay_events(db, ["evt_ok"]) == 1
+    assert stripe_inbox.drain_inbox(db)["processed"] == 1
+    assert db.scalar(select(func.count(Payment.id))) == 2  # PaymentIntent bereits verbucht
+
+
+def test_failed_group_does_not_mark_payment_intent_as_booked(db: Session, monkeypatch):
+    first = _invoice(db, "RE-2026-0001")
+    second = _invoice(db, "RE-2026-0002")
+    # Derselbe PaymentIntent taucht (z.B. nach Umbuchung) bei zwei Rechnungen auf
+    stripe_inbox.store_event(db, _event("evt_1", "payment_intent.succeeded", first.id, 1_767_600_000,
+                                        id="pi_1", amount=10000))
+    stripe_inbox.store_event(db, _event("evt_2", "payment_intent.succeeded", second.id, 1_767_600_001,
+                                        id="pi_1", amount=10000))
+
+    refresh = stripe_inbox.reconciliation.refresh_candidates_for_invoice
+
+    def failing_refresh(session, invoice_id):
+        if invoice_id == first.id:
+            raise RuntimeError("boom")
+        return refresh(session, invoice_id)
+
+    monkeypatch.setattr(stripe_inbox.reconciliation, "refresh_candidates_for_invoice", failing_refresh)
+    stats = stripe_inbox.drain_inbox(db)
+
+    assert stats == {"processed": 1, "failed": 0, "retried": 1, "invoices": 1}
+    payments = db.execute(select(Payment.invoice_id, Payment.reference)).all()
+    assert [(p.invoice_id, p.reference) for p in payments] == [(second.id, "pi_1")]
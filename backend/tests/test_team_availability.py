@@ -0,0 +1,167 @@
+"""
+Tests für die Team-Verfügbarkeits-Matrix (hr.leave)
+-----------------------------------------------------
+- Lauflängen-Kodierung und verfügbare Personen je Tag stimmen mit dem
+  Abwesenheitskalender überein, gefiltert nach Abteilung
+- Eine Query für alle fehlenden Monate, danach aus dem Cache
+- Genehmigen (Materialisieren) und Stornieren invalidieren die Monate,
+  Änderungen an Mitarbeitern den ganzen Cache
+- Endpoint /leave/calendar/matrix
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.auth.auth import get_current_user
+from app.core.database import get_db
+from app.modules.employees import crud as employee_crud
+from app.modules.employees.models import Employee
+from app.modules.employees.schemas import EmployeeUpdate
+from app.modules.hr.enums import LeaveStatus
+from app.modules.hr.leave import availability, crud
+from app.modules.hr.leave.models import LeaveRequest
+from app.modules.hr.leave.routes import router
+
+TABLES = [
+    "departments", "employees", "hr_leave_requests", "hr_leave_balances",
+    "hr_absence_calendar", "working_hours_templates",
+]
+DEPARTMENT = uuid.uuid4()
+OTHER_DEPARTMENT = uuid.uuid4()
+
+
+@pytest.fixture()
+def engine(engine):
+    with engine.begin() as conn:
+        # roles nutzt JSONB – nur die Spalten für joinedload(Employee.role)
+        conn.execute(text(
+            "CREATE TABLE roles (id CHAR(32) PRIMARY KEY, name TEXT, description TEXT, "
+            "keycloak_id TEXT, permissions_json TEXT)"
+        ))
+    availability.invalidate_team_availability(None)  # Cache ist prozessweit
+    return engine
+
+
+def _employee(db: Session, code: str, last_name: str, department_id) -> Employee:
+    employee = Employee(
+        employee_code=code, first_name="Test", last_name=last_name,
+        email=f"{code}@example.com", department_id=department_id,
+    )
+    db.add(employee)
+    db.commit()
+    return employee
+
+
+def _approve(db: Session, employee: Employee, start: date, end: date, **kwargs) -> LeaveRequest:
+    leave_request = LeaveRequest(
+        employee_id=employee.id, leave_type="vacation", start_date=start, end_date=end,
+        total_days=Decimal(1), status=LeaveStatus.APPROVED.value, approved_date=start, **kwargs,
+    )
+    db.add(leave_request)
+    db.commit()
+    crud.create_absence_calendar_entries(db, leave_request)
+    return leave_request
+
+
+def test_matrix_runs_and_counts(db: Session):
+    anna = _employee(db, "EMP-1", "Adler", DEPARTMENT)
+    bernd = _employee(db, "EMP-2", "Berg", DEPARTMENT)
+    other = _employee(db, "EMP-3", "Christ", OTHER_DEPARTMENT)
+    # Mo 27.04. – Mi 06.05.2026: Wochenende und 1. Mai fallen heraus, halber Tag am Ende
+    _approve(db, anna, date(2026, 4, 27), date(2026, 5, 6), half_day_end=True)
+    _approve(db, other, date(2026, 4, 28), date(2026, 4, 28))
+
+    matrix = availability.get_team_availability(db, date(2026, 4, 27), date(2026, 5, 10), DEPARTMENT)
+    assert matrix["days"] == 14
+    assert matrix["headcount"] == 2
+    assert matrix["working_days"] == "11110" + "00" + "11111" + "00"
+    assert [row["employee_id"] for row in matrix["employees"]] == [anna.id, bernd.id]
+
+    assert matrix["employees"][0]["absences"] == [
+        {"start": 0, "length": 4, "leave_type": "vacation", "full_day": True},   # 27.–30.04.
+        {"start": 7, "length": 2, "leave_type": "vacation", "full_day": True},   # 04.–05.05.
+        {"start": 9, "length": 1, "leave_type": "vacation", "full_day": False},  # 06.05. halb
+    ]
+    assert matrix["employees"][1]["absences"] == []
+    assert matrix["absent"] == [1, 1, 1, 1, 0, 0, 0, 1, 1, 0, 0, 0, 0, 0]
+    assert matrix["available"] == [2 - n for n in matrix["absent"]]
+
+    everyone = availability.get_team_availability(db, date(2026, 4, 28), date(2026, 4, 28))
+    assert everyone["headcount"] == 3
+    assert everyone["absent"] == [2]
+
+
+def test_cached_per_month_and_invalidated(engine, db: Session):
+    anna = _employee(db, "EMP-1", "Adler", DEPARTMENT)
+    statements: list[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    def _query_count(start: date, end: date) -> tuple[int, dict]:
+        statements.clear()
+        matrix = availability.get_team_availability(db, start, end, DEPARTMENT)
+        return len(statements), matrix
+
+    # Drei Monate, eine Query – danach alles aus dem Cache
+    count, matrix = _query_count(date(2026, 6, 1), date(2026, 8, 31))
+    assert count == 1
+    assert matrix["absent"] == [0] * 92
+    assert _query_count(date(2026, 6, 15), date(2026, 7, 15))[0] == 0
+
+    # Genehmigung im Juli invalidiert nur Juli
+    leave_request = _approve(db, anna, date(2026, 7, 6), date(2026, 7, 7))
+    count, matrix = _query_count(date(2026, 6, 1), date(2026, 8, 31))
+    assert count == 1
+    assert matrix["employees"][0]["absences"] == [
+        {"start": 35, "length": 2, "leave_type": "vacation", "full_day": True},
+    ]
+
+    crud.cancel_leave_request(db, leave_request.id)
+    _, matrix = _query_count(date(2026, 7, 1), date(2026, 7, 31))
+    assert matrix["absent"] == [0] * 31
+
+
+def test_employee_changes_invalidate_cache(db: Session):
+    anna = _employee(db, "EMP-1", "Adler", DEPARTMENT)
+    bernd = _employee(db, "EMP-2", "Berg", DEPARTMENT)
+    day = date(2026, 5, 4)
+
+    def _names(department_id) -> list[str]:
+        matrix = availability.get_team_availability(db, day, day, department_id)
+        return [row["name"] for row in matrix["employees"]]
+
+    assert _names(DEPARTMENT) == ["Test Adler", "Test Berg"]
+    assert _names(OTHER_DEPARTMENT) == []
+
+    employee_crud.update_employee(db, bernd.id, EmployeeUpdate(department_id=OTHER_DEPARTMENT))
+    assert _names(DEPARTMENT) == ["Test Adler"]
+    assert _names(OTHER_DEPARTMENT) == ["Test Berg"]
+
+    employee_crud.delete_employee(db, anna.id)
+    assert _names(DEPARTMENT) == []
+    assert _names(None) == ["Test Berg"]
+
+
+def test_matrix_endpoint(db: Session):
+    _employee(db, "EMP-1", "Adler", DEPARTMENT)
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_user] = lambda: {"id": "tester", "permissions": ["*"]}
+    client = TestClient(app)
+
+    response = client.get("/leave/calendar/matrix", params={"date_from": "2026-05-04", "date_to": "2026-05-10"})
+    assert response.status_code == 200
+    assert response.json()["headcount"] == 1
+    assert response.json()["working_days"] == "1111100"
+
+    too_long = client.get("/leave/calendar/matrix", params={"date_from": "2026-01-01", "date_to": "2026-06-30"})
+    assert too_long.status_code == 400
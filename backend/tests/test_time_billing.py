@@ -0,0 +1,108 @@
+"""
+Tests für die Abrechnung von Zeiteinträgen
+--------------------------------------------
+- get_billable_uninvoiced: Projektion inkl. Summen aus SQL entspricht der
+  Berechnung über die ORM-Objekte
+- _claim_entries: Einträge werden genau einmal als abgerechnet markiert,
+  ein zweiter Versuch scheitert mit 422 bzw. 404 ohne Seiteneffekte
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.projects.models import Project
+from app.modules.backoffice.time_tracking import crud
+from app.modules.backoffice.time_tracking.models import TimeEntry
+from app.modules.employees.models import Employee
+
+TABLES = ["employees", "projects", "time_entries"]
+START = datetime(2026, 3, 2, 9, 0)
+
+
+def _seed(db: Session) -> dict:
+    employee = Employee(
+        employee_code="EMP-1", first_name="Erika", last_name="Muster", email="erika@example.com",
+    )
+    customer_a, customer_b = uuid.uuid4(), uuid.uuid4()
+    project = Project(title="Portal", customer_id=customer_a)
+    db.add_all([employee, project])
+    db.flush()
+
+    def _entry(minutes, **kwargs):
+        entry = TimeEntry(
+            employee_id=employee.id,
+            start_time=START + timedelta(hours=len(db.new)),
+            duration_minutes=minutes,
+            hourly_rate=Decimal("90.00"),
+            **kwargs,
+        )
+        db.add(entry)
+        return entry
+
+    entries = {
+        "project": _entry(90, project_id=project.id, billable=True, task_type="development"),
+        "direct": _entry(45, customer_id=customer_b, billable=True, task_type="support"),
+        "override": _entry(30, project_id=project.id, customer_id=customer_b, billable=True),
+        "non_billable": _entry(60, project_id=project.id, billable=False),
+        "invoiced": _entry(60, project_id=project.id, billable=True, is_invoiced=True),
+    }
+    db.commit()
+    return {"customer_a": customer_a, "customer_b": customer_b, "project": project, **entries}
+
+
+def test_billable_uninvoiced_projection(db: Session):
+    data = _seed(db)
+
+    report = crud.get_billable_uninvoiced(db)
+    by_id = {e.id: e for e in report.entries}
+    assert set(by_id) == {data["project"].id, data["direct"].id, data["override"].id}
+    assert report.total_hours == pytest.approx(2.75)
+    assert report.total_amount == pytest.approx(Decimal("247.50"))
+
+    row = by_id[data["project"].id]
+    assert row.employee_name == "Erika Muster"
+    assert row.project_name == "Portal"
+    assert row.customer_id == data["customer_a"]
+    assert row.amount == pytest.approx(Decimal("135.00"))
+    # Kunde am Eintrag geht vor Kunde am Projekt
+    assert by_id[data["override"].id].customer_id == data["customer_b"]
+
+    filtered = crud.get_billable_uninvoiced(db, customer_id=data["customer_b"])
+    assert {e.id for e in filtered.entries} == {data["direct"].id, data["override"].id}
+    assert filtered.total_hours == pytest.approx(1.25)
+
+    empty = crud.get_billable_uninvoiced(db, customer_id=uuid.uuid4())
+    assert empty.entries == [] and empty.total_amount == 0
+
+
+def test_claim_entries_once(db: Session):
+    data = _seed(db)
+    ids = [data["project"].id, data["direct"].id]
+
+    claimed = crud._claim_entries(db, ids)
+    db.commit()
+    assert {row.id for row in claimed} == set(ids)
+    assert sum(row.minutes for row in claimed) == 135
+
+    with pytest.raises(HTTPException) as exc:
+        crud._claim_entries(db, [data["override"].id, data["direct"].id])
+    assert exc.value.status_code == 422
+    # Fehlgeschlagener Claim lässt auch die gültigen Einträge unverändert
+    assert db.scalar(select(TimeEntry.is_invoiced).where(TimeEntry.id == data["override"].id)) is False
+
+    with pytest.raises(HTTPException) as exc:
+        crud._claim_entries(db, [data["override"].id, uuid.uuid4()])
+    assert exc.value.status_code == 404
+
+    lines = crud._line_items(claimed, Decimal("90.00"), group_by_task_type=True)
+    assert {(l.description, l.quantity) for l in lines} == {
+        ("development", Decimal("1.5")), ("support", Decimal("0.75")),
+    }
@@ -0,0 +1,111 @@
+"""
+Tests für Bulk-Import und Bulk-Freigabe von Zeiteinträgen
+-----------------------------------------------------------
+- bulk_create_entries: Ergebnis pro Zeile, Überschneidungen gegen Bestand
+  und innerhalb des Batches, all_or_nothing
+- bulk_set_approved: per ID-Liste und per Filter, Audit-Einträge
+- Das Tages-Rollup bleibt in beiden Fällen konsistent
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.modules.backoffice.invoices.models import AuditLog
+from app.modules.backoffice.time_tracking import crud
+from app.modules.backoffice.time_tracking.models import TimeDailyRollup, TimeEntry
+from app.modules.backoffice.time_tracking.schemas import TimeEntryCreate
+from app.modules.employees.models import Employee
+
+TABLES = ["employees", "projects", "time_entries", "time_daily_rollups", "audit_logs"]
+START = datetime(2026, 3, 2, 9, 0)
+
+
+@pytest.fixture()
+def employees(db: Session) -> list[uuid.UUID]:
+    rows = [
+        Employee(employee_code=f"EMP-{i}", first_name="Test", last_name=str(i), email=f"t{i}@example.com")
+        for i in range(2)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [e.id for e in rows]
+
+
+def _entry(employee_id, offset_hours: float, minutes: int, **kwargs) -> TimeEntryCreate:
+    start = START + timedelta(hours=offset_hours)
+    return TimeEntryCreate(
+        employee_id=employee_id, start_time=start, end_time=start + timedelta(minutes=minutes), **kwargs,
+    )
+
+
+def _rollup_totals(db: Session) -> tuple[int, int, int]:
+    return db.execute(select(
+        func.coalesce(func.sum(TimeDailyRollup.total_minutes), 0),
+        func.coalesce(func.sum(TimeDailyRollup.approved_minutes), 0),
+        func.coalesce(func.sum(TimeDailyRollup.entry_count), 0),
+    )).one()
+
+
+def _naive_totals(db: Session) -> tuple[int, int, int]:
+    entries = db.scalars(select(TimeEntry)).all()
+    return (
+        sum(e.duration_minutes or 0 for e in entries),
+        sum(e.duration_minutes or 0 for e in entries if e.is_approved),
+        len(entries),
+    )
+
+
+def test_bulk_create_validates_per_row(db: Session, employees):
+    a, b = employees
+    crud.create_entry(db, _entry(a, 0, 60))  # 09:00–10:00
+
+    results = crud.bulk_create_entries(db, [
+        _entry(a, 1, 30),                 # ok, schließt direkt an
+        _entry(a, 0.5, 60),               # überschneidet Bestand
+        _entry(a, 1.25, 30),              # überschneidet Zeile 0
+        _entry(b, 0, 60),                 # anderer Mitarbeiter: ok
+        _entry(uuid.uuid4(), 0, 60),      # unbekannter Mitarbeiter
+        _entry(b, 3, 0),                  # end_time == start_time
+        TimeEntryCreate(employee_id=b, start_time=START + timedelta(hours=5)),  # laufend
+    ])
+
+    assert [r["success"] for r in results] == [True, False, False, True, False, False, True]
+    assert "Überschneidet" in results[1]["error"]
+    assert "Überschneidet" in results[2]["error"]
+    assert db.scalar(select(func.count(TimeEntry.id))) == 4
+    assert _rollup_totals(db) == _naive_totals(db)
+
+
+def test_bulk_create_all_or_nothing(db: Session, employees):
+    a, _ = employees
+    results = crud.bulk_create_entries(
+        db, [_entry(a, 0, 60), _entry(a, 0.5, 60)], all_or_nothing=True,
+    )
+    assert not any(r["success"] for r in results)
+    assert db.scalar(select(func.count(TimeEntry.id))) == 0
+
+
+def test_bulk_approval_by_ids_and_filter(db: Session, employees):
+    a, b = employees
+    crud.bulk_create_entries(db, [_entry(a, i * 2, 60) for i in range(3)] + [_entry(b, 0, 90)])
+    ids = list(db.scalars(select(TimeEntry.id).where(TimeEntry.employee_id == a).order_by(TimeEntry.start_time)))
+    crud.approve_entry(db, ids[0])
+
+    unknown = uuid.uuid4()
+    results = crud.bulk_set_approved(db, True, entry_ids=[ids[0], ids[1], unknown], user_id="42")
+    assert [(r["success"], r["changed"]) for r in results] == [(True, False), (True, True), (False, False)]
+    assert db.scalar(select(func.count(AuditLog.id))) == 1
+    assert _rollup_totals(db) == _naive_totals(db)
+
+    results = crud.bulk_set_approved(db, True, employee_id=b)
+    assert len(results) == 1 and results[0]["changed"]
+    results = crud.bulk_set_approved(db, False, start_date=START.date(), end_date=START.date())
+    assert len(results) == 3  # ids[0], ids[1] und der Eintrag von b
+    assert _rollup_totals(db) == _naive_totals(db)
+    assert db.scalar(select(func.count(AuditLog.id))) == 5
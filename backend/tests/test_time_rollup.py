@@ -0,0 +1,150 @@
+"""
+Tests für das Zeit-Rollup (time_tracking)
+-------------------------------------------
+Die Werte aus time_daily_rollups müssen immer der naiven Berechnung über
+die TimeEntry-Tabelle entsprechen:
+- nach create/update/delete/approve/reject (inkrementelle Pflege)
+- nach rebuild_time_rollup
+- für Wochenübersicht und Projekt-Kennzahlen
+"""
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.settings.database import Base
+from app.modules.backoffice.projects import crud as project_crud
+from app.modules.backoffice.projects.models import Project
+from app.modules.backoffice.time_tracking import crud
+from app.modules.backoffice.time_tracking.models import TimeDailyRollup, TimeEntry
+from app.modules.backoffice.time_tracking.schemas import TimeEntryCreate, TimeEntryUpdate
+
+from query_count import count_queries
+
+EMPLOYEE_A = uuid.uuid4()
+EMPLOYEE_B = uuid.uuid4()
+MONDAY = date(2026, 3, 2)
+
+TABLES = [
+    "projects", "time_entries", "time_daily_rollups", "working_hours_templates",
+    "invoices", "invoice_line_items", "expenses", "expense_daily_rollups",
+]
+
+
+def _project(db: Session, **kwargs) -> Project:
+    project = Project(title="Projekt", customer_id=uuid.uuid4(), **kwargs)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _create(db: Session, employee_id, project_id, day_offset: int, minutes: int, billable=True) -> TimeEntry:
+    start = datetime.combine(MONDAY + timedelta(days=day_offset), datetime.min.time()) + timedelta(hours=9)
+    return crud.create_entry(db, TimeEntryCreate(
+        employee_id=employee_id,
+        project_id=project_id,
+        start_time=start,
+        end_time=start + timedelta(minutes=minutes),
+        billable=billable,
+    ))
+
+
+def _rollup_snapshot(db: Session) -> dict:
+    rows = db.execute(select(
+        TimeDailyRollup.day, TimeDailyRollup.employee_id, TimeDailyRollup.project_id,
+        TimeDailyRollup.billable, TimeDailyRollup.total_minutes,
+        TimeDailyRollup.approved_minutes, TimeDailyRollup.entry_count,
+    )).all()
+    # Leere Buckets (nach Löschen/Verschieben) zählen nicht
+    return {tuple(r[:4]): tuple(r[4:]) for r in rows if r.entry_count}
+
+
+def _naive_snapshot(db: Session) -> dict:
+    buckets: dict = {}
+    for e in db.scalars(select(TimeEntry)):
+        key = (e.start_time.date(), e.employee_id, e.project_id, e.billable)
+        total, approved, count = buckets.get(key, (0, 0, 0))
+        minutes = e.duration_minutes or 0
+        buckets[key] = (total + minutes, approved + (minutes if e.is_approved else 0), count + 1)
+    return buckets
+
+
+def test_incremental_rollup_matches_naive(db: Session):
+    project = _project(db)
+    a = _create(db, EMPLOYEE_A, project.id, 0, 90)
+    b = _create(db, EMPLOYEE_A, project.id, 0, 30, billable=False)
+    c = _create(db, EMPLOYEE_B, None, 2, 45)
+    _create(db, EMPLOYEE_B, project.id, 4, 120)
+    assert _rollup_snapshot(db) == _naive_snapshot(db)
+
+    crud.approve_entry(db, a.id)
+    crud.approve_entry(db, a.id)  # idempotent
+    crud.update_entry(db, b.id, TimeEntryUpdate(billable=True, start_time=b.start_time + timedelta(days=1)))
+    crud.update_entry(db, c.id, TimeEntryUpdate(project_id=project.id))
+    crud.approve_entry(db, c.id)
+    crud.reject_entry(db, c.id)
+    crud.delete_entry(db, a.id)
+    assert _rollup_snapshot(db) == _naive_snapshot(db)
+
+    crud.rebuild_time_rollup(db)
+    assert _rollup_snapshot(db) == _naive_snapshot(db)
+
+
+def test_weekly_summary_from_rollup(db: Session):
+    _create(db, EMPLOYEE_A, None, 0, 60)
+    _create(db, EMPLOYEE_A, None, 0, 30)
+    _create(db, EMPLOYEE_A, None, 3, 240)
+    _create(db, EMPLOYEE_A, None, 7, 600)  # nächste Woche
+    _create(db, EMPLOYEE_B, None, 1, 60)
+
+    year, week, _ = MONDAY.isocalendar()
+    summary = crud.get_weekly_summary(db, EMPLOYEE_A, year, week)
+    assert summary["total_hours"] == 5.5
+    assert summary["target_hours"] == 40.0  # Standard-Woche, kein Feiertag
+    by_day = {d["date"]: (d["hours"], d["entries_count"]) for d in summary["daily_breakdown"]}
+    assert len(by_day) == 7
+    assert by_day[MONDAY.isoformat()] == (1.5, 2)
+    assert by_day[(MONDAY + timedelta(days=3)).isoformat()] == (4.0, 1)
+    assert by_day[(MONDAY + timedelta(days=1)).isoformat()] == (0.0, 0)
+
+
+def test_project_financials_from_rollups(db: Session):
+    project = _project(db, budget=Decimal("1000.00"), hourly_rate=Decimal("100.00"))
+    other = _project(db)
+    _create(db, EMPLOYEE_A, project.id, 0, 120)
+    _create(db, EMPLOYEE_B, project.id, 1, 60, billable=False)
+    _create(db, EMPLOYEE_A, other.id, 1, 30)
+    db.execute(insert(Base.metadata.tables["expense_daily_rollups"]), [{
+        "id": uuid.uuid4(), "day": MONDAY, "category": "travel",
+        "project_id": project.id, "total_amount": Decimal("50.00"), "expense_count": 1,
+    }])
+    db.commit()
+    db.refresh(project)
+
+    # Alle Properties teilen sich eine Kennzahlen-Query
+    with count_queries(db.get_bind()) as statements:
+        assert project.total_hours_tracked == Decimal(3)
+        assert project.billable_hours == Decimal(2)
+        assert project.total_revenue == Decimal(0)
+        assert project.total_expenses == Decimal("50.00")
+        # Kosten: 50 + 2h * 100 = 250 von 1000
+        assert project.budget_utilization == pytest.approx(25.0)
+        assert project.profit_margin is None  # kein Umsatz
+    assert len(statements) == 1
+
+    rows = dict(project_crud.get_projects_with_financials(db))
+    assert rows[project].total_minutes == 180
+    assert rows[other].billable_minutes == 30
+    item = project_crud.project_list_item(project, rows[project])
+    assert item.budget_utilization == pytest.approx(25.0)
+    assert item.total_hours_tracked == 3.0
+
+    # Nach dem Commit (expire) werden die Kennzahlen neu gelesen
+    _create(db, EMPLOYEE_A, project.id, 2, 60)
+    assert project.total_hours_tracked == Decimal(4)
@@ -0,0 +1,190 @@
+"""
+Tests für die SQL-aggregierten Zeiterfassungs-Statistiken
+-----------------------------------------------------------
+- get_stats liefert dieselben Werte wie die bisherige Python-Berechnung
+  über alle Einträge (heute/Woche/Monat, billable, je Projekt/Tätigkeit)
+- Konstante Anzahl SQL-Statements
+- Benchmark (optional, WORKMATE_BENCHMARK=1): get_stats pro Mitarbeiter
+  bleibt bei 10k → 1M Einträgen flach (ix_time_entries_employee_start)
+"""
+from __future__ import annotations
+
+import os
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Generator
+
+import pytest
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.main  # noqa: F401 – registriert alle Models für die Mapper-Konfiguration
+from app.core.settings.database import Base
+from app.modules.backoffice.time_tracking import crud
+from app.modules.backoffice.time_tracking.models import TimeEntry
+
+from query_count import count_queries
+
+EMPLOYEES = [uuid.uuid4() for _ in range(4)]
+PROJECTS = [uuid.uuid4(), uuid.uuid4(), None]
+TASK_TYPES = ["development", "meeting", "", None]
+
+
+def _make_engine():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(bind=engine, tables=[TimeEntry.__table__])
+    return engine
+
+
+@pytest.fixture()
+def engine():
+    engine = _make_engine()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db(engine) -> Generator[Session, None, None]:
+    session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+    yield session
+    session.close()
+
+
+def _rows(count: int, employees: list[uuid.UUID], now: datetime) -> list[dict]:
+    """Einträge über ~90 Tage verteilt, gemischt billable/Projekt/Tätigkeit."""
+    return [
+        {
+            "id": uuid.uuid4(),
+            "employee_id": employees[i % len(employees)],
+            "project_id": PROJECTS[i % len(PROJECTS)],
+            "start_time": now - timedelta(hours=i * 7 % (90 * 24)),
+            "duration_minutes": None if i % 11 == 0 else 15 + i % 240,
+            "billable": i % 3 != 0,
+            "task_type": TASK_TYPES[i % len(TASK_TYPES)],
+            "is_approved": False,
+            "is_invoiced": False,
+        }
+        for i in range(count)
+    ]
+
+
+def _seed(db: Session, rows: list[dict]) -> None:
+    db.execute(insert(TimeEntry), rows)
+    db.commit()
+
+
+def _naive_stats(db: Session, employee_id=None) -> dict:
+    """Referenz: die frühere Berechnung in Python über alle Einträge."""
+    query = db.query(TimeEntry)
+    if employee_id:
+        query = query.filter(TimeEntry.employee_id == employee_id)
+    entries = query.all()
+
+    now = datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today_start - timedelta(days=today_start.weekday())
+    month_start = today_start.replace(day=1)
+
+    def _sum_hours(items):
+        return round(sum((e.duration_minutes or 0) for e in items) / 60, 2)
+
+    project_map: dict[str, float] = {}
+    type_map: dict[str, float] = {}
+    for e in entries:
+        pid = str(e.project_id) if e.project_id else "no_project"
+        project_map[pid] = project_map.get(pid, 0) + (e.duration_minutes or 0)
+        tt = e.task_type or "unspecified"
+        type_map[tt] = type_map.get(tt, 0) + (e.duration_minutes or 0)
+
+    return {
+        "total_hours_today": _sum_hours([e for e in entries if e.start_time >= today_start]),
+        "total_hours_week": _sum_hours([e for e in entries if e.start_time >= week_start]),
+        "total_hours_month": _sum_hours([e for e in entries if e.start_time >= month_start]),
+        "total_entries": len(entries),
+        "billable_hours": _sum_hours([e for e in entries if e.billable]),
+        "non_billable_hours": _sum_hours([e for e in entries if not e.billable]),
+        "hours_by_project": {k: round(v / 60, 2) for k, v in project_map.items()},
+        "hours_by_task_type": {k: round(v / 60, 2) for k, v in type_map.items()},
+    }
+
+
+# ---------------------------------------------------------------------------
+# Tests
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("employee_id", [None, EMPLOYEES[1]])
+def test_stats_match_naive(engine, db: Session, employee_id):
+    _seed(db, _rows(600, EMPLOYEES, datetime.utcnow()))
+
+    with count_queries(engine) as statements:
+        stats = crud.get_stats(db, employee_id=employee_id)
+    assert len(statements) == 3
+
+    expected = _naive_stats(db, employee_id)
+    for key in (
+        "total_hours_today", "total_hours_week", "total_hours_month",
+        "total_entries", "billable_hours", "non_billable_hours",
+    ):
+        assert stats[key] == pytest.approx(expected[key]), key
+    assert {p["project_id"]: p["hours"] for p in stats["hours_by_project"]} == expected["hours_by_project"]
+    assert {t["task_type"]: t["hours"] for t in stats["hours_by_task_type"]} == expected["hours_by_task_type"]
+
+
+def test_stats_empty(db: Session):
+    stats = crud.get_stats(db)
+    assert stats["total_entries"] == 0
+    assert stats["total_hours_month"] == 0
+    assert stats["hours_by_project"] == []
+
+
+# ---------------------------------------------------------------------------
+# Benchmark
+# ---------------------------------------------------------------------------
+
+BENCHMARK_SIZES = (10_000, 100_000, 1_000_000)
+ENTRIES_PER_EMPLOYEE = 1_000
+
+
+@pytest.mark.skipif(
+    not os.getenv("WORKMATE_BENCHMARK"),
+    reason="Benchmark nur mit WORKMATE_BENCHMARK=1",
+)
+def test_benchmark_stats_latency_flat():
+    """
+    get_stats(employee_id) bei wachsender Tabelle und konstant vielen
+    Einträgen pro Mitarbeiter: die Latenz darf nicht mit der Tabelle wachsen.
+    """
+    now = datetime.utcnow()
+    medians = {}
+
+    for size in BENCHMARK_SIZES:
+        engine = _make_engine()
+        session = sessionmaker(bind=engine, autocommit=False, autoflush=False)()
+        employees = [uuid.uuid4() for _ in range(size // ENTRIES_PER_EMPLOYEE)]
+        for start in range(0, size, 50_000):
+            batch = _rows(min(50_000, size - start), employees, now)
+            session.execute(insert(TimeEntry), batch)
+        session.commit()
+
+        timings = []
+        for employee_id in employees[:20]:
+            started = time.perf_counter()
+            crud.get_stats(session, employee_id=employee_id)
+            timings.append(time.perf_counter() - started)
+        medians[size] = statistics.median(timings)
+
+        session.close()
+        engine.dispose()
+
+    print("\nget_stats(employee_id) median latency:")
+    for size, median in medians.items():
+        print(f"  {size:>9,} entries: {median * 1000:.2f} ms")
+
+    assert medians[BENCHMARK_SIZES[-1]] < medians[BENCHMARK_SIZES[0]] * 3
@@ -4,7 +4,7 @@ import { useEffect, useState } from "react"
 import Link from "next/link"
 import { useRouter } from "next/navigation"
 import { crmService } from "@/lib/crm/service"
-import type { CrmStats, CrmActivity } from "@/lib/crm/types"
+import type { CrmStats, CrmActivity, PipelineColumn } from "@/lib/crm/types"
 import { Button } from "@/components/ui/button"
 import {
   Users, KanbanSquare, Contact2, PlusIcon, ArrowRight,
@@ -48,7 +48,7 @@ function timeAgo(dateStr: string): string {
 export function CrmDashboard() {
   const router = useRouter()
   const [stats, setStats] = useState<CrmStats | null>(null)
-  const [pipeline, setPipeline] = useState<Record<string, unknown[]>>({})
+  const [pipeline, setPipeline] = useState<Record<string, PipelineColumn>>({})
   const [activities, setActivities] = useState<(CrmActivity & { customer_name?: string })[]>([])
   const [loading, setLoading] = useState(true)
 
@@ -67,7 +67,7 @@ export function CrmDashboard() {
     load()
   }, [])
 
-  const pipelineTotal = Object.values(pipeline).reduce((s, c) => s + c.length, 0)
+  const pipelineTotal = Object.values(pipeline).reduce((s, c) => s + c.count, 0)
 
   return (
     <div className="space-y-6 px-8 py-6">
@@ -146,7 +146,7 @@ export function CrmDashboard() {
           ) : (
             <div className="space-y-3">
               {STAGE_CONFIG.map(stage => {
-                const count = (pipeline[stage.id] ?? []).length
+                const count = pipeline[stage.id]?.count ?? 0
                 const pct = pipelineTotal ? Math.round((count / pipelineTotal) * 100) : 0
                 return (
                   <div key={stage.id} className="flex items-center gap-3">
@@ -3,7 +3,7 @@
 import { useEffect, useRef, useState } from "react"
 import { useRouter } from "next/navigation"
 import { crmService } from "@/lib/crm/service"
-import type { Customer, PipelineStage } from "@/lib/crm/types"
+import type { PipelineCard, PipelineColumn, PipelineStage } from "@/lib/crm/types"
 import { BuildingIcon, MailIcon, PhoneIcon, ExternalLinkIcon } from "lucide-react"
 
 const STAGES: { id: PipelineStage; label: string; color: string; headerColor: string }[] = [
@@ -15,6 +15,8 @@ const STAGES: { id: PipelineStage; label: string; color: string; headerColor: st
   { id: "lost",       label: "Verloren",      color: "border-red-200 dark:border-red-800",      headerColor: "bg-red-50 dark:bg-red-950" },
 ]
 
+const EMPTY_COLUMN: PipelineColumn = { count: 0, items: [], next_cursor: null }
+
 const TYPE_ICON: Record<string, string> = {
   business: "🏢", individual: "👤", creator: "✨", government: "🏛️",
 }
@@ -23,7 +25,7 @@ function CustomerCard({
   customer,
   onDragStart,
 }: {
-  customer: Customer
+  customer: PipelineCard
   onDragStart: (e: React.DragEvent, id: string) => void
 }) {
   const router = useRouter()
@@ -77,15 +79,18 @@ function CustomerCard({
 
 function KanbanColumn({
   stage,
-  customers,
+  column,
   onDragStart,
   onDrop,
+  onLoadMore,
 }: {
   stage: typeof STAGES[number]
-  customers: Customer[]
+  column: PipelineColumn
   onDragStart: (e: React.DragEvent, id: string) => void
   onDrop: (stageId: PipelineStage) => void
+  onLoadMore: (stageId: PipelineStage) => void
 }) {
+  const customers = column.items
   const [dragOver, setDragOver] = useState(false)
 
   return (
@@ -99,7 +104,7 @@ function KanbanColumn({
       <div className={`flex items-center justify-between rounded-t-[10px] px-3 py-2.5 ${stage.headerColor}`}>
         <span className="text-sm font-semibold">{stage.label}</span>
         <span className="rounded-full bg-background/60 px-2 py-0.5 text-xs font-medium tabular-nums">
-          {customers.length}
+          {column.count}
         </span>
       </div>
 
@@ -108,6 +113,14 @@ function KanbanColumn({
         {customers.map(c => (
           <CustomerCard key={c.id} customer={c} onDragStart={onDragStart} />
         ))}
+        {column.next_cursor && (
+          <button
+            onClick={() => onLoadMore(stage.id)}
+            className="rounded-lg border border-dashed py-2 text-xs text-muted-foreground hover:text-foreground hover:border-primary/40 transition-colors"
+          >
+            Weitere laden ({column.count - customers.length})
+          </button>
+        )}
         {dragOver && customers.length === 0 && (
           <div className="rounded-lg border-2 border-dashed border-primary/40 h-20 flex items-center justify-center text-xs text-primary/60">
             Hier ablegen
@@ -119,7 +132,7 @@ function KanbanColumn({
 }
 
 export function PipelineBoard() {
-  const [pipeline, setPipeline] = useState<Record<string, Customer[]>>({})
+  const [pipeline, setPipeline] = useState<Record<string, PipelineColumn>>({})
   const [loading, setLoading] = useState(true)
   const dragIdRef = useRef<string | null>(null)
 
@@ -146,18 +159,20 @@ export function PipelineBoard() {
     dragIdRef.current = null
 
     // Find current stage
-    const currentStage = Object.entries(pipeline).find(([, customers]) =>
-      customers.some(c => c.id === id)
+    const currentStage = Object.entries(pipeline).find(([, column]) =>
+      column.items.some(c => c.id === id)
     )?.[0]
     if (!currentStage || currentStage === targetStage) return
 
     // Optimistic update
     setPipeline(prev => {
       const next = { ...prev }
-      const customer = prev[currentStage]?.find(c => c.id === id)
+      const from = prev[currentStage]
+      const to = prev[targetStage] ?? EMPTY_COLUMN
+      const customer = from?.items.find(c => c.id === id)
       if (!customer) return prev
-      next[currentStage] = (prev[currentStage] ?? []).filter(c => c.id !== id)
-      next[targetStage] = [{ ...customer, pipeline_stage: targetStage }, ...(prev[targetStage] ?? [])]
+      next[currentStage] = { ...from, count: from.count - 1, items: from.items.filter(c => c.id !== id) }
+      next[targetStage] = { ...to, count: to.count + 1, items: [{ ...customer, pipeline_stage: targetStage }, ...to.items] }
       return next
     })
 
@@ -169,7 +184,25 @@ export function PipelineBoard() {
     }
   }
 
-  const totalLeads = Object.values(pipeline).reduce((s, c) => s + c.length, 0)
+  async function handleLoadMore(stageId: PipelineStage) {
+    const cursor = pipeline[stageId]?.next_cursor
+    if (!cursor) return
+    const page = await crmService.getPipelineStage(stageId, cursor)
+    setPipeline(prev => {
+      const column = prev[stageId] ?? EMPTY_COLUMN
+      const known = new Set(column.items.map(c => c.id))
+      return {
+        ...prev,
+        [stageId]: {
+          ...column,
+          items: [...column.items, ...page.items.filter(c => !known.has(c.id))],
+          next_cursor: page.next_cursor,
+        },
+      }
+    })
+  }
+
+  const totalLeads = Object.values(pipeline).reduce((s, c) => s + c.count, 0)
 
   return (
     <div className="flex flex-col gap-4 px-8 py-6 h-full">
@@ -192,9 +225,10 @@ export function PipelineBoard() {
             <KanbanColumn
               key={stage.id}
               stage={stage}
-              customers={pipeline[stage.id] ?? []}
+              column={pipeline[stage.id] ?? EMPTY_COLUMN}
               onDragStart={handleDragStart}
               onDrop={handleDrop}
+              onLoadMore={handleLoadMore}
             />
           ))}
         </div>
@@ -1,5 +1,5 @@
 import { apiClient } from "@/lib/api/client"
-import type { Customer, Contact, CrmActivity, CreateCrmActivity, CsvImportResult, CrmStats, ContactWithCustomer } from "./types"
+import type { Customer, Contact, CrmActivity, CreateCrmActivity, CsvImportResult, CrmStats, ContactWithCustomer, PipelineColumn, PipelineColumnPage } from "./types"
 
 export const crmService = {
   // Customers
@@ -50,8 +50,12 @@ export const crmService = {
   },
 
   // Pipeline
-  async getPipeline(): Promise<Record<string, Customer[]>> {
-    const { data } = await apiClient.get("/api/backoffice/crm/pipeline")
+  async getPipeline(limit?: number): Promise<Record<string, PipelineColumn>> {
+    const { data } = await apiClient.get("/api/backoffice/crm/pipeline", { params: { limit } })
+    return data
+  },
+  async getPipelineStage(stage: string, cursor: string, limit?: number): Promise<PipelineColumnPage> {
+    const { data } = await apiClient.get(`/api/backoffice/crm/pipeline/${stage}`, { params: { cursor, limit } })
     return data
   },
   async updatePipelineStage(customerId: string, stage: string): Promise<Customer> {
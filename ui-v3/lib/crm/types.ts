@@ -24,6 +24,27 @@ export interface Customer {
   contacts?: Contact[]
 }
 
+export interface PipelineCard {
+  id: string
+  customer_number: string | null
+  name: string
+  type: CustomerType | null
+  email: string | null
+  phone: string | null
+  city: string | null
+  country: string | null
+  pipeline_stage: PipelineStage | null
+}
+
+export interface PipelineColumnPage {
+  items: PipelineCard[]
+  next_cursor: string | null
+}
+
+export interface PipelineColumn extends PipelineColumnPage {
+  count: number
+}
+
 export interface Contact {
   id: string
   customer_id: string